@@ -38,12 +38,17 @@ from helpers.enhanced_player_search import enhanced_player_search
 from flask_migrate import Migrate
 
 from helpers.utils import data_path, DATA_DIR
+from helpers.team_resolver import team_resolver
+from helpers.player_resolver import player_resolver, player_name_key
+from helpers.fast_json import FastJSONProvider
+from helpers.compression import init_response_compression
 
 # Ensure data directory exists
 os.makedirs(DATA_DIR, exist_ok=True)
 
 # Flask app initialization and config
 app = Flask(__name__, static_folder='.', static_url_path='')
+app.json = FastJSONProvider(app)
 
 # Register blueprints
  # Serve index.html at root
@@ -150,9 +155,11 @@ def issues():
 from routes.admin import admin_bp
 from routes.auth import auth_bp
 from routes import bets_bp
+from routes.analytics import analytics_bp
 app.register_blueprint(admin_bp)
 app.register_blueprint(auth_bp)
 app.register_blueprint(bets_bp)  # No url_prefix, endpoints at root
+app.register_blueprint(analytics_bp)
 
 # Database configuration
 database_url = os.environ.get('DATABASE_URL')
@@ -187,6 +194,10 @@ else:
         }
     }
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
+
+# Offline runs: replay (ESPN_REPLAY_URL) or record (ESPN_RECORD_DIR) ESPN traffic
+from helpers.espn_fixtures import install_from_env as install_espn_fixtures
+install_espn_fixtures()
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 app.config['PERMANENT_SESSION_LIFETIME'] = 2592000
@@ -194,7 +205,8 @@ app.config['SESSION_COOKIE_SECURE'] = False
 app.config['REMEMBER_COOKIE_DURATION'] = 2592000
 
 print("DEBUG: Initializing CORS")
-CORS(app, supports_credentials=True)
+CORS(app, supports_credentials=True, expose_headers=['ETag'])
+init_response_compression(app)
 print("DEBUG: Initializing DB")
 db.init_app(app)
 print(f"DEBUG: DB initialized. Extensions: {app.extensions.keys()}")
@@ -217,7 +229,7 @@ from services import calculate_bet_value, process_parlay_data
 from typing import Any
 def get_user_bets_query(user: Any, **filters: Any) -> Any:
     """
-    Get bets for a user using array containment.
+    Get bets for a user via the bet_participants table.
     This returns all bets the user has access to (owned + shared + watched).
     
     Args:
@@ -227,26 +239,10 @@ def get_user_bets_query(user: Any, **filters: Any) -> Any:
     Returns:
         SQLAlchemy query object
     """
-    from sqlalchemy import or_
+    from services.user_service import participant_bets_query, ALL_ROLES
     
-    # Query bets where user is primary, secondary bettor, or watcher
-    # Query bets where user is primary, secondary bettor, or watcher
-    # SQLite workaround: Check string containment for JSON arrays
-    user_id_str = str(user.id)
-    query = Bet.query.filter(
-        or_(
-            Bet.user_id == user.id,  # Primary bettor
-            # Check if user_id is in the JSON string (e.g. "[1, 2]")
-            # We check for: "[1", ", 1,", "1]" to avoid matching 11 in [11]
-            # But for simplicity in dev, simple string check is often enough, 
-            # though strictly we should be careful. 
-            # Let's use a slightly safer CAST to string approach if possible, 
-            # or just rely on the fact that IDs are unique enough.
-            # Actually, let's just use CAST to String and LIKE for now.
-            db.cast(Bet.secondary_bettors, db.String).like(f'%{user_id_str}%'),
-            db.cast(Bet.watchers, db.String).like(f'%{user_id_str}%')
-        )
-    )
+    # Query bets where user is primary, secondary bettor, or watcher (indexed join)
+    query = participant_bets_query(user.id, ALL_ROLES)
     
     # Apply additional filters
     for key, value in filters.items():
@@ -387,7 +383,6 @@ def get_user_bets_from_db(user_id: int, status_filter: Optional[Any] = None) ->
 def populate_game_ids_for_bet(bet: Any) -> None:
     """Populate ESPN game IDs for all bet legs in a bet that have game dates and team info."""
     from helpers.espn_api import get_espn_games_with_ids_for_date
-    from models import Team
     
     bet_legs = db.session.query(BetLeg).filter(
         BetLeg.bet_id == bet.id,
@@ -401,52 +396,13 @@ def populate_game_ids_for_bet(bet: Any) -> None:
     
     app.logger.info(f"[GAME-ID-POPULATION] Populating game IDs for {len(bet_legs)} legs in bet {bet.id}")
     
-    # Build team lookup from database (for normalization)
-    teams = Team.query.all()
-    team_lookup_for_norm = {}
-    for sport in ['NFL', 'NBA', 'MLB', 'NHL']:
-        sport_teams = [t for t in teams if t.sport == sport]
-        abbr_to_fullname = {}
-        shortname_to_fullname = {}
-        for team in sport_teams:
-            if team.team_name:
-                full_name_norm = team.team_name.lower().strip()
-                if team.team_abbr:
-                    abbr_to_fullname[team.team_abbr.upper().strip()] = full_name_norm
-                if team.team_name_short:
-                    shortname_to_fullname[team.team_name_short.lower().strip()] = full_name_norm
-                # Also add nickname mapping
-                if team.nickname and team.nickname.lower().strip() != team.team_name.lower().strip():
-                    shortname_to_fullname[team.nickname.lower().strip()] = full_name_norm
-        team_lookup_for_norm[sport] = {
-            'abbr_to_fullname': abbr_to_fullname,
-            'shortname_to_fullname': shortname_to_fullname
-        }
-    
     def normalize_team_name_for_matching(team_str, sport='NFL'):
         """Normalize team name to ESPN-compatible full name for matching"""
-        if not team_str or sport not in team_lookup_for_norm:
-            return team_str.lower().strip() if team_str else ''
-        
-        lookup = team_lookup_for_norm[sport]
-        team_lower = team_str.lower().strip()
-        team_upper = team_str.upper().strip()
-        
-        # Try abbreviation lookup (e.g., "SEA" -> "seattle seahawks")
-        if team_upper in lookup['abbr_to_fullname']:
-            return lookup['abbr_to_fullname'][team_upper]
-        
-        # Try short name/nickname lookup (e.g., "Seahawks" -> "seattle seahawks")
-        if team_lower in lookup['shortname_to_fullname']:
-            return lookup['shortname_to_fullname'][team_lower]
-        
-        # Try partial match
-        for shortname, fullname in lookup['shortname_to_fullname'].items():
-            if shortname in team_lower:
-                return fullname
-        
-        # Fallback: just return lowercase
-        return team_lower
+        if not team_str:
+            return ''
+        # Abbreviation, short name/nickname or partial name (e.g. "SEA", "Seahawks" -> "seattle seahawks")
+        full_name = team_resolver.full_name(team_str, sport)
+        return full_name.lower().strip() if full_name else team_str.lower().strip()
     
     # Group legs by game date for efficiency
     legs_by_date = {}
@@ -660,7 +616,6 @@ def populate_player_data_for_bet(bet: Any) -> None:
     - Game total bets (where player_name is 'Game Total')
     - Legs that already have player_id
     """
-    from helpers.espn_api import search_espn_player
     from models import Player
     
     # Filter for legs that need player population
@@ -747,14 +702,11 @@ def populate_player_data_for_bet(bet: Any) -> None:
             continue
 
         try:
-            # First, try to find existing player by name
-            existing_player = Player.query.filter(
-                db.or_(
-                    Player.player_name == leg.player_name,
-                    Player.normalized_name == leg.player_name.lower().strip(),
-                    Player.display_name == leg.player_name
-                )
-            ).first()
+            # First, try the local player index (exact and suffix-less names; approximate
+            # ones only when the slip's team agrees)
+            existing_player = player_resolver.find(leg.player_name, sport=leg.sport, team=leg.player_team)
+            if existing_player is not None and leg.sport and (existing_player.sport or '').upper() != leg.sport.upper():
+                existing_player = None  # only link players of the leg's sport
             
             if existing_player:
                 # Use existing player
@@ -767,9 +719,9 @@ def populate_player_data_for_bet(bet: Any) -> None:
             
             # Check if we've already created this player in this transaction
             new_player_in_session = None
-            normalized_name = leg.player_name.lower().strip()
+            name_key = player_name_key(leg.player_name)
             for obj in db.session.new:
-                if isinstance(obj, Player) and obj.normalized_name == normalized_name:
+                if isinstance(obj, Player) and player_name_key(obj.player_name) == name_key:
                     new_player_in_session = obj
                     break
             
@@ -782,13 +734,27 @@ def populate_player_data_for_bet(bet: Any) -> None:
                 app.logger.info(f"[PLAYER-POPULATION] Reusing newly created player {new_player_in_session.player_name} (ID: {new_player_in_session.id}) for leg {leg.id}")
                 continue
             
-            # Player not found, search ESPN with enhanced fallback strategies
+            # Genuine local miss: search ESPN (recent ESPN misses are skipped)
             # Determine sport and league from bet leg
             sport_param = "football" if leg.parlay_sport in ['NFL', None] else "basketball"
             league_param = leg.parlay_sport.lower() if leg.parlay_sport else "nfl"
             
             app.logger.info(f"[PLAYER-POPULATION] Player {leg.player_name} not found locally, searching ESPN with enhanced strategies (sport={sport_param}, league={league_param})...")
-            espn_player_data = enhanced_player_search(leg.player_name, sport=sport_param, league=league_param)
+            espn_player_data = player_resolver.search_espn(leg.player_name, sport=sport_param, league=league_param)
+            
+            # ESPN's spelling may already be known locally (e.g. "Kenneth Walker" -> "Kenneth Walker III")
+            known_player = player_resolver.find(espn_player_data['player_name'], sport=espn_player_data.get('sport'),
+                                                team=espn_player_data.get('current_team')) if espn_player_data else None
+            if known_player is not None and espn_player_data.get('sport') and \
+                    (known_player.sport or '').upper() != espn_player_data['sport'].upper():
+                known_player = None
+            if known_player:
+                leg.player_id = known_player.id
+                leg.player_position = known_player.position
+                if known_player.current_team:
+                    leg.player_team = known_player.current_team
+                app.logger.info(f"[PLAYER-POPULATION] ESPN name {espn_player_data['player_name']} matched existing player (ID: {known_player.id}) for leg {leg.id}")
+                continue
             
             if espn_player_data:
                 # Create new player record
@@ -848,7 +814,7 @@ def populate_player_data_for_bet(bet: Any) -> None:
 
 def save_bet_to_db(user_id: int, bet_data: dict, skip_duplicate_check: bool = False) -> dict:
     """Save a bet to database with JSON backup and create BetLeg records"""
-    from models import Team, Bet, BetLeg
+    from models import Bet, BetLeg
 
     # --- DUPLICATE CHECK LOGIC ---
     legs = bet_data.get('legs', [])
@@ -866,39 +832,11 @@ def save_bet_to_db(user_id: int, bet_data: dict, skip_duplicate_check: bool = Fa
                 return existing_bet.to_dict()
 
     # --- NORMALIZATION AND SAVE LOGIC ---
-    teams = Team.query.all()
-    team_lookup = {}
-    for sport in ['NFL', 'NBA']:
-            sport_teams = [t for t in teams if t.sport == sport]
-            abbr_to_nickname = {}
-            name_to_nickname = {}
-            for team in sport_teams:
-                if team.nickname:
-                    if team.team_abbr:
-                        abbr_to_nickname[team.team_abbr.upper().strip()] = team.nickname
-                    if team.team_name:
-                        name_to_nickname[team.team_name.lower().strip()] = team.nickname
-                    if team.team_name_short:
-                        name_to_nickname[team.team_name_short.lower().strip()] = team.nickname
-            team_lookup[sport] = {
-                'abbr_to_nickname': abbr_to_nickname,
-                'name_to_nickname': name_to_nickname
-            }
-
     def normalize_team_name(team_str, sport):
-        if not team_str or not sport or sport not in team_lookup:
+        # Only NFL/NBA slips are normalized to nicknames; other sports keep the slip's spelling
+        if not team_str or sport not in ('NFL', 'NBA'):
             return team_str
-        lookup = team_lookup[sport]
-        team_lower = team_str.lower().strip()
-        team_upper = team_str.upper().strip()
-        if team_upper in lookup['abbr_to_nickname']:
-            return lookup['abbr_to_nickname'][team_upper]
-        if team_lower in lookup['name_to_nickname']:
-            return lookup['name_to_nickname'][team_lower]
-        for full_name, nickname in lookup['name_to_nickname'].items():
-            if full_name in team_lower or team_lower in full_name:
-                return nickname
-        return team_str
+        return team_resolver.nickname(team_str, sport, default=team_str)
 
     bet = Bet(user_id=user_id)
     import json
@@ -1304,127 +1242,35 @@ def normalize_bet_leg_team_names():
     Also updates status and is_hit for completed bets with pending legs.
     """
     try:
-        from models import Team
-        
         app.logger.info("[DATA-NORMALIZE] Starting SPORT-AWARE team name normalization...")
         
-        # Build sport-specific lookup dictionaries from teams table
-        teams = Team.query.all()
-        
-        # Separate lookups by sport: lookups[sport][lookup_type][key] = value
-        lookups = {'NFL': {}, 'NBA': {}}
-        
-        for sport in ['NFL', 'NBA']:
-            sport_teams = [t for t in teams if t.sport == sport]
-            
-            # Map: full name -> nickname (e.g., "Detroit Lions" -> "Lions")
-            name_to_nickname = {}
-            # Map: abbreviation -> nickname (e.g., "DET" -> "Lions" for NFL, "Pistons" for NBA)
-            abbr_to_nickname = {}
-            # Map: full name -> abbreviation (e.g., "Detroit Lions" -> "DET")
-            name_to_abbr = {}
-            # Map: nickname -> abbreviation (e.g., "Lions" -> "DET" for NFL)
-            nickname_to_abbr = {}
-            
-            for team in sport_teams:
-                if team.nickname:
-                    # Full name mappings
-                    if team.team_name:
-                        name_to_nickname[team.team_name.lower().strip()] = team.nickname
-                        name_to_abbr[team.team_name.lower().strip()] = team.team_abbr
-                    
-                    # Abbreviation mappings
-                    if team.team_abbr:
-                        abbr_to_nickname[team.team_abbr.upper().strip()] = team.nickname
-                        nickname_to_abbr[team.nickname.lower().strip()] = team.team_abbr
-                    
-                    # Short name mappings (if different from nickname)
-                    if team.team_name_short and team.team_name_short != team.nickname:
-                        name_to_nickname[team.team_name_short.lower().strip()] = team.nickname
-                        name_to_abbr[team.team_name_short.lower().strip()] = team.team_abbr
-            
-            lookups[sport] = {
-                'name_to_nickname': name_to_nickname,
-                'abbr_to_nickname': abbr_to_nickname,
-                'name_to_abbr': name_to_abbr,
-                'nickname_to_abbr': nickname_to_abbr
-            }
-        
-        app.logger.info(f"[DATA-NORMALIZE] Built sport-specific lookup tables: NFL={len(lookups['NFL']['name_to_nickname'])}, NBA={len(lookups['NBA']['name_to_nickname'])}")
-        
         # Helper function to normalize team name to nickname (sport-aware)
+        # Only NFL/NBA legs are rewritten; other sports keep the names they were saved with
         def to_nickname(team_str, sport):
-            if not team_str or not sport or sport not in lookups:
+            if not team_str or sport not in ('NFL', 'NBA'):
                 return team_str
             
-            sport_lookup = lookups[sport]
-            team_lower = team_str.lower().strip()
-            team_upper = team_str.upper().strip()
-            
             # CRITICAL FIX: Check if this is a nickname/name/abbr from the WRONG sport
             # If so, we need to convert it to the correct sport's team
             # Example: "Timberwolves" (NBA) on NFL leg should become "Vikings" (NFL) - both MIN
             wrong_sport = 'NBA' if sport == 'NFL' else 'NFL'
-            if wrong_sport in lookups:
-                wrong_sport_lookup = lookups[wrong_sport]
-                
-                # Is this a nickname from the wrong sport?
-                if team_lower in wrong_sport_lookup['nickname_to_abbr']:
-                    # Get the abbreviation from wrong sport
-                    abbr = wrong_sport_lookup['nickname_to_abbr'][team_lower]
-                    # Look up the correct sport's team with same abbreviation
-                    if abbr.upper() in sport_lookup['abbr_to_nickname']:
-                        app.logger.info(f"[DATA-NORMALIZE] Converting {team_str} ({wrong_sport}) to {sport_lookup['abbr_to_nickname'][abbr.upper()]} ({sport}) via {abbr}")
-                        return sport_lookup['abbr_to_nickname'][abbr.upper()]
-            
-            # Check if it's already a nickname in the correct sport
-            if team_lower in sport_lookup['nickname_to_abbr']:
-                return team_str  # Already normalized
+            wrong_team = team_resolver.resolve(team_str, wrong_sport)
+            if (wrong_team is not None and wrong_team.nickname
+                    and wrong_team.nickname.lower() == team_str.lower().strip()):
+                # Look up the correct sport's team with same abbreviation
+                team = team_resolver.by_abbreviation(wrong_team.team_abbr, sport)
+                if team is not None and team.nickname:
+                    app.logger.info(f"[DATA-NORMALIZE] Converting {team_str} ({wrong_sport}) to {team.nickname} ({sport}) via {wrong_team.team_abbr}")
+                    return team.nickname
             
-            # Check if it's a full name
-            if team_lower in sport_lookup['name_to_nickname']:
-                return sport_lookup['name_to_nickname'][team_lower]
-            
-            # Check if it's an abbreviation
-            if team_upper in sport_lookup['abbr_to_nickname']:
-                return sport_lookup['abbr_to_nickname'][team_upper]
-            
-            # Try partial matching (e.g., "Los Angeles Lakers" contains "Lakers")
-            for full_name, nickname in sport_lookup['name_to_nickname'].items():
-                if full_name in team_lower or team_lower in full_name:
-                    return nickname
-            
-            # No match found, return original
-            return team_str
+            # Full name, abbreviation, nickname or partial name (e.g. "Los Angeles Lakers" -> "Lakers")
+            return team_resolver.nickname(team_str, sport, default=team_str)
         
         # Helper function to normalize team name to abbreviation (sport-aware)
         def to_abbr(team_str, sport):
-            if not team_str or not sport or sport not in lookups:
+            if not team_str or sport not in ('NFL', 'NBA'):
                 return team_str
-            
-            sport_lookup = lookups[sport]
-            team_lower = team_str.lower().strip()
-            team_upper = team_str.upper().strip()
-            
-            # Check if it's already an abbreviation
-            if team_upper in sport_lookup['abbr_to_nickname']:
-                return team_upper  # Already normalized
-            
-            # Check if it's a nickname
-            if team_lower in sport_lookup['nickname_to_abbr']:
-                return sport_lookup['nickname_to_abbr'][team_lower]
-            
-            # Check if it's a full name
-            if team_lower in sport_lookup['name_to_abbr']:
-                return sport_lookup['name_to_abbr'][team_lower]
-            
-            # Try partial matching
-            for full_name, abbr in sport_lookup['name_to_abbr'].items():
-                if full_name in team_lower or team_lower in full_name:
-                    return abbr
-            
-            # No match found, return original
-            return team_str
+            return team_resolver.abbreviation(team_str, sport, default=team_str)
         
         # Get all bet legs
         all_legs = BetLeg.query.all()
@@ -2009,6 +1855,12 @@ def run_standardize_bet_leg_team_names():
     with app.app_context():
         standardize_bet_leg_team_names()
 
+def run_prune_sync_tombstones():
+    logger.info("[SCHEDULER] Running prune_sync_tombstones")
+    with app.app_context():
+        from services.bet_sync import prune_sync_tombstones
+        prune_sync_tombstones()
+
 def run_auto_move_bets_no_live_legs():
     logger.info("[SCHEDULER] Running auto_move_bets_no_live_legs")
     with app.app_context():
@@ -2115,6 +1967,16 @@ def run_enrich_player_data():
         except Exception as e:
             logger.error(f"[PLAYER-ENRICHMENT] Error in run_enrich_player_data: {e}")
 
+def run_ingest_rosters():
+    """Bulk-ingest league rosters into the players table"""
+    logger.info("[SCHEDULER] Running ingest_rosters")
+    with app.app_context():
+        try:
+            from jobs.roster_ingestion_job import ingest_rosters
+            ingest_rosters()
+        except Exception as e:
+            logger.error(f"[ROSTER-INGESTION] Error in run_ingest_rosters: {e}")
+
 # Schedule automated tasks (moved outside if __name__ == '__main__' so it runs on Render)
 scheduler.add_job(
     func=run_update_completed_bet_legs,
@@ -2140,6 +2002,14 @@ scheduler.add_job(
     replace_existing=True
 )
 
+scheduler.add_job(
+    func=run_prune_sync_tombstones,
+    trigger=IntervalTrigger(hours=24),
+    id='prune_sync_tombstones',
+    name='Prune delta sync tombstones past the retention window daily',
+    replace_existing=True
+)
+
 scheduler.add_job(
     func=run_auto_move_bets_no_live_legs,
     trigger=IntervalTrigger(minutes=5),
@@ -2196,6 +2066,14 @@ scheduler.add_job(
     replace_existing=True
 )
 
+scheduler.add_job(
+    func=run_ingest_rosters,
+    trigger=CronTrigger(hour=4, minute=30, timezone='US/Eastern'),
+    id='ingest_rosters',
+    name='Ingest NFL/NBA team rosters into the players table daily at 4:30 AM ET',
+    replace_existing=True
+)
+
 # REMOVED: Lambda function can't be serialized by SQLAlchemyJobStore
 # scheduler.add_job(
 #     func=lambda: app.app_context().push() or __import__('update_teams').update_teams(),
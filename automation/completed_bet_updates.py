@@ -99,7 +99,8 @@ def update_completed_bet_legs():
                                 is_valid, reason = validate_achieved_value(
                                     leg.stat_type,
                                     achieved_value,
-                                    leg.player_name
+                                    leg.player_name,
+                                    sport=leg.sport
                                 )
                                 
                                 if is_valid:
@@ -129,7 +129,7 @@ def _link_player_to_leg(leg, db, issues):
     Note: Team prop bets (moneyline, spread, total_points) should NOT have player_ids.
     Only player prop bets (player_prop, passing_yards, etc.) should be linked.
     """
-    from models import Player
+    from helpers.player_resolver import player_resolver
     
     # Skip team prop bets - these don't need player linking
     # Team props have bet_type='Team Prop' or stat_type in: moneyline, spread, total_points
@@ -140,15 +140,11 @@ def _link_player_to_leg(leg, db, issues):
     if not leg.player_name:
         return True  # Not a player bet, no linking needed
     
-    # Try to find player by exact name matches
-    player = Player.query.filter(
-        db.or_(
-            Player.player_name == leg.player_name,
-            Player.normalized_name == leg.player_name,
-            Player.display_name == leg.player_name
-        ),
-        Player.sport == leg.sport
-    ).first()
+    # Try to find player in the local index (exact and suffix-less names; approximate
+    # ones only when the slip's team agrees)
+    player = player_resolver.find(leg.player_name, sport=leg.sport, team=leg.player_team)
+    if player is not None and leg.sport and (player.sport or '').upper() != leg.sport.upper():
+        player = None  # only link players of the leg's sport
     
     if player:
         leg.player_id = player.id
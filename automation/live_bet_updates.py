@@ -107,7 +107,8 @@ def update_live_bet_legs():
                                     is_valid, reason = validate_achieved_value(
                                         bet_leg.stat_type, 
                                         new_current, 
-                                        bet_leg.player_name
+                                        bet_leg.player_name,
+                                        sport=bet_leg.sport
                                     )
                                     
                                     if is_valid:
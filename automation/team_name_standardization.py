@@ -3,109 +3,209 @@ Team Name Standardization Automation
 
 Standardizes team names in bet_legs to use team_name_short from teams table.
 Runs daily to ensure consistent team naming across the database.
+
+The job is incremental and set-based:
+
+1. team_aliases is (re)seeded from the teams table whenever teams changed
+2. spellings in the new legs that no alias covers yet are matched once with
+   the team resolver and stored as learned aliases (or as known misses)
+3. one UPDATE per team column rewrites every new leg whose spelling maps to
+   a different canonical name, joined against team_aliases
+
+Only legs updated since the stored watermark are looked at, so the daily
+cost follows the amount of new data rather than the whole bet history.
+
+Like the original job, only NFL and NBA legs (and legs without a sport,
+matched against NFL/NBA teams) are standardized; other sports keep the
+spellings they were saved with.
 """
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from helpers.team_utils import find_team_name_short
+import logging
+from datetime import timedelta
+
+from sqlalchemy import delete, func, insert, or_, select, true, union, update
+
+from helpers.team_resolver import team_resolver
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_JOB = 'team_name_standardization'
+ALIASES_WATERMARK_JOB = 'team_aliases'
+# Rows committed late with an earlier updated_at are still picked up
+WATERMARK_OVERLAP_SECONDS = 5
+TEAM_COLUMNS = ('player_team', 'home_team', 'away_team')
+STANDARDIZED_SPORTS = ('NFL', 'NBA')
+
+
+def _alias_key(value):
+    return value.strip().lower()[:100] if value else ''
+
+
+def seed_team_aliases(force=False):
+    """Rebuild team_aliases from the teams table if teams changed since the last seed.
+
+    Learned aliases are dropped too, since they may point at renamed teams.
+    Returns the number of aliases written (0 when nothing changed).
+    """
+    from models import db, Team, TeamAlias, JobWatermark
+
+    teams_changed_at = db.session.execute(select(func.max(Team.updated_at))).scalar()
+    seeded_at = JobWatermark.get(ALIASES_WATERMARK_JOB)
+    has_aliases = db.session.execute(select(TeamAlias.alias).limit(1)).first() is not None
+    if not force and has_aliases and seeded_at is not None and (
+            teams_changed_at is None or teams_changed_at <= seeded_at):
+        return 0
+
+    aliases = {}
+    teams = db.session.execute(
+        select(Team.id, Team.sport, Team.team_name, Team.team_name_short, Team.nickname,
+               Team.location, Team.team_abbr)
+        .where(func.upper(Team.sport).in_(STANDARDIZED_SPORTS))
+        .order_by(Team.id)
+    ).all()
+    for team in teams:
+        spellings = [team.team_name, team.team_name_short, team.nickname, team.team_abbr]
+        if team.location and team.nickname:
+            spellings.append(f"{team.location} {team.nickname}")
+        for spelling in spellings:
+            key = _alias_key(spelling)
+            if not key:
+                continue
+            # First team by id wins collisions, as in the resolver
+            for sport in ((team.sport or '').upper(), TeamAlias.ALL_SPORTS):
+                aliases.setdefault((key, sport), (team.team_name_short, team.id))
+
+    db.session.execute(delete(TeamAlias))
+    if aliases:
+        db.session.execute(insert(TeamAlias), [
+            {'alias': key, 'sport': sport, 'canonical': canonical, 'team_id': team_id,
+             'source': TeamAlias.SOURCE_TEAM}
+            for (key, sport), (canonical, team_id) in aliases.items()
+        ])
+    JobWatermark.set(ALIASES_WATERMARK_JOB, teams_changed_at)
+    db.session.commit()
+    logger.info(f"[TEAM-STANDARDIZE] Seeded {len(aliases)} team aliases from {len(teams)} teams")
+    return len(aliases)
+
+
+def _leg_scope(legs):
+    """The alias sport for a bet_legs row: its upper-cased sport, or '*' when unset."""
+    from models import TeamAlias
+
+    return func.coalesce(func.nullif(func.upper(legs.c.sport), ''), TeamAlias.ALL_SPORTS)
 
 
-def standardize_bet_leg_team_names():
+def _standardized_legs(legs):
+    """Legs this job rewrites: NFL, NBA and sport-less ones."""
+    from models import TeamAlias
+
+    return _leg_scope(legs).in_(STANDARDIZED_SPORTS + (TeamAlias.ALL_SPORTS,))
+
+
+def _resolve(value, sport):
+    from models import TeamAlias
+
+    if sport != TeamAlias.ALL_SPORTS:
+        return team_resolver.resolve(value, sport)
+    for standardized_sport in STANDARDIZED_SPORTS:
+        team = team_resolver.resolve(value, standardized_sport)
+        if team is not None:
+            return team
+    return None
+
+
+def _learn_new_spellings(legs, window):
+    """Resolve spellings in the window that team_aliases doesn't know yet; store the results."""
+    from models import db, TeamAlias
+
+    known = set(db.session.execute(select(TeamAlias.alias, TeamAlias.sport)).all())
+    scope = _leg_scope(legs)
+    spellings = db.session.execute(union(*(
+        select(scope.label('sport'), legs.c[column].label('value'))
+        .where(window, legs.c[column].isnot(None), legs.c[column] != '')
+        for column in TEAM_COLUMNS
+    ))).all()
+
+    learned = {}
+    for sport, value in spellings:
+        key = _alias_key(value)
+        if not key or (key, sport) in known or (key, sport) in learned:
+            continue
+        team = _resolve(value, sport)
+        learned[(key, sport)] = (team.team_name_short if team is not None else None,
+                                 team.id if team is not None else None)
+    if learned:
+        db.session.execute(insert(TeamAlias), [
+            {'alias': key, 'sport': sport, 'canonical': canonical, 'team_id': team_id,
+             'source': TeamAlias.SOURCE_LEARNED}
+            for (key, sport), (canonical, team_id) in learned.items()
+        ])
+    return len(learned)
+
+
+def standardize_bet_leg_team_names(full=False):
     """Background job to standardize team names in bet_legs to use team_name_short from teams table.
-    
-    This runs periodically to ensure all bet_legs have consistent team names that match
-    the standardized team_name_short values from the teams table.
+
+    Only legs updated since the last run are processed; ``full`` ignores the
+    watermark (e.g. after a bulk import with old timestamps).
+    Returns the number of bet legs changed.
     """
-    from app import app, db
-    from models import Team, BetLeg
-    
+    from models import db, BetLeg, TeamAlias, JobWatermark
+    from services.bet_search import refresh_search_documents
+    from services.bet_sync import database_now, timestamp_param
+
     try:
-        import logging
-        logging.info("[TEAM-STANDARDIZE] Starting team name standardization check...")
-        
-        # Get all teams for mapping
-        teams = Team.query.all()
-        
-        # Create sport-specific mapping dictionaries
-        nfl_name_to_short = {}
-        nfl_abbr_to_short = {}
-        nba_name_to_short = {}
-        nba_abbr_to_short = {}
-        
-        for team in teams:
-            if team.sport == 'NFL':
-                if team.team_name:
-                    nfl_name_to_short[team.team_name.lower()] = team.team_name_short
-                if team.team_name_short:
-                    nfl_name_to_short[team.team_name_short.lower()] = team.team_name_short
-                if team.team_abbr:
-                    nfl_abbr_to_short[team.team_abbr.lower()] = team.team_name_short
-            elif team.sport == 'NBA':
-                if team.team_name:
-                    nba_name_to_short[team.team_name.lower()] = team.team_name_short
-                if team.team_name_short:
-                    nba_name_to_short[team.team_name_short.lower()] = team.team_name_short
-                if team.team_abbr:
-                    nba_abbr_to_short[team.team_abbr.lower()] = team.team_name_short
-        
-        # Get all bet legs
-        bet_legs = BetLeg.query.all()
-        updated_count = 0
-        
-        for leg in bet_legs:
-            original_player_team = leg.player_team
-            original_home_team = leg.home_team
-            original_away_team = leg.away_team
-            
-            # Choose the appropriate mapping based on the bet leg's sport
-            if leg.sport == 'NFL':
-                name_to_short = nfl_name_to_short
-                abbr_to_short = nfl_abbr_to_short
-            elif leg.sport == 'NBA':
-                name_to_short = nba_name_to_short
-                abbr_to_short = nba_abbr_to_short
-            else:
-                # For unknown sports, try NFL first, then NBA
-                name_to_short = {**nfl_name_to_short, **nba_name_to_short}
-                abbr_to_short = {**nfl_abbr_to_short, **nba_abbr_to_short}
-            
-            # Update player_team if it exists
-            if leg.player_team:
-                new_player_team = find_team_name_short(leg.player_team, name_to_short, abbr_to_short)
-                if new_player_team and new_player_team != leg.player_team:
-                    leg.player_team = new_player_team
-            
-            # Update home_team
-            if leg.home_team:
-                new_home_team = find_team_name_short(leg.home_team, name_to_short, abbr_to_short)
-                if new_home_team and new_home_team != leg.home_team:
-                    leg.home_team = new_home_team
-            
-            # Update away_team
-            if leg.away_team:
-                new_away_team = find_team_name_short(leg.away_team, name_to_short, abbr_to_short)
-                if new_away_team and new_away_team != leg.away_team:
-                    leg.away_team = new_away_team
-            
-            # Check if any updates were made
-            if (leg.player_team != original_player_team or
-                leg.home_team != original_home_team or
-                leg.away_team != original_away_team):
-                
-                try:
-                    db.session.commit()
-                    updated_count += 1
-                except Exception as e:
-                    db.session.rollback()
-                    logging.error(f"[TEAM-STANDARDIZE] Error updating bet_leg {leg.id}: {e}")
-        
-        if updated_count > 0:
-            logging.info(f"[TEAM-STANDARDIZE] ✓ Standardized team names for {updated_count} bet legs")
+        logger.info("[TEAM-STANDARDIZE] Starting team name standardization check...")
+
+        run_started = database_now()
+        seeded = seed_team_aliases()
+        watermark = None if (full or seeded) else JobWatermark.get(WATERMARK_JOB)
+
+        legs = BetLeg.__table__
+        aliases = TeamAlias.__table__
+        window = legs.c.updated_at > timestamp_param(watermark) if watermark is not None else true()
+        window = window & _standardized_legs(legs)
+        learned = _learn_new_spellings(legs, window)
+
+        scope = _leg_scope(legs)
+        def canonical_for(column):
+            return (select(aliases.c.canonical)
+                    .where(aliases.c.alias == func.lower(func.trim(legs.c[column])),
+                           aliases.c.sport == scope,
+                           aliases.c.canonical.isnot(None))
+                    .scalar_subquery())
+
+        needs_update = {
+            column: (canonical_for(column).isnot(None)) & (canonical_for(column) != legs.c[column])
+            for column in TEAM_COLUMNS
+        }
+        changed = db.session.execute(
+            select(legs.c.id, legs.c.bet_id).where(window, or_(*needs_update.values()))
+        ).all()
+
+        if changed:
+            for column, condition in needs_update.items():
+                db.session.execute(
+                    update(legs).where(window, condition).values({column: canonical_for(column)})
+                )
+            # Bulk UPDATEs skip the flush hook that keeps search documents current
+            refresh_search_documents({row.bet_id for row in changed if row.bet_id is not None})
+
+        JobWatermark.set(WATERMARK_JOB, run_started - timedelta(seconds=WATERMARK_OVERLAP_SECONDS))
+        db.session.commit()
+
+        if changed:
+            logger.info(f"[TEAM-STANDARDIZE] ✓ Standardized team names for {len(changed)} bet legs "
+                        f"({learned} new spellings learned)")
         else:
-            logging.info("[TEAM-STANDARDIZE] No bet legs needed team name standardization")
-            
+            logger.info("[TEAM-STANDARDIZE] No bet legs needed team name standardization")
+        return len(changed)
+
     except Exception as e:
-        logging.error(f"[TEAM-STANDARDIZE] Error in standardize_bet_leg_team_names: {e}")
-        db.session.rollback()
\ No newline at end of file
+        logger.error(f"[TEAM-STANDARDIZE] Error in standardize_bet_leg_team_names: {e}")
+        db.session.rollback()
+        return 0
@@ -6,45 +6,21 @@ Provides validation functions to prevent bad data from being written to database
 
 import logging
 
-# Validation ranges for common stats (min, max, allow_negative)
-STAT_VALIDATION_RANGES = {
-    # NFL Stats
-    'passing_yards': (0, 600, False),
-    'rushing_yards': (0, 400, False),
-    'receiving_yards': (0, 400, False),
-    'receptions': (0, 30, False),
-    'passing_touchdowns': (0, 10, False),
-    'rushing_touchdowns': (0, 6, False),
-    'interceptions_thrown': (0, 10, False),
-    'sacks': (0, 10, False),
-    'tackles_assists': (0, 30, False),
-    
-    # NBA Stats
-    'points': (0, 100, False),
-    'rebounds': (0, 40, False),
-    'assists': (0, 30, False),
-    'steals': (0, 15, False),
-    'blocks': (0, 15, False),
-    'turnovers': (0, 20, False),
-    'three_pointers_made': (0, 20, False),
-    'made_threes': (0, 20, False),
-    '3_pointers_made': (0, 20, False),
-    
-    # Team Props
-    'moneyline': (-100, 100, True),  # Score differential
-    'spread': (-100, 100, True),  # Score differential
-    'point_spread': (-100, 100, True),  # Score differential
-    'total_points': (0, 200, False),
-}
+from helpers import stat_catalog
 
+# Validation ranges for common stats (min, max, allow_negative), keyed by
+# canonical stat; lookups go through the stat catalog so aliases resolve too
+STAT_VALIDATION_RANGES = stat_catalog.VALIDATION_RANGES
 
-def validate_achieved_value(stat_type, value, player_name=None):
+
+def validate_achieved_value(stat_type, value, player_name=None, sport=None):
     """Validate that an achieved value is reasonable for the stat type.
     
     Args:
-        stat_type: The type of stat (e.g., 'points', 'rebounds')
+        stat_type: The type of stat (e.g., 'points', 'rebounds', or any alias)
         value: The achieved value to validate
         player_name: Optional player name for logging
+        sport: Optional leg sport, to resolve sport-specific aliases
         
     Returns:
         tuple: (is_valid, reason)
@@ -56,15 +32,15 @@ def validate_achieved_value(stat_type, value, player_name=None):
         return (False, "Value is None")
     
     # Check if stat type has defined range
-    stat_type_lower = stat_type.lower() if stat_type else ''
+    valid_range = stat_catalog.validation_range(stat_type, sport)
     
-    if stat_type_lower not in STAT_VALIDATION_RANGES:
+    if valid_range is None:
         # Unknown stat type - accept any reasonable value (0 to 1000)
         if value < 0 or value > 1000:
             return (False, f"Value {value} outside reasonable range [0, 1000] for unknown stat '{stat_type}'")
         return (True, None)
     
-    min_val, max_val, allow_negative = STAT_VALIDATION_RANGES[stat_type_lower]
+    min_val, max_val, allow_negative = valid_range
     
     # Check if negative values are allowed
     if value < 0 and not allow_negative:
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Benchmark JSON encoding and compression on a realistic 100-bet page.
+
+Seeds 100 settled bets (4 legs each) into a throwaway SQLite database, builds
+the processed /historical payload exactly like the endpoint does, then
+compares Flask's default JSON provider against FastJSONProvider (orjson when
+installed) and reports payload sizes raw / gzip / brotli for the v1 and
+compact v2 schemas.
+
+Usage: python benchmarks/bench_json_responses.py [--bets 100] [--runs 50]
+"""
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import app
+from models import db, User, Bet, BetLeg
+from services import serialize_bets, process_parlay_data, shape_bet_payloads
+from helpers import fast_json
+from helpers.compression import brotli, compress_body, GZIP_LEVEL
+from helpers.fast_json import FastJSONProvider
+
+PLAYERS = [
+    ('Patrick Mahomes', 'Kansas City Chiefs', 'QB', 'passing_yards', 'NFL'),
+    ('Travis Kelce', 'Kansas City Chiefs', 'TE', 'receiving_yards', 'NFL'),
+    ('Nikola Jokic', 'Denver Nuggets', 'C', 'rebounds', 'NBA'),
+    ('Jamal Murray', 'Denver Nuggets', 'PG', 'points', 'NBA'),
+    ('Josh Allen', 'Buffalo Bills', 'QB', 'rushing_yards', 'NFL'),
+    ('Jayson Tatum', 'Boston Celtics', 'SF', 'made_threes', 'NBA'),
+]
+OPPONENTS = {'NFL': 'Denver Broncos', 'NBA': 'Utah Jazz'}
+
+
+def seed_bets(count):
+    user = User(username='bench_json_user', email='bench_json_user@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    start = date(2025, 1, 1)
+    for i in range(count):
+        bet_date = (start + timedelta(days=i // 3)).isoformat()
+        bet = Bet(user_id=user.id, status='won' if i % 3 else 'lost', bet_type='SGP',
+                  betting_site='DraftKings' if i % 2 else 'FanDuel', bet_date=bet_date,
+                  wager=Decimal('10.00'), final_odds='+450', potential_winnings=Decimal('55.00'),
+                  total_legs=4, secondary_bettors=[], watchers=[])
+        db.session.add(bet)
+        db.session.flush()
+        for n in range(4):
+            player, team, position, stat, sport = PLAYERS[(i + n) % len(PLAYERS)]
+            db.session.add(BetLeg(
+                bet_id=bet.id, leg_order=n, player_name=player, player_team=team, player_position=position,
+                home_team=team, away_team=OPPONENTS[sport], game_date=datetime.fromisoformat(bet_date).date(),
+                sport=sport, bet_type='player_prop', stat_type=stat, bet_line_type='over',
+                target_value=Decimal('24.5'), achieved_value=Decimal('31.0'), status='won',
+                home_score=27, away_score=20, game_status='STATUS_FINAL',
+            ))
+    db.session.commit()
+    return user
+
+
+def build_page(count):
+    bets = Bet.query.options(db.joinedload(Bet.bet_legs_rel)).order_by(Bet.bet_date.desc()).limit(count).all()
+    return process_parlay_data(serialize_bets(bets), fetch_live=False)
+
+
+def time_encoder(encode, payload, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        encode(payload)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bets', type=int, default=100)
+    parser.add_argument('--runs', type=int, default=50)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        seed_bets(args.bets)
+        v1 = {'bets': build_page(args.bets)}
+        v2 = {'bets': shape_bet_payloads(v1['bets'], version=2)}
+
+        default_provider = DefaultJSONProvider(app)
+        fast_provider = FastJSONProvider(app)
+        encoders = {
+            'flask default': lambda obj: default_provider.dumps(obj).encode('utf-8'),
+            'FastJSONProvider': fast_provider.dumps_bytes,
+        }
+
+        print(f"JSON backend: {'orjson' if fast_json.orjson is not None else 'stdlib json (orjson not installed)'}")
+        print(f"Page: {args.bets} bets x 4 legs, {args.runs} runs\n")
+        print(f"{'schema':<6} {'encoder':<18} {'median ms':>10} {'max ms':>8}")
+        for name, payload in (('v1', v1), ('v2', v2)):
+            for label, encode in encoders.items():
+                median, worst = time_encoder(encode, payload, args.runs)
+                print(f"{name:<6} {label:<18} {median:>10.2f} {worst:>8.2f}")
+
+        print(f"\n{'schema':<6} {'raw KB':>8} {'gzip KB':>8} {'gzip ms':>8} {'br KB':>8} {'br ms':>8}")
+        for name, payload in (('v1', v1), ('v2', v2)):
+            body = fast_provider.dumps_bytes(payload)
+            started = time.perf_counter()
+            gz = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            gz_ms = (time.perf_counter() - started) * 1000
+            if brotli is not None:
+                started = time.perf_counter()
+                br = compress_body(body, 'br')
+                br_ms = (time.perf_counter() - started) * 1000
+                br_cols = f"{len(br) / 1024:>8.1f} {br_ms:>8.2f}"
+            else:
+                br_cols = f"{'n/a':>8} {'n/a':>8}"
+            print(f"{name:<6} {len(body) / 1024:>8.1f} {len(gz) / 1024:>8.1f} {gz_ms:>8.2f} {br_cols}")
+
+
+if __name__ == '__main__':
+    main()
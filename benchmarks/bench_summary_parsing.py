@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark selective vs full parsing of ESPN /summary payloads.
+
+For each payload, times json.loads of the whole document against
+helpers.espn_payloads.parse_json_parts for the subtrees the app reads, and
+reports peak traced memory of one parse (tracemalloc).
+
+Pass recorded summaries as JSON files; without any, a synthetic NFL-sized
+summary (boxscore, ~180 plays, drives, news, pickcenter) is generated.
+
+Usage: python benchmarks/bench_summary_parsing.py [payload.json ...] [--runs 50]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from helpers import espn_payloads
+from helpers.espn_payloads import parse_json_parts, select_parts
+from helpers.game_summaries import SUMMARY_PARTS
+from services.bet_service import SUMMARY_GAME_PARTS
+
+PART_SETS = {
+    'game details': SUMMARY_GAME_PARTS,
+    'summary cache': SUMMARY_PARTS,
+}
+
+
+def _play(i, scoring=False):
+    return {
+        'id': str(400000000 + i), 'sequenceNumber': str(i * 100),
+        'type': {'id': '67' if scoring else '5', 'text': 'Passing Touchdown' if scoring else 'Rush'},
+        'text': f'Player {i % 40} {i % 20} Yd Run to the DET {i % 50} for {i % 9} yards (Tackler {i % 30}).',
+        'awayScore': i // 20, 'homeScore': i // 18, 'period': {'number': 1 + i // 45},
+        'clock': {'value': 900 - (i * 5) % 900, 'displayValue': '12:34'}, 'scoringPlay': scoring,
+        'start': {'down': 1 + i % 4, 'distance': 10, 'yardLine': i % 100, 'team': {'id': '8'}},
+        'end': {'down': 1 + (i + 1) % 4, 'distance': 7, 'yardLine': (i + 3) % 100, 'team': {'id': '8'}},
+        'statYardage': i % 20, 'wallclock': '2025-11-16T18:25:43Z',
+        'participants': [{'athlete': {'id': str(1000 + i % 40), 'displayName': f'Player {i % 40}'}}],
+    }
+
+
+def synthetic_summary():
+    athletes = [{'athlete': {'id': str(1000 + i), 'displayName': f'Player {i}'},
+                 'stats': [str(i), str(i * 7), '4.2', str(i % 2), str(i + 10)]} for i in range(12)]
+    groups = [{'name': name, 'labels': ['CAR', 'YDS', 'AVG', 'TD', 'LONG'], 'athletes': athletes}
+              for name in ('passing', 'rushing', 'receiving', 'fumbles', 'defensive', 'interceptions',
+                           'kickReturns', 'puntReturns', 'kicking', 'punting')]
+    plays = [_play(i, scoring=i % 25 == 0) for i in range(180)]
+    return {
+        'boxscore': {'teams': [{'statistics': [{'name': f'stat{i}', 'displayValue': str(i)} for i in range(25)]}] * 2,
+                     'players': [{'team': {'displayName': team}, 'statistics': groups}
+                                 for team in ('Detroit Lions', 'Minnesota Vikings')]},
+        'gameInfo': {'venue': {'fullName': 'Ford Field', 'address': {'city': 'Detroit'}}, 'attendance': 65000},
+        'drives': {'previous': [{'id': str(i), 'description': '8 plays, 75 yards', 'plays': plays[i * 7:i * 7 + 7]}
+                                for i in range(24)]},
+        'leaders': [{'leaders': [{'leaders': [{'athlete': athletes[0]['athlete'], 'displayValue': '20/28'}]}] * 3}] * 2,
+        'header': {'id': '401772001', 'competitions': [{'status': {'type': {'completed': True, 'state': 'post'}}}]},
+        'plays': plays,
+        'winprobability': [{'playId': p['id'], 'homeWinPercentage': 0.5, 'tiePercentage': 0.0} for p in plays],
+        'scoringPlays': [p for p in plays if p['scoringPlay']],
+        'news': {'articles': [{'headline': 'Lions beat Vikings' * 5, 'description': 'Recap ' * 120,
+                               'images': [{'url': 'https://a.espncdn.com/photo.jpg', 'width': 576}] * 3}] * 12},
+        'pickcenter': [{'provider': {'name': f'Book {i}'}, 'details': 'DET -3.5', 'overUnder': 47.5,
+                        'spread': -3.5} for i in range(6)],
+    }
+
+
+def time_parse(parse, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        parse()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def peak_kb(parse):
+    tracemalloc.start()
+    try:
+        parse()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('payloads', nargs='*', help='recorded /summary JSON files')
+    parser.add_argument('--runs', type=int, default=50)
+    args = parser.parse_args()
+
+    payloads = [(Path(path).name, Path(path).read_bytes()) for path in args.payloads]
+    if not payloads:
+        payloads = [('synthetic NFL summary', json.dumps(synthetic_summary()).encode())]
+
+    backend = espn_payloads.ijson.backend if espn_payloads.ijson is not None else None
+    print(f"ijson backend: {backend or 'not installed'} "
+          f"(selective parsing {'on' if espn_payloads.selective_parsing else 'off: full-parse fallback'})")
+    print(f"{args.runs} runs per measurement\n")
+    print(f"{'payload':<24} {'parts':<14} {'KB':>7} {'parser':<10} {'median ms':>10} {'max ms':>8} {'peak KB':>8}")
+    for name, body in payloads:
+        for label, paths in PART_SETS.items():
+            full = lambda: select_parts(json.loads(body), paths)
+            selective = lambda: parse_json_parts(body, paths)
+            assert full() == selective(), f"{name}: selective parse differs for {label}"
+            for parser_name, parse in (('full', full), ('selective', selective)):
+                median, worst = time_parse(parse, args.runs)
+                print(f"{name[:24]:<24} {label:<14} {len(body) / 1024:>7.0f} {parser_name:<10} "
+                      f"{median:>10.2f} {worst:>8.2f} {peak_kb(parse):>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
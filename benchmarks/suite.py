@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""End-to-end benchmarks for the parlay processing hot paths, checked against a baseline.
+
+Seeds a throwaway database with live and settled bets on a fixed slate of NFL
+and NBA games, writes matching ESPN scoreboard/summary fixtures and serves
+them from a local FixtureServer (helpers.espn_fixtures), then times each case
+with ESPN traffic replayed from it. Per case it reports latency percentiles,
+SQL queries per run and ESPN requests per run.
+
+Query and ESPN call counts are deterministic and must not exceed the
+baseline. Median latency may not exceed it by more than --tolerance (plus a
+small absolute noise floor). A case missing from the baseline fails the
+check until it is recorded. Background jobs are paused while measuring.
+The baseline records --bets, --runs and --latency-ms; checking with other
+settings fails instead of comparing unlike numbers. Baselines are machine
+specific: regenerate benchmarks/baseline.json with --update-baseline on the
+machine that checks it.
+
+The suite always runs against its own in-memory SQLite database (whatever
+DATABASE_URL says) and deletes the bets it seeded when it is done.
+
+Usage: python benchmarks/suite.py [--bets 30] [--runs 20] [--latency-ms 0]
+                                  [--only CASE] [--update-baseline] [--tolerance 0.5]
+"""
+import argparse
+import copy
+import json
+import logging
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+BENCH_DATABASE_URL = 'sqlite:///:memory:'
+# The suite seeds and rewrites bets freely, so never point it at a real database
+os.environ['DATABASE_URL'] = BENCH_DATABASE_URL
+
+from sqlalchemy import event, update
+from unittest.mock import patch
+
+from app import app, scheduler
+from models import db, User, Bet, BetLeg
+from helpers.espn_fixtures import FixtureServer, FixtureStore, fixture_key, replaying
+from helpers.game_snapshot import GameSnapshot
+from helpers.utils import _get_player_stat_from_boxscore
+from services import serialize_bets
+from services import bet_service
+from services.bet_batch import batch_delete_bets
+from services.bet_service import calculate_bet_value, process_parlay_data
+
+BASELINE_PATH = ROOT / 'benchmarks' / 'baseline.json'
+NOISE_FLOOR_MS = 0.5
+GAME_DATE = date(2025, 11, 16)
+SEED = 2025
+
+SLATE = {
+    'NFL': [('Minnesota Vikings', 'Detroit Lions'), ('Kansas City Chiefs', 'Denver Broncos'),
+            ('Buffalo Bills', 'Miami Dolphins'), ('Philadelphia Eagles', 'Dallas Cowboys')],
+    'NBA': [('Utah Jazz', 'Denver Nuggets'), ('Boston Celtics', 'New York Knicks'),
+            ('Los Angeles Lakers', 'Golden State Warriors')],
+}
+ESPN_PATHS = {'NFL': 'football/nfl', 'NBA': 'basketball/nba'}
+FIRST_NAMES = ['Jalen', 'Marcus', 'Tyler', 'Devin', 'Chris', 'Jordan', 'Aaron', 'Kyle', 'Derrick', 'Malik',
+               'Trey', 'Isaiah', 'Darius', 'Cole', 'Andre', 'Zach']
+LAST_NAMES = ['Walker', 'Brooks', 'Hayes', 'Coleman', 'Bennett', 'Foster', 'Griffin', 'Howard', 'Jenkins',
+              'Patterson', 'Russell', 'Sanders', 'Simmons', 'Wallace', 'Warren', 'Tucker']
+PLAYER_STATS = {
+    'NFL': ['passing_yards', 'rushing_yards', 'receiving_yards', 'receptions', 'anytime_touchdown'],
+    'NBA': ['points', 'rebounds', 'assists', 'three_pointers', 'points_rebounds_assists'],
+}
+TEAM_STATS = ['moneyline', 'spread', 'total_points']
+NFL_GROUPS = {
+    'passing': ['C/ATT', 'YDS', 'AVG', 'TD', 'INT'],
+    'rushing': ['CAR', 'YDS', 'AVG', 'TD', 'LONG'],
+    'receiving': ['REC', 'YDS', 'AVG', 'TD', 'LONG', 'TGTS'],
+}
+NBA_LABELS = ['MIN', 'FG', '3PT', 'FT', 'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TO', 'PF', '+/-', 'PTS']
+
+
+# --- synthetic slate: players, ESPN fixtures, bets ---------------------------
+
+def build_slate(rng):
+    """[{sport, event_id, away, home, players: {team: [names]}, event, summary}] for SLATE."""
+    games = []
+    names = iter(rng.sample([f'{f} {l}' for f in FIRST_NAMES for l in LAST_NAMES], 200))
+    event_id = 401770000
+    for sport, matchups in SLATE.items():
+        for away, home in matchups:
+            event_id += 1
+            players = {team: [next(names) for _ in range(5 if sport == 'NFL' else 8)] for team in (away, home)}
+            box = [{'team': {'displayName': team}, 'statistics': _groups(sport, team_players, rng, event_id)}
+                   for team, team_players in players.items()]
+            away_score, home_score = rng.randint(90, 125) if sport == 'NBA' else rng.randint(10, 35), \
+                rng.randint(90, 125) if sport == 'NBA' else rng.randint(10, 35)
+            scorers = [p for team_players in players.values() for p in team_players[1:3]] if sport == 'NFL' else []
+            event = {
+                'id': str(event_id), 'date': f'{GAME_DATE.isoformat()}T18:00Z',
+                'status': {'type': {'name': 'STATUS_IN_PROGRESS'}, 'period': 3, 'displayClock': '7:12'},
+                'competitions': [{'status': {'type': {'name': 'STATUS_IN_PROGRESS'}}, 'competitors': [
+                    {'homeAway': 'away', 'score': str(away_score), 'team': {'displayName': away,
+                                                                           'abbreviation': away[:3].upper()}},
+                    {'homeAway': 'home', 'score': str(home_score), 'team': {'displayName': home,
+                                                                           'abbreviation': home[:3].upper()}},
+                ]}],
+            }
+            summary = {
+                'boxscore': {'players': box},
+                'scoringPlays': [{'type': {'text': 'Rushing Touchdown'}, 'text': f'{name} 3 Yd Run',
+                                  'team': {'displayName': away}} for name in scorers[:3]],
+                'plays': [{'id': str(i), 'text': f'Play {i}', 'type': {'text': 'Rush'}} for i in range(150)],
+                'news': {'articles': [{'headline': 'Recap', 'description': 'Recap ' * 100}] * 5},
+            }
+            games.append({'sport': sport, 'event_id': str(event_id), 'away': away, 'home': home,
+                          'players': players, 'event': event, 'summary': summary})
+    return games
+
+
+def _groups(sport, names, rng, event_id):
+    athletes = lambda labels: [{'athlete': {'id': f'{event_id}{i}', 'displayName': name},
+                                'stats': [_stat(label, rng) for label in labels]} for i, name in enumerate(names)]
+    if sport == 'NBA':
+        return [{'name': '', 'labels': NBA_LABELS, 'athletes': athletes(NBA_LABELS)}]
+    return [{'name': name, 'labels': labels, 'athletes': athletes(labels)} for name, labels in NFL_GROUPS.items()]
+
+
+def _stat(label, rng):
+    if label in ('FG', '3PT', 'FT', 'C/ATT'):
+        made = rng.randint(0, 12)
+        return f'{made}-{made + rng.randint(0, 8)}'
+    if label == 'AVG':
+        return f'{rng.uniform(0, 15):.1f}'
+    if label == 'TD':
+        return str(rng.choice([0, 0, 0, 1, 2]))
+    return str(rng.randint(0, 120 if label == 'YDS' else 15))
+
+
+def write_fixtures(games, store):
+    for sport, path in ESPN_PATHS.items():
+        events = [g['event'] for g in games if g['sport'] == sport]
+        scoreboard = (f"https://site.api.espn.com/apis/site/v2/sports/{path}/scoreboard"
+                      f"?dates={GAME_DATE.strftime('%Y%m%d')}")
+        store.put(fixture_key('GET', scoreboard), 200, json.dumps({'events': events}))
+    for g in games:
+        summary = f"https://site.api.espn.com/apis/site/v2/sports/{ESPN_PATHS[g['sport']]}/summary?event={g['event_id']}"
+        store.put(fixture_key('GET', summary), 200, json.dumps(g['summary']))
+
+
+def seed_bets(games, bets, rng):
+    user = User(username='bench_suite_user', email='bench_suite_user@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    for i in range(bets * 2):
+        live = i < bets
+        bet = Bet(user_id=user.id, status='live' if live else rng.choice(['won', 'lost']), is_active=live,
+                  is_archived=False, bet_type='Parlay', betting_site=rng.choice(['FanDuel', 'DraftKings']),
+                  bet_date=GAME_DATE.isoformat(), wager=Decimal('10.00'), final_odds=rng.choice([250, 450, 900]),
+                  total_legs=4, secondary_bettors=[], watchers=[])
+        db.session.add(bet)
+        db.session.flush()
+        for n in range(4):
+            g = rng.choice(games)
+            team = rng.choice([g['away'], g['home']])
+            common = dict(bet_id=bet.id, leg_order=n, home_team=g['home'], away_team=g['away'], game_date=GAME_DATE,
+                          game_id=g['event_id'], sport=g['sport'], status='live' if live else bet.status)
+            if rng.random() < 0.8:
+                db.session.add(BetLeg(player_name=rng.choice(g['players'][team]), player_team=team,
+                                      bet_type='player_prop', stat_type=rng.choice(PLAYER_STATS[g['sport']]),
+                                      bet_line_type='over', target_value=Decimal(rng.randint(1, 60)) + Decimal('0.5'),
+                                      achieved_value=None if live else Decimal(rng.randint(0, 80)), **common))
+            else:
+                stat = rng.choice(TEAM_STATS)
+                db.session.add(BetLeg(player_name=team, player_team=team, bet_type=stat, stat_type=stat,
+                                      bet_line_type='over' if stat == 'total_points' else None,
+                                      target_value=Decimal('3.5'), **common))
+    db.session.commit()
+    return user
+
+
+def remove_seeded(user):
+    bet_ids = [bet_id for (bet_id,) in db.session.query(Bet.id).filter_by(user_id=user.id)]
+    batch_delete_bets(user.id, bet_ids)
+    db.session.delete(user)
+    db.session.commit()
+
+
+# --- measurement -------------------------------------------------------------
+
+class Counters:
+    """SQL statements and ESPN requests seen since the last reset."""
+
+    def __init__(self, server):
+        self.server = server
+        self.queries = 0
+        event.listen(db.engine, 'before_cursor_execute', self._on_query)
+
+    def _on_query(self, *args):
+        self.queries += 1
+
+    def snapshot(self):
+        return self.queries, self.server.counts['requests']
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(counters, run, runs, setup=None):
+    if setup:
+        setup()
+    run()  # warm-up: imports, first-use caches
+    samples, queries, calls = [], [], []
+    for _ in range(runs):
+        if setup:
+            setup()
+        q0, c0 = counters.snapshot()
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+        q1, c1 = counters.snapshot()
+        queries.append(q1 - q0)
+        calls.append(c1 - c0)
+    return {
+        'runs': runs,
+        'p50_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'p99_ms': round(percentile(samples, 99), 3),
+        'max_ms': round(max(samples), 3),
+        'queries': max(queries),
+        'espn_calls': max(calls),
+    }
+
+
+def compare(results, baseline, settings, tolerance):
+    """Regression messages for results against baseline; unbaselined cases are problems too."""
+    if baseline.get('settings') != settings:
+        return [f"baseline was recorded with {baseline.get('settings')}, this run used {settings} "
+                f"(rerun with those settings or --update-baseline)"]
+    problems = []
+    for name, result in results.items():
+        base = baseline['cases'].get(name)
+        if not base:
+            problems.append(f"{name}: not in baseline (run with --update-baseline to add it)")
+            continue
+        for counter in ('queries', 'espn_calls'):
+            if result[counter] > base[counter]:
+                problems.append(f"{name}: {counter} {result[counter]} > baseline {base[counter]}")
+        limit = base['p50_ms'] * (1 + tolerance) + NOISE_FLOOR_MS
+        if result['p50_ms'] > limit:
+            problems.append(f"{name}: p50 {result['p50_ms']:.2f} ms > {limit:.2f} ms "
+                            f"(baseline {base['p50_ms']:.2f} ms +{tolerance:.0%})")
+    return problems
+
+
+# --- cases ---------------------------------------------------------------------
+
+def build_cases(games, user, runs, client):
+    nfl = next(g for g in games if g['sport'] == 'NFL')
+    nba = next(g for g in games if g['sport'] == 'NBA')
+    nfl_box, nba_box = nfl['summary']['boxscore']['players'], nba['summary']['boxscore']['players']
+    nfl_snapshot = GameSnapshot.from_espn(nfl['event'], 'NFL', GAME_DATE.isoformat(), nfl_box,
+                                          nfl['summary']['scoringPlays'])
+    nba_snapshot = GameSnapshot.from_espn(nba['event'], 'NBA', GAME_DATE.isoformat(), nba_box, [])
+    nfl_player, nba_player = nfl['players'][nfl['home']][2], nba['players'][nba['home']][4]
+    value_legs = [({'player': nfl_player, 'stat': stat, 'sport': 'NFL'}, nfl_snapshot)
+                  for stat in PLAYER_STATS['NFL']] + \
+                 [({'player': nba_player, 'stat': stat, 'sport': 'NBA'}, nba_snapshot)
+                  for stat in PLAYER_STATS['NBA']] + \
+                 [({'stat': 'moneyline', 'team': nfl['home'], 'sport': 'NFL'}, nfl_snapshot)]
+
+    live_bets = Bet.query.filter_by(user_id=user.id, status='live').options(db.joinedload(Bet.bet_legs_rel)).all()
+    live_parlays = serialize_bets(live_bets, use_live_data=True)
+    legs = [leg for bet in live_bets for leg in bet.bet_legs_rel]
+    live_ids = [bet.id for bet in live_bets]
+    seeded_ids = [bet_id for (bet_id,) in db.session.query(Bet.id).filter_by(user_id=user.id)]
+
+    def reset_live_legs():
+        db.session.execute(update(BetLeg).where(BetLeg.bet_id.in_(live_ids)).values(achieved_value=None, is_hit=None))
+        db.session.commit()
+        bet_service.clear_game_cache()
+
+    def reset_hit_status():
+        seeded = BetLeg.bet_id.in_(seeded_ids)
+        db.session.execute(update(BetLeg).where(seeded).values(is_hit=None))
+        db.session.execute(update(BetLeg).where(seeded, BetLeg.achieved_value == None)
+                           .values(achieved_value=Decimal('12')))
+        db.session.commit()
+
+    def update_live():
+        from automation.live_bet_updates import update_live_bet_legs
+        update_live_bet_legs()
+
+    def determine_hits():
+        from automation.bet_status_management import auto_determine_leg_hit_status
+        auto_determine_leg_hit_status()
+
+    def get(url):
+        response = client.get(url)
+        assert response.status_code == 200, f"{url}: {response.status_code}"
+
+    heavy = max(3, runs // 4)
+    return {
+        'calculate_bet_value': (lambda: [calculate_bet_value(leg, game) for leg, game in value_legs], runs, None),
+        '_get_player_stat_from_boxscore': (
+            lambda: [_get_player_stat_from_boxscore(nfl_player, 'receiving', 'YDS', nfl_box),
+                     _get_player_stat_from_boxscore(nba_player, '', 'PTS', nba_box)], runs, None),
+        'process_parlay_data (cold cache)': (
+            lambda: process_parlay_data(copy.deepcopy(live_parlays)), heavy, bet_service.clear_game_cache),
+        'process_parlay_data (warm cache)': (lambda: process_parlay_data(copy.deepcopy(live_parlays)), runs, None),
+        'Bet.to_dict_structured': (lambda: [bet.to_dict_structured() for bet in live_bets], runs, None),
+        'BetLeg.to_dict': (lambda: [leg.to_dict() for leg in legs], runs, None),
+        'update_live_bet_legs': (update_live, heavy, reset_live_legs),
+        'auto_determine_leg_hit_status': (determine_hits, heavy, reset_hit_status),
+        'GET /live': (lambda: get('/live'), heavy, bet_service.clear_game_cache),
+        'GET /historical': (lambda: get('/historical?per_page=50'), runs, None),
+    }
+
+
+def run_suite(bets=30, runs=20, latency_ms=0, only=None):
+    """Seed, serve fixtures and measure every case. Returns {case: result}."""
+    # Importing app started the background jobs; keep them from adding queries or ESPN calls
+    if scheduler.running:
+        scheduler.pause()
+    rng = random.Random(SEED)
+    games = build_slate(rng)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FixtureStore(tmp)
+        write_fixtures(games, store)
+        app.config['TESTING'] = True
+        app.config['LOGIN_DISABLED'] = True
+        with app.app_context(), FixtureServer(store, latency_ms=latency_ms, seed=SEED) as server, \
+                replaying(server.url):
+            url = db.engine.url
+            if url.get_backend_name() != 'sqlite' or url.database not in (None, '', ':memory:'):
+                raise RuntimeError(f"refusing to benchmark against {url!r}; "
+                                   f"the suite only runs on {BENCH_DATABASE_URL}")
+            db.create_all()
+            user = seed_bets(games, bets, rng)
+            try:
+                counters = Counters(server)
+                with patch('routes.bets.current_user', user), app.test_client() as client:
+                    for name, (run, case_runs, setup) in build_cases(games, user, runs, client).items():
+                        if only and only not in name:
+                            continue
+                        results[name] = measure(counters, run, case_runs, setup)
+            finally:
+                db.session.rollback()
+                remove_seeded(user)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bets', type=int, default=30, help='live bets (as many settled ones are added)')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=0, help='simulated ESPN latency per request')
+    parser.add_argument('--only', help='run only cases whose name contains this')
+    parser.add_argument('--baseline', default=str(BASELINE_PATH))
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed p50 slowdown (0.5 = +50%%)')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = run_suite(args.bets, args.runs, args.latency_ms, args.only)
+
+    print(f"{args.bets} live + {args.bets} settled bets x 4 legs, ESPN latency {args.latency_ms:g} ms\n")
+    print(f"{'case':<34} {'runs':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'espn':>6}")
+    for name, r in results.items():
+        print(f"{name:<34} {r['runs']:>4} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+              f"{r['queries']:>8} {r['espn_calls']:>6}")
+
+    settings = {'bets': args.bets, 'runs': args.runs, 'latency_ms': args.latency_ms}
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        cases = {}
+        if baseline_path.exists() and args.only:
+            baseline = json.loads(baseline_path.read_text())
+            if baseline.get('settings') != settings:
+                print(f"\nBaseline was recorded with {baseline.get('settings')}; "
+                      f"rerun with those settings or without --only")
+                return 1
+            cases = baseline['cases']
+        cases.update(results)
+        baseline_path.write_text(json.dumps({'settings': settings, 'cases': cases}, indent=2, sort_keys=True) + '\n')
+        print(f"\nBaseline written to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}; run with --update-baseline to create one")
+        return 0
+    problems = compare(results, json.loads(baseline_path.read_text()), settings, args.tolerance)
+    if problems:
+        print("\nRegressions against baseline:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
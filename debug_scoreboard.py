@@ -2,6 +2,7 @@ import sys
 import os
 from app import app, db
 from models import Bet, BetLeg, Team
+from helpers.team_resolver import team_resolver, ALL_SPORTS
 import json
 
 def debug_scoreboard():
@@ -10,22 +11,22 @@ def debug_scoreboard():
         print("SCOREBOARD DEBUGGER")
         print("="*50 + "\n")
         
-        # 1. Inspect Team Cache
-        print("--- 1. Team Cache Inspection ---")
-        # Trigger cache load
-        Team.get_team_by_name_cached("Test")
-        cache_size = len(Team._team_cache) if hasattr(Team, '_team_cache') else 0
-        print(f"Cache Size: {cache_size} entries")
+        # 1. Inspect the team resolver's compiled names
+        print("--- 1. Team Resolver Inspection ---")
+        # Trigger compile
+        team_resolver.resolve("Test")
+        names = team_resolver._maps[ALL_SPORTS].exact if ALL_SPORTS in team_resolver._maps else {}
+        print(f"Resolver Size: {len(names)} names")
         
         # Print keys starting with 'los'
-        print("Cache keys starting with 'los':")
-        if hasattr(Team, '_team_cache'):
-            los_keys = [k for k in Team._team_cache.keys() if k.startswith('los')]
+        print("Resolver names starting with 'los':")
+        if names:
+            los_keys = [k for k in names if k.startswith('los')]
             for k in sorted(los_keys):
-                t = Team._team_cache[k]
+                t = names[k]
                 print(f"  '{k}' -> {t.team_name} ({t.team_abbr})")
         else:
-            print("  Cache not initialized!")
+            print("  No teams compiled!")
             
         print("\n" + "-"*30 + "\n")
         
@@ -56,11 +57,11 @@ def debug_scoreboard():
             
             if not match:
                 # Debug why it failed
-                print(f"    DEBUG: '{team_name.lower()}' not in cache keys.")
+                print(f"    DEBUG: '{team_name.lower()}' not among resolver names.")
                 # Check for near matches
-                for k in Team._team_cache.keys():
+                for k in names:
                     if 'lakers' in k and 'lakers' in team_name.lower():
-                         print(f"    Did you mean cache key: '{k}'?")
+                         print(f"    Did you mean resolver name: '{k}'?")
         
         print("\n" + "-"*30 + "\n")
 
@@ -0,0 +1,100 @@
+"""
+Response compression based on the client's Accept-Encoding.
+
+Large JSON (and other text) responses are compressed with brotli when the
+client accepts it and a brotli module is installed, otherwise with gzip.
+Small bodies, streamed responses and already-encoded responses are left
+alone.
+"""
+
+import gzip
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Bodies smaller than this aren't worth the CPU (or the headers)
+COMPRESSION_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/html',
+    'text/css',
+    'text/plain',
+}
+
+
+def available_encodings():
+    """Encodings this server can produce, in order of preference."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encodings):
+    """Pick the best encoding the client accepts (werkzeug Accept header), or None."""
+    for encoding in available_encodings():
+        if accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+def compress_body(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def compress_response(response, accept_encodings, min_size=COMPRESSION_MIN_SIZE):
+    """Compress a response in place if worthwhile. Returns the response."""
+    if (response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    response.set_data(compress_body(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+
+    # Same resource, different bytes: a strong ETag would no longer be valid.
+    # Listing endpoints compare with contains_weak(), so 304s still work.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_response_compression(app):
+    """Register the after_request hook that compresses responses."""
+    from flask import request
+
+    min_size = app.config.get('COMPRESSION_MIN_SIZE', COMPRESSION_MIN_SIZE)
+
+    @app.after_request
+    def _compress(response):
+        try:
+            return compress_response(response, request.accept_encodings, min_size)
+        except Exception as e:
+            logger.warning(f"[COMPRESSION] Skipping compression: {e}")
+            return response
+
+    logger.info(f"[COMPRESSION] Enabled ({', '.join(available_encodings())}, min {min_size} bytes)")
@@ -7,6 +7,10 @@ import requests
 from datetime import datetime, timedelta
 from typing import List, Tuple
 
+from helpers import stat_catalog
+from helpers.game_summaries import game_summary_cache
+from helpers.espn_payloads import read_json_parts
+
 def get_espn_games_for_date(date: datetime) -> List[Tuple[str, str]]:
     """
     Fetch NFL games from ESPN API for a given date
@@ -269,15 +273,23 @@ def _get_player_stats_from_boxscore(player_name: str, sport: str, boxscore: dict
     return combined_stats if player_found else {}
 
 
-def _extract_achieved_value(stats: dict, stat_type: str, bet_type: str, bet_line_type: str) -> float:
+def _flat_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _extract_achieved_value(stats: dict, stat_type: str, bet_type: str, bet_line_type: str, sport: str = None) -> float:
     """
     Extract achieved value from player stats based on stat and bet type
     
     Args:
-        stats: Player stats dictionary
+        stats: Player stats dictionary (flattened, see _get_player_stats_from_boxscore)
         stat_type: Type of stat (e.g., 'points', 'assists', 'made_threes')
         bet_type: Type of bet (e.g., 'total', 'made_threes', 'assists')
         bet_line_type: Line type ('over', 'under')
+        sport: Leg sport, to pick the right stat catalog entry
     
     Returns:
         Achieved value or None
@@ -288,127 +300,34 @@ def _extract_achieved_value(stats: dict, stat_type: str, bet_type: str, bet_line
     stat_type_lower = (stat_type or '').lower().strip()
     bet_type_lower = (bet_type or '').lower().strip()
     
-    # Helper to check keys
-    def check_keys(keys):
-        for key in keys:
-            if key in stats:
-                return stats[key]
-        return None
+    # Catalog extraction plan for the stat (or, failing that, the bet type)
+    definition = stat_catalog.lookup(stat_type_lower, sport)
+    if definition is None or definition.kind is None:
+        definition = stat_catalog.lookup(bet_type_lower, sport) or definition
 
-    # --- NFL Mappings ---
-    
-    # Rushing + Receiving Yards
-    if 'rushing' in stat_type_lower and 'receiving' in stat_type_lower:
-        rush = check_keys(['rushing_yds', 'rush_yds']) or 0
-        rec = check_keys(['receiving_yds', 'rec_yds']) or 0
-        return float(rush) + float(rec)
-
-    # Rushing Yards
-    if 'rushing_yards' in stat_type_lower or 'rush_yds' in stat_type_lower:
-        val = check_keys(['rushing_yds', 'yds'])
-        if val is not None: return val
-
-    # Receiving Yards
-    if 'receiving_yards' in stat_type_lower or 'rec_yds' in stat_type_lower:
-        val = check_keys(['receiving_yds', 'yds'])
-        if val is not None: return val
-
-    # Passing Yards
-    if 'passing_yards' in stat_type_lower or 'pass_yds' in stat_type_lower:
-        val = check_keys(['passing_yds', 'yds'])
-        if val is not None: return val
-        
-    # Receptions
-    if 'receptions' in stat_type_lower or 'catches' in stat_type_lower:
-        val = check_keys(['receiving_rec', 'rec'])
-        if val is not None: return val
-        
-    # Touchdowns (Anytime / Total)
-    if 'touchdown' in stat_type_lower or 'td' in stat_type_lower:
-        # Special case: Passing TDs
-        if 'passing' in stat_type_lower or 'pass' in stat_type_lower:
-            if 'passing_td' in stats:
-                return float(stats['passing_td'])
-            return None
+    if definition is not None and definition.kind == stat_catalog.KIND_BOXSCORE:
+        values = []
+        for keys in definition.flat_keys():
+            values.append(next((stats[key] for key in keys if key in stats), None))
+        if len(values) == 1:
+            if values[0] is not None:
+                return values[0]
+        elif any(value is not None for value in values):
+            # Combos count a missing component (e.g. no receiving line) as 0
+            numbers = [_flat_number(value) if value is not None else 0.0 for value in values]
+            if None not in numbers:
+                return definition.combine(numbers)
 
+    if definition is not None and definition.kind == stat_catalog.KIND_TOUCHDOWNS:
         # Sum up all TDs found (excluding passing_td and generic 'td')
-        total_td = 0
-        found_td = False
-        for key, val in stats.items():
-            # Skip generic 'td' to avoid double counting
-            if key == 'td':
-                continue
-            
-            # Skip 'passing_td' for non-passing TD bets (Anytime TD)
-            if key == 'passing_td':
-                continue
-                
-            if key.endswith('_td'):
-                try:
-                    total_td += float(val)
-                    found_td = True
-                except:
-                    pass
-        
+        tds = [_flat_number(val) for key, val in stats.items()
+               if key.endswith('_td') and key != 'passing_td']
+        tds = [td for td in tds if td is not None]
+        if tds:
+            return sum(tds)
         # Fallback: If no specific TDs found but generic 'td' exists, use it
-        if not found_td and 'td' in stats:
-            try:
-                return float(stats['td'])
-            except:
-                pass
-                
-        if found_td:
-            return total_td
-
-    # --- NBA Mappings ---
-    
-    if 'point' in stat_type_lower or 'point' in bet_type_lower or 'pts' in stat_type_lower:
-        val = check_keys(['pts', 'points'])
-        if val is not None: return val
-    
-    if 'assist' in stat_type_lower or 'ast' in stat_type_lower:
-        val = check_keys(['ast', 'assists'])
-        if val is not None: return val
-    
-    if 'rebound' in stat_type_lower or 'reb' in stat_type_lower:
-        val = check_keys(['reb', 'rebounds'])
-        if val is not None: return val
-    
-    # Three pointers - ESPN uses "3PT" label
-    if 'three' in stat_type_lower or '3p' in stat_type_lower.replace('-', '').replace('_', '') or 'three' in bet_type_lower or '3p' in bet_type_lower.replace('-', '').replace('_', ''):
-        # Try ESPN abbreviations first
-        val = check_keys(['3pt', '3p', '3-pt'])
-        if val is not None:
-             if isinstance(val, (int, float)):
-                 return val
-        
-        # Then try full names
-        possible_keys = [
-            '3-pt made',
-            '3-pointers made',
-            'three-pointers made',
-            'three pointers made',
-            'made threes',
-            'made 3-pointers',
-            'made 3-pt',
-        ]
-        val = check_keys(possible_keys)
-        if val is not None: return val
-    
-    # Steals
-    if 'steal' in stat_type_lower or 'stl' in stat_type_lower:
-        val = check_keys(['stl', 'steals'])
-        if val is not None: return val
-    
-    # Blocks
-    if 'block' in stat_type_lower or 'blk' in stat_type_lower:
-        val = check_keys(['blk', 'blocks'])
-        if val is not None: return val
-    
-    # Turnovers
-    if 'turnover' in stat_type_lower or 'to' in stat_type_lower:
-        val = check_keys(['to', 'turnovers'])
-        if val is not None: return val
+        if 'td' in stats and _flat_number(stats['td']) is not None:
+            return _flat_number(stats['td'])
     
     # Try direct key match first
     if stat_type_lower in stats:
@@ -531,15 +450,14 @@ def get_espn_game_data(home_team: str, away_team: str, game_date: str, player_na
                     summary_url = f"https://site.api.espn.com/apis/site/v2/sports/{sport_path}/summary?event={current_game_id}"
                     summary_response = requests.get(summary_url, headers=headers, timeout=10)
                     if summary_response.status_code == 200:
-                        summary_data = summary_response.json()
-                        boxscore = summary_data.get('boxscore', {})
+                        boxscore = read_json_parts(summary_response, ('boxscore',))['boxscore'] or {}
                         
                         # Get player stats from boxscore
                         player_stats = _get_player_stats_from_boxscore(player_name, sport, boxscore)
                         
                         if player_stats:
                             # Extract the relevant stat
-                            achieved_value = _extract_achieved_value(player_stats, stat_type, bet_type, bet_line_type)
+                            achieved_value = _extract_achieved_value(player_stats, stat_type, bet_type, bet_line_type, sport)
                 except Exception as e:
                     print(f"Error fetching player stats for {player_name}: {e}")
             
@@ -605,6 +523,81 @@ def get_espn_player_details(player_id: str, sport: str = "football", league: str
         print(f"Error fetching ESPN player details for ID {player_id}: {e}")
         return None
 
+def _roster_athlete(athlete: dict, team: dict, sport_code: str) -> dict:
+    """Player fields from one roster entry"""
+    jersey = str(athlete.get('jersey') or '').strip()
+    status = athlete.get('status') or {}
+    return {
+        'espn_player_id': str(athlete.get('id', '')),
+        'player_name': athlete.get('fullName') or athlete.get('displayName', ''),
+        'display_name': athlete.get('displayName') or athlete.get('fullName', ''),
+        'position': (athlete.get('position') or {}).get('abbreviation') or None,
+        'jersey_number': int(jersey) if jersey.isdigit() else None,
+        'current_team': team.get('displayName', ''),
+        'team_abbreviation': team.get('abbreviation', ''),
+        'status': (status.get('type') or 'active').lower(),
+        'sport': sport_code
+    }
+
+
+def get_league_rosters(sport: str = "football", league: str = "nfl", max_workers: int = 8) -> List[dict]:
+    """
+    Fetch every team roster of a league from ESPN
+
+    One request lists the league's teams, then the team rosters are fetched
+    concurrently over a shared connection pool.
+
+    Args:
+        sport: Sport (default: "football")
+        league: League (default: "nfl")
+        max_workers: Concurrent roster requests
+
+    Returns:
+        List of player dicts (espn_player_id, player_name, display_name, position,
+        jersey_number, current_team, team_abbreviation, status, sport); empty if
+        the team list could not be fetched. Teams whose roster fails are skipped.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    base_url = f"https://site.api.espn.com/apis/site/v2/sports/{sport}/{league}"
+    sport_code = league.upper()
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+    session.mount('https://', adapter)
+
+    try:
+        response = session.get(f"{base_url}/teams", params={'limit': 1000}, timeout=10)
+        response.raise_for_status()
+        leagues = response.json().get('sports', [{}])[0].get('leagues', [{}])
+        teams = [entry.get('team', {}) for entry in leagues[0].get('teams', [])] if leagues else []
+    except Exception as e:
+        print(f"Error fetching ESPN teams for {league}: {e}")
+        session.close()
+        return []
+
+    def fetch_roster(team: dict) -> List[dict]:
+        try:
+            roster_response = session.get(f"{base_url}/teams/{team['id']}/roster", timeout=10)
+            roster_response.raise_for_status()
+            athletes = roster_response.json().get('athletes', [])
+        except Exception as e:
+            print(f"Error fetching ESPN roster for {team.get('abbreviation')} ({league}): {e}")
+            return []
+        players = []
+        for athlete in athletes:
+            # NFL rosters are grouped by unit (offense/defense/special teams)
+            for item in athlete.get('items', [athlete]) if isinstance(athlete, dict) else []:
+                if item.get('id'):
+                    players.append(_roster_athlete(item, team, sport_code))
+        return players
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            rosters = list(executor.map(fetch_roster, [team for team in teams if team.get('id')]))
+    finally:
+        session.close()
+    return [player for roster in rosters for player in roster]
+
 # Stats Standardization Mapping
 STATS_MAPPING = {
     "nba": {
@@ -890,8 +883,13 @@ def get_player_season_stats(player_id: str, sport: str = "football", league: str
                     
                     # Ensure events is a list before slicing
                     if isinstance(events, list):
-                        # Take up to 5
-                        for event in events[:5]:
+                        # Take up to 5; boxscores come from the shared summary cache
+                        # (fetched concurrently, reused across teammates)
+                        events = events[:5]
+                        boxscores = game_summary_cache.boxscores(
+                            sport, league, [event.get('id') for event in events]
+                        )
+                        for event in events:
                             game_stats = {}
                             game_id = event.get('id')
                             
@@ -900,33 +898,10 @@ def get_player_season_stats(player_id: str, sport: str = "football", league: str
                             game_stats['gameDate'] = event.get('gameDate')
                             game_stats['opponent'] = event.get('opponent', {}).get('abbreviation')
                             
-                            # Fetch detailed boxscore for this game
-                            try:
-                                summary_url = f"https://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/summary?event={game_id}"
-                                summary_res = requests.get(summary_url, timeout=5)
-                                if summary_res.status_code == 200:
-                                    summary_data = summary_res.json()
-                                    if 'boxscore' in summary_data and 'players' in summary_data['boxscore']:
-                                        # Find player in boxscore
-                                        found_stats = False
-                                        for team_box in summary_data['boxscore']['players']:
-                                            if 'statistics' in team_box:
-                                                stats_wrapper = team_box['statistics'][0]
-                                                names = stats_wrapper.get('names', [])
-                                                athletes = stats_wrapper.get('athletes', [])
-                                                
-                                                for athlete in athletes:
-                                                    if athlete.get('athlete', {}).get('id') == player_id:
-                                                        stats_vals = athlete.get('stats', [])
-                                                        if len(names) == len(stats_vals):
-                                                            for k, v in zip(names, stats_vals):
-                                                                game_stats[k] = v
-                                                        found_stats = True
-                                                        break
-                                            if found_stats:
-                                                break
-                            except Exception as e:
-                                print(f"Error fetching boxscore for game {game_id}: {e}")
+                            # Player's row from the indexed boxscore for this game
+                            player_row = (boxscores.get(str(game_id)) or {}).get(str(player_id))
+                            if player_row:
+                                game_stats.update(player_row)
                             
                             # Standardize game stats immediately
                             game_stats = standardize_keys(game_stats, league)
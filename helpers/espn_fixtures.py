@@ -0,0 +1,284 @@
+"""
+Record/replay of ESPN API traffic.
+
+Every ESPN call in the app goes through requests (module-level requests.get
+or a pooled Session), so both modes hook requests.Session.send:
+
+- record: real ESPN responses (scoreboard, summary, athlete, search, rosters)
+  are written to a FixtureStore as they come back
+- replay: ESPN URLs are rewritten to a local FixtureServer, which serves the
+  stored responses with configurable latency and error injection
+
+Fixtures are keyed by method, host, path and sorted query, one JSON file
+each under <store>/<host>/. Both modes can be switched on for a whole
+process with ESPN_RECORD_DIR / ESPN_REPLAY_URL (see install_from_env), or
+scoped with the recording()/replaying() context managers in tests and
+benchmarks. tools/espn_fixtures.py has the record and serve commands.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+ESPN_HOSTS = frozenset({
+    'site.api.espn.com', 'site.web.api.espn.com', 'sports.core.api.espn.com', 'now.core.api.espn.com',
+})
+
+
+def is_espn_url(url):
+    return urlsplit(url).hostname in ESPN_HOSTS
+
+
+def fixture_key(method, url):
+    """Canonical 'METHOD host/path?sorted-query' for a request URL."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {parts.hostname}{parts.path}" + (f"?{query}" if query else '')
+
+
+class FixtureStore:
+    """Recorded responses on disk, one JSON file per fixture key."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def path_for(self, key):
+        method, target = key.split(' ', 1)
+        host, _, rest = target.partition('/')
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', rest.partition('?')[0]).strip('_')[-80:] or 'root'
+        digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+        return self.root / host / f"{method.lower()}_{slug}_{digest}.json"
+
+    def get(self, key):
+        """The stored fixture dict for a key, or None."""
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        with path.open(encoding='utf-8') as f:
+            return json.load(f)
+
+    def put(self, key, status, body, content_type='application/json'):
+        path = self.path_for(key)
+        fixture = {'key': key, 'status': status, 'content_type': content_type,
+                   'body': body.decode('utf-8', errors='replace') if isinstance(body, bytes) else body}
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            with tmp.open('w', encoding='utf-8') as f:
+                json.dump(fixture, f)
+            tmp.replace(path)
+        return path
+
+    def keys(self):
+        return sorted(json.loads(path.read_text(encoding='utf-8'))['key'] for path in self.root.glob('*/*.json'))
+
+
+# --- requests hook ---------------------------------------------------------
+
+_original_send = requests.Session.send
+_hooks = []  # (name, wrapper) in install order; the last installed runs first
+_hooks_lock = threading.Lock()
+
+
+def _dispatch(session, request, **kwargs):
+    with _hooks_lock:
+        hooks = list(_hooks)
+
+    def call(index, request):
+        if index < 0:
+            return _original_send(session, request, **kwargs)
+        return hooks[index][1](request, lambda req: call(index - 1, req))
+
+    return call(len(hooks) - 1, request)
+
+
+def _install(name, wrapper):
+    with _hooks_lock:
+        _hooks.append((name, wrapper))
+        requests.Session.send = _dispatch
+
+
+def _uninstall(name, wrapper):
+    with _hooks_lock:
+        if (name, wrapper) in _hooks:
+            _hooks.remove((name, wrapper))
+        if not _hooks:
+            requests.Session.send = _original_send
+
+
+def _record_wrapper(store):
+    def record(request, send):
+        # Keyed before sending: replay rewrites request.url in place
+        key = fixture_key(request.method, request.url) if is_espn_url(request.url) else None
+        response = send(request)
+        if key is not None and response.status_code < 500:
+            store.put(key, response.status_code, response.content,
+                      response.headers.get('Content-Type', 'application/json'))
+        return response
+    return record
+
+
+def _replay_wrapper(base_url):
+    base_url = base_url.rstrip('/')
+
+    def replay(request, send):
+        if is_espn_url(request.url):
+            parts = urlsplit(request.url)
+            request.url = f"{base_url}/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+        return send(request)
+    return replay
+
+
+@contextmanager
+def recording(store):
+    """Write ESPN responses made inside the block to ``store`` (a FixtureStore or directory)."""
+    store = store if isinstance(store, FixtureStore) else FixtureStore(store)
+    wrapper = _record_wrapper(store)
+    _install('record', wrapper)
+    try:
+        yield store
+    finally:
+        _uninstall('record', wrapper)
+
+
+@contextmanager
+def replaying(base_url):
+    """Send ESPN requests made inside the block to a FixtureServer at ``base_url``."""
+    wrapper = _replay_wrapper(base_url)
+    _install('replay', wrapper)
+    try:
+        yield
+    finally:
+        _uninstall('replay', wrapper)
+
+
+def install_from_env():
+    """Turn on process-wide replay (ESPN_REPLAY_URL) and/or recording (ESPN_RECORD_DIR)."""
+    replay_url = os.environ.get('ESPN_REPLAY_URL')
+    record_dir = os.environ.get('ESPN_RECORD_DIR')
+    if replay_url:
+        _install('replay', _replay_wrapper(replay_url))
+        logger.warning(f"[ESPN-FIXTURES] Replaying ESPN requests from {replay_url}")
+    if record_dir:
+        _install('record', _record_wrapper(FixtureStore(record_dir)))
+        logger.warning(f"[ESPN-FIXTURES] Recording ESPN responses to {record_dir}")
+
+
+# --- stand-in server -------------------------------------------------------
+
+class FixtureServer:
+    """Local HTTP stand-in for ESPN that serves a FixtureStore.
+
+    Requests look like /<espn host>/<path>?<query> (what replaying() sends).
+    Each response waits latency_ms (+ up to jitter_ms); with probability
+    error_rate it is a 503 instead, and with probability stall_rate it stalls
+    for stall_seconds first (to trip client timeouts). Unknown fixtures get
+    missing_status. Randomness comes from ``seed``, so runs are repeatable.
+    """
+
+    def __init__(self, store, host='127.0.0.1', port=0, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 stall_rate=0.0, stall_seconds=10.0, missing_status=404, seed=0):
+        self.store = store if isinstance(store, FixtureStore) else FixtureStore(store)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.missing_status = missing_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {'requests': 0, 'served': 0, 'missing': 0, 'errors': 0, 'stalls': 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                logger.debug(f"[ESPN-FIXTURES] {self.address_string()} {format % args}")
+
+        return Handler
+
+    def _draw(self):
+        with self._lock:
+            self.counts['requests'] += 1
+            return (self._random.random(), self._random.random(), self._random.random())
+
+    def _count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def _handle(self, handler):
+        error_roll, stall_roll, jitter_roll = self._draw()
+        delay = (self.latency_ms + jitter_roll * self.jitter_ms) / 1000
+        if stall_roll < self.stall_rate:
+            self._count('stalls')
+            delay += self.stall_seconds
+        if delay:
+            time.sleep(delay)
+
+        if error_roll < self.error_rate:
+            self._count('errors')
+            return self._send(handler, 503, b'{"error": "injected"}', 'application/json')
+
+        fixture = self.store.get(fixture_key(handler.command, f"https:/{handler.path}"))
+        if fixture is None:
+            self._count('missing')
+            return self._send(handler, self.missing_status, b'{"error": "no fixture"}', 'application/json')
+        self._count('served')
+        self._send(handler, fixture['status'], fixture['body'].encode('utf-8'), fixture['content_type'])
+
+    @staticmethod
+    def _send(handler, status, body, content_type):
+        try:
+            handler.send_response(status)
+            handler.send_header('Content-Type', content_type)
+            handler.send_header('Content-Length', str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (timeout); nothing to do
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='espn-fixture-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,72 @@
+"""
+Selective parsing of large ESPN payloads.
+
+A /summary document carries the boxscore, plays, drives, news, odds,
+pickcenter and more, but callers only read a couple of its subtrees
+(boxscore players, scoring plays, the header's status). read_json_parts
+returns just those, keyed by dotted path:
+
+    read_json_parts(response, ('boxscore.players', 'scoringPlays'))
+    -> {'boxscore.players': [...], 'scoringPlays': [...]}
+
+With ijson's C backend installed each subtree is pulled out of the raw body
+by the C tokenizer, which stops as soon as the subtree is complete; the rest
+of the document is never turned into Python objects. Paths whose top-level
+key doesn't occur in the body are skipped without a pass. Without ijson (or
+with only its pure-Python backends, which are slower than json) the body is
+parsed in full and the same parts are picked out of it.
+"""
+
+import io
+import json
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - depends on the environment
+    ijson = None
+
+# The pure-Python backends lose to json.loads by an order of magnitude
+selective_parsing = ijson is not None and ijson.backend in ('yajl2_c', 'yajl2_cffi')
+
+
+def select_parts(document, paths):
+    """{path: subtree or None} from an already parsed document."""
+    parts = {}
+    for path in paths:
+        node = document
+        for key in path.split('.'):
+            node = node.get(key) if isinstance(node, dict) else None
+            if node is None:
+                break
+        parts[path] = node
+    return parts
+
+
+def parse_json_parts(body, paths):
+    """{path: subtree or None} from a raw JSON body (bytes)."""
+    if not selective_parsing:
+        return select_parts(json.loads(body), paths)
+    parts = {}
+    for path in paths:
+        top_key = path.split('.', 1)[0]
+        if b'"%s"' % top_key.encode() not in body:
+            parts[path] = None
+            continue
+        try:
+            parts[path] = next(ijson.items(io.BytesIO(body), path, use_float=True), None)
+        except ijson.JSONError as e:
+            # Same error type json.loads raises on a broken body
+            raise ValueError(f"Invalid JSON body: {e}") from e
+    return parts
+
+
+def read_json_parts(response, paths):
+    """{path: subtree or None} from a requests response's JSON body.
+
+    Responses without a raw byte body (stand-ins that only implement .json())
+    are parsed with .json().
+    """
+    body = getattr(response, 'content', None)
+    if not isinstance(body, (bytes, bytearray)):
+        return select_parts(response.json(), paths)
+    return parse_json_parts(bytes(body), paths)
@@ -0,0 +1,83 @@
+"""
+Fast JSON provider for Flask responses.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise, so ``jsonify`` keeps working either way. Both paths encode the
+types our models emit exactly like Flask's default provider, which the
+frontend was written against:
+
+- Decimal (Numeric columns) -> string ("10.50")
+- date / datetime -> HTTP date string ("Sat, 01 Mar 2025 18:30:00 GMT")
+- UUID -> string, dataclass -> object
+
+plus set / frozenset -> list.
+"""
+
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date
+
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(obj):
+    """Encode types that neither encoder handles natively (orjson passes datetimes through)."""
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_default(obj):
+    """Fallback encoder: also covers what orjson does natively."""
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    return _default(obj)
+
+
+class FastJSONProvider(JSONProvider):
+    """JSON provider with an orjson fast path.
+
+    Output is compact and keys keep insertion order (no sort_keys), which
+    is what makes orjson cheap; nothing in the API relies on sorted keys.
+    """
+
+    mimetype = 'application/json'
+
+    def dumps_bytes(self, obj):
+        if orjson is not None:
+            return orjson.dumps(obj, default=_default,
+                                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+        return self.dumps(obj).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return self.dumps_bytes(obj).decode('utf-8')
+        kwargs.setdefault('default', _stdlib_default)
+        kwargs.setdefault('ensure_ascii', False)
+        kwargs.setdefault('separators', (',', ':'))
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
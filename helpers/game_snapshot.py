@@ -0,0 +1,200 @@
+"""
+Compact per-game snapshots of ESPN game data.
+
+fetch_game_details_from_espn turns an ESPN event (plus its summary) into a
+GameSnapshot once per fetch. game_data_cache holds snapshots instead of the
+raw ESPN boxscore/scoring play lists:
+
+- boxscore categories become StatGroups: labels shared per group, one
+  PlayerLine per athlete holding its parsed stat values as a tuple
+- scoring plays are reduced to the touchdown scorer index and the first/last
+  scoring teams, the only things stat evaluation reads from them
+- the client view (a parlay's 'games' entry) is built once per snapshot and
+  carries only the fields the frontend uses
+"""
+
+from helpers.utils import _norm, _stat_int, _match_athlete, TouchdownIndex, touchdown_index
+
+# Keys of the client view, in the order the old game dicts had them
+CLIENT_FIELDS = ('espn_game_id', 'teams', 'startTime', 'startDateTime', 'game_date',
+                 'statusTypeName', 'period', 'clock', 'score')
+
+
+class PlayerLine:
+    """One athlete's row in a boxscore category."""
+
+    __slots__ = ('athlete_id', 'name', 'name_norm', 'values')
+
+    def __init__(self, athlete_id, name, values):
+        self.athlete_id = athlete_id
+        self.name = name
+        self.name_norm = _norm(name)
+        self.values = values
+
+
+class StatGroup:
+    """One team's boxscore category ('rushing', or '' for NBA's unnamed group)."""
+
+    __slots__ = ('name', 'labels', 'lines', 'names')
+
+    def __init__(self, name, labels, lines):
+        self.name = name
+        self.labels = labels
+        self.lines = lines
+        self.names = [line.name_norm for line in lines]
+
+    @classmethod
+    def from_espn(cls, cat):
+        # ESPN returns 'None' as a string for NBA stats, treat as empty category
+        name = cat.get('name')
+        name = '' if name in ('None', None) else name.lower()
+        labels = {label: idx for idx, label in enumerate(cat.get('labels', []))}
+        lines = []
+        for ath in cat.get('athletes', []):
+            athlete = ath.get('athlete', {})
+            lines.append(PlayerLine(str(athlete['id']) if athlete.get('id') else None,
+                                    athlete.get('displayName', ''),
+                                    tuple(_stat_int(val) for val in ath.get('stats', []))))
+        return cls(name, labels, lines)
+
+
+class GameSnapshot:
+    """The parts of one ESPN game the app uses."""
+
+    __slots__ = ('espn_game_id', 'sport', 'away', 'home', 'away_abbr', 'home_abbr', 'start_time',
+                 'start_date_time', 'game_date', 'status', 'period', 'clock', 'away_score', 'home_score',
+                 'groups', 'touchdowns', 'first_scoring_team', 'last_scoring_team', '_client')
+
+    def __init__(self, espn_game_id, sport, away, home, away_abbr='', home_abbr='', start_time='',
+                 start_date_time='', game_date='', status='unknown', period=0, clock='00:00',
+                 away_score=0, home_score=0, groups=(), touchdowns=None,
+                 first_scoring_team=None, last_scoring_team=None):
+        self.espn_game_id = espn_game_id
+        self.sport = sport
+        self.away = away
+        self.home = home
+        self.away_abbr = away_abbr
+        self.home_abbr = home_abbr
+        self.start_time = start_time
+        self.start_date_time = start_date_time
+        self.game_date = game_date
+        self.status = status
+        self.period = period
+        self.clock = clock
+        self.away_score = away_score
+        self.home_score = home_score
+        self.groups = tuple(groups)
+        self.touchdowns = touchdowns if touchdowns is not None else TouchdownIndex([], [])
+        self.first_scoring_team = first_scoring_team
+        self.last_scoring_team = last_scoring_team
+        self._client = None
+
+    @classmethod
+    def from_espn(cls, event, sport, game_date, boxscore, scoring_plays, away_abbr=None, home_abbr=None):
+        """Build a snapshot from a scoreboard event plus its boxscore players and scoring plays."""
+        comp = event['competitions'][0]
+        away = next(c for c in comp['competitors'] if c['homeAway'] == 'away')
+        home = next(c for c in comp['competitors'] if c['homeAway'] == 'home')
+        start = event.get('date', '')
+        status = event['status']
+        return cls(
+            espn_game_id=event['id'],
+            sport=sport,
+            away=away['team']['displayName'],
+            home=home['team']['displayName'],
+            away_abbr=away_abbr if away_abbr is not None else away['team'].get('abbreviation', ''),
+            home_abbr=home_abbr if home_abbr is not None else home['team'].get('abbreviation', ''),
+            start_time=start.split('T')[1][:5] + ' ET' if 'T' in start else '',
+            start_date_time=start,
+            game_date=game_date,
+            status=status['type']['name'],
+            period=status.get('period', 0),
+            clock=status.get('displayClock', '00:00'),
+            away_score=int(away.get('score', 0)),
+            home_score=int(home.get('score', 0)),
+            groups=_groups(boxscore),
+            touchdowns=TouchdownIndex(boxscore, scoring_plays),
+            **_scoring_teams(scoring_plays),
+        )
+
+    @classmethod
+    def from_game_dict(cls, game):
+        """Snapshot of an old-style game dict (raw 'boxscore'/'scoring_plays' lists)."""
+        teams = game.get('teams') or {}
+        score = game.get('score') or {}
+        boxscore = game.get('boxscore') or []
+        scoring_plays = game.get('scoring_plays') or []
+        return cls(
+            espn_game_id=game.get('espn_game_id', ''),
+            sport=game.get('sport'),
+            away=teams.get('away', ''),
+            home=teams.get('home', ''),
+            away_abbr=teams.get('away_abbr', ''),
+            home_abbr=teams.get('home_abbr', ''),
+            start_time=game.get('startTime', ''),
+            start_date_time=game.get('startDateTime', ''),
+            game_date=game.get('game_date', ''),
+            status=game.get('statusTypeName', 'unknown'),
+            period=game.get('period') or 0,
+            clock=game.get('clock', '00:00'),
+            away_score=score.get('away', 0),
+            home_score=score.get('home', 0),
+            groups=_groups(boxscore),
+            touchdowns=touchdown_index(game.get('boxscore', []), game.get('scoring_plays', [])),
+            **_scoring_teams(scoring_plays),
+        )
+
+    def player_stat(self, player_name, category, label):
+        """A player's value for a boxscore category/label, or None if not found.
+
+        Same matching as helpers.utils._get_player_stat_from_boxscore: groups in
+        boxscore order, all-tokens match first, then the fuzzy fallbacks.
+        """
+        category = '' if category in ('None', None) else category.lower()
+        player_norm = _norm(player_name or '')
+        for group in self.groups:
+            if group.name != category or label not in group.labels:
+                continue
+            idx = _match_athlete(player_norm, group.names)
+            if idx == -1:
+                continue
+            values = group.lines[idx].values
+            stat_idx = group.labels[label]
+            if stat_idx < len(values):
+                return values[stat_idx]
+        return None
+
+    def to_client(self):
+        """The JSON view sent to clients in a parlay's 'games'; built once and shared."""
+        if self._client is None:
+            self._client = {
+                'espn_game_id': self.espn_game_id,
+                'teams': {'away': self.away, 'home': self.home,
+                          'away_abbr': self.away_abbr, 'home_abbr': self.home_abbr},
+                'startTime': self.start_time,
+                'startDateTime': self.start_date_time,
+                'game_date': self.game_date,
+                'statusTypeName': self.status,
+                'period': self.period,
+                'clock': self.clock,
+                'score': {'away': self.away_score, 'home': self.home_score},
+            }
+        return self._client
+
+    def get(self, key, default=None):
+        """Dict-style read of a client field, for callers written against game dicts."""
+        return self.to_client().get(key, default)
+
+    def __getitem__(self, key):
+        return self.to_client()[key]
+
+
+def _groups(boxscore):
+    return [StatGroup.from_espn(cat) for team_box in boxscore or [] for cat in team_box.get('statistics', [])]
+
+
+def _scoring_teams(scoring_plays):
+    if not scoring_plays:
+        return {}
+    return {'first_scoring_team': scoring_plays[0].get('team', {}).get('displayName'),
+            'last_scoring_team': scoring_plays[-1].get('team', {}).get('displayName')}
@@ -0,0 +1,145 @@
+"""
+Shared cache of indexed ESPN game boxscores.
+
+Player enrichment reads each player's row out of the /summary boxscore of
+their last five games. Teammates (and opponents) share those games, so the
+summaries are fetched once per process and indexed by athlete id:
+
+    {game_id: {athlete_id: {stat_name: value}}}
+
+Finished games never change and are kept for FINAL_SUMMARY_TTL_SECONDS;
+games still in progress only for LIVE_SUMMARY_TTL_SECONDS. Missing
+summaries are fetched concurrently over one pooled requests.Session, and
+only their boxscore players and header are parsed.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from helpers.espn_payloads import read_json_parts
+
+logger = logging.getLogger(__name__)
+
+FINAL_SUMMARY_TTL_SECONDS = 24 * 3600
+LIVE_SUMMARY_TTL_SECONDS = 60
+SUMMARY_CACHE_MAX_ENTRIES = 2000
+SUMMARY_FETCH_WORKERS = 8
+SUMMARY_TIMEOUT_SECONDS = 5
+
+# Only these summary subtrees are parsed (see helpers.espn_payloads)
+SUMMARY_PARTS = ('boxscore.players', 'header.competitions')
+
+SUMMARY_URL = "https://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/summary"
+
+
+def is_final_summary(summary):
+    """True when the summary's game is over."""
+    try:
+        status = summary['header']['competitions'][0]['status']['type']
+    except (KeyError, IndexError, TypeError):
+        return False
+    return bool(status.get('completed')) or status.get('state') == 'post'
+
+
+def index_boxscore_players(summary):
+    """{athlete_id: {stat_name: value}} from a summary's boxscore.
+
+    Uses each team's first statistics group; the first row seen for an
+    athlete wins.
+    """
+    players = {}
+    for team_box in (summary.get('boxscore') or {}).get('players', []):
+        groups = team_box.get('statistics') or []
+        if not groups:
+            continue
+        names = groups[0].get('names', [])
+        for athlete in groups[0].get('athletes', []):
+            athlete_id = str((athlete.get('athlete') or {}).get('id', ''))
+            values = athlete.get('stats', [])
+            if athlete_id and athlete_id not in players and len(names) == len(values):
+                players[athlete_id] = dict(zip(names, values))
+    return players
+
+
+class GameSummaryCache:
+    """Process-wide LRU of indexed boxscores; see the module docstring."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (league, game_id) -> (players, expires_at)
+        self.fetches = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _put(self, key, players, final):
+        ttl = FINAL_SUMMARY_TTL_SECONDS if final else LIVE_SUMMARY_TTL_SECONDS
+        with self._lock:
+            self._entries[key] = (players, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > SUMMARY_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def boxscores(self, sport, league, game_ids):
+        """{game_id: athlete index} for ``game_ids``; games that failed to load map to None."""
+        game_ids = [str(game_id) for game_id in dict.fromkeys(game_ids) if game_id]
+        result = {}
+        missing = []
+        for game_id in game_ids:
+            players = self._get((league, game_id))
+            if players is None:
+                missing.append(game_id)
+            else:
+                result[game_id] = players
+        if not missing:
+            return result
+
+        session = requests.Session()
+        workers = min(SUMMARY_FETCH_WORKERS, len(missing))
+        session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+        url = SUMMARY_URL.format(sport=sport, league=league)
+
+        def fetch(game_id):
+            try:
+                response = session.get(url, params={'event': game_id}, timeout=SUMMARY_TIMEOUT_SECONDS)
+                if response.status_code != 200:
+                    return game_id, None
+                parts = read_json_parts(response, SUMMARY_PARTS)
+            except Exception as e:
+                logger.warning(f"[GAME-SUMMARY] Error fetching summary for game {game_id}: {e}")
+                return game_id, None
+            summary = {'boxscore': {'players': parts['boxscore.players'] or []},
+                       'header': {'competitions': parts['header.competitions'] or []}}
+            players = index_boxscore_players(summary)
+            self._put((league, game_id), players, is_final_summary(summary))
+            return game_id, players
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for game_id, players in executor.map(fetch, missing):
+                    result[game_id] = players
+        finally:
+            session.close()
+        with self._lock:
+            self.fetches += len(missing)
+        return result
+
+
+game_summary_cache = GameSummaryCache()
@@ -0,0 +1,411 @@
+"""
+Local player resolver.
+
+Bet slips name players loosely ("C.J. Stroud", "CJ Stroud", "Marvin Harrison
+Jr", "J. Allen", "Nikola Jokić"). Resolving those through ESPN search costs
+up to six requests per unknown name, so PlayerResolver compiles the players
+table (including rosters ingested in bulk) into in-process indexes:
+
+- exact: name key (accents, punctuation and Jr/Sr/II-V suffixes removed)
+- initials: (first initial, last name) for "J. Allen" / "CJ Stroud" forms
+- last name: for single-word names ("Jokic") when only one player matches
+- trigrams: candidates for misspellings, confirmed by an edit-similarity
+  ratio with a margin over the runner-up
+
+Lookups with a sport stay within that sport; only sport-less lookups search
+every player. Only exact (suffix-stripped) name matches are trusted on their
+own: initials, last-name and fuzzy matches are candidates that may be a
+different player who isn't in the table yet ("Jalen Williams" vs "Jaylin
+Williams"), so find() links them only when the player's team agrees with
+the team the caller knows from the bet slip, and fuzzy ones only for a
+one-character slip. Results are memoized; the indexes follow committed inserts/updates/deletes
+of players in this process and are fully rebuilt every
+RESOLVER_REFRESH_SECONDS to pick up other processes' writes.
+
+ESPN is searched (via enhanced_player_search) only on a local miss, and
+names ESPN doesn't know are remembered for ESPN_MISS_TTL_SECONDS.
+"""
+
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+RESOLVER_REFRESH_SECONDS = 3600
+RESOLVER_MEMO_MAX_ENTRIES = 50000
+ESPN_MISS_TTL_SECONDS = 6 * 3600
+ESPN_MISS_MAX_ENTRIES = 10000
+
+# Fuzzy matches must be at least this similar, and beat the runner-up by the margin
+FUZZY_MIN_RATIO = 0.88
+FUZZY_MIN_MARGIN = 0.04
+FUZZY_MAX_CANDIDATES = 25
+
+ALL_SPORTS = '*'
+TRUSTED_METHODS = {'exact'}
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+# Columns copied into the index entries
+_PLAYER_FIELDS = ('id', 'player_name', 'display_name', 'normalized_name', 'sport', 'position',
+                  'jersey_number', 'current_team', 'team_abbreviation', 'espn_player_id')
+
+
+def player_name_key(name):
+    """'Marvin Harrison Jr.' -> 'marvin harrison', 'Nikola Jokić' -> 'nikola jokic'."""
+    if not name:
+        return ''
+    name = unicodedata.normalize('NFKD', str(name))
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch)).lower()
+    name = name.replace('.', '').replace("'", '').replace('’', '')
+    tokens = _NON_WORD_RE.sub(' ', name).split()
+    while len(tokens) > 2 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    if len(tokens) == 2 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def _initials_key(key):
+    """('j', 'allen') for 'j allen' / 'josh allen'; None for single-word names."""
+    tokens = key.split()
+    if len(tokens) < 2:
+        return None
+    return tokens[0][0], tokens[-1]
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _within_one_edit(a, b):
+    """True if ``a`` and ``b`` differ by at most one insertion, deletion or substitution."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return a[i + 1:] == b[i + 1:] if len(a) == len(b) else a[i:] == b[i + 1:]
+    return True
+
+
+def espn_sport_league(sport):
+    """ESPN (sport, league) path segments for one of our sport codes."""
+    return {
+        'NFL': ('football', 'nfl'),
+        'NBA': ('basketball', 'nba'),
+        'MLB': ('baseball', 'mlb'),
+        'NHL': ('hockey', 'nhl'),
+        'NCAAF': ('football', 'college-football'),
+        'NCAAB': ('basketball', 'mens-college-basketball'),
+    }.get((sport or 'NFL').upper(), ('football', 'nfl'))
+
+
+class _Scope:
+    """Indexes over the players of one sport (or ALL_SPORTS)."""
+
+    __slots__ = ('exact', 'initials', 'last_names', 'trigrams')
+
+    def __init__(self):
+        self.exact = defaultdict(set)
+        self.initials = defaultdict(set)
+        self.last_names = defaultdict(set)
+        self.trigrams = defaultdict(set)
+
+    def add(self, entry):
+        for key in entry['keys']:
+            self.exact[key].add(entry['id'])
+            initials = _initials_key(key)
+            if initials:
+                self.initials[initials].add(entry['id'])
+                self.last_names[initials[1]].add(entry['id'])
+            for gram in _trigrams(key):
+                self.trigrams[gram].add(entry['id'])
+
+    def remove(self, entry):
+        for key in entry['keys']:
+            _discard(self.exact, key, entry['id'])
+            initials = _initials_key(key)
+            if initials:
+                _discard(self.initials, initials, entry['id'])
+                _discard(self.last_names, initials[1], entry['id'])
+            for gram in _trigrams(key):
+                _discard(self.trigrams, gram, entry['id'])
+
+
+def _discard(index, key, player_id):
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(player_id)
+        if not ids:
+            del index[key]
+
+
+class PlayerResolver:
+    """Resolve free-form player names against the players table; see the module docstring."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._scopes = {}
+        self._memo = {}
+        self._espn_misses = {}
+        self._loaded_at = 0.0
+        self._stale = True
+
+    def invalidate(self):
+        """Force a full rebuild on the next lookup."""
+        self._stale = True
+
+    @staticmethod
+    def _entry(row):
+        entry = {field: row[field] for field in _PLAYER_FIELDS}
+        entry['sport'] = (entry['sport'] or '').upper()
+        entry['keys'] = {key for key in (player_name_key(entry['player_name']),
+                                         player_name_key(entry['display_name']),
+                                         player_name_key(entry['normalized_name'])) if key}
+        return entry
+
+    def _add(self, entry):
+        self._entries[entry['id']] = entry
+        for scope in (entry['sport'], ALL_SPORTS):
+            self._scopes.setdefault(scope, _Scope()).add(entry)
+
+    def _remove(self, player_id):
+        entry = self._entries.pop(player_id, None)
+        if entry is not None:
+            for scope in (entry['sport'], ALL_SPORTS):
+                if scope in self._scopes:
+                    self._scopes[scope].remove(entry)
+
+    def _ensure_loaded(self):
+        if not self._stale and time.time() - self._loaded_at < RESOLVER_REFRESH_SECONDS:
+            return
+        from models import db, Player
+
+        columns = [getattr(Player, field) for field in _PLAYER_FIELDS]
+        rows = db.session.execute(select(*columns).order_by(Player.id)).mappings().all()
+        with self._lock:
+            self._entries = {}
+            self._scopes = {}
+            for row in rows:
+                self._add(self._entry(row))
+            self._memo = {}
+            self._loaded_at = time.time()
+            self._stale = False
+        logger.debug(f"[PLAYER-RESOLVER] Indexed {len(rows)} players")
+
+    def apply_changes(self, upserted_rows, deleted_ids):
+        """Update the indexes in place for committed player writes."""
+        if self._stale:
+            return  # the next lookup rebuilds everything anyway
+        with self._lock:
+            for player_id in deleted_ids:
+                self._remove(player_id)
+            for row in upserted_rows:
+                self._remove(row['id'])
+                self._add(self._entry(row))
+            self._memo = {}
+
+    def _unique(self, ids):
+        ids = sorted(ids)
+        if len(ids) == 1:
+            return ids[0]
+        # Same name listed twice (e.g. re-created player): prefer the one linked to ESPN
+        linked = [i for i in ids if self._entries[i]['espn_player_id']]
+        names = {frozenset(self._entries[i]['keys']) for i in ids}
+        if len(names) == 1:
+            return (linked or ids)[0]
+        return None
+
+    def _match_in_scope(self, scope, key):
+        exact = scope.exact.get(key)
+        if exact:
+            return self._unique(exact), 'exact'
+
+        initials = _initials_key(key)
+        tokens = key.split()
+        if initials and len(tokens[0]) <= 2:
+            # "j allen" / "cj stroud": first-name initials
+            ids = [i for i in scope.initials.get(initials, [])
+                   if any(k.split()[0].startswith(tokens[0]) or _initials_of(k) == tokens[0]
+                          for k in self._entries[i]['keys'])]
+            if ids:
+                player_id = self._unique(ids)
+                if player_id is not None:
+                    return player_id, 'initials'
+        if len(tokens) == 1:
+            ids = scope.last_names.get(key)
+            if ids:
+                player_id = self._unique(ids)
+                if player_id is not None:
+                    return player_id, 'last_name'
+
+        return self._fuzzy(scope, key)
+
+    def _fuzzy(self, scope, key):
+        counts = defaultdict(int)
+        for gram in _trigrams(key):
+            for player_id in scope.trigrams.get(gram, ()):
+                counts[player_id] += 1
+        if not counts:
+            return None, None
+        candidates = sorted(counts, key=lambda i: -counts[i])[:FUZZY_MAX_CANDIDATES]
+        scored = sorted(
+            ((max(SequenceMatcher(None, key, k).ratio() for k in self._entries[i]['keys']), i)
+             for i in candidates),
+            reverse=True,
+        )
+        best_ratio, best_id = scored[0]
+        if best_ratio < FUZZY_MIN_RATIO:
+            return None, None
+        for ratio, other_id in scored[1:]:
+            if best_ratio - ratio >= FUZZY_MIN_MARGIN:
+                break
+            if self._entries[other_id]['keys'] != self._entries[best_id]['keys']:
+                return None, None
+        return best_id, 'fuzzy'
+
+    def match(self, name, sport=None):
+        """(entry dict, method) for the best local match, or (None, None)."""
+        key = player_name_key(name)
+        if not key:
+            return None, None
+        self._ensure_loaded()
+        sport = (sport or '').upper()
+        memo_key = (sport, key)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+
+        # apply_changes edits the scope sets in place, so read them under the lock too
+        with self._lock:
+            result = (None, None)
+            scope = self._scopes.get(sport or ALL_SPORTS)
+            if scope is not None:
+                player_id, method = self._match_in_scope(scope, key)
+                if player_id is not None:
+                    result = (self._entries[player_id], method)
+
+            if len(self._memo) >= RESOLVER_MEMO_MAX_ENTRIES:
+                self._memo.clear()
+            self._memo[memo_key] = result
+        return result
+
+    def confirmed(self, entry, method, name, sport=None, team=None):
+        """True if a match() result may be linked without asking ESPN."""
+        if entry is None:
+            return False
+        if method in TRUSTED_METHODS:
+            return True
+        if method == 'fuzzy' and not any(_within_one_edit(player_name_key(name), k) for k in entry['keys']):
+            return False
+        return _same_team(entry, team, sport)
+
+    def find(self, name, sport=None, team=None):
+        """Session-bound Player for ``name``, or None (no ESPN calls).
+
+        Approximate matches need ``team`` (the team on the bet slip) to agree
+        with the player's; see the module docstring.
+        """
+        from models import db, Player
+
+        entry, method = self.match(name, sport)
+        if not self.confirmed(entry, method, name, sport, team):
+            if entry is not None:
+                logger.debug(f"[PLAYER-RESOLVER] Unconfirmed {method} match {entry['player_name']!r} for {name!r}")
+            return None
+        return db.session.get(Player, entry['id'])
+
+    def search_espn(self, name, sport='football', league='nfl'):
+        """enhanced_player_search, skipping names ESPN recently didn't know."""
+        from helpers.enhanced_player_search import enhanced_player_search
+
+        miss_key = (sport, league, player_name_key(name))
+        expires_at = self._espn_misses.get(miss_key)
+        if expires_at is not None:
+            if expires_at > time.time():
+                logger.debug(f"[PLAYER-RESOLVER] Skipping ESPN search for known miss {name!r}")
+                return None
+            self._espn_misses.pop(miss_key, None)
+
+        data = enhanced_player_search(name, sport=sport, league=league)
+        if not data:
+            with self._lock:
+                if len(self._espn_misses) >= ESPN_MISS_MAX_ENTRIES:
+                    now = time.time()
+                    self._espn_misses = {k: v for k, v in self._espn_misses.items() if v > now}
+                self._espn_misses[miss_key] = time.time() + ESPN_MISS_TTL_SECONDS
+        return data
+
+    def resolve(self, name, sport=None, espn_sport=None, espn_league=None, team=None):
+        """Local Player if known, else ESPN player data (dict) from a search, else None."""
+        player = self.find(name, sport, team)
+        if player is not None:
+            return player
+        default_sport, default_league = espn_sport_league(sport)
+        return self.search_espn(name, espn_sport or default_sport, espn_league or default_league)
+
+
+def _initials_of(key):
+    return ''.join(token[0] for token in key.split()[:-1])
+
+
+def _same_team(entry, team, sport):
+    """True if the player's team (full name or abbreviation) is ``team``."""
+    from helpers.team_resolver import normalize_team_key, team_resolver
+
+    wanted_key = normalize_team_key(team)
+    if not wanted_key:
+        return False
+    wanted = team_resolver.resolve(team, sport or entry['sport'])
+    for name in (entry['current_team'], entry['team_abbreviation']):
+        if not name:
+            continue
+        if normalize_team_key(name) == wanted_key:
+            return True
+        if wanted is not None:
+            found = team_resolver.resolve(name, sport or entry['sport'])
+            if found is not None and found.id == wanted.id:
+                return True
+    return False
+
+
+player_resolver = PlayerResolver()
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_player_changes(session, flush_context):
+    from models import Player
+
+    changed = session.info.setdefault('players_changed', {'upserted': {}, 'deleted': set()})
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Player) and obj.id is not None:
+            changed['upserted'][obj.id] = {field: getattr(obj, field) for field in _PLAYER_FIELDS}
+    for obj in session.deleted:
+        if isinstance(obj, Player) and obj.id is not None:
+            changed['upserted'].pop(obj.id, None)
+            changed['deleted'].add(obj.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_player_changes(session):
+    # Applied once committed, so a rolled-back insert never becomes resolvable
+    changed = session.info.pop('players_changed', None)
+    if changed and (changed['upserted'] or changed['deleted']):
+        player_resolver.apply_changes(list(changed['upserted'].values()), changed['deleted'])
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_player_changes(session, previous_transaction):
+    session.info.pop('players_changed', None)
@@ -0,0 +1,384 @@
+"""
+Stat catalog.
+
+The one place that knows about stat types. Every sport's alias table is
+compiled once into StatDefinitions and a reverse index (alias -> definitions
+in sport order), so resolving a bet slip spelling is a single dict lookup.
+
+Each definition carries:
+
+- canonical name and sport
+- an extraction plan: ``kind`` plus, for boxscore stats, the (category,
+  label) components to read and the ``combiner`` that merges them
+- a validation range (min, max, allow_negative) for achieved values
+
+Consumers: stat_standardization (aliases), services.bet_service.calculate_bet_value
+(ESPN boxscore lists), helpers.espn_api._extract_achieved_value (flattened
+per-player stats) and automation.validators (achieved value ranges).
+"""
+
+# --- Alias tables ---
+# Canonical stat -> spellings seen on bet slips and in our own data. Within a
+# sport the first canonical listing an alias wins; across sports, NFL, NBA,
+# MLB, NHL order.
+
+NFL_STATS = {
+    'passing_yards': ['passing_yards', 'passing yards', 'pass yards', 'pass_yards', 'passing yds', 'pass yds', 'alt_passing_yards', 'alt_passing_yds', 'passing_yards_alt', 'alt passing yards', 'alt pass yds', 'alt passing yds'],
+    'passing_touchdowns': ['passing_touchdowns', 'passing touchdowns', 'pass touchdowns', 'passing_td', 'passing td', 'pass td'],
+    'interceptions_thrown': ['interceptions_thrown', 'interceptions thrown', 'interceptions', 'int_thrown'],
+    'passing_completions': ['passing_completions', 'passing completions', 'completions', 'pass_completions'],
+    'rushing_yards': ['rushing_yards', 'rushing yards', 'rush yards', 'rush_yards', 'rushing yds', 'rush yds', 'alt_rushing_yards', 'alt_rushing_yds', 'rushing_yards_alt', 'alt rushing yards', 'alt rush yds', 'alt rushing yds'],
+    'rushing_touchdowns': ['rushing_touchdowns', 'rushing touchdowns', 'rush touchdowns', 'rushing_td', 'rushing td', 'rush td'],
+    'rushing_attempts': ['rushing_attempts', 'rushing attempts', 'rush attempts', 'rushing_att', 'rush_att', 'carries'],
+    'receiving_yards': ['receiving_yards', 'receiving yards', 'rec yards', 'rec_yards', 'receiving yds', 'rec yds', 'alt_receiving_yards', 'alt_receiving_yds', 'receiving_yards_alt', 'alt receiving yards', 'alt rec yds', 'alt receiving yds'],
+    'receiving_touchdowns': ['receiving_touchdowns', 'receiving touchdowns', 'rec touchdowns', 'receiving_td', 'receiving td', 'rec td'],
+    'receptions': ['receptions', 'reception', 'rec', 'catches', 'receptions_alt', 'alt_receptions', 'alt receptions'],
+    'longest_reception': ['longest_reception', 'longest reception', 'longest rec'],
+    'sacks': ['sacks', 'sack', 'sks', 'quarterback_sacks'],
+    'tackles_assists': ['tackles_assists', 'tackles assists', 'tackles', 'tackle', 'total tackles'],
+    'field_goals_made': ['field_goals_made', 'field goals made', 'fg made', 'field_goals', 'fgm'],
+    'kicking_points': ['kicking_points', 'kicking points', 'kicker points'],
+    'rushing_receiving_yards': ['rushing_receiving_yards', 'rushing receiving yards', 'rush receiving yards', 'alt_rushing_receiving_yards', 'alt rushing receiving yards'],
+    'passing_rushing_yards': ['passing_rushing_yards', 'passing rushing yards', 'pass rushing yards'],
+    'anytime_touchdown': ['anytime_touchdown', 'anytime td', 'anytime_td', 'anytime_td_scorer', 'any_time_touchdown_scorer', 'touchdown_scorer', 'td_scorer', 'any_td', 'anytime td scorer', 'touchdown scorer', 'anytime touchdown scorer', 'anytime touchdown'],
+    'team_total_points': ['team_total_points', 'team total points', 'team points', 'team_score'],
+    'moneyline': ['moneyline', 'money line', 'ml', 'win'],
+    'spread': ['spread', 'point spread', 'spread_total', 'point_spread'],
+    'passing_attempts': ['passing_attempts', 'passing attempts', 'pass_attempts', 'pass attempts'],
+    'longest_pass_completion': ['longest_pass_completion', 'longest pass completion', 'longest completion'],
+    'longest_rush': ['longest_rush', 'longest rush'],
+    'solo_tackles': ['solo_tackles', 'solo tackles'],
+    'defensive_interceptions': ['defensive_interceptions', 'defensive interceptions'],
+    'extra_points_made': ['extra_points_made', 'extra points made', 'xp made'],
+    'player_to_score_2_touchdowns': ['player_to_score_2_touchdowns', '2+ touchdowns', '2+ td'],
+    'player_to_score_3_touchdowns': ['player_to_score_3_touchdowns', '3+ touchdowns', '3+ td'],
+    'first_touchdown_scorer': ['first_touchdown_scorer', 'first touchdown scorer', 'first_td_scorer', 'first td scorer'],
+    'last_touchdown_scorer': ['last_touchdown_scorer', 'last touchdown scorer', 'last_td_scorer', 'last td scorer'],
+    'total_points': ['total_points', 'game_total'],
+    # Kept apart from total_points: saved legs and database.py's settlement check use these names
+    'total_points_over': ['total_points_over'],
+    'total_points_under': ['total_points_under'],
+    'first_team_to_score': ['first_team_to_score', 'first team to score'],
+    'last_team_to_score': ['last_team_to_score', 'last team to score'],
+    'will_be_overtime': ['will_be_overtime', 'overtime'],
+}
+
+NBA_STATS = {
+    'points': ['points', 'point', 'pts', 'scoring', 'score', 'player_points', 'alt_points'],
+    'three_pointers': ['three_pointers', 'three pointers', 'three_pointers_made', 'three pointers made', '3_pointers', '3 pointers', 'threes', '3pm', 'made_threes', 'threes_made', '3-pointers_made', '3_pointers_made'],
+    'field_goals_made': ['field_goals_made', 'field goals made', 'fgm', 'field_goals'],
+    'field_goal_percentage': ['field_goal_percentage', 'field goal percentage', 'fg%', 'fg_pct'],
+    'rebounds': ['rebounds', 'rebound', 'reb', 'total rebounds', 'trb', 'alt_rebounds'],
+    'offensive_rebounds': ['offensive_rebounds', 'offensive rebounds', 'off reb', 'orb'],
+    'defensive_rebounds': ['defensive_rebounds', 'defensive rebounds', 'def reb', 'drb'],
+    'assists': ['assists', 'assist', 'ast', 'total assists', 'alt_assists'],
+    'turnovers': ['turnovers', 'turnover', 'to', 'total turnovers'],
+    'steals': ['steals', 'steal', 'stl', 'total steals'],
+    'blocks': ['blocks', 'block', 'blk', 'total blocks'],
+    'plus_minus': ['plus_minus', '+/-', 'plus minus'],
+    'points_rebounds_assists': ['points_rebounds_assists', 'points rebounds assists', 'pra', 'triple double'],
+    'points_assists': ['points_assists', 'points assists', 'pts ast', 'pa'],
+    'rebounds_assists': ['rebounds_assists', 'rebounds assists', 'reb ast', 'ra'],
+    'moneyline': ['moneyline', 'money line', 'ml', 'win'],
+    'spread': ['spread', 'point spread', 'spread_total', 'point_spread'],
+    'over_under': ['over_under', 'over under', 'o/u', 'total points'],
+    'points_rebounds': ['points_rebounds', 'points rebounds', 'pts reb', 'pr'],
+    'double_double': ['double_double', 'double double'],
+    'triple_double': ['triple_double'],
+    'total_points': ['total_points', 'game_total'],
+    'total_points_over': ['total_points_over'],
+    'total_points_under': ['total_points_under'],
+    'team_total_points': ['team_total_points', 'team total points', 'team points', 'team_score'],
+    'will_be_overtime': ['will_be_overtime', 'overtime'],
+}
+
+MLB_STATS = {
+    'home_runs': ['home_runs', 'home runs', 'home_run', 'home run', 'hrs', 'hr', 'homers'],
+    'hits': ['hits', 'hit', 'h', 'total hits'],
+    'runs_batted_in': ['runs_batted_in', 'runs batted in', 'rbi', 'rbis', 'runs_scored'],
+    'runs': ['runs', 'run', 'r', 'total runs'],
+    'batting_average': ['batting_average', 'batting average', 'avg', 'ba'],
+    'strikeouts_batter': ['strikeouts_batter', 'strikeouts batter', 'k', 'strikeout', 'strikeouts'],
+    'walks': ['walks', 'walk', 'bb', 'base on balls'],
+    'doubles': ['doubles', 'double', '2b', 'two_base_hits'],
+    'triples': ['triples', 'triple', '3b', 'three_base_hits'],
+    'stolen_bases': ['stolen_bases', 'stolen bases', 'sb', 'steals'],
+    'on_base_percentage': ['on_base_percentage', 'on base percentage', 'obp'],
+    'strikeouts_pitcher': ['strikeouts_pitcher', 'strikeouts pitcher', 'pitcher strikeouts', 'strikeout'],
+    'innings_pitched': ['innings_pitched', 'innings pitched', 'ip', 'innings'],
+    'earned_runs': ['earned_runs', 'earned runs', 'er', 'runs_allowed'],
+    'earned_run_average': ['earned_run_average', 'earned run average', 'era'],
+    'hits_allowed': ['hits_allowed', 'hits allowed'],
+    'walks_allowed': ['walks_allowed', 'walks allowed', 'walks'],
+    'pitcher_wins': ['pitcher_wins', 'pitcher wins', 'wins', 'w'],
+    'pitcher_saves': ['pitcher_saves', 'pitcher saves', 'saves', 'sv', 'save'],
+    'moneyline': ['moneyline', 'money line', 'ml', 'win'],
+    'run_line': ['run_line', 'run line', 'rl'],
+    'total_runs': ['total_runs', 'total runs', 'total'],
+}
+
+NHL_STATS = {
+    'goals': ['goals', 'goal', 'g'],
+    'assists': ['assists', 'assist', 'ast', 'a', 'total assists'],
+    'points_hockey': ['points_hockey', 'points', 'pts', 'total points', 'goals_assists'],
+    'shots_on_goal': ['shots_on_goal', 'shots on goal', 'sog', 'shots', 'shot'],
+    'shooting_percentage': ['shooting_percentage', 'shooting percentage', 'sh%'],
+    'saves': ['saves', 'save', 'sv'],
+    'shutouts': ['shutouts', 'shutout', 'so'],
+    'goals_against_average': ['goals_against_average', 'goals against average', 'gaa'],
+    'save_percentage': ['save_percentage', 'save percentage', 'sv%'],
+    'plus_minus': ['plus_minus', '+/-', 'plus minus'],
+    'penalty_minutes': ['penalty_minutes', 'penalty minutes', 'pim', 'minutes'],
+    'blocks': ['blocks', 'block', 'blk', 'shot blocks'],
+    'hits': ['hits', 'hit', 'hc'],
+    'moneyline': ['moneyline', 'money line', 'ml', 'win'],
+    'puck_line': ['puck_line', 'puck line', 'pl'],
+    'total_goals': ['total_goals', 'total goals', 'total'],
+}
+
+STAT_TYPE_STANDARDIZATION = {
+    'NFL': NFL_STATS,
+    'NBA': NBA_STATS,
+    'MLB': MLB_STATS,
+    'NHL': NHL_STATS,
+}
+
+# --- Extraction plans ---
+
+KIND_BOXSCORE = 'boxscore'                # combine (category, label) boxscore values
+KIND_TOUCHDOWNS = 'touchdowns'            # player's touchdown count
+KIND_FIRST_TOUCHDOWN = 'first_touchdown'  # 1 if the player scored the game's first TD
+KIND_LAST_TOUCHDOWN = 'last_touchdown'
+KIND_TEAM_TOTAL = 'team_total'            # bet team's score
+KIND_GAME_TOTAL = 'game_total'            # both teams' scores
+KIND_FIRST_TEAM_TO_SCORE = 'first_team_to_score'
+KIND_LAST_TEAM_TO_SCORE = 'last_team_to_score'
+KIND_SCORE_DIFFERENTIAL = 'score_differential'  # bet team's margin (moneyline/spread)
+KIND_OVERTIME = 'overtime'                # 1 if the game went past regulation
+
+PLAYER_KINDS = frozenset({KIND_BOXSCORE, KIND_TOUCHDOWNS, KIND_FIRST_TOUCHDOWN, KIND_LAST_TOUCHDOWN})
+
+COMBINE_VALUE = 'value'
+COMBINE_SUM = 'sum'
+COMBINE_DOUBLE_DOUBLE = 'double_double'
+COMBINE_TRIPLE_DOUBLE = 'triple_double'
+
+# NBA boxscore categories come back unnamed, hence ''
+_NBA_DOUBLE_CATEGORIES = (('', 'PTS'), ('', 'REB'), ('', 'AST'), ('', 'STL'), ('', 'BLK'))
+_TEAM_PLANS = {
+    'moneyline': (KIND_SCORE_DIFFERENTIAL,), 'spread': (KIND_SCORE_DIFFERENTIAL,),
+    'team_total_points': (KIND_TEAM_TOTAL,), 'total_points': (KIND_GAME_TOTAL,),
+    'total_points_over': (KIND_GAME_TOTAL,), 'total_points_under': (KIND_GAME_TOTAL,),
+    'first_team_to_score': (KIND_FIRST_TEAM_TO_SCORE,), 'last_team_to_score': (KIND_LAST_TEAM_TO_SCORE,),
+    'will_be_overtime': (KIND_OVERTIME,),
+}
+
+# (sport, canonical) -> (kind[, components[, combiner]])
+EXTRACTION_PLANS = {
+    **{('NFL', stat): plan for stat, plan in _TEAM_PLANS.items()},
+    **{('NBA', stat): plan for stat, plan in _TEAM_PLANS.items()},
+    ('NBA', 'over_under'): (KIND_GAME_TOTAL,),
+    ('MLB', 'moneyline'): (KIND_SCORE_DIFFERENTIAL,),
+    ('MLB', 'run_line'): (KIND_SCORE_DIFFERENTIAL,),
+    ('MLB', 'total_runs'): (KIND_GAME_TOTAL,),
+    ('NHL', 'moneyline'): (KIND_SCORE_DIFFERENTIAL,),
+    ('NHL', 'puck_line'): (KIND_SCORE_DIFFERENTIAL,),
+    ('NHL', 'total_goals'): (KIND_GAME_TOTAL,),
+
+    # NFL
+    ('NFL', 'passing_yards'): (KIND_BOXSCORE, (('passing', 'YDS'),)),
+    ('NFL', 'passing_attempts'): (KIND_BOXSCORE, (('passing', 'ATT'),)),
+    ('NFL', 'passing_completions'): (KIND_BOXSCORE, (('passing', 'COMP'),)),
+    ('NFL', 'passing_touchdowns'): (KIND_BOXSCORE, (('passing', 'TD'),)),
+    ('NFL', 'interceptions_thrown'): (KIND_BOXSCORE, (('passing', 'INT'),)),
+    ('NFL', 'longest_pass_completion'): (KIND_BOXSCORE, (('passing', 'LONG'),)),
+    ('NFL', 'rushing_yards'): (KIND_BOXSCORE, (('rushing', 'YDS'),)),
+    ('NFL', 'rushing_attempts'): (KIND_BOXSCORE, (('rushing', 'CAR'),)),
+    ('NFL', 'rushing_touchdowns'): (KIND_BOXSCORE, (('rushing', 'TD'),)),
+    ('NFL', 'longest_rush'): (KIND_BOXSCORE, (('rushing', 'LONG'),)),
+    ('NFL', 'receiving_yards'): (KIND_BOXSCORE, (('receiving', 'YDS'),)),
+    ('NFL', 'receptions'): (KIND_BOXSCORE, (('receiving', 'REC'),)),
+    ('NFL', 'receiving_touchdowns'): (KIND_BOXSCORE, (('receiving', 'TD'),)),
+    ('NFL', 'longest_reception'): (KIND_BOXSCORE, (('receiving', 'LONG'),)),
+    ('NFL', 'sacks'): (KIND_BOXSCORE, (('defensive', 'SACKS'),)),
+    ('NFL', 'tackles_assists'): (KIND_BOXSCORE, (('defensive', 'TOT'),)),
+    ('NFL', 'solo_tackles'): (KIND_BOXSCORE, (('defensive', 'SOLO'),)),
+    ('NFL', 'defensive_interceptions'): (KIND_BOXSCORE, (('interceptions', 'INT'),)),
+    ('NFL', 'field_goals_made'): (KIND_BOXSCORE, (('kicking', 'FG'),)),
+    ('NFL', 'kicking_points'): (KIND_BOXSCORE, (('kicking', 'PTS'),)),
+    ('NFL', 'extra_points_made'): (KIND_BOXSCORE, (('kicking', 'XP'),)),
+    ('NFL', 'rushing_receiving_yards'): (KIND_BOXSCORE, (('rushing', 'YDS'), ('receiving', 'YDS')), COMBINE_SUM),
+    ('NFL', 'passing_rushing_yards'): (KIND_BOXSCORE, (('passing', 'YDS'), ('rushing', 'YDS')), COMBINE_SUM),
+    ('NFL', 'anytime_touchdown'): (KIND_TOUCHDOWNS,),
+    ('NFL', 'player_to_score_2_touchdowns'): (KIND_TOUCHDOWNS,),
+    ('NFL', 'player_to_score_3_touchdowns'): (KIND_TOUCHDOWNS,),
+    ('NFL', 'first_touchdown_scorer'): (KIND_FIRST_TOUCHDOWN,),
+    ('NFL', 'last_touchdown_scorer'): (KIND_LAST_TOUCHDOWN,),
+
+    # NBA
+    ('NBA', 'points'): (KIND_BOXSCORE, (('', 'PTS'),)),
+    ('NBA', 'rebounds'): (KIND_BOXSCORE, (('', 'REB'),)),
+    ('NBA', 'offensive_rebounds'): (KIND_BOXSCORE, (('', 'OREB'),)),
+    ('NBA', 'defensive_rebounds'): (KIND_BOXSCORE, (('', 'DREB'),)),
+    ('NBA', 'assists'): (KIND_BOXSCORE, (('', 'AST'),)),
+    ('NBA', 'steals'): (KIND_BOXSCORE, (('', 'STL'),)),
+    ('NBA', 'blocks'): (KIND_BOXSCORE, (('', 'BLK'),)),
+    ('NBA', 'turnovers'): (KIND_BOXSCORE, (('', 'TO'),)),
+    ('NBA', 'plus_minus'): (KIND_BOXSCORE, (('', '+/-'),)),
+    ('NBA', 'three_pointers'): (KIND_BOXSCORE, (('', '3PT'),)),
+    ('NBA', 'field_goals_made'): (KIND_BOXSCORE, (('', 'FG'),)),
+    ('NBA', 'points_rebounds_assists'): (KIND_BOXSCORE, (('', 'PTS'), ('', 'REB'), ('', 'AST')), COMBINE_SUM),
+    ('NBA', 'points_rebounds'): (KIND_BOXSCORE, (('', 'PTS'), ('', 'REB')), COMBINE_SUM),
+    ('NBA', 'points_assists'): (KIND_BOXSCORE, (('', 'PTS'), ('', 'AST')), COMBINE_SUM),
+    ('NBA', 'rebounds_assists'): (KIND_BOXSCORE, (('', 'REB'), ('', 'AST')), COMBINE_SUM),
+    ('NBA', 'double_double'): (KIND_BOXSCORE, _NBA_DOUBLE_CATEGORIES, COMBINE_DOUBLE_DOUBLE),
+    ('NBA', 'triple_double'): (KIND_BOXSCORE, _NBA_DOUBLE_CATEGORIES, COMBINE_TRIPLE_DOUBLE),
+}
+
+# --- Validation ranges for achieved values: canonical -> (min, max, allow_negative) ---
+
+VALIDATION_RANGES = {
+    # NFL
+    'passing_yards': (0, 600, False),
+    'rushing_yards': (0, 400, False),
+    'receiving_yards': (0, 400, False),
+    'receptions': (0, 30, False),
+    'passing_touchdowns': (0, 10, False),
+    'rushing_touchdowns': (0, 6, False),
+    'interceptions_thrown': (0, 10, False),
+    'sacks': (0, 10, False),
+    'tackles_assists': (0, 30, False),
+
+    # NBA
+    'points': (0, 100, False),
+    'rebounds': (0, 40, False),
+    'assists': (0, 30, False),
+    'steals': (0, 15, False),
+    'blocks': (0, 15, False),
+    'turnovers': (0, 20, False),
+    'three_pointers': (0, 20, False),
+
+    # Team props
+    'moneyline': (-100, 100, True),  # Score differential
+    'spread': (-100, 100, True),  # Score differential
+    'total_points': (0, 200, False),
+    'total_points_over': (0, 200, False),
+    'total_points_under': (0, 200, False),
+}
+
+
+class StatDefinition:
+    """One canonical stat of one sport, with its extraction plan and validation range."""
+
+    __slots__ = ('canonical', 'sport', 'aliases', 'kind', 'components', 'combiner', 'validation')
+
+    def __init__(self, canonical, sport, aliases):
+        plan = EXTRACTION_PLANS.get((sport, canonical), ())
+        self.canonical = canonical
+        self.sport = sport
+        self.aliases = tuple(aliases)
+        self.kind = plan[0] if plan else None
+        self.components = plan[1] if len(plan) > 1 else ()
+        self.combiner = plan[2] if len(plan) > 2 else COMBINE_VALUE
+        self.validation = VALIDATION_RANGES.get(canonical)
+
+    def __repr__(self):
+        return f'<StatDefinition {self.sport}:{self.canonical} kind={self.kind}>'
+
+    def flat_keys(self):
+        """Keys of each component in a flattened per-player stats dict ('rushing_yds', then 'yds')."""
+        return [
+            ([f"{category}_{label.lower()}", label.lower()] if category else [label.lower()])
+            for category, label in self.components
+        ]
+
+    def combine(self, values):
+        """Merge component values per the combiner; None if any component is missing."""
+        if not values or any(value is None for value in values):
+            return None
+        if self.combiner == COMBINE_SUM:
+            return sum(values)
+        if self.combiner in (COMBINE_DOUBLE_DOUBLE, COMBINE_TRIPLE_DOUBLE):
+            needed = 2 if self.combiner == COMBINE_DOUBLE_DOUBLE else 3
+            return 1 if sum(1 for value in values if value >= 10) >= needed else 0
+        return values[0]
+
+
+def _alias_key(stat):
+    return str(stat).lower().strip()
+
+
+def _compile():
+    definitions = {}
+    index = {}  # alias -> [StatDefinition], one per sport, in sport order
+    for sport, table in STAT_TYPE_STANDARDIZATION.items():
+        for canonical, aliases in table.items():
+            definition = StatDefinition(canonical, sport, aliases)
+            definitions[(sport, canonical)] = definition
+            for alias in aliases:
+                candidates = index.setdefault(_alias_key(alias), [])
+                if all(existing.sport != sport for existing in candidates):
+                    candidates.append(definition)
+    return definitions, {alias: tuple(candidates) for alias, candidates in index.items()}
+
+
+DEFINITIONS, ALIAS_INDEX = _compile()
+
+
+def standardize(stat_type, sport=None):
+    """Canonical name for ``stat_type`` or None.
+
+    A known sport restricts the search to that sport; otherwise the first
+    sport listing the alias wins.
+    """
+    if not stat_type:
+        return None
+    candidates = ALIAS_INDEX.get(_alias_key(stat_type), ())
+    if sport and sport in STAT_TYPE_STANDARDIZATION:
+        candidates = [d for d in candidates if d.sport == sport]
+    return candidates[0].canonical if candidates else None
+
+
+def lookup(stat_type, sport=None):
+    """Best StatDefinition for evaluating ``stat_type``, or None.
+
+    Prefers the leg's own sport, but falls back to another sport's
+    definition that has an extraction plan (legs are sometimes filed under
+    the wrong sport).
+    """
+    if not stat_type:
+        return None
+    candidates = ALIAS_INDEX.get(_alias_key(stat_type))
+    if not candidates:
+        return None
+    sport = (sport or '').upper()
+    own = [d for d in candidates if d.sport == sport]
+    for definition in (*own, *candidates):
+        if definition.kind is not None:
+            return definition
+    return (own or candidates)[0]
+
+
+def plan_kind(stat_type, sport=None):
+    """Extraction kind for ``stat_type`` (KIND_*), or None."""
+    definition = lookup(stat_type, sport)
+    return definition.kind if definition is not None else None
+
+
+def validation_range(stat_type, sport=None):
+    """(min, max, allow_negative) for achieved values of ``stat_type``, or None if unknown."""
+    definition = lookup(stat_type, sport)
+    return definition.validation if definition is not None else None
+
+
+def get_stat_aliases(canonical_stat, sport):
+    """Get all aliases for a canonical stat name in a specific sport."""
+    definition = DEFINITIONS.get((sport, canonical_stat))
+    return list(definition.aliases) if definition is not None else []
+
+
+def get_all_stats_for_sport(sport):
+    """Get all canonical stat names for a specific sport."""
+    if sport not in STAT_TYPE_STANDARDIZATION:
+        return []
+    return list(STAT_TYPE_STANDARDIZATION[sport].keys())
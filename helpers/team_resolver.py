@@ -0,0 +1,224 @@
+"""
+Process-wide team name resolver.
+
+Bet slips, ESPN and our own tables spell teams many ways ("SEA", "Seahawks",
+"Seattle Seahawks", "seattle seahawks "). TeamResolver compiles the teams
+table once into per-sport lookup maps:
+
+- exact: normalized full name, short name, nickname and "location nickname"
+- abbreviation: upper-cased team_abbr
+- token index: token -> teams containing it, for partial names such as
+  "LA Lakers" or "Hawks Seattle", scored by token rarity instead of a
+  linear substring scan over every team
+
+Results are memoized per (sport, name). The maps are rebuilt lazily after
+any committed change to the teams table (see the session hooks below) and
+at most RESOLVER_REFRESH_SECONDS after a change made by another process.
+
+Teams handed out are read-only Team instances bound to no session; load
+them into the session (Team.get_team_by_name_cached loads them by id) before modifying them.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+RESOLVER_REFRESH_SECONDS = 3600
+RESOLVER_MEMO_MAX_ENTRIES = 20000
+
+# Lookups without a sport search every team (first team by id wins collisions)
+ALL_SPORTS = '*'
+
+# Informal spellings -> tokens used in the teams table
+TOKEN_ALIASES = {
+    'la': ('los', 'angeles'),
+    'ny': ('new', 'york'),
+    'sf': ('san', 'francisco'),
+    'kc': ('kansas', 'city'),
+    'tb': ('tampa', 'bay'),
+    'gb': ('green', 'bay'),
+    'ne': ('new', 'england'),
+    'no': ('new', 'orleans'),
+    'okc': ('oklahoma', 'city'),
+    'niners': ('49ers',),
+    'sixers': ('76ers',),
+    'cavs': ('cavaliers',),
+    'mavs': ('mavericks',),
+    'wolves': ('timberwolves',),
+    'blazers': ('trail', 'blazers'),
+    'pels': ('pelicans',),
+    'bucs': ('buccaneers',),
+    'pats': ('patriots',),
+    'jags': ('jaguars',),
+}
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_team_key(name):
+    """Lowercase, drop periods/apostrophes and collapse everything else to single spaces."""
+    if not name:
+        return ''
+    name = str(name).lower().replace('.', '').replace("'", '')
+    return _NON_WORD_RE.sub(' ', name).strip()
+
+
+def _tokens(key):
+    tokens = []
+    for token in key.split():
+        tokens.extend(TOKEN_ALIASES.get(token, (token,)))
+    return tokens
+
+
+class _SportMaps:
+    """Compiled lookups for one sport (or ALL_SPORTS)."""
+
+    __slots__ = ('exact', 'abbr', 'token_index')
+
+    def __init__(self):
+        self.exact = {}
+        self.abbr = {}
+        self.token_index = defaultdict(set)
+
+    def add(self, team):
+        for name in (team.team_name, team.team_name_short, team.nickname,
+                     f"{team.location} {team.nickname}" if team.location and team.nickname else None):
+            key = normalize_team_key(name)
+            if key:
+                self.exact.setdefault(key, team)
+                for token in key.split():
+                    self.token_index[token].add(team.id)
+        if team.team_abbr:
+            abbr = team.team_abbr.strip().upper()
+            self.abbr.setdefault(abbr, team)
+            self.token_index[abbr.lower()].add(team.id)
+
+
+class TeamResolver:
+    """Resolve free-form team names to Team rows; see the module docstring."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._teams = {}
+        self._maps = {}
+        self._memo = {}
+        self._loaded_at = 0.0
+        self._stale = True
+
+    def invalidate(self):
+        """Force a rebuild on the next lookup (called when the teams table changes)."""
+        self._stale = True
+
+    def _ensure_loaded(self):
+        if not self._stale and time.time() - self._loaded_at < RESOLVER_REFRESH_SECONDS:
+            return
+        from models import db, Team
+
+        # Core select: never attaches to (or expunges from) the caller's session
+        rows = db.session.execute(select(Team.__table__).order_by(Team.id)).mappings().all()
+        teams = {row['id']: Team(**row) for row in rows}
+        maps = defaultdict(_SportMaps)
+        for team in teams.values():
+            maps[(team.sport or '').upper()].add(team)
+            maps[ALL_SPORTS].add(team)
+
+        with self._lock:
+            self._teams = teams
+            self._maps = dict(maps)
+            self._memo = {}
+            self._loaded_at = time.time()
+            self._stale = False
+        logger.debug(f"[TEAM-RESOLVER] Compiled {len(teams)} teams across {len(maps) - 1} sports")
+
+    def _match(self, maps, key):
+        team = maps.exact.get(key)
+        if team is None:
+            team = maps.abbr.get(key.replace(' ', '').upper())
+        if team is None:
+            team = self._match_tokens(maps, key)
+        return team
+
+    def _match_tokens(self, maps, key):
+        """Best partial match: highest summed 1/df over shared tokens; None on a tie."""
+        scores = defaultdict(float)
+        for token in set(_tokens(key)):
+            team_ids = maps.token_index.get(token)
+            if team_ids:
+                weight = 1.0 / len(team_ids)
+                for team_id in team_ids:
+                    scores[team_id] += weight
+        if not scores:
+            return None
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if len(ranked) > 1 and ranked[0][1] == ranked[1][1]:
+            return None
+        return self._teams.get(ranked[0][0])
+
+    def resolve(self, name, sport=None):
+        """Team for ``name`` (optionally restricted to ``sport``), or None."""
+        key = normalize_team_key(name)
+        if not key:
+            return None
+        self._ensure_loaded()
+        scope = (sport or '').upper() or ALL_SPORTS
+        memo_key = (scope, key)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+
+        maps = self._maps.get(scope)
+        team = self._match(maps, key) if maps is not None else None
+        with self._lock:
+            if len(self._memo) >= RESOLVER_MEMO_MAX_ENTRIES:
+                self._memo.clear()
+            self._memo[memo_key] = team
+        return team
+
+    def by_abbreviation(self, abbr, sport=None):
+        if not abbr:
+            return None
+        self._ensure_loaded()
+        maps = self._maps.get((sport or '').upper() or ALL_SPORTS)
+        return maps.abbr.get(abbr.strip().upper()) if maps is not None else None
+
+    def nickname(self, name, sport=None, default=None):
+        team = self.resolve(name, sport)
+        return team.nickname if team is not None and team.nickname else default
+
+    def abbreviation(self, name, sport=None, default=None):
+        team = self.resolve(name, sport)
+        return team.team_abbr if team is not None and team.team_abbr else default
+
+    def short_name(self, name, sport=None, default=None):
+        team = self.resolve(name, sport)
+        return team.team_name_short if team is not None and team.team_name_short else default
+
+    def full_name(self, name, sport=None, default=None):
+        team = self.resolve(name, sport)
+        return team.team_name if team is not None and team.team_name else default
+
+
+team_resolver = TeamResolver()
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_team_changes(session, flush_context):
+    from models import Team
+
+    if any(isinstance(obj, Team) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info['teams_changed'] = True
+        team_resolver.invalidate()
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_soft_rollback')
+def _refresh_after_transaction(session, *args):
+    # Rebuild once the change is committed (or undone), not just flushed
+    if session.info.pop('teams_changed', False):
+        team_resolver.invalidate()
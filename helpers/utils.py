@@ -5,6 +5,8 @@ DATA_DIR = os.path.join(os.path.dirname(__file__), "../data")
 def data_path(filename: str) -> str:
     return os.path.join(DATA_DIR, filename)
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any, List, Optional
 import requests
@@ -207,152 +209,173 @@ def _get_player_stat_from_boxscore(player_name, category_name, stat_label, boxsc
                     continue
     return None
 
-def _get_touchdowns(player_name, boxscore, scoring_plays=None):
-    td_cats = {
-        "rushing": "TD", "receiving": "TD",
-        "interception": "TD", "kickoffReturn": "TD", "puntReturn": "TD",
-        "fumbleReturn": "TD"
-    }
-    total_tds = 0
-    for cat, label in td_cats.items():
-        val = _get_player_stat_from_boxscore(player_name, cat, label, boxscore)
-        if val is not None:
-            total_tds += val
-    if total_tds > 0:
-        return total_tds
-    if scoring_plays:
-        player_norm = _norm(player_name)
-        td_count = 0
-        for play in scoring_plays:
+TOUCHDOWN_CATEGORIES = ("rushing", "receiving", "interception", "kickoffReturn", "puntReturn", "fumbleReturn")
+TOUCHDOWN_INDEX_MAX_ENTRIES = 256
+
+
+def _stat_int(val):
+    """Boxscore cell to int, reading "made-attempted" / "made/attempted" as made."""
+    if isinstance(val, str):
+        for sep in ("-", "/"):
+            if sep in val:
+                try:
+                    return int(val.split(sep)[0])
+                except ValueError:
+                    pass
+    try:
+        return int(float(val))
+    except Exception:
+        return 0
+
+
+def _match_athlete(player_norm, names):
+    """Index of the athlete matching player_norm, using _get_player_stat_from_boxscore's rules."""
+    tokens = player_norm.split()
+    for idx, name in enumerate(names):
+        if all(tok in name for tok in tokens):
+            return idx
+    for idx, name in enumerate(names):
+        if player_norm in name or name in player_norm:
+            return idx
+    if len(tokens) >= 2 and len(tokens[0]) == 1:
+        for idx, name in enumerate(names):
+            name_parts = name.split()
+            if len(name_parts) >= 2 and name_parts[0].startswith(tokens[0]) and tokens[-1] in name_parts[-1]:
+                return idx
+    matches = difflib.get_close_matches(player_norm, names, n=1, cutoff=0.75)
+    if matches:
+        return names.index(matches[0])
+    return -1
+
+
+class TouchdownIndex:
+    """Touchdown scorers of one game, precomputed from its boxscore and scoring plays.
+
+    Built once per fetched game (see touchdown_index); counts per player are
+    memoized, so every anytime-TD leg on the game after the first is a dict lookup.
+    """
+
+    __slots__ = ("by_name", "by_athlete_id", "categories", "plays", "first_scorer", "last_scorer", "_memo")
+
+    def __init__(self, boxscore, scoring_plays=None):
+        self.by_name = {}
+        self.by_athlete_id = {}
+        # Per TD category: ([normalized athlete names], [TD counts]) in boxscore order
+        self.categories = []
+        for team_box in boxscore or []:
+            for cat in team_box.get("statistics", []):
+                if cat.get("name") not in TOUCHDOWN_CATEGORIES:
+                    continue
+                labels = cat.get("labels", [])
+                if "TD" not in labels:
+                    continue
+                stat_idx = labels.index("TD")
+                names, counts = [], []
+                for ath in cat.get("athletes", []):
+                    athlete = ath.get("athlete", {})
+                    stats = ath.get("stats", [])
+                    tds = _stat_int(stats[stat_idx]) if stat_idx < len(stats) else 0
+                    name = _norm(athlete.get("displayName", ""))
+                    names.append(name)
+                    counts.append(tds)
+                    self.by_name[name] = self.by_name.get(name, 0) + tds
+                    if athlete.get("id"):
+                        athlete_id = str(athlete["id"])
+                        self.by_athlete_id[athlete_id] = self.by_athlete_id.get(athlete_id, 0) + tds
+                self.categories.append((names, counts))
+
+        # Scoring plays: (participant names or None, normalized text, is a passing TD)
+        self.plays = []
+        td_scorers = []
+        for play in scoring_plays or []:
+            play_type = play.get("type", {}).get("text", "")
             participants = play.get("participants")
-            # If participants is present (scoreboard endpoint), use it
+            names = None
             if participants:
-                for p in participants:
-                    name = p.get("displayName") or p.get("athlete", {}).get("displayName")
-                    if name and player_norm in _norm(name):
-                        # Special handling for Passing TDs to avoid counting the passer
-                        # If play type is "Passing Touchdown", the text usually starts with the passer's name
-                        play_type = play.get("type", {}).get("text", "")
-                        if "Passing Touchdown" in play_type:
-                            text = play.get("text", "")
-                            if text:
-                                text_norm = _norm(text)
-                                # If the text starts with the player's name, they are the passer
-                                if text_norm.startswith(player_norm):
-                                    continue
-                        
-                        td_count += 1
-                        break
-            # Fallback: Check text description if participants is missing (summary endpoint)
-            # Text format: "Player Name 1 Yd Run..."
-            else:
-                text = play.get("text", "")
-                if text:
-                    text_norm = _norm(text)
-                    # Check if player name is in the text
-                    # We use a stricter check here to avoid false positives
-                    if player_norm in text_norm:
-                        # Special handling for Passing TDs to avoid counting the passer
-                        # If play type is "Passing Touchdown", the text usually starts with the passer's name
-                        # e.g. "Sam Darnold 5 Yd Pass to..."
-                        play_type = play.get("type", {}).get("text", "")
-                        if "Passing Touchdown" in play_type:
-                            if text_norm.startswith(player_norm):
-                                continue
-                        
-                        td_count += 1
-        return td_count
-    return total_tds
+                names = tuple(_norm(n) for n in (p.get("displayName") or p.get("athlete", {}).get("displayName")
+                                                 for p in participants) if n)
+            self.plays.append((names, _norm(play.get("text", "") or ""), "Passing Touchdown" in play_type))
+            if "Touchdown" in play_type:
+                first = (participants or [{}])[0]
+                td_scorers.append((first.get("displayName") or "").lower())
+        self.first_scorer = td_scorers[0] if td_scorers else None
+        self.last_scorer = td_scorers[-1] if td_scorers else None
+        self._memo = {}
+
+    def _boxscore_total(self, player_norm):
+        if player_norm in self.by_name:
+            return self.by_name[player_norm]
+        total = 0
+        for names, counts in self.categories:
+            idx = _match_athlete(player_norm, names)
+            if idx != -1:
+                total += counts[idx]
+        return total
+
+    def _play_count(self, player_norm):
+        count = 0
+        for names, text_norm, passing in self.plays:
+            if names is not None:
+                if not any(player_norm in name for name in names):
+                    continue
+            elif not text_norm or player_norm not in text_norm:
+                continue
+            # Passing TD text starts with the passer ("Sam Darnold 5 Yd Pass to..."); don't count them
+            if passing and text_norm.startswith(player_norm):
+                continue
+            count += 1
+        return count
+
+    def count(self, player_name, athlete_id=None):
+        """Touchdowns scored by a player: boxscore total, or scoring plays when that's zero."""
+        if athlete_id is not None and str(athlete_id) in self.by_athlete_id:
+            tds = self.by_athlete_id[str(athlete_id)]
+            if tds > 0 or not self.plays:
+                return tds
+        player_norm = _norm(player_name or "")
+        if player_norm in self._memo:
+            return self._memo[player_norm]
+        tds = self._boxscore_total(player_norm)
+        if tds == 0 and self.plays:
+            tds = self._play_count(player_norm)
+        self._memo[player_norm] = tds
+        return tds
+
+    def scored(self, player_name, last=False):
+        """1 if the player scored the game's first (or last) touchdown, else 0."""
+        scorer = self.last_scorer if last else self.first_scorer
+        return 1 if scorer and (player_name or "").lower() in scorer else 0
+
+
+_touchdown_indexes = OrderedDict()
+_touchdown_indexes_lock = threading.Lock()
+
+
+def touchdown_index(boxscore, scoring_plays=None):
+    """The TouchdownIndex for a game's boxscore/scoring plays lists.
+
+    Indexes are kept per list identity (fetched game data is never mutated in
+    place), so all legs on a cached game share one index. The entry holds the
+    lists themselves, which keeps their ids from being reused while cached.
+    """
+    key = (id(boxscore), id(scoring_plays))
+    with _touchdown_indexes_lock:
+        entry = _touchdown_indexes.get(key)
+        if entry is not None and entry[0] is boxscore and entry[1] is scoring_plays:
+            _touchdown_indexes.move_to_end(key)
+            return entry[2]
+    index = TouchdownIndex(boxscore, scoring_plays)
+    with _touchdown_indexes_lock:
+        _touchdown_indexes[key] = (boxscore, scoring_plays, index)
+        while len(_touchdown_indexes) > TOUCHDOWN_INDEX_MAX_ENTRIES:
+            _touchdown_indexes.popitem(last=False)
+    return index
+
+
+def _get_touchdowns(player_name, boxscore, scoring_plays=None, athlete_id=None):
+    return touchdown_index(boxscore, scoring_plays).count(player_name, athlete_id)
 
 def calculate_bet_value(bet, game_data):
-    stat = bet["stat"].strip().lower()
-    boxscore = game_data.get("boxscore", [])
-    scoring_plays = game_data.get("scoring_plays", [])
-    if "player" in bet:
-        player_name = bet["player"]
-        stat_map = {
-            "passing_yards": ("passing", "YDS"), "passing_yards_alt": ("passing", "YDS"),
-            "pass_attempts": ("passing", "ATT"),
-            "pass_completions": ("passing", "COMP"), "passing_touchdowns": ("passing", "TD"),
-            "interceptions_thrown": ("passing", "INT"), "longest_pass_completion": ("passing", "LONG"),
-            "rushing_yards": ("rushing", "YDS"), "rushing_yards_alt": ("rushing", "YDS"),
-            "rushing_attempts": ("rushing", "CAR"),
-            "rushing_touchdowns": ("rushing", "TD"), "longest_rush": ("rushing", "LONG"),
-            "receiving_yards": ("receiving", "YDS"), "receiving_yards_alt": ("receiving", "YDS"),
-            "receptions": ("receiving", "REC"), "receptions_alt": ("receiving", "REC"),
-            "receiving_touchdowns": ("receiving", "TD"), "longest_reception": ("receiving", "LONG"),
-            "sacks": ("defensive", "SACK"), "tackles_assists": ("defensive", "TOT"),
-            "field_goals_made": ("kicking", "FGM"), "kicking_points": ("kicking", "PTS"),
-        }
-        if stat in stat_map:
-            cat, label = stat_map[stat]
-            return _get_player_stat_from_boxscore(player_name, cat, label, boxscore)
-        if stat == "rushing_receiving_yards":
-            rush = _get_player_stat_from_boxscore(player_name, "rushing", "YDS", boxscore)
-            rec = _get_player_stat_from_boxscore(player_name, "receiving", "YDS", boxscore)
-            return rush + rec
-        if stat == "passing_rushing_yards":
-            pass_yds = _get_player_stat_from_boxscore(player_name, "passing", "YDS", boxscore)
-            rush_yds = _get_player_stat_from_boxscore(player_name, "rushing", "YDS", boxscore)
-            return pass_yds + rush_yds
-        if stat in ["anytime_touchdown", "anytime_td_scorer", "player_to_score_2_touchdowns", "player_to_score_3_touchdowns"]:
-            return _get_touchdowns(player_name, boxscore, scoring_plays)
-        td_plays = [p for p in scoring_plays if "Touchdown" in p.get("type", {}).get("text", "")]
-        if stat == "first_touchdown_scorer":
-            if td_plays and player_name.lower() in td_plays[0].get("participants", [{}])[0].get("displayName", "").lower():
-                return 1
-            return 0
-        if stat == "last_touchdown_scorer":
-            if td_plays and player_name.lower() in td_plays[-1].get("participants", [{}])[0].get("displayName", "").lower():
-                return 1
-            return 0
-    home_score = game_data["score"]["home"]
-    away_score = game_data["score"]["away"]
-    if stat == "team_total_points":
-        return home_score if bet["team"] == game_data["teams"]["home"] else away_score
-    if stat == "total_points" or stat == "total_points_under" or stat == "total_points_over":
-        return home_score + away_score
-    if stat == "first_team_to_score":
-        if scoring_plays:
-            return scoring_plays[0].get("team", {}).get("displayName")
-        return "N/A"
-    if stat == "last_team_to_score":
-        if scoring_plays:
-            return scoring_plays[-1].get("team", {}).get("displayName")
-        return "N/A"
-    if stat == "will_be_overtime":
-        return 1 if game_data.get("period", 0) > 4 else 0
-    if stat == "moneyline":
-        if "team" not in bet:
-            return 0
-        bet_team = bet["team"]
-        home_team = game_data["teams"]["home"]
-        away_team = game_data["teams"]["away"]
-        bet_team_norm = bet_team.lower().strip()
-        home_team_norm = home_team.lower().strip()
-        away_team_norm = away_team.lower().strip()
-        if (bet_team_norm == home_team_norm or bet_team_norm in home_team_norm or home_team_norm in bet_team_norm):
-            score_diff = home_score - away_score
-        elif (bet_team_norm == away_team_norm or bet_team_norm in away_team_norm or away_team_norm in bet_team_norm):
-            score_diff = away_score - home_score
-        else:
-            return 0
-        return score_diff
-    if stat == "spread":
-        if "team" not in bet:
-            return 0
-        bet_team = bet["team"]
-        home_team = game_data["teams"]["home"]
-        away_team = game_data["teams"]["away"]
-        spread = bet.get("target", 0)
-        bet_team_norm = bet_team.lower().strip()
-        home_team_norm = home_team.lower().strip()
-        away_team_norm = away_team.lower().strip()
-        if (bet_team_norm == home_team_norm or bet_team_norm in home_team_norm or home_team_norm in bet_team_norm):
-            score_diff = home_score - away_score
-        elif (bet_team_norm == away_team_norm or bet_team_norm in away_team_norm or away_team_norm in bet_team_norm):
-            score_diff = away_score - home_score
-        else:
-            return 0
-        return score_diff
-    return 0
+    """Kept for old imports; stat evaluation lives in services.bet_service (driven by the stat catalog)."""
+    from services.bet_service import calculate_bet_value as evaluate
+    return evaluate(bet, game_data)
@@ -1,128 +1,250 @@
+"""
+Player enrichment job.
+
+Work is driven by the player_enrichment_queue table:
+
+1. refill: every player needing work (missing profile fields, or stale
+   season stats) is enqueued with a priority - players in live/pending legs
+   first, then players in recent legs, then everyone else
+2. process: queue rows are taken in priority order until the run's time
+   budget is spent; finished players leave the queue, failures back off
+   exponentially, and whatever wasn't reached is picked up next run
+"""
+
 import logging
+import time
 from datetime import datetime, timedelta
+
+from sqlalchemy import case, exists, insert, or_, select, update
+
 from app import app, db
-from models import Player
-from helpers.enhanced_player_search import enhanced_player_search
+from models import Player, BetLeg, PlayerEnrichmentQueue
+from helpers.player_resolver import player_resolver, espn_sport_league
 from helpers.espn_api import get_player_season_stats
+from jobs.roster_ingestion_job import fresh_roster_sports
 
 logger = logging.getLogger(__name__)
 
-def enrich_player_data():
+ENRICHMENT_TIME_BUDGET_SECONDS = 240  # the job runs every 5 minutes
+ENRICHMENT_BATCH_SIZE = 25
+STATS_STALE_AFTER = timedelta(days=1)
+RECENT_LEG_DAYS = 14
+BACKOFF_BASE_SECONDS = 300
+BACKOFF_MAX_SECONDS = 24 * 3600
+
+
+def _needs_work_filters(fresh_sports, now):
+    """(profile_incomplete, stats_stale) SQL conditions on players."""
+    has_espn_id = (Player.espn_player_id != None) & (Player.espn_player_id != '')
+    profile_incomplete = (
+        (Player.position == None) |
+        (Player.jersey_number == None) |
+        (Player.current_team == None) |
+        (Player.current_team == '')
+    )
+    if fresh_sports:
+        # Linked players of leagues with freshly ingested rosters already carry
+        # everything ESPN knows about them; only unlinked ones need a search.
+        profile_incomplete = profile_incomplete & (Player.sport.notin_(fresh_sports) | ~has_espn_id)
+    stats_stale = has_espn_id & (
+        (Player.stats_season == None) |
+        (Player.last_stats_update == None) |
+        (Player.last_stats_update < now - STATS_STALE_AFTER)
+    )
+    return profile_incomplete, stats_stale
+
+
+def _player_needs(player, fresh_sports, now):
+    """(needs_profile, needs_stats) for a loaded player, mirroring _needs_work_filters."""
+    has_espn_id = bool(player.espn_player_id)
+    needs_profile = (player.position is None or player.jersey_number is None or not player.current_team)
+    if needs_profile and has_espn_id and player.sport in fresh_sports:
+        needs_profile = False
+    needs_stats = has_espn_id and (
+        not player.stats_season or player.last_stats_update is None or
+        player.last_stats_update < now - STATS_STALE_AFTER
+    )
+    return needs_profile, needs_stats
+
+
+def refill_enrichment_queue(fresh_sports=None):
+    """Enqueue players needing work and re-rank queued ones. Returns the number enqueued."""
+    Queue = PlayerEnrichmentQueue
+    now = datetime.utcnow()
+    if fresh_sports is None:
+        fresh_sports = fresh_roster_sports()
+
+    legs = BetLeg.__table__
+    recent_cutoff = now - timedelta(days=RECENT_LEG_DAYS)
+    in_active_legs = exists().where(legs.c.player_id == Player.id, legs.c.status.in_(('pending', 'live')))
+    in_recent_legs = exists().where(
+        legs.c.player_id == Player.id,
+        or_(legs.c.game_date >= recent_cutoff.date(),
+            (legs.c.game_date == None) & (legs.c.created_at >= recent_cutoff)),
+    )
+    priority = case(
+        (in_active_legs, Queue.PRIORITY_ACTIVE),
+        (in_recent_legs, Queue.PRIORITY_RECENT),
+        else_=Queue.PRIORITY_BACKGROUND,
+    )
+    profile_incomplete, stats_stale = _needs_work_filters(fresh_sports, now)
+
+    candidates = db.session.execute(
+        select(Player.id, priority).where(profile_incomplete | stats_stale)
+    ).all()
+    queued = dict(db.session.execute(select(Queue.player_id, Queue.priority)).all())
+
+    new_rows = [{'player_id': player_id, 'priority': rank, 'enqueued_at': now}
+                for player_id, rank in candidates if player_id not in queued]
+    reranked = [{'player_id': player_id, 'priority': rank}
+                for player_id, rank in candidates if player_id in queued and queued[player_id] != rank]
+    if new_rows:
+        db.session.execute(insert(Queue), new_rows)
+    if reranked:
+        db.session.execute(update(Queue), reranked)
+    db.session.commit()
+    return len(new_rows)
+
+
+def _enrich_profile(p):
+    """Fill missing profile fields from an ESPN search. Returns True if anything changed."""
+    updated = False
+    sport, league = espn_sport_league(p.sport)
+    data = player_resolver.search_espn(p.player_name, sport=sport, league=league)
+    if not data:
+        return False
+
+    if data.get('sport') and p.sport != data['sport']:
+        p.sport = data['sport']
+        updated = True
+    if not p.position and data.get('position'):
+        p.position = data['position']
+        updated = True
+
+    current_jersey = str(p.jersey_number) if p.jersey_number is not None else None
+    new_jersey = str(data['jersey_number']) if data.get('jersey_number') is not None else None
+    if current_jersey != new_jersey and new_jersey:
+        try:
+            p.jersey_number = int(data['jersey_number'])
+            updated = True
+        except (TypeError, ValueError):
+            pass
+
+    if not p.current_team and data.get('current_team'):
+        p.current_team = data['current_team']
+        updated = True
+    if not p.team_abbreviation and data.get('team_abbreviation'):
+        p.team_abbreviation = data['team_abbreviation']
+        updated = True
+    if not p.espn_player_id and data.get('espn_player_id'):
+        p.espn_player_id = data['espn_player_id']
+        updated = True
+    return updated
+
+
+def _refresh_stats(p):
+    """Fetch season stats and the last five games. Returns True if stats were stored."""
+    sport, league = espn_sport_league(p.sport)
+    stats_data = get_player_season_stats(p.espn_player_id, sport=sport, league=league)
+    if not stats_data:
+        return False
+
+    # Merge new season stats with existing history (keyed by season year)
+    current_stats = p.stats_season if isinstance(p.stats_season, dict) else {}
+    current_stats = dict(current_stats)
+    current_stats.update(stats_data.get('stats_season') or {})
+
+    p.stats_season = current_stats
+    p.stats_last_5_games = stats_data.get('stats_last_5_games')
+    p.last_stats_update = datetime.utcnow()
+    logger.info(f"[PLAYER-ENRICHMENT] Updated stats for {p.player_name}")
+    return True
+
+
+def _back_off(item, now, error):
+    item.attempts = (item.attempts or 0) + 1
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (item.attempts - 1), BACKOFF_MAX_SECONDS)
+    item.next_attempt_at = now + timedelta(seconds=delay)
+    item.last_error = str(error)[:255]
+
+
+def process_enrichment_queue(time_budget=ENRICHMENT_TIME_BUDGET_SECONDS, batch_size=ENRICHMENT_BATCH_SIZE,
+                             fresh_sports=None):
+    """Work through due queue rows in priority order until the time budget is spent.
+
+    Returns counts: processed, completed (left the queue), backed_off, stats_updated.
+    """
+    Queue = PlayerEnrichmentQueue
+    deadline = time.monotonic() + time_budget
+    if fresh_sports is None:
+        fresh_sports = fresh_roster_sports()
+    counts = {'processed': 0, 'completed': 0, 'backed_off': 0, 'stats_updated': 0}
+
+    while time.monotonic() < deadline:
+        now = datetime.utcnow()
+        player_ids = db.session.execute(
+            select(Queue.player_id)
+            .where(or_(Queue.next_attempt_at == None, Queue.next_attempt_at <= now))
+            .order_by(Queue.priority, Queue.enqueued_at, Queue.player_id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not player_ids:
+            break
+
+        for player_id in player_ids:
+            if time.monotonic() >= deadline:
+                break
+            counts['processed'] += 1
+            item = db.session.get(Queue, player_id)
+            p = db.session.get(Player, player_id)
+            try:
+                if p is not None:
+                    needs_profile, needs_stats = _player_needs(p, fresh_sports, now)
+                    if needs_profile:
+                        _enrich_profile(p)
+                        needs_stats = _player_needs(p, fresh_sports, now)[1]
+                    if needs_stats and _refresh_stats(p):
+                        counts['stats_updated'] += 1
+                    still_profile, still_stats = _player_needs(p, fresh_sports, now)
+                else:
+                    still_profile = still_stats = False
+
+                if still_profile or still_stats:
+                    missing = 'profile' if still_profile else 'stats'
+                    _back_off(item, now, f"{missing} still incomplete after enrichment")
+                    counts['backed_off'] += 1
+                else:
+                    db.session.delete(item)
+                    counts['completed'] += 1
+                # Commit per player so an interrupted run keeps its progress
+                db.session.commit()
+            except Exception as e:
+                logger.error(f"[PLAYER-ENRICHMENT] Error processing player {player_id}: {e}")
+                db.session.rollback()
+                item = db.session.get(Queue, player_id)
+                if item is not None:
+                    _back_off(item, now, e)
+                    db.session.commit()
+                counts['backed_off'] += 1
+
+    return counts
+
+
+def enrich_player_data(time_budget=ENRICHMENT_TIME_BUDGET_SECONDS):
     """
     Background job to:
-    1. Find players with missing basic data (enrichment)
-    2. Update season stats for players (stats update)
+    1. Queue players with missing basic data (enrichment) or stale season stats
+    2. Work through the queue by priority within the time budget
     """
     with app.app_context():
         logger.info("[PLAYER-ENRICHMENT] Starting player data enrichment job...")
-        
-        # 1. Basic Enrichment (Missing info)
-        incomplete_players = Player.query.filter(
-            (Player.position == None) | 
-            (Player.jersey_number == None) | 
-            (Player.current_team == None) | 
-            (Player.current_team == '')
-        ).limit(50).all()  # Limit to avoid timeouts
-        
-        # 2. Stats Update (Missing stats or old stats)
-        # Prioritize players with ESPN ID but no stats
-        stats_needed_players = Player.query.filter(
-            Player.espn_player_id != None,
-            (Player.season_stats == None) | 
-            (Player.last_stats_update < datetime.utcnow() - timedelta(days=1))
-        ).limit(50).all()
-        
-        # Combine lists (unique players)
-        players_to_process = list(set(incomplete_players + stats_needed_players))
-        
-        if not players_to_process:
-            logger.info("[PLAYER-ENRICHMENT] No players need updates.")
-            return
-
-        logger.info(f"[PLAYER-ENRICHMENT] Found {len(players_to_process)} players to process.")
-        
-        updated_count = 0
-        
-        for p in players_to_process:
-            try:
-                updated = False
-                
-                # Determine sport/league
-                sport = "football" if p.sport == 'NFL' else "basketball"
-                league = "nfl" if p.sport == 'NFL' else "nba"
-                
-                # --- Basic Enrichment ---
-                if p in incomplete_players:
-                    data = enhanced_player_search(p.player_name, sport=sport, league=league)
-                    if data:
-                        if p.sport != data['sport']:
-                            p.sport = data['sport']
-                            updated = True
-                        if not p.position and data['position']:
-                            p.position = data['position']
-                            updated = True
-                        
-                        current_jersey = str(p.jersey_number) if p.jersey_number is not None else None
-                        new_jersey = str(data['jersey_number']) if data['jersey_number'] is not None else None
-                        if current_jersey != new_jersey and new_jersey:
-                            try:
-                                p.jersey_number = int(data['jersey_number'])
-                                updated = True
-                            except: pass
-
-                        if (not p.current_team or p.current_team == '') and data['current_team']:
-                            p.current_team = data['current_team']
-                            updated = True
-                        if (not p.team_abbreviation or p.team_abbreviation == '') and data['team_abbreviation']:
-                            p.team_abbreviation = data['team_abbreviation']
-                            updated = True
-                        if (not p.espn_player_id or p.espn_player_id == '') and data['espn_player_id']:
-                             p.espn_player_id = data['espn_player_id']
-                             updated = True
-                
-                # --- Stats Update ---
-                if p.espn_player_id:
-                    # Refresh sport/league in case it changed
-                    sport = "football" if p.sport == 'NFL' else "basketball"
-                    league = "nfl" if p.sport == 'NFL' else "nba"
-                    # Fetch stats
-                    stats_data = get_player_season_stats(p.espn_player_id, sport=sport, league=league)
-                    
-                    if stats_data:
-                        p.season_stats = stats_data.get('stats_season') # Keep for backward compatibility
-                        # Merge new season stats with existing history
-                        current_stats = p.stats_season or {}
-                        # If current_stats is not a dict (legacy data), reset it
-                        if not isinstance(current_stats, dict):
-                            current_stats = {}
-                        
-                        # Update with new data (keyed by season year)
-                        new_stats = stats_data.get('stats_season', {})
-                        current_stats.update(new_stats)
-                        
-                        p.stats_season = current_stats
-                        p.stats_last_5_games = stats_data.get('stats_last_5_games')
-                        p.last_stats_update = datetime.utcnow()
-                        
-                        stats_updated_count += 1
-                        updated = True # Mark as updated if stats were fetched
-                        logger.info(f"[PLAYER-ENRICHMENT] Updated stats for {p.player_name}")
-
-                if updated:
-                    updated_count += 1
-                
-                # Commit every 10 updates or at the end of the loop
-                if (updated_count + stats_updated_count) % 10 == 0:
-                    db.session.commit()
-            
-            except Exception as e:
-                logger.error(f"[PLAYER-ENRICHMENT] Error processing {p.player_name}: {e}")
-                db.session.rollback()
-        
-        # Final commit for any remaining changes
-        if updated_count > 0 or stats_updated_count > 0:
-            db.session.commit()
-                
-        logger.info(f"[PLAYER-ENRICHMENT] Job completed. Updated {updated_count} players (including {stats_updated_count} with stats).")
-
-        logger.info(f"[PLAYER-ENRICHMENT] Job completed. Updated {updated_count} players (including {stats_updated_count} with stats).")
+
+        fresh_sports = fresh_roster_sports()
+        enqueued = refill_enrichment_queue(fresh_sports)
+        counts = process_enrichment_queue(time_budget, fresh_sports=fresh_sports)
+        remaining = PlayerEnrichmentQueue.query.count()
+
+        logger.info(f"[PLAYER-ENRICHMENT] Job completed. Enqueued {enqueued}, processed {counts['processed']} "
+                    f"({counts['completed']} done, {counts['backed_off']} backed off, "
+                    f"{counts['stats_updated']} with stats); {remaining} left in queue.")
+        return counts
@@ -0,0 +1,139 @@
+"""
+Roster ingestion job.
+
+Pulls every team roster of a league from ESPN (one team list request plus
+one concurrent request per team) and bulk-upserts the players table:
+
+- rows already linked by ESPN id get position, jersey, team and status updates
+- unlinked rows (created from bet slips) with the same name key are linked,
+  unless several athletes on the league's rosters share that key
+- everyone else on a roster is inserted
+
+Afterwards, basic player enrichment for an ingested league is a local join
+against the players table instead of one ESPN search per player.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, update
+
+from models import db, Player, JobWatermark
+from helpers.espn_api import get_league_rosters
+from helpers.player_resolver import player_resolver, player_name_key, espn_sport_league
+
+logger = logging.getLogger(__name__)
+
+ROSTER_SPORTS = ('NFL', 'NBA')
+# Enrichment skips ESPN lookups for linked players of leagues ingested this recently
+ROSTER_FRESH_HOURS = 48
+ROSTER_FIELDS = ('position', 'jersey_number', 'current_team', 'team_abbreviation', 'status', 'display_name')
+
+
+def roster_job_name(sport):
+    return f'roster_ingestion:{sport.upper()}'
+
+
+def fresh_roster_sports(sports=ROSTER_SPORTS):
+    """Sports whose rosters were ingested within ROSTER_FRESH_HOURS."""
+    cutoff = datetime.utcnow() - timedelta(hours=ROSTER_FRESH_HOURS)
+    return {sport for sport in sports
+            if (JobWatermark.get(roster_job_name(sport)) or datetime.min) > cutoff}
+
+
+def upsert_roster_players(sport, roster):
+    """Bulk-upsert roster player dicts (see get_league_rosters) for one sport.
+
+    Returns a dict with inserted/updated/linked/unchanged counts.
+    """
+    sport = sport.upper()
+    counts = {'inserted': 0, 'updated': 0, 'linked': 0, 'unchanged': 0}
+
+    existing = db.session.execute(
+        select(Player.id, Player.espn_player_id, Player.player_name, Player.sport,
+               *(getattr(Player, field) for field in ROSTER_FIELDS))
+        .where(Player.sport == sport)
+        .order_by(Player.id)
+    ).mappings().all()
+    by_espn_id = {row['espn_player_id']: row for row in existing if row['espn_player_id']}
+    unlinked_by_key = {}
+    for row in existing:
+        if not row['espn_player_id']:
+            unlinked_by_key.setdefault(player_name_key(row['player_name']), row)
+
+    # A bet-slip name shared by two athletes could be either; leave it to enrichment
+    roster_keys = Counter(player_name_key(player['player_name'])
+                          for player in {p['espn_player_id']: p for p in roster if p['espn_player_id']}.values())
+
+    now = datetime.utcnow()
+    inserts, updates = [], []
+    seen = set()
+    for player in roster:
+        espn_id = player['espn_player_id']
+        if not espn_id or espn_id in seen:
+            continue
+        seen.add(espn_id)
+        values = {field: player[field] for field in ROSTER_FIELDS}
+
+        row = by_espn_id.get(espn_id)
+        if row is None:
+            key = player_name_key(player['player_name'])
+            row = unlinked_by_key.pop(key, None) if roster_keys[key] == 1 else None
+            if row is not None:
+                updates.append({'id': row['id'], 'espn_player_id': espn_id, 'updated_at': now, **values})
+                counts['linked'] += 1
+                continue
+            inserts.append({
+                'player_name': player['player_name'],
+                'normalized_name': player['player_name'].lower(),
+                'sport': sport,
+                'espn_player_id': espn_id,
+                'created_at': now,
+                'updated_at': now,
+                **values,
+            })
+            counts['inserted'] += 1
+        elif any(row[field] != value for field, value in values.items()):
+            updates.append({'id': row['id'], 'updated_at': now, **values})
+            counts['updated'] += 1
+        else:
+            counts['unchanged'] += 1
+
+    if inserts:
+        db.session.execute(insert(Player), inserts)
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany
+        db.session.execute(update(Player), updates)
+    return counts
+
+
+def ingest_rosters(sports=ROSTER_SPORTS):
+    """Fetch and upsert the rosters of ``sports``. Returns per-sport counts.
+
+    Must run inside an app context. A league whose rosters can't be fetched
+    is skipped and keeps its previous watermark.
+    """
+    results = {}
+    for sport in sports:
+        sport = sport.upper()
+        espn_sport, league = espn_sport_league(sport)
+        try:
+            roster = get_league_rosters(espn_sport, league)
+            if not roster:
+                logger.warning(f"[ROSTER-INGESTION] No roster data returned for {sport}")
+                continue
+            counts = upsert_roster_players(sport, roster)
+            JobWatermark.set(roster_job_name(sport), datetime.utcnow())
+            db.session.commit()
+            results[sport] = counts
+            logger.info(f"[ROSTER-INGESTION] {sport}: {len(roster)} roster players, "
+                        f"{counts['inserted']} inserted, {counts['updated']} updated, "
+                        f"{counts['linked']} linked, {counts['unchanged']} unchanged")
+        except Exception as e:
+            logger.error(f"[ROSTER-INGESTION] Error ingesting {sport} rosters: {e}")
+            db.session.rollback()
+    if results:
+        # Bulk statements bypass the flush hooks that keep the resolver current
+        player_resolver.invalidate()
+    return results
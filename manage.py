@@ -1,9 +1,58 @@
-from app import app, db
+import bcrypt
+import click
+from datetime import date
+
+from app import app, db, scheduler
 from flask_migrate import Migrate
 
 # Re-initialize to be sure, though it should be in app.py
 migrate = Migrate(app, db)
 
+
+@app.cli.command('generate-synthetic-data')
+@click.option('--users', default=100, show_default=True)
+@click.option('--bets', default=1000, show_default=True)
+@click.option('--legs', default=4000, show_default=True, help='Total legs (at least one per bet).')
+@click.option('--players', default=1000, show_default=True)
+@click.option('--teams-per-sport', default=32, show_default=True)
+@click.option('--shared-rate', default=0.08, show_default=True, help='Share of bets with secondary bettors.')
+@click.option('--watched-rate', default=0.12, show_default=True, help='Share of bets with watchers.')
+@click.option('--seed', default=0, show_default=True)
+@click.option('--as-of', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Day of the live bets (default today); fix it to reproduce a dataset later.')
+@click.option('--prefix', default='synth', show_default=True, help='Username prefix of the generated users.')
+@click.option('--password', default=None, help='Password shared by the generated users.')
+@click.option('--skip-derived', is_flag=True, help='Skip analytics rollups and the player prop index.')
+@click.option('--batch-size', default=5000, show_default=True)
+def generate_synthetic_data_command(users, bets, legs, players, teams_per_sport, shared_rate, watched_rate, seed,
+                                    as_of, prefix, password, skip_derived, batch_size):
+    """Populate the database with seeded synthetic users, bets and legs for scale testing.
+
+    \b
+    Example (10k users, 1M legs):
+        python manage.py generate-synthetic-data --users 10000 --bets 250000 --legs 1000000 --players 5000
+    """
+    from services.synthetic_data import DEFAULT_PASSWORD, generate_synthetic_data
+
+    # Importing app started the background jobs; keep them off the half-written data
+    if scheduler.running:
+        scheduler.pause()
+    password = password or DEFAULT_PASSWORD
+    password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    with db.engine.connect() as connection:
+        try:
+            counts = generate_synthetic_data(
+                connection, users=users, bets=bets, legs=legs, players=players, teams_per_sport=teams_per_sport,
+                shared_rate=shared_rate, watched_rate=watched_rate, seed=seed,
+                as_of=as_of.date() if as_of else date.today(), prefix=prefix, password_hash=password_hash,
+                derived=not skip_derived, batch_size=batch_size, progress=click.echo)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+    for table, count in counts.items():
+        click.echo(f"{table}: {count} rows")
+    click.echo(f"Log in as {prefix}_<n> with password '{password}'")
+
+
 if __name__ == '__main__':
     from flask.cli import FlaskGroup
     cli = FlaskGroup(create_app=lambda: app)
@@ -0,0 +1,123 @@
+"""Add indexed search document for bets
+
+Revision ID: add_bet_search_index
+Revises: add_historical_keyset_index
+Create Date: 2026-10-19 12:00:00
+
+"""
+import json
+import re
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_bet_search_index'
+down_revision = 'add_historical_keyset_index'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the services.bet_search document rules and SQLite FTS schema at
+# this revision, so the backfill doesn't change with the app (the flush hook
+# keeps documents current after)
+LEG_SEARCH_FIELDS = ('player_name', 'player_team', 'home_team', 'away_team', 'stat_type')
+SQLITE_FTS_TABLE = 'bet_search_fts'
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _search_document(betting_site, bet_type, bet_data_json, legs):
+    parts = [betting_site, bet_type]
+
+    bet_data = {}
+    if bet_data_json:
+        try:
+            bet_data = json.loads(bet_data_json)
+        except (TypeError, ValueError):
+            bet_data = {}
+    if isinstance(bet_data, dict):
+        parts.append(bet_data.get('name'))
+
+    if legs:
+        for leg in legs:
+            parts.extend(leg)
+    elif isinstance(bet_data, dict):
+        # Legacy bets that only have legs inside the JSON blob
+        for leg in bet_data.get('legs') or []:
+            if isinstance(leg, dict):
+                parts.extend(leg.get(key) for key in ('player', 'team', 'home', 'away', 'stat'))
+
+    seen = []
+    for part in parts:
+        for token in _TOKEN_RE.findall(str(part).lower()) if part is not None else []:
+            if token not in seen:
+                seen.append(token)
+    return ' '.join(seen)
+
+
+def _create_sqlite_search_index():
+    """FTS5 external-content table over bets.search_document, synced by triggers."""
+    op.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} "
+               f"USING fts5(search_document, content='bets', content_rowid='id')")
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS bets_search_ai AFTER INSERT ON bets BEGIN
+            INSERT INTO {SQLITE_FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS bets_search_ad AFTER DELETE ON bets BEGIN
+            INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, search_document)
+            VALUES ('delete', old.id, old.search_document);
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS bets_search_au AFTER UPDATE OF search_document ON bets BEGIN
+            INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, search_document)
+            VALUES ('delete', old.id, old.search_document);
+            INSERT INTO {SQLITE_FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+        END
+    """)
+    op.execute(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')")
+
+
+def upgrade():
+    """Add bets.search_document, backfill it and index it for /historical search."""
+    op.add_column('bets', sa.Column('search_document', sa.Text(), nullable=True))
+    
+    bind = op.get_bind()
+    
+    # Backfill through the migration connection (the column isn't visible to the app session yet)
+    legs_by_bet = defaultdict(list)
+    leg_rows = bind.execute(sa.text(
+        f"SELECT bet_id, {', '.join(LEG_SEARCH_FIELDS)} FROM bet_legs ORDER BY bet_id, leg_order"
+    ))
+    for row in leg_rows:
+        legs_by_bet[row[0]].append(tuple(row[1:]))
+    
+    bet_rows = bind.execute(sa.text("SELECT id, betting_site, bet_type, bet_data FROM bets")).fetchall()
+    updates = [
+        {'id': bet_id, 'doc': _search_document(site, bet_type, bet_data, legs_by_bet.get(bet_id, []))}
+        for bet_id, site, bet_type, bet_data in bet_rows
+    ]
+    if updates:
+        bind.execute(sa.text("UPDATE bets SET search_document = :doc WHERE id = :id"), updates)
+    
+    if bind.dialect.name == 'postgresql':
+        # Trigram GIN index makes substring LIKE searches indexed
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX idx_bets_search_document_trgm ON bets USING gin (search_document gin_trgm_ops)")
+    elif bind.dialect.name == 'sqlite':
+        _create_sqlite_search_index()
+
+
+def downgrade():
+    """Remove the bet search index and column."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS idx_bets_search_document_trgm")
+    elif bind.dialect.name == 'sqlite':
+        for trigger in ('bets_search_ai', 'bets_search_ad', 'bets_search_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS bet_search_fts")
+    op.drop_column('bets', 'search_document')
@@ -0,0 +1,35 @@
+"""Add indexes for bet listing version tokens
+
+Revision ID: add_bet_version_indexes
+Revises: add_performance_indexes
+Create Date: 2026-10-19 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_bet_version_indexes'
+down_revision = 'add_performance_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Index updated_at so ETag version lookups stay cheap."""
+    
+    # max(updated_at) per user/status for listing ETags
+    op.create_index('idx_bets_user_status_updated', 'bets', ['user_id', 'status', 'updated_at'])
+    
+    # max(updated_at) of a bet's legs (ETags and per-bet payload cache versions)
+    op.create_index('idx_bet_legs_bet_updated', 'bet_legs', ['bet_id', 'updated_at'])
+    
+    # Bets written before updated_at had a default: seed it from created_at
+    op.execute("UPDATE bets SET updated_at = created_at WHERE updated_at IS NULL")
+
+
+def downgrade():
+    """Remove bet version indexes."""
+    op.drop_index('idx_bets_user_status_updated', table_name='bets')
+    op.drop_index('idx_bet_legs_bet_updated', table_name='bet_legs')
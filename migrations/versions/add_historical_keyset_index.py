@@ -0,0 +1,30 @@
+"""Add keyset pagination index for historical bets
+
+Revision ID: add_historical_keyset_index
+Revises: add_bet_version_indexes
+Create Date: 2026-10-19 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_historical_keyset_index'
+down_revision = 'add_bet_version_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Index (bet_date, id) for cursor-based /historical pagination."""
+    
+    # Keyset comparisons skip NULLs, so normalize missing dates first
+    op.execute("UPDATE bets SET bet_date = '' WHERE bet_date IS NULL")
+    
+    op.create_index('idx_bets_status_date_id', 'bets', ['status', 'bet_date', 'id'])
+
+
+def downgrade():
+    """Remove keyset pagination index."""
+    op.drop_index('idx_bets_status_date_id', table_name='bets')
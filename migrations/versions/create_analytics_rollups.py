@@ -0,0 +1,170 @@
+"""Create analytics rollup tables and backfill them from settled bets
+
+Revision ID: create_analytics_rollups
+Revises: create_sync_tombstones
+Create Date: 2026-10-19 15:00:00
+
+"""
+import json
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_analytics_rollups'
+down_revision = 'create_sync_tombstones'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the services.analytics contribution rules at this revision, so
+# the backfill doesn't change with the app (the hook keeps rollups current after)
+SETTLED_STATUSES = {'won': 'bets_won', 'lost': 'bets_lost', 'void': 'bets_void', 'push': 'bets_void',
+                    'completed': None}
+METRICS = ('bets', 'bets_won', 'bets_lost', 'bets_void', 'wagered', 'returned', 'legs', 'legs_won', 'legs_lost')
+MONEY_METRICS = ('wagered', 'returned')
+BET_LEVEL = ''  # AnalyticsRollup.BET_LEVEL
+
+
+def _money(value):
+    return Decimal(str(value)).quantize(Decimal('0.01')) if value is not None else Decimal('0.00')
+
+
+def _leg_won(leg):
+    return leg.status == 'won' or (leg.status != 'lost' and leg.is_hit is True)
+
+
+def _leg_lost(leg):
+    return not _leg_won(leg) and (leg.status == 'lost' or leg.is_hit is False)
+
+
+def _outcome(bet, legs):
+    outcome = SETTLED_STATUSES[bet.status]
+    if outcome is not None:
+        return outcome
+    if any(_leg_lost(leg) for leg in legs):
+        return 'bets_lost'
+    if legs and all(_leg_won(leg) or leg.status in ('void', 'push') for leg in legs):
+        return 'bets_won' if any(_leg_won(leg) for leg in legs) else 'bets_void'
+    if bet.actual_winnings is not None:
+        returned = _money(bet.actual_winnings)
+        if returned == 0:
+            return 'bets_lost'
+        return 'bets_won' if returned > _money(bet.wager) else 'bets_void'
+    return None
+
+
+def _contribution(bet, legs):
+    try:
+        day = date.fromisoformat((bet.bet_date or '')[:10])
+    except ValueError:
+        day = bet.created_at.date() if bet.created_at else date(1970, 1, 1)
+    day = day.isoformat()
+    site = (bet.betting_site or 'Unknown')[:50]
+    sports = {leg.sport or 'Unknown' for leg in legs}
+    bet_sport = (sports.pop() if len(sports) == 1 else 'Mixed')[:20]
+
+    outcome = _outcome(bet, legs)
+    wagered = _money(bet.wager)
+    if bet.actual_winnings is not None:
+        returned = _money(bet.actual_winnings)
+    elif outcome == 'bets_won':
+        returned = _money(bet.potential_winnings)
+    elif outcome in ('bets_void', None):
+        returned = wagered
+    else:
+        returned = Decimal('0.00')
+
+    user_ids = [bet.user_id] if bet.user_id else []
+    for uid in bet.secondary_bettors or []:
+        if uid and int(uid) not in user_ids:
+            user_ids.append(int(uid))
+
+    contribution = {}
+    for user_id in user_ids:
+        bet_metrics = dict.fromkeys(METRICS, 0)
+        bet_metrics.update({'bets': 1, 'wagered': wagered, 'returned': returned})
+        if outcome is not None:
+            bet_metrics[outcome] = 1
+        contribution[(user_id, day, bet_sport, site, BET_LEVEL)] = bet_metrics
+        for leg in legs:
+            key = (user_id, day, (leg.sport or 'Unknown')[:20], site, (leg.stat_type or 'unknown')[:50])
+            metrics = contribution.setdefault(key, dict.fromkeys(METRICS, 0))
+            metrics['legs'] += 1
+            if _leg_won(leg):
+                metrics['legs_won'] += 1
+            elif _leg_lost(leg):
+                metrics['legs_lost'] += 1
+    return contribution
+
+
+def upgrade():
+    """Per-(user, day, sport, site, stat_type) rollups plus per-bet contributions."""
+    rollups = op.create_table(
+        'analytics_rollups',
+        sa.Column('user_id', sa.Integer(), primary_key=True),
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('sport', sa.String(length=20), primary_key=True),
+        sa.Column('site', sa.String(length=50), primary_key=True),
+        sa.Column('stat_type', sa.String(length=50), primary_key=True),
+        sa.Column('bets', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bets_won', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bets_lost', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bets_void', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('wagered', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('returned', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('legs', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('legs_won', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('legs_lost', sa.Integer(), nullable=False, server_default='0'),
+    )
+    contributions = op.create_table(
+        'analytics_bet_contributions',
+        sa.Column('bet_id', sa.Integer(), primary_key=True),
+        sa.Column('contribution', sa.Text(), nullable=False),
+    )
+    
+    # Backfill in batches of settled bets; the tables are new, so rollups are plain sums
+    bind = op.get_bind()
+    bets = sa.table('bets', *(sa.column(name) for name in (
+        'id', 'user_id', 'status', 'betting_site', 'bet_date', 'created_at', 'wager', 'potential_winnings',
+        'actual_winnings')), sa.column('secondary_bettors', sa.JSON))
+    legs_table = sa.table('bet_legs', *(sa.column(name) for name in ('bet_id', 'sport', 'stat_type', 'status', 'is_hit')))
+    totals = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+    last_id = 0
+    while True:
+        batch = bind.execute(
+            sa.select(bets).where(bets.c.id > last_id, bets.c.status.in_(list(SETTLED_STATUSES)))
+            .order_by(bets.c.id).limit(500)
+        ).all()
+        if not batch:
+            break
+        legs = defaultdict(list)
+        for leg in bind.execute(sa.select(legs_table).where(legs_table.c.bet_id.in_([bet.id for bet in batch]))):
+            legs[leg.bet_id].append(leg)
+        rows = []
+        for bet in batch:
+            contribution = _contribution(bet, legs[bet.id])
+            for key, metrics in contribution.items():
+                for m in METRICS:
+                    totals[key][m] += metrics[m]
+            rows.append({'bet_id': bet.id, 'contribution': json.dumps([
+                [list(key), [str(metrics[m]) if m in MONEY_METRICS else metrics[m] for m in METRICS]]
+                for key, metrics in contribution.items()
+            ])})
+        bind.execute(contributions.insert(), rows)
+        last_id = batch[-1].id
+
+    rows = [dict(zip(('user_id', 'day', 'sport', 'site', 'stat_type'), key), **metrics) for key, metrics in totals.items()]
+    for row in rows:
+        row['day'] = date.fromisoformat(row['day'])
+    for start in range(0, len(rows), 1000):
+        bind.execute(rollups.insert(), rows[start:start + 1000])
+
+
+def downgrade():
+    """Drop analytics rollup tables."""
+    op.drop_table('analytics_bet_contributions')
+    op.drop_table('analytics_rollups')
@@ -0,0 +1,70 @@
+"""Create bet_participants table and backfill from bet arrays
+
+Revision ID: create_bet_participants
+Revises: add_bet_search_index
+Create Date: 2026-10-19 13:00:00
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_bet_participants'
+down_revision = 'add_bet_search_index'
+branch_labels = None
+depends_on = None
+
+
+def _id_list(value):
+    """secondary_bettors / watchers come back as a list (Postgres ARRAY) or JSON text (SQLite)."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return [v for v in value if v]
+
+
+def upgrade():
+    """Normalize bet access (primary / secondary / watcher) into an indexed table."""
+    op.create_table(
+        'bet_participants',
+        sa.Column('bet_id', sa.Integer(), sa.ForeignKey('bets.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('role', sa.String(length=20), nullable=False),
+    )
+    op.create_index('idx_bet_participants_user_role', 'bet_participants', ['user_id', 'role', 'bet_id'])
+    
+    # Backfill: strongest role wins (primary > secondary > watcher)
+    bind = op.get_bind()
+    user_ids = {row[0] for row in bind.execute(sa.text("SELECT id FROM users"))}
+    rows = bind.execute(sa.text("SELECT id, user_id, secondary_bettors, watchers FROM bets")).fetchall()
+    participants = []
+    for bet_id, owner_id, secondary, watchers in rows:
+        roles = {}
+        for uid in _id_list(watchers):
+            roles[int(uid)] = 'watcher'
+        for uid in _id_list(secondary):
+            roles[int(uid)] = 'secondary'
+        if owner_id:
+            roles[int(owner_id)] = 'primary'
+        participants.extend(
+            {'bet_id': bet_id, 'user_id': uid, 'role': role}
+            for uid, role in roles.items() if uid in user_ids  # skip dangling ids (FK)
+        )
+    if participants:
+        bind.execute(
+            sa.text("INSERT INTO bet_participants (bet_id, user_id, role) VALUES (:bet_id, :user_id, :role)"),
+            participants
+        )
+
+
+def downgrade():
+    """Drop bet_participants (bet arrays remain the source data)."""
+    op.drop_index('idx_bet_participants_user_role', table_name='bet_participants')
+    op.drop_table('bet_participants')
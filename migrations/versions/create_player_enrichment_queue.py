@@ -0,0 +1,40 @@
+"""Create player_enrichment_queue for the prioritized enrichment job
+
+Revision ID: create_player_enrichment_queue
+Revises: create_team_aliases
+Create Date: 2026-10-19 20:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_player_enrichment_queue'
+down_revision = 'create_team_aliases'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Queue table plus the index the job reads it in.
+
+    The job fills the queue itself on its next run.
+    """
+    op.create_table(
+        'player_enrichment_queue',
+        sa.Column('player_id', sa.Integer(), primary_key=True),
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='2'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.String(length=255), nullable=True),
+        sa.Column('enqueued_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('idx_player_enrichment_queue_order', 'player_enrichment_queue',
+                    ['priority', 'enqueued_at', 'player_id'])
+
+
+def downgrade():
+    """Drop player_enrichment_queue."""
+    op.drop_index('idx_player_enrichment_queue_order', table_name='player_enrichment_queue')
+    op.drop_table('player_enrichment_queue')
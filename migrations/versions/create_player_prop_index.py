@@ -0,0 +1,46 @@
+"""Create player_prop_index for prop hit-rate history
+
+Revision ID: create_player_prop_index
+Revises: create_analytics_rollups
+Create Date: 2026-10-19 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_player_prop_index'
+down_revision = 'create_analytics_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Per-(sport, player, stat_type) game values and settled outcomes."""
+    from services.player_props import backfill_player_prop_index
+    
+    op.create_table(
+        'player_prop_index',
+        sa.Column('sport', sa.String(length=20), primary_key=True),
+        sa.Column('player_key', sa.String(length=100), primary_key=True),
+        sa.Column('stat_type', sa.String(length=50), primary_key=True),
+        sa.Column('player_id', sa.Integer(), nullable=True),
+        sa.Column('log_values', sa.JSON(), nullable=True),
+        sa.Column('leg_results', sa.JSON(), nullable=True),
+        sa.Column('sorted_values', sa.JSON(), nullable=True),
+        sa.Column('legs_settled', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('legs_won', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('season', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+    )
+    # Lookups without a sport filter
+    op.create_index('idx_player_prop_index_player_stat', 'player_prop_index', ['player_key', 'stat_type'])
+    
+    backfill_player_prop_index(op.get_bind())
+
+
+def downgrade():
+    """Drop player_prop_index."""
+    op.drop_index('idx_player_prop_index_player_stat', table_name='player_prop_index')
+    op.drop_table('player_prop_index')
@@ -0,0 +1,42 @@
+"""Create sync_tombstones and index updated_at for delta sync
+
+Revision ID: create_sync_tombstones
+Revises: create_bet_participants
+Create Date: 2026-10-19 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_sync_tombstones'
+down_revision = 'create_bet_participants'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Per-user deletion log plus updated_at range indexes for /api/sync."""
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=10), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('bet_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('idx_sync_tombstones_user_deleted', 'sync_tombstones', ['user_id', 'deleted_at'])
+    
+    # "changed since" range scans (the existing indexes lead with user_id / bet_id)
+    op.create_index('idx_bets_updated_at', 'bets', ['updated_at', 'id'])
+    op.create_index('idx_bet_legs_updated_at', 'bet_legs', ['updated_at', 'bet_id'])
+
+
+def downgrade():
+    """Drop the delta sync table and indexes."""
+    op.drop_index('idx_bet_legs_updated_at', table_name='bet_legs')
+    op.drop_index('idx_bets_updated_at', table_name='bets')
+    op.drop_index('idx_sync_tombstones_user_deleted', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
@@ -0,0 +1,44 @@
+"""Create team_aliases and job_watermarks for incremental team standardization
+
+Revision ID: create_team_aliases
+Revises: create_player_prop_index
+Create Date: 2026-10-19 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_team_aliases'
+down_revision = 'create_player_prop_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Alias table joined by the standardization UPDATE, plus per-job watermarks.
+
+    team_aliases is seeded by the job itself on its first run.
+    """
+    op.create_table(
+        'team_aliases',
+        sa.Column('alias', sa.String(length=100), primary_key=True),
+        sa.Column('sport', sa.String(length=20), primary_key=True),
+        sa.Column('canonical', sa.String(length=100), nullable=True),
+        sa.Column('team_id', sa.Integer(), nullable=True),
+        sa.Column('source', sa.String(length=10), nullable=False, server_default='team'),
+        sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+    )
+    op.create_table(
+        'job_watermarks',
+        sa.Column('job_name', sa.String(length=100), primary_key=True),
+        sa.Column('watermark', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    """Drop team_aliases and job_watermarks."""
+    op.drop_table('job_watermarks')
+    op.drop_table('team_aliases')
@@ -0,0 +1,127 @@
+"""Re-key player_prop_index rows for stat spellings the stat catalog now folds
+
+Revision ID: rekey_player_prop_index
+Revises: create_player_enrichment_queue
+Create Date: 2026-10-19 20:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'rekey_player_prop_index'
+down_revision = 'create_player_enrichment_queue'
+branch_labels = None
+depends_on = None
+
+# Frozen at this revision: spellings that standardize_stat_type returned
+# unchanged before helpers/stat_catalog.py and now maps to a canonical stat,
+# so index rows were stored under the raw spelling
+REKEYED = {
+    'NFL': {
+        '2+ td': 'player_to_score_2_touchdowns', '2+ touchdowns': 'player_to_score_2_touchdowns',
+        '3+ td': 'player_to_score_3_touchdowns', '3+ touchdowns': 'player_to_score_3_touchdowns',
+        'defensive interceptions': 'defensive_interceptions',
+        'extra points made': 'extra_points_made', 'xp made': 'extra_points_made',
+        'first td scorer': 'first_touchdown_scorer', 'first touchdown scorer': 'first_touchdown_scorer',
+        'first_td_scorer': 'first_touchdown_scorer',
+        'last td scorer': 'last_touchdown_scorer', 'last touchdown scorer': 'last_touchdown_scorer',
+        'last_td_scorer': 'last_touchdown_scorer',
+        'first team to score': 'first_team_to_score', 'last team to score': 'last_team_to_score',
+        'game_total': 'total_points',
+        'longest completion': 'longest_pass_completion', 'longest pass completion': 'longest_pass_completion',
+        'longest rush': 'longest_rush',
+        'overtime': 'will_be_overtime',
+        'pass attempts': 'passing_attempts', 'pass_attempts': 'passing_attempts',
+        'passing attempts': 'passing_attempts',
+        'point_spread': 'spread',
+        'receiving_yards_alt': 'receiving_yards',
+        'solo tackles': 'solo_tackles',
+    },
+    'NBA': {
+        '3-pointers_made': 'three_pointers', '3_pointers_made': 'three_pointers', 'made_threes': 'three_pointers',
+        'threes_made': 'three_pointers',
+        'alt_assists': 'assists', 'alt_points': 'points', 'alt_rebounds': 'rebounds',
+        'double double': 'double_double',
+        'game_total': 'total_points',
+        'overtime': 'will_be_overtime',
+        'pa': 'points_assists', 'ra': 'rebounds_assists',
+        'points rebounds': 'points_rebounds', 'pr': 'points_rebounds', 'pts reb': 'points_rebounds',
+        'point_spread': 'spread',
+        'team points': 'team_total_points', 'team total points': 'team_total_points',
+        'team_score': 'team_total_points',
+    },
+}
+# Sports without alias tables search every sport, NFL first
+CATALOG_SPORTS = ('NFL', 'NBA', 'MLB', 'NHL')
+OTHER_SPORTS = {**REKEYED['NBA'], **REKEYED['NFL']}
+MAX_LOG_VALUES = 200  # services.player_props.MAX_LOG_VALUES
+
+
+def _canonical(sport, stat_type):
+    mapping = REKEYED.get(sport, {}) if sport in CATALOG_SPORTS else OTHER_SPORTS
+    return mapping.get(str(stat_type).lower().strip())
+
+
+def _merge(target, source):
+    """Fold ``source`` into ``target`` and recompute the derived columns (services.player_props._finalize)."""
+    target['leg_results'] = {**(source['leg_results'] or {}), **(target['leg_results'] or {})}
+    log_values = {**(source['log_values'] or {}), **(target['log_values'] or {})}
+    target['log_values'] = dict(list(log_values.items())[-MAX_LOG_VALUES:])
+    target['season'] = target['season'] or source['season']
+    target['player_id'] = target['player_id'] or source['player_id']
+
+    values = {}
+    for record in target['leg_results'].values():
+        if record[3] and record[4] is not None:
+            values[record[3]] = record[4]
+    values.update(target['log_values'])
+    target['sorted_values'] = sorted(values.values())
+    target['legs_settled'] = len(target['leg_results'])
+    target['legs_won'] = sum(1 for record in target['leg_results'].values() if record[2])
+
+
+def upgrade():
+    """Move rows stored under a now-aliased spelling onto the canonical stat, merging with existing rows."""
+    index = sa.table(
+        'player_prop_index',
+        sa.column('sport', sa.String), sa.column('player_key', sa.String), sa.column('stat_type', sa.String),
+        sa.column('player_id', sa.Integer), sa.column('log_values', sa.JSON), sa.column('leg_results', sa.JSON),
+        sa.column('sorted_values', sa.JSON), sa.column('legs_settled', sa.Integer),
+        sa.column('legs_won', sa.Integer), sa.column('season', sa.JSON),
+    )
+    connection = op.get_bind()
+    rows = {(row.sport, row.player_key, row.stat_type): dict(row._mapping)
+            for row in connection.execute(sa.select(index))}
+
+    merged, moved = {}, []
+    for key, row in rows.items():
+        canonical = _canonical(row['sport'], row['stat_type'])
+        if canonical is None or canonical == row['stat_type']:
+            continue
+        target_key = (row['sport'], row['player_key'], canonical)
+        if target_key not in merged:
+            merged[target_key] = dict(rows.get(target_key) or {
+                'sport': target_key[0], 'player_key': target_key[1], 'stat_type': canonical,
+                'player_id': None, 'log_values': {}, 'leg_results': {}, 'season': None,
+            })
+        _merge(merged[target_key], row)
+        moved.append(key)
+
+    def where(key):
+        return sa.and_(index.c.sport == key[0], index.c.player_key == key[1], index.c.stat_type == key[2])
+
+    for key in moved:
+        connection.execute(index.delete().where(where(key)))
+    for key, entry in merged.items():
+        if key in rows:
+            connection.execute(index.update().where(where(key)).values(
+                {k: v for k, v in entry.items() if k not in ('sport', 'player_key', 'stat_type')}))
+        else:
+            connection.execute(index.insert().values(**entry))
+
+
+def downgrade():
+    """Merged rows can't be split back apart; nothing to undo."""
+    pass
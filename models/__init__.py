@@ -5,5 +5,12 @@ db = SQLAlchemy()
 from .user import User
 from .bet import Bet
 from .bet_leg import BetLeg
+from .bet_participant import BetParticipant
 from .player import Player
-from .team import Team
\ No newline at end of file
+from .team import Team
+from .sync_tombstone import SyncTombstone
+from .analytics import AnalyticsRollup, AnalyticsBetContribution
+from .player_prop_index import PlayerPropIndex
+from .team_alias import TeamAlias
+from .job_watermark import JobWatermark
+from .player_enrichment_queue import PlayerEnrichmentQueue
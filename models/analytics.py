@@ -0,0 +1,52 @@
+from models import db
+
+
+class AnalyticsRollup(db.Model):
+    """Settled-bet totals per (user, day, sport, site, stat_type).
+
+    Two kinds of rows share the table so any grouping is a plain SUM:
+
+    - bet rows (stat_type == BET_LEVEL): bet counts and money, keyed by the
+      bet's sport ('Mixed' when legs span several sports)
+    - leg rows (stat_type set): leg hit/miss counts, keyed by the leg's sport
+
+    Maintained incrementally by services.analytics whenever a bet settles or
+    a settled bet is corrected; never written directly.
+    """
+    __tablename__ = 'analytics_rollups'
+
+    BET_LEVEL = ''
+
+    user_id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    sport = db.Column(db.String(20), primary_key=True)
+    site = db.Column(db.String(50), primary_key=True)
+    stat_type = db.Column(db.String(50), primary_key=True)
+
+    bets = db.Column(db.Integer, nullable=False, default=0)
+    bets_won = db.Column(db.Integer, nullable=False, default=0)
+    bets_lost = db.Column(db.Integer, nullable=False, default=0)
+    bets_void = db.Column(db.Integer, nullable=False, default=0)
+    wagered = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    returned = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    legs = db.Column(db.Integer, nullable=False, default=0)
+    legs_won = db.Column(db.Integer, nullable=False, default=0)
+    legs_lost = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<AnalyticsRollup user={self.user_id} {self.day} {self.sport}/{self.site}/{self.stat_type or "*"}>'
+
+
+class AnalyticsBetContribution(db.Model):
+    """What one settled bet currently adds to analytics_rollups.
+
+    Lets a re-settled or corrected bet subtract exactly what it added before,
+    without rescanning history.
+    """
+    __tablename__ = 'analytics_bet_contributions'
+
+    bet_id = db.Column(db.Integer, primary_key=True)
+    contribution = db.Column(db.Text, nullable=False)  # JSON list of [key, metrics]
+
+    def __repr__(self):
+        return f'<AnalyticsBetContribution bet={self.bet_id}>'
@@ -17,8 +17,8 @@ class Bet(db.Model):
     api_fetched = db.Column(db.String(3))
     bet_data = db.Column(db.Text)
     created_at = db.Column(db.DateTime)
-    updated_at = db.Column(db.DateTime)
-    bet_date = db.Column(db.String(20))
+    updated_at = db.Column(db.DateTime, default=db.func.now(), onupdate=db.func.now())
+    bet_date = db.Column(db.String(20), default='')  # never NULL: keyset pagination compares it
     wager = db.Column(db.Numeric(10, 2))
     original_odds = db.Column(db.Integer)
     boosted_odds = db.Column(db.Integer)
@@ -37,9 +37,12 @@ class Bet(db.Model):
     legs_live = db.Column(db.Integer)
     legs_void = db.Column(db.Integer)
     last_api_update = db.Column(db.DateTime)
-    secondary_bettors = db.Column(ARRAY(db.Integer), default=list)
-    watchers = db.Column(ARRAY(db.Integer), default=list)
+    secondary_bettors = db.Column(ARRAY(db.Integer).with_variant(db.JSON, 'sqlite'), default=list)
+    watchers = db.Column(ARRAY(db.Integer).with_variant(db.JSON, 'sqlite'), default=list)
+    search_document = db.Column(db.Text)  # maintained by services.bet_search on write
     bet_legs_rel = db.relationship('BetLeg', backref='bet', lazy=True)
+    participants = db.relationship('BetParticipant', backref='bet', lazy=True, cascade='all, delete-orphan',
+                                   passive_deletes=True)
 
     __mapper_args__ = {
         'include_properties': [
@@ -48,11 +51,13 @@ class Bet(db.Model):
             'bet_date', 'wager', 'original_odds', 'boosted_odds', 'final_odds', 'is_boosted',
             'potential_winnings', 'actual_winnings', 'has_insurance', 'insurance_type',
             'insurance_amount', 'insurance_triggered', 'total_legs', 'legs_won', 'legs_lost',
-            'legs_pending', 'legs_live', 'legs_void', 'last_api_update', 'secondary_bettors', 'watchers'
+            'legs_pending', 'legs_live', 'legs_void', 'last_api_update', 'secondary_bettors', 'watchers',
+            'search_document'
         ]
     }
 
-    def get_bet_data(self):
+    def get_bet_data(self, include_legs=True):
+        """Parsed bet_data JSON; legs are filled from bet_legs_rel unless include_legs=False."""
         import json
         data = {}
         if self.bet_data:
@@ -62,12 +67,19 @@ class Bet(db.Model):
                 data = {}
         
         # Include legs from database relationship if not already in bet_data
-        if 'legs' not in data and self.bet_legs_rel:
+        if include_legs and 'legs' not in data and self.bet_legs_rel:
             data['legs'] = [leg.to_dict() for leg in sorted(self.bet_legs_rel, key=lambda x: x.leg_order or 0)]
         
         return data
 
-    def to_dict_structured(self, use_live_data=False):
+    def to_dict_structured(self, use_live_data=False, context=None):
+        """Serialize the bet with its legs.
+
+        Args:
+            use_live_data: Kept for API compatibility
+            context: Optional BetSerializationContext with preloaded users/players/teams.
+                     Pass one when serializing many bets to avoid per-bet queries.
+        """
         result = {
             'db_id': self.id,
             'betting_site_id': self.betting_site_id,
@@ -107,10 +119,11 @@ class Bet(db.Model):
         # Resolve bettor usernames for display (primary bettor first, then secondary)
         from models.user import User
         bettor_usernames = []
+        get_user = context.get_user if context is not None else User.query.get
         
         # Primary bettor (always first)
         if self.user_id:
-            primary_user = User.query.get(self.user_id)
+            primary_user = get_user(self.user_id)
             if primary_user:
                 bettor_usernames.append(primary_user.username)
         
@@ -118,16 +131,15 @@ class Bet(db.Model):
         if self.secondary_bettors:
             for user_id in self.secondary_bettors:
                 if user_id:
-                    secondary_user = User.query.get(user_id)
+                    secondary_user = get_user(user_id)
                     if secondary_user:
                         bettor_usernames.append(secondary_user.username)
         
         result['bettor_usernames'] = bettor_usernames
         
         # Add name field for process_parlay_data compatibility
-        # Add name field for process_parlay_data compatibility
-        # Check if name exists in bet_data first
-        bet_data_obj = self.get_bet_data()
+        # Check if name exists in bet_data first (legs aren't needed for the name)
+        bet_data_obj = self.get_bet_data(include_legs=False)
         if bet_data_obj.get('name'):
             result['name'] = bet_data_obj['name']
         elif self.bet_type == 'SGP':
@@ -143,7 +155,7 @@ class Bet(db.Model):
         
         # Include legs from database relationship
         if self.bet_legs_rel:
-            result['legs'] = [leg.to_dict() for leg in sorted(self.bet_legs_rel, key=lambda x: x.leg_order or 0)]
+            result['legs'] = [leg.to_dict(context=context) for leg in sorted(self.bet_legs_rel, key=lambda x: x.leg_order or 0)]
         else:
             result['legs'] = []
             
@@ -151,6 +163,7 @@ class Bet(db.Model):
         # This ensures the frontend always has game status information
         if 'games' not in result:
             from models import Team
+            get_team = context.get_team if context is not None else Team.get_team_by_name_cached
             games_map = {}
             for leg in result['legs']:
                 if leg.get('home_team') and leg.get('away_team'):
@@ -161,8 +174,8 @@ class Bet(db.Model):
                     game_key = f"{leg['away_team']}-{leg['home_team']}"
                     if game_key not in games_map:
                         # Look up team abbreviations from teams table using cached lookup
-                        home_team_obj = Team.get_team_by_name_cached(leg["home_team"])
-                        away_team_obj = Team.get_team_by_name_cached(leg["away_team"])
+                        home_team_obj = get_team(leg["home_team"])
+                        away_team_obj = get_team(leg["away_team"])
                         
                         home_abbr = home_team_obj.team_abbr if home_team_obj else leg['home_team'][:3].upper()
                         away_abbr = away_team_obj.team_abbr if away_team_obj else leg['away_team'][:3].upper()
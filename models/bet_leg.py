@@ -88,7 +88,7 @@ class BetLeg(db.Model):
         
         return None
 
-    def to_dict(self):
+    def to_dict(self, context=None):
         base_dict = {
             'id': self.id,
             'bet_id': self.bet_id,
@@ -147,7 +147,7 @@ class BetLeg(db.Model):
         }
         
         # Add jersey and team branding info
-        self._add_branding_info(base_dict)
+        self._add_branding_info(base_dict, context=context)
         
         # Add display values for moneyline and spread bets
         display_values = self.get_display_values()
@@ -155,8 +155,12 @@ class BetLeg(db.Model):
         
         return base_dict
 
-    def _add_branding_info(self, data):
-        """Add jersey number, team colors, and logo to the dictionary."""
+    def _add_branding_info(self, data, context=None):
+        """Add jersey number, team colors, and logo to the dictionary.
+
+        When a BetSerializationContext is given, players and teams come from its
+        preloaded maps instead of per-leg queries.
+        """
         from models.player import Player
         from models.team import Team
         
@@ -167,15 +171,15 @@ class BetLeg(db.Model):
         data['team_logo'] = '/media/unknown-logo.svg'
         
         # 1. Fetch Player Jersey Number
-        # Optimization: Use joinedload in query instead of fetching here if possible, 
-        # but for now we'll just keep it simple. Player data is harder to cache globally.
-        if self.player_id:
+        if context is not None:
+            data['player_jersey_number'] = context.get_jersey_number(self.player_id, self.player_name, self.sport)
+        elif self.player_id:
             player = Player.query.get(self.player_id)
             if player and player.jersey_number:
                 data['player_jersey_number'] = player.jersey_number
         
         # If not found by ID (e.g. new player), try matching by name and sport
-        if data['player_jersey_number'] is None and self.player_name and self.sport:
+        if context is None and data['player_jersey_number'] is None and self.player_name and self.sport:
             player = Player.query.filter_by(player_name=self.player_name, sport=self.sport).first()
             if player and player.jersey_number:
                 data['player_jersey_number'] = player.jersey_number
@@ -184,7 +188,7 @@ class BetLeg(db.Model):
         # Optimization: Use cached team lookup
         team_name = self.player_team or self.home_team or self.away_team
         if team_name:
-            team = Team.get_team_by_name_cached(team_name)
+            team = context.get_team(team_name) if context is not None else Team.get_team_by_name_cached(team_name)
             
             if team:
                 if team.color:
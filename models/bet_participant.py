@@ -0,0 +1,71 @@
+from models import db
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+
+class BetParticipant(db.Model):
+    """Normalized bet access: one row per (bet, user) with the user's role.
+
+    Mirrors Bet.user_id / secondary_bettors / watchers so listing queries can
+    use an indexed join instead of matching on the array columns. Kept in sync
+    automatically on every ORM write to those columns (see sync hook below).
+    """
+    __tablename__ = 'bet_participants'
+
+    ROLE_PRIMARY = 'primary'
+    ROLE_SECONDARY = 'secondary'
+    ROLE_WATCHER = 'watcher'
+
+    bet_id = db.Column(db.Integer, db.ForeignKey('bets.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    role = db.Column(db.String(20), nullable=False)
+
+    __table_args__ = (
+        db.Index('idx_bet_participants_user_role', 'user_id', 'role', 'bet_id'),
+    )
+
+    def __repr__(self):
+        return f'<BetParticipant bet={self.bet_id} user={self.user_id} ({self.role})>'
+
+    @staticmethod
+    def roles_for(user_id, secondary_bettors, watchers):
+        """{user_id: role} for a bet; a user appears once with their strongest role."""
+        roles = {}
+        for uid in watchers or []:
+            if uid:
+                roles[int(uid)] = BetParticipant.ROLE_WATCHER
+        for uid in secondary_bettors or []:
+            if uid:
+                roles[int(uid)] = BetParticipant.ROLE_SECONDARY
+        if user_id:
+            roles[int(user_id)] = BetParticipant.ROLE_PRIMARY
+        return roles
+
+
+def sync_bet_participants(bet):
+    """Make bet.participants match user_id / secondary_bettors / watchers."""
+    desired = BetParticipant.roles_for(bet.user_id, bet.secondary_bettors, bet.watchers)
+    for participant in list(bet.participants):
+        role = desired.pop(participant.user_id, None)
+        if role is None:
+            bet.participants.remove(participant)
+        elif participant.role != role:
+            participant.role = role
+    for user_id, role in desired.items():
+        bet.participants.append(BetParticipant(user_id=user_id, role=role))
+
+
+@event.listens_for(Session, 'before_flush')
+def _sync_participants_before_flush(session, flush_context, instances):
+    from models.bet import Bet
+
+    with session.no_autoflush:
+        for obj in list(session.new) + list(session.dirty):
+            if not isinstance(obj, Bet) or obj in session.deleted:
+                continue
+            if obj in session.new:
+                sync_bet_participants(obj)
+                continue
+            state = inspect(obj)
+            if any(state.attrs[name].history.has_changes() for name in ('user_id', 'secondary_bettors', 'watchers')):
+                sync_bet_participants(obj)
@@ -0,0 +1,31 @@
+from models import db
+
+
+class JobWatermark(db.Model):
+    """Progress marker for incremental background jobs, one row per job.
+
+    ``watermark`` is the database time up to which the job has processed
+    rows; the next run only looks at rows updated after it.
+    """
+    __tablename__ = 'job_watermarks'
+
+    job_name = db.Column(db.String(100), primary_key=True)
+    watermark = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=db.func.now(), onupdate=db.func.now())
+
+    def __repr__(self):
+        return f'<JobWatermark {self.job_name} {self.watermark}>'
+
+    @staticmethod
+    def get(job_name):
+        row = db.session.get(JobWatermark, job_name)
+        return row.watermark if row is not None else None
+
+    @staticmethod
+    def set(job_name, watermark):
+        """Store the watermark (committed by the caller with the job's writes)."""
+        row = db.session.get(JobWatermark, job_name)
+        if row is None:
+            row = JobWatermark(job_name=job_name)
+            db.session.add(row)
+        row.watermark = watermark
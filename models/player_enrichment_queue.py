@@ -0,0 +1,30 @@
+from models import db
+
+
+class PlayerEnrichmentQueue(db.Model):
+    """Work queue for the player enrichment job, one row per player needing work.
+
+    Rows are taken in (priority, enqueued_at, player_id) order; a processed
+    player's row is deleted, while one that failed (or is still incomplete)
+    stays with an exponential ``next_attempt_at`` backoff. Unprocessed rows
+    remain at the head, so each run resumes where the previous one stopped.
+    """
+    __tablename__ = 'player_enrichment_queue'
+
+    PRIORITY_ACTIVE = 0   # in live or pending legs
+    PRIORITY_RECENT = 1   # in recent legs
+    PRIORITY_BACKGROUND = 2
+
+    player_id = db.Column(db.Integer, primary_key=True)
+    priority = db.Column(db.Integer, nullable=False, default=PRIORITY_BACKGROUND)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime)
+    last_error = db.Column(db.String(255))
+    enqueued_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+    __table_args__ = (
+        db.Index('idx_player_enrichment_queue_order', 'priority', 'enqueued_at', 'player_id'),
+    )
+
+    def __repr__(self):
+        return f'<PlayerEnrichmentQueue player={self.player_id} priority={self.priority} attempts={self.attempts}>'
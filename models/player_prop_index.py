@@ -0,0 +1,31 @@
+from models import db
+
+
+class PlayerPropIndex(db.Model):
+    """Precomputed history for one (sport, player, stat_type).
+
+    Combines game-log values from Player.stats_last_5_games (accumulated
+    across enrichment runs) with the achieved values and outcomes of our own
+    settled legs. ``sorted_values`` lets a hit rate for any line be answered
+    with a binary search instead of scanning bet_legs and JSON columns.
+
+    Maintained by services.player_props on every write to settled legs and
+    player stats; never written directly.
+    """
+    __tablename__ = 'player_prop_index'
+
+    sport = db.Column(db.String(20), primary_key=True)
+    player_key = db.Column(db.String(100), primary_key=True)
+    stat_type = db.Column(db.String(50), primary_key=True)
+
+    player_id = db.Column(db.Integer)
+    log_values = db.Column(db.JSON)     # {game_key: value} from ESPN game logs
+    leg_results = db.Column(db.JSON)    # {leg_id: [line, side, hit, game_key, achieved_value]}
+    sorted_values = db.Column(db.JSON)  # per-game values, ascending (one per game)
+    legs_settled = db.Column(db.Integer, nullable=False, default=0)
+    legs_won = db.Column(db.Integer, nullable=False, default=0)
+    season = db.Column(db.JSON)         # {'season': year, 'value': v, 'games_played': n}
+    updated_at = db.Column(db.DateTime, default=db.func.now(), onupdate=db.func.now())
+
+    def __repr__(self):
+        return f'<PlayerPropIndex {self.sport} {self.player_key} {self.stat_type}>'
@@ -0,0 +1,84 @@
+from models import db
+from sqlalchemy import event, insert, literal, select
+
+
+class SyncTombstone(db.Model):
+    """A deletion as seen by one user, for /api/sync delta responses.
+
+    Rows are written from mapper events whenever a bet or leg is deleted, or
+    a user stops participating in a bet, so clients syncing since a cursor
+    learn which cached ids to drop. Old rows are pruned periodically; a
+    cursor older than the retention window forces a full reload instead.
+    """
+    __tablename__ = 'sync_tombstones'
+
+    ENTITY_BET = 'bet'
+    ENTITY_LEG = 'leg'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    entity_type = db.Column(db.String(10), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    bet_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+    __table_args__ = (
+        db.Index('idx_sync_tombstones_user_deleted', 'user_id', 'deleted_at'),
+    )
+
+    def __repr__(self):
+        return f'<SyncTombstone {self.entity_type} {self.entity_id} user={self.user_id}>'
+
+    @staticmethod
+    def record_bets(connection, bet_ids):
+        """Tombstone bets for every current participant (call before deleting them).
+
+        Needed for bulk deletes, which bypass the mapper events below.
+        """
+        from models.bet_participant import BetParticipant
+
+        if not bet_ids:
+            return
+        _insert_for_participants(connection, SyncTombstone.ENTITY_BET, BetParticipant.bet_id,
+                                 BetParticipant.bet_id.in_(list(bet_ids)))
+
+
+def _insert_for_participants(connection, entity_type, entity_id, condition):
+    """INSERT ... SELECT one tombstone per participant row matching ``condition``."""
+    from models.bet_participant import BetParticipant
+
+    rows = select(
+        BetParticipant.user_id, literal(entity_type), entity_id, BetParticipant.bet_id,
+    ).where(condition)
+    connection.execute(
+        insert(SyncTombstone).from_select(['user_id', 'entity_type', 'entity_id', 'bet_id'], rows)
+    )
+
+
+def _register_tombstone_events():
+    from models.bet import Bet
+    from models.bet_leg import BetLeg
+    from models.bet_participant import BetParticipant
+
+    @event.listens_for(Bet, 'before_delete')
+    def _bet_deleted(mapper, connection, target):
+        # Participants go with the bet (DB cascade), so read them first
+        SyncTombstone.record_bets(connection, [target.id])
+
+    @event.listens_for(BetLeg, 'after_delete')
+    def _leg_deleted(mapper, connection, target):
+        if target.bet_id is None:
+            return
+        _insert_for_participants(connection, SyncTombstone.ENTITY_LEG, literal(target.id),
+                                 BetParticipant.bet_id == target.bet_id)
+
+    @event.listens_for(BetParticipant, 'after_delete')
+    def _participant_removed(mapper, connection, target):
+        # Lost access (or the bet itself went): the bet disappears for this user
+        connection.execute(insert(SyncTombstone).values(
+            user_id=target.user_id, entity_type=SyncTombstone.ENTITY_BET,
+            entity_id=target.bet_id, bet_id=target.bet_id,
+        ))
+
+
+_register_tombstone_events()
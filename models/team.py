@@ -78,69 +78,37 @@ class Team(db.Model):
     def __repr__(self):
         return f'<Team {self.team_name} ({self.sport})>'
 
+    @staticmethod
+    def find_cached_team(team_name):
+        """Get a detached (read-only) team from the cache without touching the session.
+
+        Use this when only team attributes are read (e.g. serialization);
+        use get_team_by_name_cached when the team must be session-bound.
+        """
+        if not team_name:
+            return None
+        from helpers.team_resolver import team_resolver
+        try:
+            return team_resolver.resolve(team_name)
+        except Exception as e:
+            print(f"Unexpected error in find_cached_team: {e}")
+            return None
+
     @staticmethod
     def get_team_by_name_cached(team_name):
         """Get team by name or abbreviation using a cache to avoid DB hits."""
         if not team_name:
             return None
-            
-        # Initialize cache if needed
-        if not hasattr(Team, '_team_cache'):
-            Team._team_cache = {}
-            Team._team_cache_time = 0
-            
-        import time
+
         from sqlalchemy.exc import PendingRollbackError, OperationalError
-        
+        from helpers.team_resolver import team_resolver
+
         for attempt in range(2):
             try:
-                current_time = time.time()
-                
-                # Refresh cache every hour
-                if current_time - getattr(Team, '_team_cache_time', 0) > 3600:
-                    all_teams = Team.query.all()
-                    # Expunge all teams from session so they are detached but loaded.
-                    # This prevents them from being expired when the session commits/rolls back,
-                    # avoiding DetachedInstanceError when accessing attributes later.
-                    for t in all_teams:
-                        db.session.expunge(t)
-                        
-                    Team._team_cache = {t.team_name.lower(): t for t in all_teams}
-                    # Also index by abbreviation and short name
-                    for t in all_teams:
-                        if t.team_abbr:
-                            Team._team_cache[t.team_abbr.lower()] = t
-                        if t.team_name_short:
-                            Team._team_cache[t.team_name_short.lower()] = t
-                    Team._team_cache_time = current_time
-                    
-                team_name_lower = team_name.lower()
-                
-                # Try exact match from cache
-                t = None
-                if team_name_lower in Team._team_cache:
-                    t = Team._team_cache[team_name_lower]
-                
-                # Try partial match if not found
-                if not t:
-                    for key, team in Team._team_cache.items():
-                        if team_name_lower in key or key in team_name_lower:
-                            t = team
-                            break
-                
-                # Fallback for specific known issues
-                if not t and team_name_lower.startswith('los angeles'):
-                    la_teams = ['lakers', 'clippers', 'rams', 'chargers', 'dodgers', 'angels', 'kings', 'galaxy', 'la fc']
-                    for suffix in la_teams:
-                        if suffix in team_name_lower:
-                            for key, team in Team._team_cache.items():
-                                if suffix in key:
-                                    t = team
-                                    break
-                            if t: break
+                t = team_resolver.resolve(team_name)
 
                 if t:
-                    return db.session.merge(t)
+                    return db.session.get(Team, t.id)
                 return None
 
             except (PendingRollbackError, OperationalError) as e:
@@ -161,45 +129,8 @@ class Team(db.Model):
         """Get just the team abbreviation string from cache.
         This avoids db.session.merge() which is expensive and causes transaction issues.
         """
-        # Reuse the logic from get_team_by_name_cached but return string only
-        # We can call the main method to ensure cache is populated/refreshed
-        # But we need to be careful not to trigger the merge if we can avoid it.
-        
-        if not team_name:
-            return ""
-            
-        # Ensure cache is initialized
-        if not hasattr(Team, '_team_cache'):
-            # Trigger cache load by calling the main method with a dummy or just copying the init logic
-            # Let's copy the init logic to be safe and efficient
-            Team.get_team_by_name_cached("ensure_cache_init")
-            
-        team_name_lower = team_name.lower()
-        t = None
-        
-        # 1. Exact match
-        if team_name_lower in Team._team_cache:
-            t = Team._team_cache[team_name_lower]
-            
-        # 2. Partial match
-        if not t:
-            for key, team in Team._team_cache.items():
-                if team_name_lower in key or key in team_name_lower:
-                    t = team
-                    break
-                    
-        # 3. Fallback (LA teams etc)
-        if not t and team_name_lower.startswith('los angeles'):
-            la_teams = ['lakers', 'clippers', 'rams', 'chargers', 'dodgers', 'angels', 'kings', 'galaxy', 'la fc']
-            for suffix in la_teams:
-                if suffix in team_name_lower:
-                    for key, team in Team._team_cache.items():
-                        if suffix in key:
-                            t = team
-                            break
-                    if t: break
-                    
+        t = Team.find_cached_team(team_name)
         if t and t.team_abbr:
             return t.team_abbr
             
-        return ""
\ No newline at end of file
+        return ""
@@ -0,0 +1,28 @@
+from models import db
+
+
+class TeamAlias(db.Model):
+    """Spelling of a team name -> the canonical name bet_legs should store.
+
+    ``alias`` is the lowercased, trimmed spelling and ``sport`` the leg's
+    sport (or '*' for legs without one), so the team name standardization
+    job can rewrite legs with a set-based UPDATE joined on this table.
+    Rows come from the teams table (source 'team') or from spellings the
+    team resolver matched once (source 'learned'). ``canonical`` is NULL
+    for spellings known not to match any team.
+    """
+    __tablename__ = 'team_aliases'
+
+    SOURCE_TEAM = 'team'
+    SOURCE_LEARNED = 'learned'
+    ALL_SPORTS = '*'
+
+    alias = db.Column(db.String(100), primary_key=True)
+    sport = db.Column(db.String(20), primary_key=True)
+    canonical = db.Column(db.String(100))
+    team_id = db.Column(db.Integer)
+    source = db.Column(db.String(10), nullable=False, default=SOURCE_TEAM)
+    created_at = db.Column(db.DateTime, default=db.func.now())
+
+    def __repr__(self):
+        return f'<TeamAlias {self.sport} {self.alias!r} -> {self.canonical!r}>'
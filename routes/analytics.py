@@ -0,0 +1,63 @@
+from datetime import date
+from typing import Any
+
+from flask import Blueprint, jsonify, request
+from flask_login import login_required, current_user
+
+from services import performance_summary, prop_line_history
+
+analytics_bp = Blueprint('analytics', __name__)
+
+
+@analytics_bp.route('/api/analytics/summary')
+@login_required
+def analytics_summary() -> Any:
+	"""ROI, win rate and profit for the current user's settled bets.
+	
+	Query params (all optional):
+		group_by: sport | site | stat_type | day | month
+		from, to: inclusive YYYY-MM-DD bounds on the bet date
+		sport, site, stat_type: filters
+	
+	Answered from the analytics rollups, so cost doesn't grow with history.
+	"""
+	try:
+		date_from = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+		date_to = date.fromisoformat(request.args['to']) if request.args.get('to') else None
+		summary = performance_summary(
+			current_user.id,
+			group_by=request.args.get('group_by') or None,
+			date_from=date_from,
+			date_to=date_to,
+			sport=request.args.get('sport') or None,
+			site=request.args.get('site') or None,
+			stat_type=request.args.get('stat_type') or None,
+		)
+	except ValueError as e:
+		return jsonify({"error": str(e)}), 400
+	response = jsonify(summary)
+	response.headers['Cache-Control'] = 'private, no-cache'
+	return response
+
+
+@analytics_bp.route('/api/analytics/prop-history')
+@login_required
+def prop_history() -> Any:
+	"""How often a player has cleared a line, from the player prop index.
+	
+	Query params: player, stat, line (required); side (over | under, default
+	over); sport (optional).
+	"""
+	player = (request.args.get('player') or '').strip()
+	stat = (request.args.get('stat') or '').strip()
+	line = request.args.get('line', type=float)
+	side = (request.args.get('side') or 'over').lower()
+	if not player or not stat or line is None:
+		return jsonify({"error": "player, stat and a numeric line are required"}), 400
+	if side not in ('over', 'under'):
+		return jsonify({"error": "side must be 'over' or 'under'"}), 400
+	
+	history = prop_line_history(player, stat, line, side=side, sport=request.args.get('sport') or None)
+	if history is None:
+		return jsonify({"error": f"No history for {player} ({stat})"}), 404
+	return jsonify(history)
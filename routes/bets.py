@@ -1,11 +1,11 @@
-from flask import Blueprint, jsonify, request, session
+from flask import Blueprint, jsonify, request, session, current_app, abort
 from typing import Any
 from flask_login import login_required, current_user
 from models import db, Bet, BetLeg
-from services import get_user_bets_query, process_parlay_data, sort_parlays_by_date
+from services import get_user_bets_query, process_parlay_data, sort_parlays_by_date, serialize_bets, get_processed_bet_payloads, invalidate_bet_payloads, bet_version_column, apply_bet_search, shape_bet_payloads, sync_bets, batch_set_archived, batch_delete_bets, batch_correct_sport, parse_bet_ids
 from stat_standardization import standardize_stat_type, get_all_stats_for_sport
 from helpers.database import has_complete_final_data, save_final_results_to_bet, auto_move_completed_bets, auto_move_pending_to_live
-from sqlalchemy import or_
+from sqlalchemy import or_, func, distinct, tuple_
 import datetime as dt_module  # Import entire datetime module
 import pytz  # For timezone handling
 # from app import app  # Removed to avoid circular import
@@ -14,7 +14,11 @@ import logging
 import os
 import requests
 import json
+import base64
+import hashlib
+import time
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import HTTPException
 
 bets_bp = Blueprint('bets', __name__)
 logger = logging.getLogger(__name__)
@@ -231,6 +235,65 @@ def db_error_handler(f):
                 raise
     return wrapper
 
+def bets_etag(query, fetch_live=False):
+    """Cheap version token for a bet listing.
+
+    One aggregate query (count + max updated_at over the bets and their legs)
+    combined with the user and request parameters. Endpoints that merge live
+    ESPN data also include the game cache generation and expiry window.
+    """
+    from services import bet_service
+    
+    bet_count, bets_updated, legs_updated = query.outerjoin(
+        BetLeg, BetLeg.bet_id == Bet.id
+    ).with_entities(
+        func.count(distinct(Bet.id)), func.max(Bet.updated_at), func.max(BetLeg.updated_at)
+    ).order_by(None).one()
+    
+    # 't' is a client-side cache buster and must not affect the version
+    params = sorted((k, v) for k, v in request.args.items(multi=True) if k != 't')
+    parts = [request.path, getattr(current_user, 'id', None), bet_count, bets_updated, legs_updated, params]
+    if fetch_live:
+        parts += [bet_service.game_cache_generation, int(time.time() // bet_service.CACHE_EXPIRATION)]
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+def encode_cursor(bet_date, bet_id):
+    """Opaque keyset cursor for (bet_date, id) pagination."""
+    raw = json.dumps([bet_date or '', bet_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_cursor(cursor):
+    """Decode a cursor from encode_cursor(); raises ValueError if malformed."""
+    try:
+        bet_date, bet_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return str(bet_date), int(bet_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def shape_bets(payloads):
+    """Apply ?v= (payload schema version) and ?fields= selection to processed bets."""
+    try:
+        return shape_bet_payloads(
+            payloads,
+            version=request.args.get('v', 1, type=int),
+            fields=request.args.get('fields')
+        )
+    except ValueError as e:
+        abort(400, description=str(e))
+
+def not_modified_response(etag):
+    """Return a 304 response if the client already has this version, else None."""
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        return with_etag(response, etag)
+    return None
+
+def with_etag(response, etag):
+    """Attach the ETag and force revalidation on every use."""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 # API Endpoints
 
 @bets_bp.route('/api/bets', methods=['POST'])
@@ -343,8 +406,8 @@ def update_bet(bet_id: int) -> Any:
 @login_required
 def delete_bet(bet_id: int) -> Any:
 	try:
-		# ...existing code...
-		return jsonify({})
+		result = batch_delete_bets(current_user.id, [bet_id])
+		return single_bet_result(result)
 	except Exception as e:
 		return jsonify({"error": str(e)}), 500
 
@@ -369,62 +432,22 @@ def correct_sport(bet_id):
             'sport': 'NBA'
         }
     """
-    bet = Bet.query.get(bet_id)
-    if not bet or not current_user.can_access(bet):
-        return {'error': 'Bet not found'}, 404
-    
     data = request.json or {}
-    new_sport = data.get('sport', '').strip().upper()
-    
-    # Validate sport
-    VALID_SPORTS = {'NFL', 'NBA', 'MLB', 'NHL', 'NCAAF', 'NCAAB'}
-    if new_sport not in VALID_SPORTS:
-        return {'error': f'Invalid sport. Must be one of: {", ".join(VALID_SPORTS)}'}, 400
-    
-    # Determine which legs to update (all, or specific leg_order)
-    leg_order = data.get('leg_order')  # Optional: specific leg to update
-    
-    # Get all bet legs
-    bet_legs = BetLeg.query.filter_by(bet_id=bet_id).all()
-    
-    updated_count = 0
-    for leg in bet_legs:
-        # If specific leg_order provided, only update that leg
-        if leg_order is not None and leg.leg_order != leg_order:
-            continue
-        
-        # Only update if sport is different
-        if leg.sport != new_sport:
-            leg.sport = new_sport
-            leg.status = 'pending'  # Reset status to force re-fetch
-            leg.achieved_value = None  # Clear cached values
-            leg.home_score = None
-            leg.away_score = None
-            leg.current_quarter = None
-            leg.time_remaining = None
-            updated_count += 1
-    
-    if updated_count > 0:
-        db.session.commit()
-        
-        # Clear game data cache for this bet (if cache exists)
-        # This ensures next live tracking will fetch fresh ESPN data
-        cache_key = f"bet_games_{bet_id}"
-        try:
-            from app import cache
-            cache.delete(cache_key)
-        except Exception:
-            pass  # Cache not available, will be cleared naturally
-        
-        logger.info(f"Sport corrected for bet {bet_id}: {updated_count} legs updated to {new_sport}")
-        
-        return {
-            'message': f'Sport corrected to {new_sport}',
-            'legs_updated': updated_count,
-            'sport': new_sport
-        }, 200
-    else:
-        return {'message': 'No changes needed (sport already set to ' + new_sport + ')'}, 200
+    try:
+        result = batch_correct_sport(current_user.id, [bet_id], data.get('sport'), data.get('leg_order'))
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    outcome = result['results'][0]['result']
+    if outcome in ('not_found', 'forbidden'):
+        return {'error': 'Bet not found'}, 404
+    if outcome == 'unchanged':
+        return {'message': 'No changes needed (sport already set to ' + result['sport'] + ')'}, 200
+    return {
+        'message': f"Sport corrected to {result['sport']}",
+        'legs_updated': result['legs_updated'],
+        'sport': result['sport']
+    }, 200
 
 
 @bets_bp.route('/api/bets/<int:bet_id>/confidence', methods=['GET'])
@@ -514,8 +537,8 @@ def get_sport_confidence(bet_id):
 @login_required
 def archive_bet(bet_id: int) -> Any:
 	try:
-		# ...existing code...
-		return jsonify({})
+		result = batch_set_archived(current_user.id, [bet_id], archived=True)
+		return single_bet_result(result)
 	except Exception as e:
 		return jsonify({"error": str(e)}), 500
 
@@ -524,30 +547,77 @@ def archive_bet(bet_id: int) -> Any:
 def get_archived_bets() -> Any:
 	try:
 		bets = get_user_bets_query(current_user, is_archived=True).options(db.joinedload(Bet.bet_legs_rel)).all()
-		archived_parlays = [bet.to_dict_structured(use_live_data=True) for bet in bets]
+		archived_parlays = serialize_bets(bets, use_live_data=True)
 		processed = process_parlay_data(archived_parlays)
-		return jsonify({"archived": processed})
+		return jsonify({"archived": shape_bets(processed)})
+	except HTTPException:
+		raise
 	except Exception as e:
 		return jsonify({"error": str(e)}), 500
 
 
 
+BATCH_ACTIONS = ('archive', 'unarchive', 'delete', 'sport')
+
+def run_bet_batch(action: str, data: dict) -> Any:
+	"""Apply one batch action to data['bet_ids']; per-id results, 400 on bad input."""
+	try:
+		bet_ids = parse_bet_ids(data.get('bet_ids'))
+		if action == 'archive':
+			result = batch_set_archived(current_user.id, bet_ids, archived=True)
+		elif action == 'unarchive':
+			result = batch_set_archived(current_user.id, bet_ids, archived=False)
+		elif action == 'delete':
+			result = batch_delete_bets(current_user.id, bet_ids)
+		elif action == 'sport':
+			result = batch_correct_sport(current_user.id, bet_ids, data.get('sport'), data.get('leg_order'))
+		else:
+			raise ValueError(f"Invalid action. Must be one of: {', '.join(BATCH_ACTIONS)}")
+	except ValueError as e:
+		return jsonify({"error": str(e)}), 400
+	result['success'] = True
+	return jsonify(result)
+
+def single_bet_result(result: dict) -> Any:
+	"""Response for a one-bet batch: 404 when the bet isn't the user's to change."""
+	if result['results'][0]['result'] in ('not_found', 'forbidden'):
+		return jsonify({"error": "Bet not found"}), 404
+	result['success'] = True
+	return jsonify(result)
+
+@bets_bp.route('/api/bets/batch', methods=['POST'])
+@login_required
+def batch_bets() -> Any:
+	"""Archive, unarchive, delete or correct the sport of many bets in one request.
+
+	Body: {"action": "archive|unarchive|delete|sport", "bet_ids": [...],
+	"sport": "NBA", "leg_order": 0}. The response lists a result per bet id
+	(ok / unchanged / forbidden / not_found).
+	"""
+	try:
+		data = request.get_json(silent=True) or {}
+		return run_bet_batch(data.get('action'), data)
+	except Exception as e:
+		db.session.rollback()
+		logger.error(f"Error running bet batch: {e}")
+		return jsonify({"error": str(e)}), 500
+
 @bets_bp.route('/api/bets/bulk-archive', methods=['POST'])
 @login_required
 def bulk_archive_bets() -> Any:
 	try:
-		# ...existing code...
-		return jsonify({})
+		return run_bet_batch('archive', request.get_json(silent=True) or {})
 	except Exception as e:
+		db.session.rollback()
 		return jsonify({"error": str(e)}), 500
 
 @bets_bp.route('/api/bets/bulk-unarchive', methods=['POST'])
 @login_required
 def bulk_unarchive_bets() -> Any:
 	try:
-		# ...existing code...
-		return jsonify({})
+		return run_bet_batch('unarchive', request.get_json(silent=True) or {})
 	except Exception as e:
+		db.session.rollback()
 		return jsonify({"error": str(e)}), 500
 
 @bets_bp.route('/api/current_user', methods=['GET'])
@@ -583,17 +653,22 @@ def db_health_check():
 @db_error_handler
 def live():
 	# Get all live bets for the current user
-	bets = get_user_bets_query(
+	query = get_user_bets_query(
 		current_user,
 		status='live',
 		is_active=True,
 		is_archived=False
-	).options(db.joinedload(Bet.bet_legs_rel)).all()
+	)
+	etag = bets_etag(query, fetch_live=True)
+	not_modified = not_modified_response(etag)
+	if not_modified:
+		return not_modified
+	bets = query.options(db.joinedload(Bet.bet_legs_rel)).all()
 	
 	# FIXED: Fetch live ESPN data for real-time updates
-	live_parlays = [bet.to_dict_structured(use_live_data=True) for bet in bets]
+	live_parlays = serialize_bets(bets, use_live_data=True)
 	processed = process_parlay_data(live_parlays, fetch_live=True)
-	return jsonify(sort_parlays_by_date(processed))
+	return with_etag(jsonify(shape_bets(sort_parlays_by_date(processed))), etag)
 
 @bets_bp.route("/todays")
 @login_required
@@ -602,17 +677,22 @@ def todays():
 	# FIXED: Fetch live ESPN data for real-time updates
 	
 	# /todays shows only bets with status='pending'
-	bets = get_user_bets_query(
+	query = get_user_bets_query(
 		current_user,
 		status='pending',
 		is_active=True,
 		is_archived=False
-	).options(db.joinedload(Bet.bet_legs_rel)).all()
+	)
+	etag = bets_etag(query, fetch_live=True)
+	not_modified = not_modified_response(etag)
+	if not_modified:
+		return not_modified
+	bets = query.options(db.joinedload(Bet.bet_legs_rel)).all()
 	
 	# FIXED: Fetch live ESPN data for real-time updates
-	todays_parlays = [bet.to_dict_structured(use_live_data=True) for bet in bets]
+	todays_parlays = serialize_bets(bets, use_live_data=True)
 	processed = process_parlay_data(todays_parlays, fetch_live=True)
-	return jsonify(sort_parlays_by_date(processed))
+	return with_etag(jsonify(shape_bets(sort_parlays_by_date(processed))), etag)
 
 @bets_bp.route("/historical")
 @login_required
@@ -621,9 +701,15 @@ def historical():
 	from app import app  # Import here to avoid circular import
 	from datetime import datetime, timedelta
 	try:
-		# Get pagination parameters
+		# Get pagination parameters.
+		# ?cursor=... selects keyset pagination; ?page=N is kept for compatibility.
 		page = request.args.get('page', 1, type=int)
 		per_page = request.args.get('per_page', 50, type=int)
+		cursor = request.args.get('cursor', '').strip()
+		try:
+			cursor_key = decode_cursor(cursor) if cursor else None
+		except ValueError as e:
+			return jsonify({"error": str(e)}), 400
 		
 		# Get filter parameters
 		filter_site = request.args.get('site', '').strip()
@@ -640,7 +726,7 @@ def historical():
 		base_query = get_user_bets_query(
 			current_user,
 			status=['won', 'lost', 'completed']
-		).options(db.joinedload(Bet.bet_legs_rel))
+		)
 		
 		# Apply filters BEFORE pagination
 		
@@ -674,15 +760,15 @@ def historical():
 			cutoff_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
 			base_query = base_query.filter(Bet.bet_date >= cutoff_date)
 		
-		# Filter by search term (searches in bet_data JSON, betting_site)
+		# Filter by search term (indexed search over players, teams, stat types, site and bet name)
 		if filter_search:
-			search_pattern = f'%{filter_search}%'
-			base_query = base_query.filter(
-				or_(
-					Bet.bet_data.ilike(search_pattern),
-					Bet.betting_site.ilike(search_pattern)
-				)
-			)
+			base_query = apply_bet_search(base_query, filter_search)
+		
+		# Idle clients revalidate with a single aggregate query
+		etag = bets_etag(base_query)
+		not_modified = not_modified_response(etag)
+		if not_modified:
+			return not_modified
 		
 		# Get total count for pagination metadata (AFTER filters applied)
 		total_bets = base_query.count()
@@ -692,24 +778,31 @@ def historical():
 		if page > total_pages and total_pages > 0:
 			page = total_pages
 		
-		# Order by bet_date DESC for consistent pagination (newest first)
-		bets = base_query.order_by(Bet.bet_date.desc(), Bet.id.desc()).offset((page - 1) * per_page).limit(per_page).all()
-		
-		app.logger.info(f"[HISTORICAL] Found {len(bets)} bets for page {page} (total filtered: {total_bets})")
+		# Order by bet_date DESC for consistent pagination (newest first).
+		# Only ids + version columns are fetched here; full rows are loaded for cache misses only.
+		page_query = base_query.with_entities(
+			Bet.id, Bet.updated_at, bet_version_column().label('legs_updated_at'), Bet.bet_date
+		).order_by(Bet.bet_date.desc(), Bet.id.desc())
+		if cursor_key:
+			# Keyset: seek past the last row of the previous page (as fast as page one)
+			page_query = page_query.filter(tuple_(Bet.bet_date, Bet.id) < tuple_(*cursor_key))
+		else:
+			page_query = page_query.offset((page - 1) * per_page)
+		# One extra row tells us whether another page exists
+		page_rows = page_query.limit(per_page + 1).all()
+		has_next = len(page_rows) > per_page
+		page_rows = page_rows[:per_page]
+		next_cursor = encode_cursor(page_rows[-1].bet_date, page_rows[-1].id) if has_next else None
 		
-		historical_parlays = []
-		for i, bet in enumerate(bets):
-			try:
-				bet_data = bet.to_dict_structured(use_live_data=False)
-				historical_parlays.append(bet_data)
-			except Exception as e:
-				app.logger.error(f"[HISTORICAL] Error processing bet {bet.id}: {e}")
-				continue
+		app.logger.info(f"[HISTORICAL] Found {len(page_rows)} bets for {'cursor' if cursor_key else f'page {page}'} (total filtered: {total_bets})")
 		
-		app.logger.info(f"[HISTORICAL] Successfully processed {len(historical_parlays)} bets")
+		# Serialized + processed payloads come from the versioned per-bet cache
+		processed_data = get_processed_bet_payloads(
+			[(row.id, (row.updated_at, row.legs_updated_at)) for row in page_rows],
+			fetch_live=False
+		)
 		
-		# Process data for correct score_diff calculations
-		processed_data = process_parlay_data(historical_parlays, fetch_live=False)
+		app.logger.info(f"[HISTORICAL] Successfully processed {len(processed_data)} bets")
 		
 		# Sort within the page (should already be sorted by query, but ensures consistency)
 		sorted_data = sort_parlays_by_date(processed_data)
@@ -726,20 +819,44 @@ def historical():
 			active_filters['search'] = filter_search
 		
 		# Return paginated response with metadata
-		return jsonify({
-			'bets': sorted_data,
-			'page': page,
+		return with_etag(jsonify({
+			'bets': shape_bets(sorted_data),
+			'page': None if cursor_key else page,
 			'per_page': per_page,
 			'total_bets': total_bets,
 			'total_pages': total_pages,
-			'has_next': page < total_pages,
-			'has_prev': page > 1,
+			'has_next': has_next,
+			'has_prev': bool(cursor_key) or page > 1,
+			'next_cursor': next_cursor,
 			'filters': active_filters
-		})
+		}), etag)
+	except HTTPException:
+		raise
 	except Exception as e:
 		app.logger.error(f"[HISTORICAL] Unexpected error: {e}", exc_info=True)
 		return jsonify({"error": str(e)}), 500
 
+@bets_bp.route("/api/sync")
+@login_required
+@db_error_handler
+def sync():
+	"""Bets changed since ?since=<cursor>, plus tombstones for deletions.
+	
+	Call without ``since`` to get a starting cursor (``reset`` is true: load the
+	full lists once), then poll with the returned ``next_cursor``. While
+	``has_more`` is true, request again immediately with the new cursor.
+	Supports the same ``v`` / ``fields`` parameters as the listing endpoints.
+	"""
+	limit = request.args.get('limit', 200, type=int)
+	try:
+		result = sync_bets(current_user.id, request.args.get('since', '').strip() or None, limit)
+	except ValueError as e:
+		return jsonify({"error": str(e)}), 400
+	result['bets'] = shape_bets(result['bets'])
+	response = jsonify(result)
+	response.headers['Cache-Control'] = 'no-store'
+	return response
+
 @bets_bp.route("/stats")
 @login_required
 @db_error_handler
@@ -748,17 +865,22 @@ def stats():
 	# This function makes ESPN API calls for all bets - should only run in background jobs
 	# Background job handles this automatically every 5 minutes
 	
+	etag = bets_etag(get_user_bets_query(current_user, status=['pending', 'live']), fetch_live=True)
+	not_modified = not_modified_response(etag)
+	if not_modified:
+		return not_modified
+	
 	pending_bets = get_user_bets_query(current_user, status='pending').options(db.joinedload(Bet.bet_legs_rel)).all()
-	parlays = [bet.to_dict_structured(use_live_data=True) for bet in pending_bets]
+	parlays = serialize_bets(pending_bets, use_live_data=True)
 	processed_parlays = process_parlay_data(parlays, fetch_live=True)  # Explicitly fetch live data
 	
 	live_bets = get_user_bets_query(current_user, status='live').options(db.joinedload(Bet.bet_legs_rel)).all()
-	live_parlays = [bet.to_dict_structured(use_live_data=True) for bet in live_bets]
+	live_parlays = serialize_bets(live_bets, use_live_data=True)
 	processed_live = process_parlay_data(live_parlays, fetch_live=True)  # Explicitly fetch live data
 	
 	# CRITICAL FIX: Return BOTH pending and live bets, not just live!
 	all_bets = processed_parlays + processed_live
-	return jsonify(sort_parlays_by_date(all_bets))
+	return with_etag(jsonify(shape_bets(sort_parlays_by_date(all_bets))), etag)
 
 
 @bets_bp.route('/api/upload-betslip', methods=['POST'])
@@ -1035,6 +1157,7 @@ def cache_bust():
 	
 	try:
 		clear_game_cache()  # Clear all cached game data
+		invalidate_bet_payloads()  # Force re-serialization of cached bet payloads
 		
 		# TRIGGER AUTOMATION: 
 		# 1. Update live bet legs (fetch fresh data from ESPN and save to DB)
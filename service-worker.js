@@ -1,6 +1,9 @@
-const CACHE_NAME = 'parlay-tracker-v2';
-const STATIC_CACHE = 'static-v2';
-const DYNAMIC_CACHE = 'dynamic-v2';
+const CACHE_NAME = 'parlay-tracker-v3';
+const STATIC_CACHE = 'static-v3';
+const DYNAMIC_CACHE = 'dynamic-v3';
+
+// Bet listing endpoints - revalidated with If-None-Match on every request
+const BET_LISTING_PATHS = ['/live', '/todays', '/historical', '/stats'];
 
 // Files to cache immediately
 const STATIC_ASSETS = [
@@ -60,6 +63,12 @@ self.addEventListener('fetch', (event) => {
     return;
   }
 
+  // Bet listings - conditional request, reuse cached body on 304
+  if (BET_LISTING_PATHS.includes(url.pathname)) {
+    event.respondWith(revalidateListing(request));
+    return;
+  }
+
     // API and auth requests - Network first, cache fallback
   if (url.pathname.includes('/api/') || url.pathname.includes('/admin/') || url.pathname.includes('/auth/')) {
     event.respondWith(
@@ -126,6 +135,43 @@ self.addEventListener('fetch', (event) => {
   );
 });
 
+// Cache key for a listing request ('t' is a client-side cache buster)
+function listingCacheKey(requestUrl) {
+  const key = new URL(requestUrl);
+  key.searchParams.delete('t');
+  return key.toString();
+}
+
+// Send the cached ETag as If-None-Match; on 304 serve the cached copy
+async function revalidateListing(request) {
+  const cacheKey = listingCacheKey(request.url);
+  const cache = await caches.open(DYNAMIC_CACHE);
+  const cached = await cache.match(cacheKey);
+
+  const headers = new Headers(request.headers);
+  const etag = cached && cached.headers.get('ETag');
+  if (etag) {
+    headers.set('If-None-Match', etag);
+  }
+
+  try {
+    const response = await fetch(new Request(request, { headers, cache: 'no-store' }));
+    if (response.status === 304 && cached) {
+      return cached;
+    }
+    if (response.status === 200) {
+      cache.put(cacheKey, response.clone());
+    }
+    return response;
+  } catch (err) {
+    // Offline - fall back to the last known copy
+    if (cached) {
+      return cached;
+    }
+    throw err;
+  }
+}
+
 // Handle messages from clients
 self.addEventListener('message', (event) => {
   if (event.data && event.data.type === 'SKIP_WAITING') {
@@ -1,5 +1,12 @@
 from .bet_service import compute_and_persist_returns, process_parlay_data, calculate_bet_value
 from .user_service import get_user_bets_query
+from .bet_serialization import BetSerializationContext, serialize_bets, get_processed_bet_payloads, invalidate_bet_payloads, bet_version_column, shape_bet_payloads
+from .bet_search import apply_bet_search, rebuild_search_documents
+from .bet_sync import sync_bets, prune_sync_tombstones
+from .analytics import performance_summary, refresh_bet_rollups, rebuild_analytics_rollups
+from .player_props import prop_line_history, rebuild_player_prop_index
+from .bet_batch import batch_set_archived, batch_delete_bets, batch_correct_sport, parse_bet_ids
+from .synthetic_data import generate_synthetic_data
 from helpers.utils import sort_parlays_by_date
 from helpers.database import has_complete_final_data, save_final_results_to_bet, auto_move_completed_bets
 # services package init
\ No newline at end of file
@@ -0,0 +1,397 @@
+"""
+Per-user performance analytics backed by incremental rollups.
+
+Every settled bet contributes to analytics_rollups rows keyed by
+(user, day, sport, site, stat_type); dashboards SUM a handful of those rows
+instead of loading bet history. An after_flush hook recomputes the
+contribution of any bet that settles, un-settles or is corrected after
+settling, and applies the difference (the previous contribution is kept in
+analytics_bet_contributions). Bulk UPDATE/DELETE statements bypass the hook
+and should call refresh_bet_rollups() for the bets they touch.
+
+Most settled bets are stored as 'completed' rather than won/lost; their
+outcome comes from the legs (any lost leg loses, otherwise any won leg wins,
+all void is a void), or from actual_winnings when the legs don't decide it.
+
+Money: ``wagered`` is the stake, ``returned`` the payout including stake
+(actual_winnings when recorded, otherwise potential_winnings for a won bet,
+the stake back for a void/push), so profit = returned - wagered.
+"""
+
+import json
+import logging
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from models import db, Bet, BetLeg
+from models.analytics import AnalyticsRollup, AnalyticsBetContribution
+
+logger = logging.getLogger(__name__)
+
+# Bet status -> outcome counter (None: decided by the legs, see settled_outcome)
+SETTLED_STATUSES = {
+    'won': 'bets_won',
+    'lost': 'bets_lost',
+    'void': 'bets_void',
+    'push': 'bets_void',
+    'completed': None,
+}
+VOID_LEG_STATUSES = ('void', 'push')
+
+# Changes to these on a settled bet (or leg of one) alter its contribution
+ANALYTICS_BET_FIELDS = (
+    'status', 'user_id', 'secondary_bettors', 'betting_site', 'bet_date', 'created_at',
+    'wager', 'potential_winnings', 'actual_winnings',
+)
+ANALYTICS_LEG_FIELDS = ('bet_id', 'status', 'is_hit', 'sport', 'stat_type')
+
+METRICS = ('bets', 'bets_won', 'bets_lost', 'bets_void', 'wagered', 'returned', 'legs', 'legs_won', 'legs_lost')
+MONEY_METRICS = ('wagered', 'returned')
+KEY_COLUMNS = ('user_id', 'day', 'sport', 'site', 'stat_type')
+
+MIXED_SPORT = 'Mixed'
+UNKNOWN_DAY = date(1970, 1, 1)
+
+GROUP_BY_OPTIONS = ('sport', 'site', 'stat_type', 'day', 'month')
+
+
+def _bet_day(bet_date, created_at):
+    try:
+        return date.fromisoformat((bet_date or '')[:10])
+    except ValueError:
+        return created_at.date() if created_at else UNKNOWN_DAY
+
+
+def _money(value):
+    return Decimal(str(value)).quantize(Decimal('0.01')) if value is not None else Decimal('0.00')
+
+
+def _bettor_ids(user_id, secondary_bettors):
+    ids = [user_id] if user_id else []
+    for uid in secondary_bettors or []:
+        if uid and int(uid) not in ids:
+            ids.append(int(uid))
+    return ids
+
+
+def _leg_won(leg):
+    return leg.status == 'won' or (leg.status != 'lost' and leg.is_hit is True)
+
+
+def _leg_lost(leg):
+    return not _leg_won(leg) and (leg.status == 'lost' or leg.is_hit is False)
+
+
+def settled_outcome(bet, legs):
+    """Outcome counter ('bets_won' / 'bets_lost' / 'bets_void') of a settled bet.
+
+    None for unsettled bets, and for 'completed' bets neither the legs nor
+    actual_winnings decide (they still count as bets, with the stake back).
+    """
+    if bet.status not in SETTLED_STATUSES:
+        return None
+    outcome = SETTLED_STATUSES[bet.status]
+    if outcome is not None:
+        return outcome
+
+    if any(_leg_lost(leg) for leg in legs):
+        return 'bets_lost'
+    if legs and all(_leg_won(leg) or leg.status in VOID_LEG_STATUSES for leg in legs):
+        return 'bets_won' if any(_leg_won(leg) for leg in legs) else 'bets_void'
+    if bet.actual_winnings is not None:
+        returned, wagered = _money(bet.actual_winnings), _money(bet.wager)
+        if returned == 0:
+            return 'bets_lost'
+        return 'bets_won' if returned > wagered else 'bets_void'
+    return None
+
+
+def compute_contribution(bet, legs):
+    """{(user_id, day, sport, site, stat_type): {metric: value}} for one bet row.
+
+    ``bet`` and ``legs`` are rows/objects with the Bet / BetLeg columns used
+    here. Unsettled bets contribute nothing.
+    """
+    if bet.status not in SETTLED_STATUSES:
+        return {}
+    outcome = settled_outcome(bet, legs)
+
+    day = _bet_day(bet.bet_date, bet.created_at).isoformat()
+    site = (bet.betting_site or 'Unknown')[:50]
+    sports = {leg.sport or 'Unknown' for leg in legs}
+    bet_sport = (sports.pop() if len(sports) == 1 else MIXED_SPORT)[:20]
+
+    wagered = _money(bet.wager)
+    if bet.actual_winnings is not None:
+        returned = _money(bet.actual_winnings)
+    elif outcome == 'bets_won':
+        returned = _money(bet.potential_winnings)
+    elif outcome in ('bets_void', None):
+        returned = wagered
+    else:
+        returned = Decimal('0.00')
+
+    contribution = {}
+    for user_id in _bettor_ids(bet.user_id, bet.secondary_bettors):
+        bet_metrics = dict.fromkeys(METRICS, 0)
+        bet_metrics.update({'bets': 1, 'wagered': wagered, 'returned': returned})
+        if outcome is not None:
+            bet_metrics[outcome] = 1
+        contribution[(user_id, day, bet_sport, site, AnalyticsRollup.BET_LEVEL)] = bet_metrics
+
+        for leg in legs:
+            key = (user_id, day, (leg.sport or 'Unknown')[:20], site, (leg.stat_type or 'unknown')[:50])
+            metrics = contribution.setdefault(key, dict.fromkeys(METRICS, 0))
+            metrics['legs'] += 1
+            if _leg_won(leg):
+                metrics['legs_won'] += 1
+            elif _leg_lost(leg):
+                metrics['legs_lost'] += 1
+    return contribution
+
+
+def _encode_contribution(contribution):
+    return json.dumps([
+        [list(key), [str(metrics[m]) if m in MONEY_METRICS else metrics[m] for m in METRICS]]
+        for key, metrics in contribution.items()
+    ])
+
+
+def _decode_contribution(raw):
+    contribution = {}
+    for key, values in json.loads(raw):
+        metrics = dict(zip(METRICS, values))
+        for m in MONEY_METRICS:
+            metrics[m] = Decimal(metrics[m])
+        contribution[tuple(key)] = metrics
+    return contribution
+
+
+def _upsert_deltas(connection, deltas):
+    """Add metric deltas to rollup rows, creating missing rows."""
+    if not deltas:
+        return
+    table = AnalyticsRollup.__table__
+    rows = []
+    for (user_id, day, sport, site, stat_type), metrics in deltas.items():
+        row = {'user_id': user_id, 'day': date.fromisoformat(day), 'sport': sport, 'site': site, 'stat_type': stat_type}
+        row.update(metrics)
+        rows.append(row)
+
+    dialect = connection.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(KEY_COLUMNS),
+            set_={m: table.c[m] + stmt.excluded[m] for m in METRICS},
+        )
+        connection.execute(stmt)
+        return
+
+    # Other dialects: update, then insert what didn't exist
+    for row in rows:
+        key_filter = [table.c[k] == row[k] for k in KEY_COLUMNS]
+        result = connection.execute(
+            table.update().where(*key_filter).values({m: table.c[m] + row[m] for m in METRICS})
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(row))
+
+
+def refresh_bet_rollups(connection, bet_ids):
+    """Bring the rollups in line with the current state of ``bet_ids``.
+
+    Works on a plain connection (usable from flush hooks and migrations).
+    Returns the number of bets whose contribution changed.
+    """
+    bet_ids = [bet_id for bet_id in set(bet_ids) if bet_id is not None]
+    if not bet_ids:
+        return 0
+
+    bets = {row.id: row for row in connection.execute(
+        select(Bet.id, Bet.user_id, Bet.secondary_bettors, Bet.status, Bet.betting_site, Bet.bet_date,
+               Bet.created_at, Bet.wager, Bet.potential_winnings, Bet.actual_winnings)
+        .where(Bet.id.in_(bet_ids))
+    )}
+    previous = {row.bet_id: row.contribution for row in connection.execute(
+        select(AnalyticsBetContribution.bet_id, AnalyticsBetContribution.contribution)
+        .where(AnalyticsBetContribution.bet_id.in_(bet_ids))
+    )}
+
+    # Only settled bets, or bets that were settled before, need any work
+    relevant = [bet_id for bet_id in bet_ids
+                if bet_id in previous or (bet_id in bets and bets[bet_id].status in SETTLED_STATUSES)]
+    if not relevant:
+        return 0
+
+    legs = defaultdict(list)
+    settled_ids = [bet_id for bet_id in relevant if bet_id in bets]
+    if settled_ids:
+        for leg in connection.execute(
+            select(BetLeg.bet_id, BetLeg.sport, BetLeg.stat_type, BetLeg.status, BetLeg.is_hit)
+            .where(BetLeg.bet_id.in_(settled_ids))
+        ):
+            legs[leg.bet_id].append(leg)
+
+    contributions = AnalyticsBetContribution.__table__
+    deltas = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+    changed = 0
+    for bet_id in relevant:
+        new = compute_contribution(bets[bet_id], legs[bet_id]) if bet_id in bets else {}
+        encoded = _encode_contribution(new) if new else None
+        if encoded == previous.get(bet_id):
+            continue
+        changed += 1
+
+        for key, metrics in new.items():
+            for m in METRICS:
+                deltas[key][m] += metrics[m]
+        if bet_id in previous:
+            for key, metrics in _decode_contribution(previous[bet_id]).items():
+                for m in METRICS:
+                    deltas[key][m] -= metrics[m]
+
+        if encoded is None:
+            connection.execute(contributions.delete().where(contributions.c.bet_id == bet_id))
+        elif bet_id in previous:
+            connection.execute(contributions.update().where(contributions.c.bet_id == bet_id)
+                               .values(contribution=encoded))
+        else:
+            connection.execute(contributions.insert().values(bet_id=bet_id, contribution=encoded))
+
+    _upsert_deltas(connection, {key: d for key, d in deltas.items() if any(d.values())})
+    if changed:
+        logger.debug(f"[ANALYTICS] Refreshed rollups for {changed} bets")
+    return changed
+
+
+def _has_changes(obj, fields):
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_rollups_after_flush(session, flush_context):
+    """Recompute contributions of bets that settled or changed after settling."""
+    bet_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Bet):
+            if obj in session.deleted:
+                bet_ids.add(obj.id)
+            elif obj in session.new:
+                if obj.status in SETTLED_STATUSES:
+                    bet_ids.add(obj.id)
+            elif _has_changes(obj, ANALYTICS_BET_FIELDS):
+                status_history = inspect(obj).attrs.status.history
+                if obj.status in SETTLED_STATUSES or status_history.has_changes():
+                    bet_ids.add(obj.id)
+        elif isinstance(obj, BetLeg):
+            if obj in session.new or obj in session.deleted or _has_changes(obj, ANALYTICS_LEG_FIELDS):
+                bet_ids.add(obj.bet_id)
+                bet_ids.update(inspect(obj).attrs.bet_id.history.deleted or ())
+
+    # Leg updates of bets loaded here that are (and stay) unsettled can't change
+    # any contribution; skipping them keeps live leg updates free of rollup queries
+    for bet_id in list(bet_ids):
+        bet = session.identity_map.get(session.identity_key(Bet, bet_id)) if bet_id is not None else None
+        if (bet is not None and bet not in session.deleted and bet.status not in SETTLED_STATUSES
+                and not inspect(bet).attrs.status.history.has_changes()):
+            bet_ids.discard(bet_id)
+
+    bet_ids.discard(None)
+    if bet_ids:
+        refresh_bet_rollups(session.connection(), bet_ids)
+
+
+def rebuild_analytics_rollups(batch_size=500):
+    """Recompute all rollups from scratch (backfill / repair). Returns bets counted."""
+    db.session.query(AnalyticsRollup).delete(synchronize_session=False)
+    db.session.query(AnalyticsBetContribution).delete(synchronize_session=False)
+    db.session.commit()
+
+    counted = 0
+    last_id = 0
+    while True:
+        ids = [row.id for row in db.session.query(Bet.id)
+               .filter(Bet.id > last_id, Bet.status.in_(list(SETTLED_STATUSES)))
+               .order_by(Bet.id).limit(batch_size)]
+        if not ids:
+            break
+        counted += refresh_bet_rollups(db.session.connection(), ids)
+        db.session.commit()
+        last_id = ids[-1]
+    logger.info(f"[ANALYTICS] Rebuilt rollups from {counted} settled bets")
+    return counted
+
+
+def _derived(metrics):
+    """Add profit / ROI / win rates to summed metrics."""
+    wagered = Decimal(str(metrics['wagered'] or 0))
+    returned = Decimal(str(metrics['returned'] or 0))
+    decided = metrics['bets_won'] + metrics['bets_lost']
+    legs_decided = metrics['legs_won'] + metrics['legs_lost']
+    profit = returned - wagered
+    metrics.update({
+        'wagered': float(wagered),
+        'returned': float(returned),
+        'profit': float(profit),
+        'roi': round(float(profit / wagered), 4) if wagered else None,
+        'win_rate': round(metrics['bets_won'] / decided, 4) if decided else None,
+        'leg_hit_rate': round(metrics['legs_won'] / legs_decided, 4) if legs_decided else None,
+    })
+    return metrics
+
+
+def performance_summary(user_id, group_by=None, date_from=None, date_to=None, sport=None, site=None, stat_type=None):
+    """Totals (and optional groups) of a user's settled bets from the rollups.
+
+    ``group_by`` is one of GROUP_BY_OPTIONS. Grouping or filtering by
+    stat_type only reads leg rows, so bet counts and money are zero there
+    (a parlay's profit can't be split across its legs). Raises ValueError
+    for an unknown group_by.
+    """
+    if group_by is not None and group_by not in GROUP_BY_OPTIONS:
+        raise ValueError(f"group_by must be one of: {', '.join(GROUP_BY_OPTIONS)}")
+
+    sums = [func.coalesce(func.sum(getattr(AnalyticsRollup, m)), 0).label(m) for m in METRICS]
+    filters = [AnalyticsRollup.user_id == user_id]
+    if date_from:
+        filters.append(AnalyticsRollup.day >= date_from)
+    if date_to:
+        filters.append(AnalyticsRollup.day <= date_to)
+    if sport:
+        filters.append(AnalyticsRollup.sport == sport)
+    if site:
+        filters.append(AnalyticsRollup.site == site)
+    if stat_type:
+        filters.append(AnalyticsRollup.stat_type == stat_type)
+    if group_by == 'stat_type':
+        filters.append(AnalyticsRollup.stat_type != AnalyticsRollup.BET_LEVEL)
+
+    totals = db.session.execute(select(*sums).where(*filters)).one()._asdict()
+    result = {'totals': _derived(totals)}
+
+    if group_by:
+        column = AnalyticsRollup.day if group_by == 'month' else getattr(AnalyticsRollup, group_by)
+        rows = db.session.execute(select(column.label('key'), *sums).where(*filters).group_by(column)).all()
+        groups = {}
+        for row in rows:
+            metrics = row._asdict()
+            key = metrics.pop('key')
+            if group_by in ('day', 'month'):
+                key = key.isoformat()[:7] if group_by == 'month' else key.isoformat()
+            if key in groups:
+                for m in METRICS:
+                    groups[key][m] += metrics[m]
+            else:
+                groups[key] = metrics
+        result['groups'] = [dict(_derived(metrics), key=key) for key, metrics in sorted(groups.items())]
+    return result
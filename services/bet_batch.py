@@ -0,0 +1,194 @@
+"""
+Set-based batch operations on bets (archive, unarchive, delete, sport correction).
+
+Multi-select actions in the UI send a list of bet ids. Each batch does its
+access check in one query against bet_participants and applies the change
+with a single UPDATE/DELETE per table, instead of loading and flushing one
+ORM object per bet. The result for every requested id is reported back:
+
+- ``ok``: the change was applied
+- ``unchanged``: accessible, but already in the requested state
+- ``forbidden``: visible to the user (e.g. watched) but not theirs to change
+- ``not_found``: no such bet, or not visible to the user
+
+Bulk statements bypass the ORM flush/mapper hooks, so the derived state
+those hooks maintain (sync tombstones, analytics rollups, the player prop
+index and the serialized payload cache) is updated explicitly here.
+"""
+
+import logging
+
+from sqlalchemy import delete, or_, select, update
+
+from models import db, Bet, BetLeg, BetParticipant, SyncTombstone
+from services.analytics import refresh_bet_rollups
+from services.bet_serialization import invalidate_bet_payloads
+from services.player_props import unindex_legs
+from services.user_service import ALL_ROLES, participant_bets_query
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_BETS = 1000
+VALID_SPORTS = ('NFL', 'NBA', 'MLB', 'NHL', 'NCAAF', 'NCAAB')
+
+RESULT_OK = 'ok'
+RESULT_UNCHANGED = 'unchanged'
+RESULT_FORBIDDEN = 'forbidden'
+RESULT_NOT_FOUND = 'not_found'
+
+
+def parse_bet_ids(raw_ids):
+    """Validated, de-duplicated list of ints (request order kept); ValueError otherwise."""
+    if not isinstance(raw_ids, list) or not raw_ids:
+        raise ValueError("bet_ids must be a non-empty list")
+    bet_ids = []
+    seen = set()
+    for raw in raw_ids:
+        if isinstance(raw, bool):
+            raise ValueError(f"Invalid bet id: {raw!r}")
+        try:
+            bet_id = int(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid bet id: {raw!r}")
+        if bet_id not in seen:
+            seen.add(bet_id)
+            bet_ids.append(bet_id)
+    if len(bet_ids) > BATCH_MAX_BETS:
+        raise ValueError(f"At most {BATCH_MAX_BETS} bets per batch")
+    return bet_ids
+
+
+def _authorize(user_id, bet_ids, owner_only=False):
+    """({bet_id: result}, {bet_id: row}) for the bets user_id may change, in one query.
+
+    Primary and secondary bettors may change a bet; watchers may not. With
+    ``owner_only`` only the primary bettor may.
+    """
+    rows = (participant_bets_query(user_id, ALL_ROLES)
+            .filter(Bet.id.in_(bet_ids))
+            .with_entities(Bet.id, Bet.is_archived, BetParticipant.role)
+            .all())
+    allowed_roles = ((BetParticipant.ROLE_PRIMARY,) if owner_only
+                     else (BetParticipant.ROLE_PRIMARY, BetParticipant.ROLE_SECONDARY))
+    results = dict.fromkeys(bet_ids, RESULT_NOT_FOUND)
+    allowed = {}
+    for row in rows:
+        if row.role in allowed_roles:
+            allowed[row.id] = row
+        else:
+            results[row.id] = RESULT_FORBIDDEN
+    return results, allowed
+
+
+def _summary(action, bet_ids, results, **extra):
+    counts = {}
+    for result in results.values():
+        counts[result] = counts.get(result, 0) + 1
+    return {
+        'action': action,
+        'results': [{'bet_id': bet_id, 'result': results[bet_id]} for bet_id in bet_ids],
+        'counts': counts,
+        **extra,
+    }
+
+
+def batch_set_archived(user_id, bet_ids, archived=True):
+    """Archive (or unarchive) bet_ids with one UPDATE."""
+    results, allowed = _authorize(user_id, bet_ids)
+    targets = []
+    for bet_id, row in allowed.items():
+        if bool(row.is_archived) == archived:
+            results[bet_id] = RESULT_UNCHANGED
+        else:
+            results[bet_id] = RESULT_OK
+            targets.append(bet_id)
+
+    if targets:
+        db.session.execute(
+            update(Bet).where(Bet.id.in_(targets)).values(is_archived=archived),
+            execution_options={'synchronize_session': False},
+        )
+        db.session.commit()
+        invalidate_bet_payloads(targets)
+
+    action = 'archive' if archived else 'unarchive'
+    logger.info(f"[BATCH] {action}: {len(targets)} of {len(bet_ids)} bets updated for user {user_id}")
+    verb = 'Archived' if archived else 'Unarchived'
+    return _summary(action, bet_ids, results, message=f"{verb} {len(targets)} bet{'s' if len(targets) != 1 else ''}")
+
+
+def batch_delete_bets(user_id, bet_ids):
+    """Delete bet_ids (primary bettor only) with one DELETE per table."""
+    results, allowed = _authorize(user_id, bet_ids, owner_only=True)
+    targets = list(allowed)
+    for bet_id in targets:
+        results[bet_id] = RESULT_OK
+
+    if targets:
+        connection = db.session.connection()
+        legs = connection.execute(
+            select(BetLeg.id, BetLeg.status, BetLeg.sport, BetLeg.player_name, BetLeg.stat_type)
+            .where(BetLeg.bet_id.in_(targets))
+        ).all()
+        # Tombstones read the participants, so they go first
+        SyncTombstone.record_bets(connection, targets)
+        no_sync = {'synchronize_session': False}
+        db.session.execute(delete(BetParticipant).where(BetParticipant.bet_id.in_(targets)), execution_options=no_sync)
+        db.session.execute(delete(BetLeg).where(BetLeg.bet_id.in_(targets)), execution_options=no_sync)
+        db.session.execute(delete(Bet).where(Bet.id.in_(targets)), execution_options=no_sync)
+        refresh_bet_rollups(connection, targets)
+        unindex_legs(connection, legs)
+        db.session.commit()
+        invalidate_bet_payloads(targets)
+
+    logger.info(f"[BATCH] delete: {len(targets)} of {len(bet_ids)} bets deleted for user {user_id}")
+    return _summary('delete', bet_ids, results,
+                    message=f"Deleted {len(targets)} bet{'s' if len(targets) != 1 else ''}")
+
+
+def batch_correct_sport(user_id, bet_ids, sport, leg_order=None):
+    """Set the sport of every leg (or only ``leg_order``) of bet_ids with one UPDATE.
+
+    Changed legs are reset to pending with their live values cleared, so the
+    next live refresh fetches them again from the right league.
+    """
+    sport = (sport or '').strip().upper()
+    if sport not in VALID_SPORTS:
+        raise ValueError(f"Invalid sport. Must be one of: {', '.join(VALID_SPORTS)}")
+
+    results, allowed = _authorize(user_id, bet_ids)
+    legs_updated = dict.fromkeys(allowed, 0)
+    changed_legs = []
+    if allowed:
+        condition = [BetLeg.bet_id.in_(list(allowed)), or_(BetLeg.sport.is_(None), BetLeg.sport != sport)]
+        if leg_order is not None:
+            condition.append(BetLeg.leg_order == leg_order)
+        changed_legs = db.session.execute(
+            select(BetLeg.id, BetLeg.bet_id, BetLeg.status, BetLeg.sport, BetLeg.player_name, BetLeg.stat_type)
+            .where(*condition)
+        ).all()
+        for leg in changed_legs:
+            legs_updated[leg.bet_id] += 1
+    for bet_id, count in legs_updated.items():
+        results[bet_id] = RESULT_OK if count else RESULT_UNCHANGED
+
+    if changed_legs:
+        leg_ids = [leg.id for leg in changed_legs]
+        touched = list({leg.bet_id for leg in changed_legs})
+        db.session.execute(
+            update(BetLeg).where(BetLeg.id.in_(leg_ids)).values(
+                sport=sport, status='pending', achieved_value=None, home_score=None,
+                away_score=None, current_quarter=None, time_remaining=None,
+            ),
+            execution_options={'synchronize_session': False},
+        )
+        connection = db.session.connection()
+        refresh_bet_rollups(connection, touched)
+        unindex_legs(connection, changed_legs)
+        db.session.commit()
+        invalidate_bet_payloads(touched)
+
+    logger.info(f"[BATCH] sport={sport}: {len(changed_legs)} legs updated across {len(bet_ids)} bets for user {user_id}")
+    return _summary('sport', bet_ids, results, sport=sport, legs_updated=len(changed_legs),
+                    legs_updated_by_bet={str(bet_id): count for bet_id, count in legs_updated.items() if count},
+                    message=f"Sport corrected to {sport} on {len(changed_legs)} leg{'s' if len(changed_legs) != 1 else ''}")
@@ -0,0 +1,222 @@
+"""
+Indexed search for historical bets.
+
+Each bet keeps a denormalized ``search_document`` (site, bet type, bet name,
+and every leg's player / teams / stat type), maintained on write by a
+before_flush hook. Searching uses an index instead of scanning the bet_data
+JSON blob:
+
+- PostgreSQL: pg_trgm GIN index on search_document (LIKE is indexed)
+- SQLite: FTS5 external-content table kept in sync by triggers
+- Anything else (or SQLite without the FTS table): plain LIKE on search_document
+
+Every backend applies the same rule: each search token must be the prefix of
+a word in the document ("lak" finds "Lakers", "akers" doesn't).
+"""
+
+import json
+import logging
+import re
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from models import db, Bet, BetLeg
+
+logger = logging.getLogger(__name__)
+
+SQLITE_FTS_TABLE = 'bet_search_fts'
+
+# Bet / BetLeg attributes that feed the search document
+BET_SEARCH_FIELDS = ('betting_site', 'bet_type', 'bet_data')
+LEG_SEARCH_FIELDS = ('player_name', 'player_team', 'home_team', 'away_team', 'stat_type')
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Cache of whether the SQLite FTS table exists, per engine URL
+_sqlite_fts_available = {}
+
+
+def _tokens(value):
+    if value is None:
+        return []
+    return _TOKEN_RE.findall(str(value).lower())
+
+
+def build_search_document(bet, exclude_legs=(), extra_legs=()):
+    """Build the lowercase, de-duplicated search text for a bet.
+
+    ``extra_legs`` covers pending legs attached only by bet_id, which aren't
+    in bet.bet_legs_rel until the session is flushed and the bet reloaded.
+    """
+    all_legs = list(bet.bet_legs_rel or [])
+    all_legs += [leg for leg in extra_legs if leg not in all_legs]
+    legs = [
+        tuple(getattr(leg, field) for field in LEG_SEARCH_FIELDS)
+        for leg in all_legs if leg not in exclude_legs
+    ]
+    return build_search_document_from_values(bet.betting_site, bet.bet_type, bet.bet_data, legs)
+
+
+def build_search_document_from_values(betting_site, bet_type, bet_data_json, legs):
+    """Same as build_search_document, from plain column values.
+
+    ``legs`` is a list of tuples ordered like LEG_SEARCH_FIELDS.
+    """
+    parts = [betting_site, bet_type]
+
+    bet_data = {}
+    if bet_data_json:
+        try:
+            bet_data = json.loads(bet_data_json)
+        except (TypeError, ValueError):
+            bet_data = {}
+    if isinstance(bet_data, dict):
+        parts.append(bet_data.get('name'))
+
+    if legs:
+        for leg in legs:
+            parts.extend(leg)
+    elif isinstance(bet_data, dict):
+        # Legacy bets that only have legs inside the JSON blob
+        for leg in bet_data.get('legs') or []:
+            if isinstance(leg, dict):
+                parts.extend(leg.get(key) for key in ('player', 'team', 'home', 'away', 'stat'))
+
+    seen = []
+    for part in parts:
+        for token in _tokens(part):
+            if token not in seen:
+                seen.append(token)
+    return ' '.join(seen)
+
+
+def _has_changes(obj, fields):
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Session, 'before_flush')
+def _maintain_search_documents(session, flush_context, instances):
+    """Recompute search_document for bets whose searchable fields changed."""
+    deleted_legs = {obj for obj in session.deleted if isinstance(obj, BetLeg)}
+    # bet -> legs touched in this flush (pending legs may not be in bet_legs_rel yet)
+    bets = {}
+
+    with session.no_autoflush:
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, Bet):
+                if obj in session.new or _has_changes(obj, BET_SEARCH_FIELDS):
+                    bets.setdefault(obj, [])
+            elif isinstance(obj, BetLeg):
+                if obj in session.new or _has_changes(obj, LEG_SEARCH_FIELDS):
+                    bet = obj.bet or (session.get(Bet, obj.bet_id) if obj.bet_id else None)
+                    if bet is not None:
+                        bets.setdefault(bet, []).append(obj)
+        for leg in deleted_legs:
+            if leg.bet is not None:
+                bets.setdefault(leg.bet, [])
+
+        for bet, touched_legs in bets.items():
+            if bet in session.deleted:
+                continue
+            document = build_search_document(bet, exclude_legs=deleted_legs, extra_legs=touched_legs)
+            if bet.search_document != document:
+                bet.search_document = document
+
+
+def ensure_sqlite_search_index(connection):
+    """Create the SQLite FTS5 table and sync triggers if missing, then rebuild it."""
+    connection.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} "
+        f"USING fts5(search_document, content='bets', content_rowid='id')"
+    ))
+    connection.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS bets_search_ai AFTER INSERT ON bets BEGIN
+            INSERT INTO {SQLITE_FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+        END
+    """))
+    connection.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS bets_search_ad AFTER DELETE ON bets BEGIN
+            INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, search_document)
+            VALUES ('delete', old.id, old.search_document);
+        END
+    """))
+    connection.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS bets_search_au AFTER UPDATE OF search_document ON bets BEGIN
+            INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, search_document)
+            VALUES ('delete', old.id, old.search_document);
+            INSERT INTO {SQLITE_FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+        END
+    """))
+    connection.execute(text(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')"))
+    _sqlite_fts_available.pop(str(connection.engine.url), None)
+
+
+def _sqlite_fts_exists():
+    key = str(db.engine.url)
+    if key not in _sqlite_fts_available:
+        _sqlite_fts_available[key] = inspect(db.engine).has_table(SQLITE_FTS_TABLE)
+    return _sqlite_fts_available[key]
+
+
+def apply_bet_search(query, term):
+    """Filter a Bet query by a free-text search term using the search index."""
+    term = (term or '').strip().lower()
+    if not term:
+        return query
+
+    tokens = _tokens(term)
+    if not tokens:
+        return query
+
+    if db.engine.dialect.name == 'sqlite' and _sqlite_fts_exists():
+        # Every token must match as a word prefix
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        fts_ids = text(f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH :match").bindparams(match=match)
+        return query.filter(Bet.id.in_(fts_ids.columns(rowid=db.Integer)))
+
+    # PostgreSQL: each LIKE is served by the pg_trgm GIN index on search_document.
+    # Documents are space-separated words, so a word prefix starts the document
+    # or follows a space (same rule as the FTS5 prefix query above).
+    for token in tokens:
+        query = query.filter(db.or_(Bet.search_document.like(f'{token}%'),
+                                    Bet.search_document.like(f'% {token}%')))
+    return query
+
+
+def refresh_search_documents(bet_ids):
+    """Recompute search_document for bet_ids after bulk leg UPDATEs (no flush hook). Returns rows updated."""
+    updated = 0
+    bet_ids = list(bet_ids)
+    for start in range(0, len(bet_ids), 500):
+        bets = (Bet.query.filter(Bet.id.in_(bet_ids[start:start + 500]))
+                .options(db.selectinload(Bet.bet_legs_rel))
+                .execution_options(populate_existing=True).all())
+        for bet in bets:
+            document = build_search_document(bet)
+            if bet.search_document != document:
+                bet.search_document = document
+                updated += 1
+    return updated
+
+
+def rebuild_search_documents(batch_size=500):
+    """Recompute search_document for every bet (backfill / repair). Returns rows updated."""
+    updated = 0
+    last_id = 0
+    while True:
+        bets = (Bet.query.filter(Bet.id > last_id)
+                .options(db.selectinload(Bet.bet_legs_rel))
+                .order_by(Bet.id).limit(batch_size).all())
+        if not bets:
+            break
+        for bet in bets:
+            document = build_search_document(bet)
+            if bet.search_document != document:
+                bet.search_document = document
+                updated += 1
+        db.session.commit()
+        last_id = bets[-1].id
+    logger.info(f"[BET-SEARCH] Rebuilt search documents ({updated} bets updated)")
+    return updated
@@ -0,0 +1,298 @@
+"""
+Batch serialization helpers for bets.
+
+Serializing a page of bets used to issue one query per bettor and up to two
+queries per leg (player jersey lookups). BetSerializationContext preloads
+everything a page needs with a fixed number of IN-queries so that
+Bet.to_dict_structured / BetLeg.to_dict only read from memory.
+
+It also holds a versioned per-bet payload cache used by /historical.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from models import db, User, Bet, BetLeg, Player, Team
+
+logger = logging.getLogger(__name__)
+
+
+class BetSerializationContext:
+    """Preloaded lookups shared by every bet serialized in one request.
+
+    Usage:
+        ctx = BetSerializationContext.for_bets(bets)
+        data = [bet.to_dict_structured(context=ctx) for bet in bets]
+    """
+
+    def __init__(self, users_by_id=None, players_by_id=None, players_by_name=None):
+        self.users_by_id = users_by_id or {}
+        self.players_by_id = players_by_id or {}
+        # (player_name, sport) -> Player, first row by id (matches .first() fallback)
+        self.players_by_name = players_by_name or {}
+        self._teams = {}
+
+    @classmethod
+    def for_bets(cls, bets):
+        """Build a context for ``bets`` (legs should already be eager-loaded)."""
+        user_ids = set()
+        player_ids = set()
+        player_names = set()
+
+        for bet in bets:
+            if bet.user_id:
+                user_ids.add(bet.user_id)
+            for user_id in (bet.secondary_bettors or []):
+                if user_id:
+                    user_ids.add(user_id)
+            for leg in bet.bet_legs_rel or []:
+                if leg.player_id:
+                    player_ids.add(leg.player_id)
+                if leg.player_name and leg.sport:
+                    player_names.add(leg.player_name)
+
+        users_by_id = {}
+        if user_ids:
+            users = User.query.filter(User.id.in_(user_ids)).all()
+            users_by_id = {u.id: u for u in users}
+
+        players_by_id = {}
+        if player_ids:
+            players = Player.query.filter(Player.id.in_(player_ids)).all()
+            players_by_id = {p.id: p for p in players}
+
+        players_by_name = {}
+        if player_names:
+            players = (Player.query
+                       .filter(Player.player_name.in_(player_names))
+                       .order_by(Player.id)
+                       .all())
+            for p in players:
+                players_by_name.setdefault((p.player_name, p.sport), p)
+
+        return cls(users_by_id, players_by_id, players_by_name)
+
+    def get_user(self, user_id):
+        return self.users_by_id.get(user_id)
+
+    def get_jersey_number(self, player_id, player_name, sport):
+        """Jersey number by player id, falling back to (name, sport)."""
+        if player_id:
+            player = self.players_by_id.get(player_id)
+            if player and player.jersey_number:
+                return player.jersey_number
+        if player_name and sport:
+            player = self.players_by_name.get((player_name, sport))
+            if player and player.jersey_number:
+                return player.jersey_number
+        return None
+
+    def get_team(self, team_name):
+        """Team lookup memoized per context.
+
+        Reads from Team's process-wide cache without merging into the session,
+        since serialization only needs read-only branding attributes.
+        """
+        if not team_name:
+            return None
+        if team_name not in self._teams:
+            self._teams[team_name] = Team.find_cached_team(team_name)
+        return self._teams[team_name]
+
+
+def serialize_bets(bets, use_live_data=False):
+    """Serialize a list of bets with a shared preloaded context."""
+    context = BetSerializationContext.for_bets(bets)
+    return [bet.to_dict_structured(use_live_data=use_live_data, context=context) for bet in bets]
+
+
+# ---------------------------------------------------------------------------
+# Versioned payload cache
+# ---------------------------------------------------------------------------
+# Settled bets almost never change, so their processed payloads are cached
+# per bet and keyed by a version: (bet.updated_at, max(leg.updated_at)).
+# Any ORM write to a bet or one of its legs bumps updated_at (onupdate) and
+# also evicts the entry in an after_flush hook, so stale payloads are never
+# served even when a write doesn't change the timestamp.
+
+# bet_id -> (version, payload); insertion order doubles as LRU order
+bet_payload_cache = OrderedDict()
+BET_PAYLOAD_CACHE_MAX_ENTRIES = 5000
+_bet_payload_cache_lock = threading.Lock()
+
+
+def bet_version_column():
+    """Correlated subquery for max(bet_legs.updated_at) of the outer Bet row."""
+    return (select(func.max(BetLeg.updated_at))
+            .where(BetLeg.bet_id == Bet.id)
+            .correlate(Bet)
+            .scalar_subquery())
+
+
+def get_cached_bet_payload(bet_id, version):
+    """Cached payload for bet_id if it was stored for the same version."""
+    with _bet_payload_cache_lock:
+        entry = bet_payload_cache.get(bet_id)
+        if entry is None or entry[0] != version:
+            return None
+        bet_payload_cache.move_to_end(bet_id)
+        return entry[1]
+
+
+def store_bet_payload(bet_id, version, payload):
+    with _bet_payload_cache_lock:
+        bet_payload_cache[bet_id] = (version, payload)
+        bet_payload_cache.move_to_end(bet_id)
+        while len(bet_payload_cache) > BET_PAYLOAD_CACHE_MAX_ENTRIES:
+            bet_payload_cache.popitem(last=False)
+
+
+def invalidate_bet_payloads(bet_ids=None):
+    """Evict the given bet ids, or clear the whole cache when bet_ids is None."""
+    with _bet_payload_cache_lock:
+        if bet_ids is None:
+            count = len(bet_payload_cache)
+            bet_payload_cache.clear()
+            logger.info(f"Cleared bet payload cache ({count} entries removed)")
+            return
+        for bet_id in bet_ids:
+            bet_payload_cache.pop(bet_id, None)
+
+
+def get_processed_bet_payloads(versioned_ids, fetch_live=False):
+    """Processed payloads for [(bet_id, version), ...], in the same order.
+
+    Cache hits are returned as-is; misses are loaded in one query, serialized
+    with a shared BetSerializationContext, run through process_parlay_data and
+    stored. Payloads are shared between requests and must not be mutated.
+
+    With ``fetch_live`` the payloads carry ESPN data that changes without the
+    bet version changing, so the cache is neither read nor written.
+    """
+    from services.bet_service import process_parlay_data
+
+    payloads = {}
+    misses = {}
+    for bet_id, version in versioned_ids:
+        cached = None if fetch_live else get_cached_bet_payload(bet_id, version)
+        if cached is not None:
+            payloads[bet_id] = cached
+        else:
+            misses[bet_id] = version
+
+    if misses:
+        bets = (Bet.query.filter(Bet.id.in_(list(misses)))
+                .options(db.joinedload(Bet.bet_legs_rel))
+                .all())
+        context = BetSerializationContext.for_bets(bets)
+        for bet in bets:
+            try:
+                bet_dict = bet.to_dict_structured(use_live_data=False, context=context)
+                processed = process_parlay_data([bet_dict], fetch_live=fetch_live)[0]
+            except Exception as e:
+                logger.error(f"[BET-CACHE] Error serializing bet {bet.id}: {e}")
+                continue
+            payloads[bet.id] = processed
+            if not fetch_live:
+                store_bet_payload(bet.id, misses[bet.id], processed)
+
+    logger.debug(f"[BET-CACHE] {len(versioned_ids) - len(misses)} hits, {len(misses)} misses")
+    return [payloads[bet_id] for bet_id, _ in versioned_ids if bet_id in payloads]
+
+
+@event.listens_for(Session, 'after_flush')
+def _evict_flushed_bets(session, flush_context):
+    """Drop cached payloads for bets (or legs of bets) written in this flush."""
+    bet_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Bet) and obj.id is not None:
+            bet_ids.add(obj.id)
+        elif isinstance(obj, BetLeg) and obj.bet_id is not None:
+            bet_ids.add(obj.bet_id)
+    if bet_ids:
+        invalidate_bet_payloads(bet_ids)
+
+
+# ---------------------------------------------------------------------------
+# Payload schema versions / field selection
+# ---------------------------------------------------------------------------
+# v1 (default) is the historical shape with duplicate aliases on every leg.
+# v2 keeps each value once under the name the frontend reads and drops the
+# raw bet_data JSON string. ?fields= selects keys from either version, e.g.
+#   fields=db_id,name,status,legs.player,legs.stat,legs.current
+
+# Dropped key -> key kept in v2 carrying the same value
+LEG_V2_ALIASES = {
+    'player_name': 'player',
+    'player_team': 'team',
+    'player_position': 'position',
+    'home_team': 'home',
+    'away_team': 'away',
+    'homeTeam': 'home',
+    'awayTeam': 'away',
+    'stat_type': 'stat',
+    'bet_line_type': 'stat_add',
+    'over_under': 'stat_add',
+    'target_value': 'target',
+    'home_score': 'homeScore',
+    'away_score': 'awayScore',
+}
+BET_V2_ALIASES = {
+    'final_odds': 'odds',
+    'returns': 'potential_winnings',
+    'bet_data': None,  # raw JSON string; its fields are already parsed out
+}
+PAYLOAD_VERSIONS = (1, 2)
+
+
+def parse_fields(fields_param):
+    """Parse ?fields=a,b,legs.c into ({'a', 'b', 'legs'}, {'legs': {'c'}}); None = all fields."""
+    if not fields_param:
+        return None, {}
+    top, nested = set(), {}
+    for field in fields_param.split(','):
+        field = field.strip()
+        if not field:
+            continue
+        if '.' in field:
+            parent, child = field.split('.', 1)
+            top.add(parent)
+            nested.setdefault(parent, set()).add(child)
+        else:
+            top.add(field)
+    return top, nested
+
+
+def _project(item, drop, keep=None):
+    return {k: v for k, v in item.items() if k not in drop and (keep is None or k in keep)}
+
+
+def shape_bet_payloads(bets, version=1, fields=None):
+    """Return new bet dicts in the requested schema version with optional field selection.
+
+    Inputs are never mutated (they may be shared cached payloads).
+    """
+    if version not in PAYLOAD_VERSIONS:
+        raise ValueError(f"Unsupported payload version: {version}")
+    top, nested = parse_fields(fields)
+    if version == 1 and top is None:
+        return bets
+
+    bet_drop = BET_V2_ALIASES.keys() if version == 2 else ()
+    leg_drop = LEG_V2_ALIASES.keys() if version == 2 else ()
+    leg_keep = nested.get('legs')
+    game_keep = nested.get('games')
+
+    shaped = []
+    for bet in bets:
+        out = _project(bet, bet_drop, top)
+        if 'legs' in out:
+            out['legs'] = [_project(leg, leg_drop, leg_keep) for leg in out['legs'] or []]
+        if game_keep is not None and 'games' in out:
+            out['games'] = [_project(game, (), game_keep) for game in out['games'] or []]
+        shaped.append(out)
+    return shaped
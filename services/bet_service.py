@@ -1,6 +1,9 @@
 import json
-from helpers.utils import data_path, get_events, _get_player_stat_from_boxscore, _get_touchdowns
+from helpers.utils import data_path, get_events
 from helpers.utils import compute_parlay_returns_from_odds
+from helpers import stat_catalog
+from helpers.game_snapshot import GameSnapshot
+from helpers.espn_payloads import read_json_parts
 import requests
 import logging
 import time
@@ -8,12 +11,18 @@ import time
 logger = logging.getLogger(__name__)
 
 # Cache for game data to avoid repeated API calls
-# Each entry is a tuple of (game_data, timestamp)
+# Each entry is a tuple of (GameSnapshot, timestamp)
 game_data_cache = {}
 
+# Summary subtrees fetch_game_details_from_espn reads
+SUMMARY_GAME_PARTS = ('boxscore.players', 'boxScore.players', 'scoringPlays', 'scoring_plays')
+
 # Cache expiration time in seconds (5 minutes = 300 seconds)
 CACHE_EXPIRATION = 300
 
+# Bumped whenever the game cache is cleared; part of live listing ETags
+game_cache_generation = 0
+
 def cache_is_fresh(game_key):
     """Check if cached data for a game is still fresh."""
     if game_key not in game_data_cache:
@@ -30,7 +39,8 @@ def cache_is_fresh(game_key):
 
 def clear_game_cache(game_key=None):
     """Clear game cache. If game_key is provided, clear only that entry. Otherwise clear all."""
-    global game_data_cache
+    global game_data_cache, game_cache_generation
+    game_cache_generation += 1
     if game_key:
         if game_key in game_data_cache:
             del game_data_cache[game_key]
@@ -41,163 +51,61 @@ def clear_game_cache(game_key=None):
         logger.info(f"Cleared entire game cache ({count} entries removed)")
 
 def calculate_bet_value(bet, game_data):
-    """Calculate the current value for a bet based on game data."""
+    """Calculate the current value for a bet based on game data.
+
+    game_data is a GameSnapshot, or an old-style game dict with raw ESPN
+    'boxscore'/'scoring_plays' lists. The stat's extraction plan comes from the
+    stat catalog (helpers.stat_catalog).
+    """
+    game = game_data if isinstance(game_data, GameSnapshot) else GameSnapshot.from_game_dict(game_data)
     stat = bet.get("stat", "").strip().lower() if bet.get("stat") else ""  # Normalize to lowercase for comparisons
-    boxscore = game_data.get("boxscore", [])
-    scoring_plays = game_data.get("scoring_plays", [])
+    definition = stat_catalog.lookup(stat, bet.get("sport"))
+    kind = definition.kind if definition is not None else None
     
     # --- Player Props ---
-    if "player" in bet:
+    if "player" in bet and kind in stat_catalog.PLAYER_KINDS:
         player_name = bet["player"]
         
-        # Simple Box Score Stats
-        stat_map = {
-            # NFL
-            "passing_yards": ("passing", "YDS"), "alt_passing_yards": ("passing", "YDS"),
-            "alt passing yds": ("passing", "YDS"), "alt_passing_yds": ("passing", "YDS"), "passing yds": ("passing", "YDS"),
-            "pass_attempts": ("passing", "ATT"),
-            "pass_completions": ("passing", "COMP"), "passing_touchdowns": ("passing", "TD"),
-            "interceptions_thrown": ("passing", "INT"), "longest_pass_completion": ("passing", "LONG"),
-            "rushing_yards": ("rushing", "YDS"), "alt_rushing_yards": ("rushing", "YDS"),
-            "alt rushing yds": ("rushing", "YDS"), "alt_rushing_yds": ("rushing", "YDS"), "rushing yds": ("rushing", "YDS"),
-            "rushing_attempts": ("rushing", "CAR"),
-            "rushing_touchdowns": ("rushing", "TD"), "longest_rush": ("rushing", "LONG"),
-            "receiving_yards": ("receiving", "YDS"), "alt_receiving_yards": ("receiving", "YDS"),
-            "alt receiving yds": ("receiving", "YDS"), "alt_receiving_yds": ("receiving", "YDS"), "receiving yds": ("receiving", "YDS"),
-            "receptions": ("receiving", "REC"), "receptions_alt": ("receiving", "REC"),
-            "receiving_touchdowns": ("receiving", "TD"), "longest_reception": ("receiving", "LONG"),
-            "sacks": ("defensive", "SACKS"), "tackles_assists": ("defensive", "TOT"),
-            "solo_tackles": ("defensive", "SOLO"), "defensive_interceptions": ("interceptions", "INT"),
-            "field_goals_made": ("kicking", "FG"), "kicking_points": ("kicking", "PTS"),
-            "extra_points_made": ("kicking", "XP"),
-            
-            # NBA
-            # NBA - Category name is often None/Empty in ESPN API
-            "points": ("", "PTS"), "alt_points": ("", "PTS"),
-            "rebounds": ("", "REB"), "alt_rebounds": ("", "REB"),
-            "assists": ("", "AST"), "alt_assists": ("", "AST"),
-            "steals": ("", "STL"),
-            "blocks": ("", "BLK"),
-            "turnovers": ("", "TO"),
-            "three_pointers_made": ("", "3PT"), "threes_made": ("", "3PT"), "made_threes": ("", "3PT"),
-            "3-pointers_made": ("", "3PT"), "3_pointers_made": ("", "3PT"),
-        }
+        if kind == stat_catalog.KIND_BOXSCORE:
+            values = [game.player_stat(player_name, cat, label) for cat, label in definition.components]
+            value = definition.combine(values)
+            if len(values) == 1:
+                cat, label = definition.components[0]
+                # DEBUG: Log the extraction
+                logger.info(f"[STAT-EXTRACT] Player='{player_name}', Stat='{stat}', Cat='{cat}', Label='{label}', Val={value}")
+            return value
         
-        if stat in stat_map:
-            cat, label = stat_map[stat]
-            # Special handling for NBA 3PT which might come as "1-5" (made-attempted)
-            val = _get_player_stat_from_boxscore(player_name, cat, label, boxscore)
-            
-            # DEBUG: Log the extraction
-            logger.info(f"[STAT-EXTRACT] Player='{player_name}', Stat='{stat}', Cat='{cat}', Label='{label}', Val={val}")
-            
-            # If it's a 3PT stat and we got a string like "1-5", parse it
-            if label == "3PT" and isinstance(val, str) and "-" in val:
-                try:
-                    return int(val.split("-")[0])
-                except:
-                    return 0
-            return val
-
-        # Complex Player Stats
-        if stat == "rushing_receiving_yards":
-            rush = _get_player_stat_from_boxscore(player_name, "rushing", "YDS", boxscore)
-            rec = _get_player_stat_from_boxscore(player_name, "receiving", "YDS", boxscore)
-            if rush is None or rec is None: return None
-            return rush + rec
-        
-        if stat == "passing_rushing_yards":
-            pass_yds = _get_player_stat_from_boxscore(player_name, "passing", "YDS", boxscore)
-            rush_yds = _get_player_stat_from_boxscore(player_name, "rushing", "YDS", boxscore)
-            if pass_yds is None or rush_yds is None: return None
-            return pass_yds + rush_yds
-            
-        # NBA Complex Stats
-        if stat in ["points_rebounds_assists", "pra"]:
-            pts = _get_player_stat_from_boxscore(player_name, "", "PTS", boxscore)
-            reb = _get_player_stat_from_boxscore(player_name, "", "REB", boxscore)
-            ast = _get_player_stat_from_boxscore(player_name, "", "AST", boxscore)
-            if pts is None or reb is None or ast is None: return None
-            return pts + reb + ast
-            
-        if stat in ["points_rebounds", "pr"]:
-            pts = _get_player_stat_from_boxscore(player_name, "", "PTS", boxscore)
-            reb = _get_player_stat_from_boxscore(player_name, "", "REB", boxscore)
-            if pts is None or reb is None: return None
-            return pts + reb
-            
-        if stat in ["points_assists", "pa"]:
-            pts = _get_player_stat_from_boxscore(player_name, "", "PTS", boxscore)
-            ast = _get_player_stat_from_boxscore(player_name, "", "AST", boxscore)
-            if pts is None or ast is None: return None
-            return pts + ast
-            
-        if stat in ["rebounds_assists", "ra"]:
-            reb = _get_player_stat_from_boxscore(player_name, "", "REB", boxscore)
-            ast = _get_player_stat_from_boxscore(player_name, "", "AST", boxscore)
-            if reb is None or ast is None: return None
-            return reb + ast
-            
-        # Double-Double / Triple-Double
-        if stat == "double_double":
-            cats = ["PTS", "REB", "AST", "STL", "BLK"]
-            count = 0
-            for label in cats:
-                val = _get_player_stat_from_boxscore(player_name, "", label, boxscore)
-                if val is None: return None
-                if val >= 10:
-                    count += 1
-            return 1 if count >= 2 else 0
-            
-        if stat == "triple_double":
-            cats = ["PTS", "REB", "AST", "STL", "BLK"]
-            count = 0
-            for label in cats:
-                val = _get_player_stat_from_boxscore(player_name, "", label, boxscore)
-                if val is None: return None
-                if val >= 10:
-                    count += 1
-            return 1 if count >= 3 else 0
-        
-        if stat in ["anytime_touchdown", "anytime_td_scorer", "player_to_score_2_touchdowns", "player_to_score_3_touchdowns"]:
-            return _get_touchdowns(player_name, boxscore, scoring_plays)
-
-        td_plays = [p for p in scoring_plays if "Touchdown" in p.get("type", {}).get("text", "")]
-        if stat == "first_touchdown_scorer":
-            if td_plays and player_name.lower() in td_plays[0].get("participants", [{}])[0].get("displayName", "").lower():
-                return 1
-            return 0
-        if stat == "last_touchdown_scorer":
-            if td_plays and player_name.lower() in td_plays[-1].get("participants", [{}])[0].get("displayName", "").lower():
-                return 1
-            return 0
+        # Touchdown legs share the game's precomputed scorer index
+        tds = game.touchdowns
+        if kind == stat_catalog.KIND_TOUCHDOWNS:
+            return tds.count(player_name, bet.get("espn_player_id"))
+        return tds.scored(player_name, last=kind == stat_catalog.KIND_LAST_TOUCHDOWN)
 
     # --- Team & Game Props ---
-    home_score = game_data["score"]["home"]
-    away_score = game_data["score"]["away"]
+    home_score = game.home_score
+    away_score = game.away_score
     
-    if stat == "team_total_points":
-        return home_score if bet["team"] == game_data["teams"]["home"] else away_score
+    if kind == stat_catalog.KIND_TEAM_TOTAL:
+        return home_score if bet["team"] == game.home else away_score
     
-    if stat == "total_points" or stat == "total_points_under" or stat == "total_points_over":
+    if kind == stat_catalog.KIND_GAME_TOTAL:
         return home_score + away_score
 
-    if stat == "first_team_to_score":
-        if scoring_plays:
-            return scoring_plays[0].get("team", {}).get("displayName")
-        return "N/A"
+    if kind == stat_catalog.KIND_FIRST_TEAM_TO_SCORE:
+        return game.first_scoring_team or "N/A"
+
+    if kind == stat_catalog.KIND_LAST_TEAM_TO_SCORE:
+        return game.last_scoring_team or "N/A"
 
-    if stat == "last_team_to_score":
-        if scoring_plays:
-            return scoring_plays[-1].get("team", {}).get("displayName")
-        return "N/A"
+    if kind == stat_catalog.KIND_OVERTIME:
+        return 1 if (game.period or 0) > 4 else 0
 
-    if stat == "moneyline" or stat == "spread" or stat == "point_spread":
+    if kind == stat_catalog.KIND_SCORE_DIFFERENTIAL:
         if "team" not in bet:
             return 0
         bet_team = bet["team"]
-        home_team = game_data["teams"]["home"]
-        away_team = game_data["teams"]["away"]
+        home_team = game.home
+        away_team = game.away
         
         bet_team_norm = (bet_team or "").lower().strip()
         home_team_norm = (home_team or "").lower().strip()
@@ -311,60 +219,43 @@ def fetch_game_details_from_espn(game_date, away_team, home_team, sport='NFL'):
                 
                 try:
                     # Try with SSL verification first
-                    summary = requests.get(summary_url, timeout=8, verify=True).json()
+                    response = requests.get(summary_url, timeout=8, verify=True)
                 except requests.exceptions.SSLError:
                     # Retry without SSL verification
                     logger.warning(f"SSL error fetching {sport} summary, retrying without SSL verification...")
-                    summary = requests.get(summary_url, timeout=8, verify=False).json()
+                    response = requests.get(summary_url, timeout=8, verify=False)
                 
-                # summary may use camelCase keys
-                s_box = summary.get("boxscore") or summary.get("boxScore") or {}
-                boxscore_players = s_box.get("players") or []
-                scoring_plays = summary.get("scoringPlays") or summary.get("scoring_plays") or []
+                # Only these subtrees are parsed; summary may use camelCase keys
+                summary = read_json_parts(response, SUMMARY_GAME_PARTS)
+                boxscore_players = summary["boxscore.players"] or summary["boxScore.players"] or []
+                scoring_plays = summary["scoringPlays"] or summary["scoring_plays"] or []
                 logger.info(f"Summary fetched: box players={len(boxscore_players)}, scoring plays={len(scoring_plays)}")
             except Exception as e:
                 logger.error(f"Error fetching {sport} summary for event {ev.get('id')}: {e}")
 
-            # Use DB to get correct abbreviations if possible
-            away_name = away["team"]["displayName"]
-            home_name = home["team"]["displayName"]
-            away_abbr = away["team"].get("abbreviation", "")
-            home_abbr = home["team"].get("abbreviation", "")
-            
-            try:
-                from models import Team
-                # Lookup Away Team
-                abbr = Team.get_team_abbr_by_name_cached(away_name)
-                if abbr:
-                    away_abbr = abbr
-                    
-                # Lookup Home Team
-                abbr = Team.get_team_abbr_by_name_cached(home_name)
-                if abbr:
-                    home_abbr = abbr
-            except Exception as e:
-                logger.error(f"Error looking up team abbreviations from DB: {e}")
+        # Use DB to get correct abbreviations if possible
+        away_name = away["team"]["displayName"]
+        home_name = home["team"]["displayName"]
+        away_abbr = away["team"].get("abbreviation", "")
+        home_abbr = home["team"].get("abbreviation", "")
+        
+        try:
+            from models import Team
+            # Lookup Away Team
+            abbr = Team.get_team_abbr_by_name_cached(away_name)
+            if abbr:
+                away_abbr = abbr
+                
+            # Lookup Home Team
+            abbr = Team.get_team_abbr_by_name_cached(home_name)
+            if abbr:
+                home_abbr = abbr
+        except Exception as e:
+            logger.error(f"Error looking up team abbreviations from DB: {e}")
 
-            game = {
-                "espn_game_id": ev["id"],
-                "teams": {
-                    "away": away_name, 
-                    "home": home_name,
-                    "away_abbr": away_abbr,
-                    "home_abbr": home_abbr
-                },
-            "startTime": ev.get("date", "").split("T")[1][:5] + " ET" if "T" in ev.get("date", "") else "",
-            "startDateTime": ev.get("date", ""),  # Full ISO datetime for countdown calculations
-            "game_date": game_date,
-            "statusTypeName": ev["status"]["type"]["name"],
-            "period": ev["status"].get("period", 0),
-            "clock": ev["status"].get("displayClock", "00:00"),
-            "score": {"away": int(away.get("score", 0)), "home": int(home.get("score", 0))},
-            "boxscore": boxscore_players,
-            "scoring_plays": scoring_plays,
-            "leaders": []
-        }
-        return game
+        # Built once per fetch; the raw ESPN lists aren't kept past this point
+        return GameSnapshot.from_espn(ev, sport, game_date, boxscore_players, scoring_plays,
+                                      away_abbr=away_abbr, home_abbr=home_abbr)
 
     except Exception as e:
         logger.error(f"Error in fetch_game_details_from_espn: {str(e)}")
@@ -437,28 +328,21 @@ def process_parlay_data(parlays, fetch_live=True):
                 except Exception as e:
                     logger.error(f"Error looking up team abbreviations from DB (fallback): {e}")
 
-                game_data = {
-                    "espn_game_id": leg.get("gameId", ""),
-                    "teams": {
-                        "away": away_name,
-                        "home": home_name,
-                        "away_abbr": away_abbr,
-                        "home_abbr": home_abbr
-                    },
-                    "startTime": "",
-                    "startDateTime": leg.get("game_date", ""),
-                    "game_date": leg.get("game_date", ""),
-                    "statusTypeName": leg.get("gameStatus") or "unknown",  # Use existing status from DB
-                    "period": leg.get("current_quarter") or 0,
-                    "clock": leg.get("time_remaining") or "00:00",
-                    "score": {
-                        "away": leg.get("awayScore") or 0, 
-                        "home": leg.get("homeScore") or 0
-                    },
-                    "boxscore": [],
-                    "scoring_plays": [],
-                    "leaders": []
-                }
+                game_data = GameSnapshot(
+                    espn_game_id=leg.get("gameId", ""),
+                    sport=sport,
+                    away=away_name,
+                    home=home_name,
+                    away_abbr=away_abbr,
+                    home_abbr=home_abbr,
+                    start_date_time=leg.get("game_date", ""),
+                    game_date=leg.get("game_date", ""),
+                    status=leg.get("gameStatus") or "unknown",  # Use existing status from DB
+                    period=leg.get("current_quarter") or 0,
+                    clock=leg.get("time_remaining") or "00:00",
+                    away_score=leg.get("awayScore") or 0,
+                    home_score=leg.get("homeScore") or 0,
+                )
                 parlay_games[game_key] = game_data
                 if fetch_live:
                     # Only warn if we EXPECTED to find it
@@ -479,27 +363,26 @@ def process_parlay_data(parlays, fetch_live=True):
             if game_data:
                 try:
                     # Update leg with live scores from game_data
-                    home_score = game_data.get("score", {}).get("home", 0)
-                    away_score = game_data.get("score", {}).get("away", 0)
+                    home_score = game_data.home_score
+                    away_score = game_data.away_score
                     leg["homeScore"] = home_score
                     leg["awayScore"] = away_score
                     
                     # Update leg with full team names from game_data
-                    game_teams = game_data.get("teams", {})
-                    if game_teams.get("away"):
-                        leg["away"] = game_teams["away"]
-                        leg["awayTeam"] = game_teams["away"]
-                    if game_teams.get("home"):
-                        leg["home"] = game_teams["home"]
-                        leg["homeTeam"] = game_teams["home"]
+                    if game_data.away:
+                        leg["away"] = game_data.away
+                        leg["awayTeam"] = game_data.away
+                    if game_data.home:
+                        leg["home"] = game_data.home
+                        leg["homeTeam"] = game_data.home
                     
                     # Update leg with game status (scheduled, in_progress, final, etc.)
-                    game_status = game_data.get("statusTypeName", "")
+                    game_status = game_data.status
                     if game_status:
                         leg["gameStatus"] = game_status
                     
                     # Update leg with ESPN game ID
-                    espn_game_id = game_data.get("espn_game_id")
+                    espn_game_id = game_data.espn_game_id
                     if espn_game_id:
                         leg["gameId"] = str(espn_game_id)
                     
@@ -523,9 +406,9 @@ def process_parlay_data(parlays, fetch_live=True):
                              logger.warning(f"Historical leg {leg.get('id')} missing scores - falling back to calculation")
 
                     # Add score differential for spread/moneyline bets
-                    if not skip_calculation and leg["stat"] in ["spread", "moneyline", "point_spread"]:
-                        home_team = game_data.get("teams", {}).get("home", "")
-                        away_team = game_data.get("teams", {}).get("away", "")
+                    if not skip_calculation and stat_catalog.plan_kind(leg["stat"], leg.get("sport")) == stat_catalog.KIND_SCORE_DIFFERENTIAL:
+                        home_team = game_data.home
+                        away_team = game_data.away
                         
                         # Calculate from bet team's perspective
                         bet_team = leg.get("team", "")
@@ -562,7 +445,7 @@ def process_parlay_data(parlays, fetch_live=True):
 
         # Copy all original parlay fields and add games
         processed_parlay = parlay.copy()
-        processed_parlay["games"] = list(parlay_games.values())
+        processed_parlay["games"] = [game.to_client() for game in parlay_games.values()]
         
         # Task 7: Add alerts for sport mismatch
         # Check if any legs had sport match warnings or no games found
@@ -0,0 +1,179 @@
+"""
+Delta sync for bet listings (/api/sync).
+
+Instead of refetching whole lists, a client keeps an opaque cursor and asks
+for what changed since it:
+
+- bets it can see whose row or any leg changed (created, updated, moved
+  between live/historical, archived, shared with it), as full payloads
+- tombstones for bets and legs that were deleted or that it lost access to
+
+Changes are found through indexed ``updated_at`` range scans on bets and
+bet_legs plus the per-user sync_tombstones table, so the cost is
+proportional to the number of changes rather than the size of the lists.
+
+Cursors carry a database timestamp. Each response's final cursor starts
+SYNC_OVERLAP_SECONDS before the query ran, so writes from transactions
+that committed late are picked up by the next sync; clients must treat
+results as upserts (the same bet may be sent twice).
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, literal, select, tuple_, union_all
+from sqlalchemy.dialects import sqlite
+
+from models import db, Bet, BetLeg, BetParticipant, SyncTombstone
+from services.bet_serialization import bet_version_column, get_processed_bet_payloads
+from services.user_service import ALL_ROLES
+
+logger = logging.getLogger(__name__)
+
+SYNC_OVERLAP_SECONDS = 5
+SYNC_DEFAULT_LIMIT = 200
+SYNC_MAX_LIMIT = 1000
+# Tombstones older than this are pruned; older cursors get a full reset
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+
+# SQLite stores CURRENT_TIMESTAMP as 'YYYY-MM-DD HH:MM:SS' text; bind cursor
+# timestamps in the same format so equal times compare equal
+_SQLITE_SECONDS = sqlite.DATETIME(
+    storage_format='%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d'
+)
+
+
+def encode_sync_cursor(timestamp, bet_id=0):
+    raw = json.dumps([timestamp.isoformat(), bet_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_sync_cursor(cursor):
+    """Return (timestamp, bet_id) from a sync cursor, or raise ValueError."""
+    try:
+        timestamp, bet_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(timestamp), int(bet_id)
+    except Exception as e:
+        raise ValueError(f"Invalid sync cursor: {cursor}") from e
+
+
+def database_now():
+    """Current time on the database clock (the one updated_at is written with)."""
+    now = db.session.execute(select(func.now())).scalar()
+    if isinstance(now, str):
+        now = datetime.fromisoformat(now)
+    # Columns are naive timestamps
+    return now.replace(tzinfo=None)
+
+
+def timestamp_param(value):
+    if db.engine.dialect.name == 'sqlite':
+        return literal(value, _SQLITE_SECONDS)
+    return value
+
+
+def _changed_bets(user_id, since, after_id, limit):
+    """[(bet_id, changed_at, updated_at, legs_updated_at)] visible to user_id, keyset-paged."""
+    since = timestamp_param(since)
+    changes = union_all(
+        select(Bet.id.label('bet_id'), Bet.updated_at.label('changed_at'))
+        .where(Bet.updated_at >= since),
+        select(BetLeg.bet_id, BetLeg.updated_at)
+        .where(BetLeg.updated_at >= since),
+        # A deleted leg changes its (surviving) bet
+        select(SyncTombstone.bet_id, SyncTombstone.deleted_at)
+        .where(SyncTombstone.user_id == user_id,
+               SyncTombstone.entity_type == SyncTombstone.ENTITY_LEG,
+               SyncTombstone.deleted_at >= since),
+    ).subquery()
+
+    per_bet = (
+        select(changes.c.bet_id, func.max(changes.c.changed_at).label('changed_at'))
+        .group_by(changes.c.bet_id)
+        .subquery()
+    )
+
+    query = (
+        db.session.query(per_bet.c.bet_id, per_bet.c.changed_at, Bet.updated_at,
+                         bet_version_column().label('legs_updated_at'))
+        .join(Bet, Bet.id == per_bet.c.bet_id)
+        .join(BetParticipant, (BetParticipant.bet_id == Bet.id)
+              & (BetParticipant.user_id == user_id)
+              & BetParticipant.role.in_(ALL_ROLES))
+        .filter(tuple_(per_bet.c.changed_at, per_bet.c.bet_id) > tuple_(since, after_id))
+        .order_by(per_bet.c.changed_at, per_bet.c.bet_id)
+        .limit(limit + 1)
+    )
+    return query.all()
+
+
+def _tombstones(user_id, since):
+    since = timestamp_param(since)
+    rows = (db.session.query(SyncTombstone.entity_type, SyncTombstone.entity_id)
+            .filter(SyncTombstone.user_id == user_id, SyncTombstone.deleted_at >= since)
+            .distinct()
+            .all())
+    deleted = {'bets': [], 'legs': []}
+    for entity_type, entity_id in rows:
+        deleted['bets' if entity_type == SyncTombstone.ENTITY_BET else 'legs'].append(entity_id)
+    return deleted
+
+
+def sync_bets(user_id, cursor=None, limit=SYNC_DEFAULT_LIMIT):
+    """Changes for user_id since ``cursor``.
+
+    Returns a dict with ``bets`` (processed payloads), ``deleted``
+    ({'bets': [...], 'legs': [...]}), ``next_cursor``, ``has_more`` and
+    ``reset``. Without a cursor, or with one older than the tombstone
+    retention window, ``reset`` is True and the client should reload its
+    lists, then continue from ``next_cursor``. Clients apply ``deleted``
+    before ``bets``: a bet can be tombstoned and re-shared in one window.
+
+    Raises ValueError for a malformed cursor.
+    """
+    limit = max(1, min(limit, SYNC_MAX_LIMIT))
+    started = database_now()
+    fresh_cursor = encode_sync_cursor(started - timedelta(seconds=SYNC_OVERLAP_SECONDS))
+    empty = {'bets': [], 'deleted': {'bets': [], 'legs': []},
+             'next_cursor': fresh_cursor, 'has_more': False, 'reset': True}
+
+    if not cursor:
+        return empty
+    since, after_id = decode_sync_cursor(cursor)
+    if since < started - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS):
+        logger.info(f"[SYNC] Cursor for user {user_id} predates tombstone retention, resetting")
+        return empty
+
+    rows = _changed_bets(user_id, since, after_id, limit)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if has_more:
+        next_cursor = encode_sync_cursor(rows[-1].changed_at, rows[-1].bet_id)
+    else:
+        next_ts = max(since, started - timedelta(seconds=SYNC_OVERLAP_SECONDS))
+        next_cursor = encode_sync_cursor(next_ts)
+
+    payloads = get_processed_bet_payloads(
+        [(row.bet_id, (row.updated_at, row.legs_updated_at)) for row in rows],
+        fetch_live=False
+    )
+    logger.info(f"[SYNC] User {user_id}: {len(payloads)} changed bets since {since.isoformat()}")
+    return {
+        'bets': payloads,
+        'deleted': _tombstones(user_id, since),
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+        'reset': False,
+    }
+
+
+def prune_sync_tombstones(retention_days=SYNC_TOMBSTONE_RETENTION_DAYS):
+    """Delete tombstones older than the retention window. Returns rows deleted."""
+    cutoff = database_now() - timedelta(days=retention_days)
+    deleted = SyncTombstone.query.filter(SyncTombstone.deleted_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    logger.info(f"[SYNC] Pruned {deleted} tombstones older than {retention_days} days")
+    return deleted
@@ -0,0 +1,369 @@
+"""
+Player prop hit-rate history.
+
+player_prop_index keeps, per (sport, player, stat_type), every known
+per-game value (ESPN game logs plus achieved values of our settled legs)
+as a sorted list, together with our own settled outcomes. The hit rate for
+any line is then a primary-key lookup plus a binary search.
+
+The index is maintained by an after_flush hook, so the settlement jobs
+(leg status / is_hit / achieved_value writes) and the enrichment job
+(Player.stats_last_5_games / stats_season writes) keep it current without
+calling anything explicitly.
+"""
+
+import bisect
+import logging
+import statistics
+
+from sqlalchemy import event, inspect, select, tuple_
+from sqlalchemy.orm import Session
+
+from models import db, BetLeg, Player
+from models.player_prop_index import PlayerPropIndex
+from stat_standardization import standardize_stat_type
+
+logger = logging.getLogger(__name__)
+
+SETTLED_LEG_STATUSES = ('won', 'lost')
+
+# Changes to these on a settled leg move or alter its index entry
+LEG_INDEX_FIELDS = (
+    'status', 'is_hit', 'achieved_value', 'target_value', 'bet_line_type',
+    'player_name', 'stat_type', 'sport', 'game_id', 'game_date',
+)
+PLAYER_INDEX_FIELDS = ('stats_last_5_games', 'stats_season')
+
+# Oldest game-log values are dropped beyond this many games
+MAX_LOG_VALUES = 200
+
+# Combined props computed from their parts when a game log has them all
+COMBO_STATS = {
+    'points_rebounds_assists': ('points', 'rebounds', 'assists'),
+    'points_assists': ('points', 'assists'),
+    'rebounds_assists': ('rebounds', 'assists'),
+    'rushing_receiving_yards': ('rushing_yards', 'receiving_yards'),
+    'passing_rushing_yards': ('passing_yards', 'rushing_yards'),
+}
+
+
+def player_key(name):
+    """Normalized player name used in the index ("A.J.  Brown" -> "aj brown")."""
+    return ' '.join(str(name or '').lower().replace('.', '').split())[:100]
+
+
+def _number(value):
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(',', ''))
+    except ValueError:
+        return None
+
+
+def _leg_index_key(sport, player_name, stat_type):
+    if not (player_name and stat_type):
+        return None
+    sport = (sport or 'NFL')[:20]
+    return sport, player_key(player_name), (standardize_stat_type(stat_type, sport) or stat_type)[:50]
+
+
+def _leg_record(leg):
+    """[line, side, hit, game_key, achieved_value] for a settled leg."""
+    hit = leg.is_hit if leg.is_hit is not None else leg.status == 'won'
+    game_key = str(leg.game_id) if leg.game_id else f"date:{leg.game_date}" if leg.game_date else None
+    side = (leg.bet_line_type or 'over').lower()
+    return [_number(leg.target_value), side, bool(hit), game_key, _number(leg.achieved_value)]
+
+
+def game_log_values(game_logs, sport):
+    """{stat_type: {game_key: value}} from a Player.stats_last_5_games list."""
+    values = {}
+    for game in game_logs or []:
+        if not isinstance(game, dict) or not game.get('gameId'):
+            continue
+        game_key = str(game['gameId'])
+        stats = {}
+        for key, raw in game.items():
+            if key in ('gameId', 'gameDate', 'opponent'):
+                continue
+            value = _number(raw)
+            if value is not None:
+                stats[(standardize_stat_type(key, sport) or key)[:50]] = value
+        for combo, parts in COMBO_STATS.items():
+            if combo not in stats and all(part in stats for part in parts):
+                stats[combo] = sum(stats[part] for part in parts)
+        for stat_type, value in stats.items():
+            values.setdefault(stat_type, {})[game_key] = value
+    return values
+
+
+def _current_season(stats_season):
+    """(season label, stats dict) for the most recent season in Player.stats_season."""
+    if not isinstance(stats_season, dict) or not stats_season:
+        return None, {}
+    seasons = {k: v for k, v in stats_season.items() if isinstance(v, dict)}
+    if not seasons:
+        return None, {}
+    label = max(seasons, key=lambda k: (k != 'current', str(k)))
+    return label, seasons[label]
+
+
+def _finalize(entry):
+    """Recompute the derived columns of an index entry from its sources."""
+    values = {}
+    for record in (entry['leg_results'] or {}).values():
+        game_key, achieved = record[3], record[4]
+        if game_key and achieved is not None:
+            values[game_key] = achieved
+    values.update(entry['log_values'] or {})  # box score values win over our own records
+    entry['sorted_values'] = sorted(values.values())
+    results = list((entry['leg_results'] or {}).values())
+    entry['legs_settled'] = len(results)
+    entry['legs_won'] = sum(1 for record in results if record[2])
+    return entry
+
+
+def _load_entries(connection, keys):
+    table = PlayerPropIndex.__table__
+    keys = list(set(keys))
+    rows = connection.execute(select(table).where(
+        tuple_(table.c.sport, table.c.player_key, table.c.stat_type).in_(keys)
+    ))
+    entries = dict.fromkeys(keys)
+    for row in rows:
+        entries[(row.sport, row.player_key, row.stat_type)] = dict(row._mapping)
+    return entries
+
+
+def _empty_entry(index_key):
+    sport, key, stat_type = index_key
+    return {'sport': sport, 'player_key': key, 'stat_type': stat_type, 'player_id': None,
+            'log_values': {}, 'leg_results': {}, 'sorted_values': [], 'legs_settled': 0,
+            'legs_won': 0, 'season': None}
+
+
+def _save_entries(connection, entries, existing):
+    table = PlayerPropIndex.__table__
+    for index_key, entry in entries.items():
+        _finalize(entry)
+        values = {k: entry[k] for k in ('player_id', 'log_values', 'leg_results', 'sorted_values',
+                                        'legs_settled', 'legs_won', 'season')}
+        if existing.get(index_key) is None:
+            connection.execute(table.insert().values(
+                sport=index_key[0], player_key=index_key[1], stat_type=index_key[2], **values
+            ))
+        else:
+            connection.execute(table.update().where(
+                table.c.sport == index_key[0], table.c.player_key == index_key[1],
+                table.c.stat_type == index_key[2],
+            ).values(**values))
+
+
+def apply_leg_changes(connection, changes):
+    """Apply [(leg_id, old_key, new_key, record_or_None), ...] to the index."""
+    keys = [k for _, old, new, _ in changes for k in (old, new) if k]
+    if not keys:
+        return
+    existing = _load_entries(connection, keys)
+    entries = {}
+
+    def entry_for(index_key):
+        if index_key not in entries:
+            stored = existing.get(index_key)
+            entries[index_key] = dict(stored) if stored else _empty_entry(index_key)
+            entries[index_key]['leg_results'] = dict(entries[index_key]['leg_results'] or {})
+        return entries[index_key]
+
+    for leg_id, old_key, new_key, record in changes:
+        leg_id = str(leg_id)
+        if old_key and old_key != new_key and existing.get(old_key) is not None:
+            entry_for(old_key)['leg_results'].pop(leg_id, None)
+        if new_key:
+            if record is None:
+                if existing.get(new_key) is not None:
+                    entry_for(new_key)['leg_results'].pop(leg_id, None)
+            else:
+                entry_for(new_key)['leg_results'][leg_id] = record
+    _save_entries(connection, entries, existing)
+
+
+def unindex_legs(connection, legs):
+    """Drop legs from the index; for bulk statements that bypass the flush hook.
+
+    ``legs`` are rows with id, status, sport, player_name and stat_type as
+    they were before the statement ran.
+    """
+    apply_leg_changes(connection, [
+        (leg.id, None, _leg_index_key(leg.sport, leg.player_name, leg.stat_type), None)
+        for leg in legs if leg.status in SETTLED_LEG_STATUSES
+    ])
+
+
+def apply_player_stats(connection, player):
+    """Merge a player's game logs and current season stats into the index."""
+    if not player.player_name:
+        return
+    sport = (player.sport or 'NFL')[:20]
+    key = player_key(player.player_name)
+    per_stat = game_log_values(player.stats_last_5_games, sport)
+    season_label, season_stats = _current_season(player.stats_season)
+    games_played = _number(season_stats.get('games_played'))
+
+    table = PlayerPropIndex.__table__
+    existing = {
+        (row.sport, row.player_key, row.stat_type): dict(row._mapping)
+        for row in connection.execute(select(table).where(table.c.sport == sport, table.c.player_key == key))
+    }
+    entries = {}
+    for stat_type in set(per_stat) | {k[2] for k in existing}:
+        index_key = (sport, key, stat_type)
+        entry = dict(existing[index_key]) if index_key in existing else _empty_entry(index_key)
+        log_values = dict(entry['log_values'] or {})
+        log_values.update(per_stat.get(stat_type, {}))
+        entry['log_values'] = dict(list(log_values.items())[-MAX_LOG_VALUES:])
+        season_value = _number(season_stats.get(stat_type))
+        entry['season'] = ({'season': season_label, 'value': season_value, 'games_played': games_played}
+                           if season_value is not None else entry['season'])
+        entry['player_id'] = player.id
+        entries[index_key] = entry
+    _save_entries(connection, entries, existing)
+
+
+def _history_value(obj, name):
+    history = inspect(obj).attrs[name].history
+    return history.deleted[0] if history.deleted else getattr(obj, name)
+
+
+@event.listens_for(Session, 'after_flush')
+def _maintain_player_prop_index(session, flush_context):
+    """Index settled legs and refreshed player stats written in this flush."""
+    changes = []
+    players = []
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, BetLeg):
+            deleted = obj in session.deleted
+            if not deleted and obj not in session.new and not any(
+                inspect(obj).attrs[f].history.has_changes() for f in LEG_INDEX_FIELDS
+            ):
+                continue
+            was_settled = _history_value(obj, 'status') in SETTLED_LEG_STATUSES
+            settled = not deleted and obj.status in SETTLED_LEG_STATUSES
+            if not (settled or was_settled):
+                continue
+            new_key = _leg_index_key(obj.sport, obj.player_name, obj.stat_type)
+            old_key = _leg_index_key(_history_value(obj, 'sport'), _history_value(obj, 'player_name'),
+                                     _history_value(obj, 'stat_type')) if was_settled else None
+            changes.append((obj.id, old_key, new_key, _leg_record(obj) if settled else None))
+        elif isinstance(obj, Player) and obj not in session.deleted:
+            if obj in session.new or any(inspect(obj).attrs[f].history.has_changes() for f in PLAYER_INDEX_FIELDS):
+                players.append(obj)
+
+    if changes:
+        apply_leg_changes(session.connection(), changes)
+    for player in players:
+        apply_player_stats(session.connection(), player)
+
+
+def prop_line_history(player_name, stat_type, line, side='over', sport=None):
+    """Distribution and hit rate of a player's stat against ``line``.
+
+    Returns None when nothing is indexed for the player/stat. ``side`` is
+    'over' (value > line) or 'under' (value < line); values equal to the
+    line count as pushes.
+    """
+    key = player_key(player_name)
+    query = PlayerPropIndex.query.filter_by(player_key=key)
+    if sport:
+        stat_type = standardize_stat_type(stat_type, sport) or stat_type
+        query = query.filter_by(sport=sport, stat_type=stat_type)
+    else:
+        query = query.filter_by(stat_type=standardize_stat_type(stat_type) or stat_type)
+    # Same name in several sports is rare; prefer the deepest history
+    entry = max(query.all(), key=lambda e: len(e.sorted_values or []), default=None)
+    if entry is None:
+        return None
+
+    values = entry.sorted_values or []
+    samples = len(values)
+    below = bisect.bisect_left(values, line)
+    above = samples - bisect.bisect_right(values, line)
+    hits = above if side == 'over' else below
+    decided = above + below
+
+    distribution = None
+    if values:
+        distribution = {
+            'min': values[0],
+            'p25': values[(samples - 1) // 4],
+            'median': statistics.median(values),
+            'p75': values[(3 * (samples - 1)) // 4],
+            'max': values[-1],
+            'mean': round(sum(values) / samples, 2),
+        }
+
+    return {
+        'player': player_name,
+        'sport': entry.sport,
+        'stat_type': entry.stat_type,
+        'line': line,
+        'side': side,
+        'samples': samples,
+        'hits': hits,
+        'pushes': samples - above - below,
+        'hit_rate': round(hits / decided, 4) if decided else None,
+        'distribution': distribution,
+        'season': entry.season,
+        'our_legs': {
+            'settled': entry.legs_settled,
+            'won': entry.legs_won,
+            'win_rate': round(entry.legs_won / entry.legs_settled, 4) if entry.legs_settled else None,
+        },
+    }
+
+
+def backfill_player_prop_index(connection, batch_size=500):
+    """Index every settled leg and every player with game logs (plain connection)."""
+    last_id = 0
+    while True:
+        legs = connection.execute(
+            select(BetLeg.id, BetLeg.sport, BetLeg.player_name, BetLeg.stat_type, BetLeg.status,
+                   BetLeg.is_hit, BetLeg.game_id, BetLeg.game_date, BetLeg.bet_line_type,
+                   BetLeg.target_value, BetLeg.achieved_value)
+            .where(BetLeg.id > last_id, BetLeg.status.in_(SETTLED_LEG_STATUSES))
+            .order_by(BetLeg.id).limit(batch_size)
+        ).all()
+        if not legs:
+            break
+        apply_leg_changes(connection, [
+            (leg.id, None, _leg_index_key(leg.sport, leg.player_name, leg.stat_type), _leg_record(leg))
+            for leg in legs
+        ])
+        last_id = legs[-1].id
+
+    last_id = 0
+    while True:
+        players = connection.execute(
+            select(Player.id, Player.player_name, Player.sport, Player.stats_last_5_games, Player.stats_season)
+            .where(Player.id > last_id)
+            .order_by(Player.id).limit(batch_size)
+        ).all()
+        if not players:
+            break
+        for player in players:
+            if player.stats_last_5_games or player.stats_season:
+                apply_player_stats(connection, player)
+        last_id = players[-1].id
+
+
+def rebuild_player_prop_index():
+    """Rebuild the whole index from settled legs and player stats. Returns rows written."""
+    db.session.query(PlayerPropIndex).delete(synchronize_session=False)
+    backfill_player_prop_index(db.session.connection())
+    db.session.commit()
+
+    rows = PlayerPropIndex.query.count()
+    logger.info(f"[PROP-INDEX] Rebuilt player prop index ({rows} rows)")
+    return rows
@@ -0,0 +1,559 @@
+"""
+Synthetic data for scale testing.
+
+generate_synthetic_data() fills a database (SQLite or PostgreSQL) with users,
+teams, players, bets and legs at any scale, with a realistic mix of:
+
+- sports in season on the bet's day (mostly NFL and NBA) and parlay sizes
+  (singles up to 20 legs)
+- player props chosen by position (QB passing, WR receiving, NBA centers
+  rebounding...) and team props (moneyline, spread, totals)
+- bet phases: settled (won / lost / void, mostly stored as 'completed' like
+  the app does; some archived), live and pending
+- shared (secondary bettors) and watched bets
+- power users: bets per user follow a heavy-tailed distribution
+
+Settled legs carry achieved values, is_hit and final scores that agree with
+each other and with the bet status; each day's games are a fixed pairing of
+the league's teams, so legs on the same game share game_id and score.
+
+Everything is drawn from random generators seeded by ``seed``, so the same
+seed and options produce the same rows. Dates are relative to ``as_of``
+(live bets are on that day, pending ones after it), so pass it explicitly
+to reproduce a dataset on another day.
+
+Rows go in with Core executemany in batches, using explicit ids so bets,
+legs and participants can be written without a round trip per row. Bulk
+inserts bypass the ORM flush hooks, so the derived state they maintain is
+written here as well: bet_participants rows and bets.search_document, and,
+unless ``derived=False``, analytics rollups and the player prop index.
+"""
+
+import json
+import logging
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from sqlalchemy import func, insert, select, text
+
+from models import Bet, BetLeg, BetParticipant, Player, Team, User
+from services.analytics import SETTLED_STATUSES, refresh_bet_rollups
+from services.bet_search import build_search_document_from_values
+from services.player_props import backfill_player_prop_index
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+HISTORY_DAYS = 365
+DEFAULT_PASSWORD = 'synthetic'
+
+SPORT_WEIGHTS = {'NFL': 50, 'NBA': 32, 'MLB': 10, 'NHL': 8}
+SPORT_CODES = {'NFL': 1, 'NBA': 2, 'MLB': 3, 'NHL': 4}  # game ids: <code><yyyymmdd><nn>
+SEASONS = {'NFL': (9, 2), 'NBA': (10, 6), 'MLB': (3, 10), 'NHL': (10, 6)}  # first and last month
+BETTING_SITES = {'FanDuel': 38, 'DraftKings': 34, 'BetMGM': 10, 'Caesars': 8, 'ESPN BET': 6, 'Fanatics': 4}
+BET_PHASES = {'settled': 85, 'pending': 10, 'live': 5}
+WAGERS = {5: 15, 10: 30, 20: 20, 25: 15, 50: 12, 100: 6, 250: 2}
+
+ARCHIVED_SHARE = 0.2      # of settled bets
+COMPLETED_SHARE = 0.65    # settled bets stored as 'completed' (outcome only in the legs), as the app mostly does
+SGP_SHARE = 0.3           # multi-leg bets with every leg on one game
+CROSS_SPORT_SHARE = 0.15  # legs of a parlay outside its main sport
+TEAM_PROP_SHARE = 0.22
+UNDER_SHARE = 0.2
+VOID_SHARE = 0.02         # settled player legs voided (player inactive)
+MAX_LEGS_PER_BET = 20
+MAX_DECIMAL_ODDS = 1001   # books cap parlay payouts at +100000
+
+# (sport, position) -> roster share; each team's players cycle through these
+POSITIONS = {
+    'NFL': {'QB': 1, 'RB': 2, 'WR': 3, 'TE': 2},
+    'NBA': {'G': 2, 'F': 2, 'C': 1},
+    'MLB': {'P': 2, 'IF': 3, 'OF': 3},
+    'NHL': {'F': 3, 'D': 2, 'G': 1},
+}
+
+# (sport, position) -> [(canonical stat, lowest line, highest line)]; lines are x.5
+PLAYER_PROPS = {
+    ('NFL', 'QB'): [('passing_yards', 189.5, 299.5), ('passing_touchdowns', 0.5, 2.5),
+                    ('passing_completions', 17.5, 26.5), ('rushing_yards', 5.5, 39.5),
+                    ('interceptions_thrown', 0.5, 0.5)],
+    ('NFL', 'RB'): [('rushing_yards', 39.5, 99.5), ('rushing_attempts', 9.5, 20.5), ('receptions', 1.5, 4.5),
+                    ('anytime_touchdown', 0.5, 0.5), ('rushing_receiving_yards', 49.5, 119.5)],
+    ('NFL', 'WR'): [('receiving_yards', 29.5, 89.5), ('receptions', 2.5, 7.5), ('anytime_touchdown', 0.5, 0.5),
+                    ('longest_reception', 14.5, 29.5)],
+    ('NFL', 'TE'): [('receiving_yards', 19.5, 59.5), ('receptions', 1.5, 5.5), ('anytime_touchdown', 0.5, 0.5)],
+    ('NBA', 'G'): [('points', 12.5, 30.5), ('assists', 3.5, 9.5), ('three_pointers', 1.5, 4.5),
+                   ('points_rebounds_assists', 20.5, 44.5)],
+    ('NBA', 'F'): [('points', 10.5, 27.5), ('rebounds', 4.5, 9.5), ('points_rebounds', 15.5, 35.5),
+                   ('three_pointers', 0.5, 2.5)],
+    ('NBA', 'C'): [('rebounds', 7.5, 13.5), ('points', 9.5, 24.5), ('blocks', 0.5, 2.5),
+                   ('double_double', 0.5, 0.5)],
+    ('MLB', 'P'): [('strikeouts_pitcher', 3.5, 8.5), ('earned_runs', 1.5, 3.5), ('hits_allowed', 4.5, 6.5)],
+    ('MLB', 'IF'): [('hits', 0.5, 1.5), ('home_runs', 0.5, 0.5), ('runs_batted_in', 0.5, 1.5)],
+    ('MLB', 'OF'): [('hits', 0.5, 1.5), ('home_runs', 0.5, 0.5), ('runs', 0.5, 0.5)],
+    ('NHL', 'F'): [('goals', 0.5, 0.5), ('points_hockey', 0.5, 1.5), ('shots_on_goal', 1.5, 3.5),
+                   ('assists', 0.5, 0.5)],
+    ('NHL', 'D'): [('shots_on_goal', 1.5, 2.5), ('blocks', 1.5, 2.5), ('points_hockey', 0.5, 0.5)],
+    ('NHL', 'G'): [('saves', 24.5, 31.5)],
+}
+
+# sport -> (moneyline-like, spread-like, spread half-range, total stat, lowest total, highest total)
+TEAM_PROPS = {
+    'NFL': ('moneyline', 'spread', 13, 'total_points', 37.5, 53.5),
+    'NBA': ('moneyline', 'spread', 12, 'total_points', 205.5, 239.5),
+    'MLB': ('moneyline', 'run_line', 1, 'total_runs', 6.5, 10.5),
+    'NHL': ('moneyline', 'puck_line', 1, 'total_goals', 5.5, 6.5),
+}
+
+# sport -> (mean, deviation) of one team's final score
+SCORES = {'NFL': (23, 9), 'NBA': (113, 12), 'MLB': (4.5, 3), 'NHL': (3, 1.6)}
+
+# Real team names, used when the teams table has no rows for a sport
+LEAGUE_TEAMS = {
+    'NFL': ['Arizona Cardinals:ARI', 'Atlanta Falcons:ATL', 'Baltimore Ravens:BAL', 'Buffalo Bills:BUF',
+            'Carolina Panthers:CAR', 'Chicago Bears:CHI', 'Cincinnati Bengals:CIN', 'Cleveland Browns:CLE',
+            'Dallas Cowboys:DAL', 'Denver Broncos:DEN', 'Detroit Lions:DET', 'Green Bay Packers:GB',
+            'Houston Texans:HOU', 'Indianapolis Colts:IND', 'Jacksonville Jaguars:JAX', 'Kansas City Chiefs:KC',
+            'Las Vegas Raiders:LV', 'Los Angeles Chargers:LAC', 'Los Angeles Rams:LAR', 'Miami Dolphins:MIA',
+            'Minnesota Vikings:MIN', 'New England Patriots:NE', 'New Orleans Saints:NO', 'New York Giants:NYG',
+            'New York Jets:NYJ', 'Philadelphia Eagles:PHI', 'Pittsburgh Steelers:PIT', 'San Francisco 49ers:SF',
+            'Seattle Seahawks:SEA', 'Tampa Bay Buccaneers:TB', 'Tennessee Titans:TEN', 'Washington Commanders:WSH'],
+    'NBA': ['Atlanta Hawks:ATL', 'Boston Celtics:BOS', 'Brooklyn Nets:BKN', 'Charlotte Hornets:CHA',
+            'Chicago Bulls:CHI', 'Cleveland Cavaliers:CLE', 'Dallas Mavericks:DAL', 'Denver Nuggets:DEN',
+            'Detroit Pistons:DET', 'Golden State Warriors:GS', 'Houston Rockets:HOU', 'Indiana Pacers:IND',
+            'LA Clippers:LAC', 'Los Angeles Lakers:LAL', 'Memphis Grizzlies:MEM', 'Miami Heat:MIA',
+            'Milwaukee Bucks:MIL', 'Minnesota Timberwolves:MIN', 'New Orleans Pelicans:NO', 'New York Knicks:NY',
+            'Oklahoma City Thunder:OKC', 'Orlando Magic:ORL', 'Philadelphia 76ers:PHI', 'Phoenix Suns:PHX',
+            'Portland Trail Blazers:POR', 'Sacramento Kings:SAC', 'San Antonio Spurs:SA', 'Toronto Raptors:TOR',
+            'Utah Jazz:UTAH', 'Washington Wizards:WSH'],
+    'MLB': ['Arizona Diamondbacks:ARI', 'Atlanta Braves:ATL', 'Baltimore Orioles:BAL', 'Boston Red Sox:BOS',
+            'Chicago Cubs:CHC', 'Chicago White Sox:CHW', 'Cincinnati Reds:CIN', 'Cleveland Guardians:CLE',
+            'Colorado Rockies:COL', 'Detroit Tigers:DET', 'Houston Astros:HOU', 'Kansas City Royals:KC',
+            'Los Angeles Angels:LAA', 'Los Angeles Dodgers:LAD', 'Miami Marlins:MIA', 'Milwaukee Brewers:MIL',
+            'Minnesota Twins:MIN', 'New York Mets:NYM', 'New York Yankees:NYY', 'Athletics:ATH',
+            'Philadelphia Phillies:PHI', 'Pittsburgh Pirates:PIT', 'San Diego Padres:SD',
+            'San Francisco Giants:SF', 'Seattle Mariners:SEA', 'St. Louis Cardinals:STL', 'Tampa Bay Rays:TB',
+            'Texas Rangers:TEX', 'Toronto Blue Jays:TOR', 'Washington Nationals:WSH'],
+    'NHL': ['Anaheim Ducks:ANA', 'Boston Bruins:BOS', 'Buffalo Sabres:BUF', 'Calgary Flames:CGY',
+            'Carolina Hurricanes:CAR', 'Chicago Blackhawks:CHI', 'Colorado Avalanche:COL',
+            'Columbus Blue Jackets:CBJ', 'Dallas Stars:DAL', 'Detroit Red Wings:DET', 'Edmonton Oilers:EDM',
+            'Florida Panthers:FLA', 'Los Angeles Kings:LA', 'Minnesota Wild:MIN', 'Montreal Canadiens:MTL',
+            'Nashville Predators:NSH', 'New Jersey Devils:NJ', 'New York Islanders:NYI', 'New York Rangers:NYR',
+            'Ottawa Senators:OTT', 'Philadelphia Flyers:PHI', 'Pittsburgh Penguins:PIT', 'San Jose Sharks:SJ',
+            'Seattle Kraken:SEA', 'St. Louis Blues:STL', 'Tampa Bay Lightning:TB', 'Toronto Maple Leafs:TOR',
+            'Utah Mammoth:UTAH', 'Vancouver Canucks:VAN', 'Vegas Golden Knights:VGK', 'Washington Capitals:WSH',
+            'Winnipeg Jets:WPG'],
+}
+
+FIRST_NAMES = (
+    'Aaron', 'Adrian', 'Alex', 'Andre', 'Anthony', 'Austin', 'Brandon', 'Brian', 'Caleb', 'Cameron', 'Carlos',
+    'Chris', 'Cole', 'Colin', 'Damian', 'Daniel', 'Darius', 'David', 'Derrick', 'Devin', 'Dominic', 'Dylan',
+    'Elijah', 'Eric', 'Evan', 'Gabriel', 'Grant', 'Isaiah', 'Jacob', 'Jalen', 'James', 'Jaylen', 'Jordan',
+    'Josh', 'Justin', 'Kevin', 'Kyle', 'Lamar', 'Landon', 'Logan', 'Lucas', 'Malik', 'Marcus', 'Mason',
+    'Matt', 'Miles', 'Nathan', 'Nick', 'Noah', 'Omar', 'Owen', 'Patrick', 'Quinn', 'Ryan', 'Sam', 'Sean',
+    'Terrell', 'Trey', 'Tyler', 'Victor', 'Xavier', 'Zach',
+)
+LAST_NAMES = (
+    'Adams', 'Allen', 'Bailey', 'Baker', 'Bell', 'Bennett', 'Brooks', 'Brown', 'Bryant', 'Butler', 'Campbell',
+    'Carter', 'Coleman', 'Collins', 'Cooper', 'Cruz', 'Davis', 'Diaz', 'Edwards', 'Ellis', 'Evans', 'Fisher',
+    'Foster', 'Garcia', 'Gibson', 'Graham', 'Gray', 'Griffin', 'Hall', 'Harris', 'Hayes', 'Henderson', 'Hill',
+    'Howard', 'Hughes', 'Jackson', 'James', 'Jenkins', 'Johnson', 'Jordan', 'Kelly', 'King', 'Lewis', 'Long',
+    'Marshall', 'Martin', 'Mitchell', 'Moore', 'Morgan', 'Murphy', 'Nelson', 'Owens', 'Parker', 'Patterson',
+    'Perry', 'Phillips', 'Powell', 'Price', 'Reed', 'Reynolds', 'Richardson', 'Rivera', 'Roberts', 'Robinson',
+    'Ross', 'Russell', 'Sanders', 'Scott', 'Simmons', 'Smith', 'Stewart', 'Sullivan', 'Taylor', 'Thomas',
+    'Thompson', 'Tucker', 'Turner', 'Walker', 'Wallace', 'Ward', 'Warren', 'Washington', 'Watson', 'White',
+    'Williams', 'Wilson', 'Wright', 'Young',
+)
+NAME_SUFFIXES = ('', ' Jr.', ' II', ' III', ' IV', ' Sr.')
+
+
+def _weighted(rng, weights):
+    """Pick a key of {choice: weight}."""
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _player_name(index):
+    """Distinct realistic names for index 0, 1, 2, ..."""
+    per_cycle = len(FIRST_NAMES) * len(LAST_NAMES)
+    cycle, rest = divmod(index, per_cycle)
+    name = f"{FIRST_NAMES[rest % len(FIRST_NAMES)]} {LAST_NAMES[rest // len(FIRST_NAMES)]}"
+    return name + (NAME_SUFFIXES[cycle] if cycle < len(NAME_SUFFIXES) else f" {cycle}")
+
+
+def _american_odds(decimal_odds):
+    if decimal_odds >= 2:
+        return int(round((decimal_odds - 1) * 100))
+    return int(round(-100 / (decimal_odds - 1)))
+
+
+def _decimal_odds(american):
+    return 1 + (american / 100 if american > 0 else 100 / -american)
+
+
+class _Schedule:
+    """Each (sport, day)'s games: a seeded pairing of the league, with final scores.
+
+    Seeded per (sport, day), so a game looks the same whichever bet asks first.
+    """
+
+    def __init__(self, seed, teams):
+        self.seed = seed
+        self.teams = teams
+        self._days = {}
+
+    def games(self, sport, day):
+        key = (sport, day)
+        if key not in self._days:
+            rng = random.Random(f"{self.seed}:{sport}:{day.isoformat()}")
+            names = [team for team, _ in self.teams[sport]]
+            rng.shuffle(names)
+            mean, deviation = SCORES[sport]
+            games = []
+            for number, (away, home) in enumerate(zip(names[::2], names[1::2])):
+                game_id = f"{SPORT_CODES[sport]}{day.strftime('%Y%m%d')}{number:02d}"
+                home_score, away_score = (max(0, round(rng.gauss(mean, deviation))) for _ in range(2))
+                if home_score == away_score and sport != 'NFL':
+                    home_score += 1  # no ties outside football
+                progress = rng.uniform(0.2, 0.9)  # how far along the game is when live
+                games.append((game_id, home, away, home_score, away_score, progress))
+            self._days[key] = games
+        return self._days[key]
+
+
+def _in_season(month, first, last):
+    return first <= month <= last if first <= last else (month >= first or month <= last)
+
+
+# month -> SPORT_WEIGHTS of the leagues in season that month
+SEASON_WEIGHTS = {
+    month: {sport: weight for sport, weight in SPORT_WEIGHTS.items() if _in_season(month, *SEASONS[sport])}
+    for month in range(1, 13)
+}
+
+
+def _game_day(sport, day, phase):
+    """NFL games settle on Sundays; every other league plays daily."""
+    if sport == 'NFL' and phase == 'settled':
+        return day - timedelta(days=(day.weekday() + 1) % 7)
+    return day
+
+
+def _next_id(connection, model):
+    return (connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+class _Writer:
+    """Buffers rows per model and writes them with one executemany per batch."""
+
+    ORDER = (User, Team, Player, Bet, BetParticipant, BetLeg)  # foreign keys first
+
+    def __init__(self, connection, batch_size):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.rows = {model: [] for model in self.ORDER}
+        self.counts = {model.__tablename__: 0 for model in self.ORDER}
+
+    def add(self, model, row):
+        self.rows[model].append(row)
+        if len(self.rows[model]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for model in self.ORDER:
+            rows = self.rows[model]
+            if rows:
+                self.connection.execute(insert(model), rows)
+                self.counts[model.__tablename__] += len(rows)
+                self.rows[model] = []
+        self.connection.commit()
+
+
+def _load_teams(connection, writer, teams_per_sport, rng, created_at):
+    """{sport: [(team name, abbreviation)]}, reusing existing team rows and adding missing leagues."""
+    existing = {}
+    for name, abbr, sport in connection.execute(select(Team.team_name, Team.team_abbr, Team.sport)
+                                                .order_by(Team.id)):
+        existing.setdefault(sport, []).append((name, abbr))
+
+    teams = {}
+    for sport in SPORT_WEIGHTS:
+        if existing.get(sport):
+            teams[sport] = existing[sport][:teams_per_sport]
+            continue
+        league = [tuple(entry.rsplit(':', 1)) for entry in LEAGUE_TEAMS[sport]][:teams_per_sport]
+        for name, abbr in league:
+            location, _, nickname = name.rpartition(' ')
+            writer.add(Team, {
+                'team_name': name, 'team_name_short': nickname, 'team_abbr': abbr, 'sport': sport,
+                'location': location or None, 'nickname': nickname, 'is_active': True,
+                'wins': rng.randint(0, 12), 'losses': rng.randint(0, 12),
+                'created_at': created_at, 'updated_at': created_at,
+            })
+        teams[sport] = league
+    return teams
+
+
+def _create_players(writer, first_id, players, teams, rng, created_at):
+    """Insert ``players`` players spread over sports and teams; returns {(sport, team): [player]}."""
+    rosters = {}
+    names = list(range(players))
+    rng.shuffle(names)
+    sports = rng.choices(list(SPORT_WEIGHTS), weights=list(SPORT_WEIGHTS.values()), k=players)
+    cursor = {sport: 0 for sport in SPORT_WEIGHTS}
+    for index, (name_index, sport) in enumerate(zip(names, sports)):
+        team, abbr = teams[sport][cursor[sport] % len(teams[sport])]
+        positions = [p for p, share in POSITIONS[sport].items() for _ in range(share)]
+        position = positions[(cursor[sport] // len(teams[sport])) % len(positions)]
+        cursor[sport] += 1
+        name = _player_name(name_index)
+        player = (first_id + index, name, position)
+        rosters.setdefault((sport, team), []).append(player)
+        writer.add(Player, {
+            'id': player[0], 'player_name': name, 'normalized_name': name.lower(), 'display_name': name,
+            'sport': sport, 'position': position, 'position_group': position, 'current_team': team,
+            'team_abbreviation': abbr, 'jersey_number': rng.randint(0, 99), 'status': 'active',
+            'created_at': created_at, 'updated_at': created_at,
+        })
+    return rosters
+
+
+def _leg_counts(bets, legs, rng):
+    """Legs per bet: at least one each, the rest spread unevenly (most parlays are short)."""
+    counts = [1] * bets
+    weights = list(accumulate(rng.expovariate(1.0) for _ in range(bets)))
+    overflow = 0
+    for index in rng.choices(range(bets), cum_weights=weights, k=legs - bets):
+        if counts[index] < MAX_LEGS_PER_BET:
+            counts[index] += 1
+        else:
+            overflow += 1
+    index = 0
+    while overflow:
+        if counts[index] < MAX_LEGS_PER_BET:
+            counts[index] += 1
+            overflow -= 1
+        index = (index + 1) % bets
+    return counts
+
+
+def _settle_player_leg(rng, line, side):
+    if line < 1:
+        achieved = rng.choices((0, 1, 2), weights=(60, 32, 8))[0]
+    else:
+        achieved = max(0, round(rng.gauss(line, max(1.0, line * 0.35))))
+    return achieved, (achieved > line if side == 'over' else achieved < line)
+
+
+def _make_leg(rng, schedule, rosters, sport, day, phase, game=None):
+    """One leg's column values (without bet_id / id / leg_order)."""
+    if game is None:
+        game = rng.choice(schedule.games(sport, day))
+    game_id, home, away, home_score, away_score, progress = game
+    team = rng.choice((home, away))
+    roster = rosters.get((sport, team))
+    leg = {
+        'player_id': None, 'player_position': None, 'home_team': home, 'away_team': away, 'game_id': game_id,
+        'game_date': day, 'sport': sport, 'player_team': team, 'achieved_value': None, 'is_hit': None,
+        'home_score': None, 'away_score': None, 'void_reason': None,
+        'final_leg_odds': rng.choice((-140, -125, -115, -110, -110, 100, 120, 150, 200)),
+    }
+
+    if roster and rng.random() >= TEAM_PROP_SHARE:
+        player_id, name, position = rng.choice(roster)
+        stat, low, high = rng.choice(PLAYER_PROPS[(sport, position)])
+        line = low + rng.randint(0, int(high - low))
+        side = 'under' if line > 1 and rng.random() < UNDER_SHARE else 'over'
+        leg.update(player_id=player_id, player_name=name, player_position=position, bet_type='Player Prop',
+                   stat_type=stat, bet_line_type=side, target_value=Decimal(str(line)))
+        achieved, hit = _settle_player_leg(rng, line, side)
+    else:
+        moneyline, spread, spread_range, total, low, high = TEAM_PROPS[sport]
+        team_score, other_score = (home_score, away_score) if team == home else (away_score, home_score)
+        kind = rng.choice(('moneyline', 'spread', 'total'))
+        side = None
+        if kind == 'moneyline':
+            stat, line, achieved = moneyline, 0, team_score - other_score
+            hit = achieved > 0
+        elif kind == 'spread':
+            line = rng.choice((-1, 1)) * (rng.randint(0, spread_range - 1) + 1.5)
+            stat, achieved = spread, team_score - other_score
+            hit = achieved + line > 0
+        else:
+            side = 'under' if rng.random() < 0.4 else 'over'
+            stat, line, achieved = total, low + rng.randint(0, int(high - low)), home_score + away_score
+            hit = achieved > line if side == 'over' else achieved < line
+        leg.update(player_name=team, bet_type='Team Prop', stat_type=stat, bet_line_type=side,
+                   target_value=Decimal(str(line)))
+
+    if phase == 'settled':
+        leg.update(game_status='STATUS_FINAL', home_score=home_score, away_score=away_score)
+        if leg['bet_type'] == 'Player Prop' and rng.random() < VOID_SHARE:
+            leg.update(status='void', void_reason='Player inactive')
+        elif leg['stat_type'] == 'moneyline' and achieved == 0:
+            leg.update(status='void', void_reason='Tie', achieved_value=Decimal(0))
+        else:
+            leg.update(status='won' if hit else 'lost', is_hit=hit, achieved_value=Decimal(achieved))
+    elif phase == 'live':
+        leg.update(game_status='STATUS_IN_PROGRESS', status='live',
+                   home_score=round(home_score * progress), away_score=round(away_score * progress))
+        if leg['bet_type'] == 'Player Prop' and rng.random() < 0.6:
+            leg['achieved_value'] = Decimal(max(0, int(achieved * progress)))
+    else:
+        leg.update(game_status='STATUS_SCHEDULED', status='pending')
+    return leg
+
+
+def generate_synthetic_data(connection, users=100, bets=1000, legs=4000, players=1000, teams_per_sport=32,
+                            shared_rate=0.08, watched_rate=0.12, seed=0, as_of=None, prefix='synth',
+                            password_hash=None, derived=True, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Write a synthetic dataset through ``connection`` (committing per batch). Returns row counts.
+
+    ``legs`` must be between ``bets`` and MAX_LEGS_PER_BET x ``bets``.
+    Usernames are ``<prefix>_<n>``; a prefix that is already taken raises
+    ValueError, so runs can be layered with different prefixes. ``password_hash`` is shared
+    by every user (hashing 10k passwords would dominate the run).
+    """
+    if users < 1 or bets < 0 or players < 1 or teams_per_sport < 2:
+        raise ValueError("users and players must be positive, bets non-negative and teams_per_sport at least 2")
+    if not bets <= legs <= bets * MAX_LEGS_PER_BET:
+        raise ValueError(f"legs must be between bets and {MAX_LEGS_PER_BET} x bets")
+    if connection.execute(select(func.count()).select_from(User)
+                          .where(User.username.like(f"{prefix}\\_%", escape='\\'))).scalar():
+        raise ValueError(f"Users with prefix '{prefix}' already exist; pick another prefix")
+
+    rng = random.Random(seed)
+    as_of = as_of or date.today()
+    report = progress or (lambda message: None)
+    writer = _Writer(connection, batch_size)
+
+    # Fixed timestamps too, so reruns match row for row
+    created_at = datetime.combine(as_of - timedelta(days=HISTORY_DAYS), time(12))
+    first_user = _next_id(connection, User)
+    user_ids = list(range(first_user, first_user + users))
+    password_hash = password_hash or '!synthetic'
+    for index, user_id in enumerate(user_ids):
+        username = f"{prefix}_{index + 1:0{len(str(users))}d}"
+        writer.add(User, {
+            'id': user_id, 'username': username, 'display_name': username.replace('_', ' ').title(),
+            'email': f"{username}@example.com", 'password_hash': password_hash, 'is_active': True,
+            'user_role': 'user', 'created_at': created_at,
+        })
+    teams = _load_teams(connection, writer, teams_per_sport, rng, created_at)
+    rosters = _create_players(writer, _next_id(connection, Player), players, teams, rng, created_at)
+    writer.flush()
+    report(f"{users} users, {sum(len(t) for t in teams.values())} teams, {players} players")
+
+    schedule = _Schedule(seed, teams)
+    user_weights = list(accumulate(rng.paretovariate(2.0) for _ in user_ids))
+    owners = rng.choices(user_ids, cum_weights=user_weights, k=bets)
+    leg_counts = _leg_counts(bets, legs, rng)
+    bet_id = _next_id(connection, Bet)
+    leg_id = _next_id(connection, BetLeg)
+    settled_ids = []
+
+    for index, (owner, leg_count) in enumerate(zip(owners, leg_counts)):
+        phase = _weighted(rng, BET_PHASES)
+        if phase == 'settled':
+            day = as_of - timedelta(days=rng.randint(1, HISTORY_DAYS))
+        elif phase == 'live':
+            day = as_of
+        else:
+            day = as_of + timedelta(days=rng.randint(1, 7))
+
+        in_season = SEASON_WEIGHTS[day.month]
+        sport = _weighted(rng, in_season)
+        sgp = leg_count > 1 and rng.random() < SGP_SHARE
+        bet_game = None
+        if sgp:
+            bet_game = rng.choice(schedule.games(sport, _game_day(sport, day, phase)))
+        bet_legs = []
+        for _ in range(leg_count):
+            leg_sport = sport if sgp or rng.random() >= CROSS_SPORT_SHARE else _weighted(rng, in_season)
+            bet_legs.append(_make_leg(rng, schedule, rosters, leg_sport, _game_day(leg_sport, day, phase),
+                                      phase, game=bet_game))
+
+        statuses = [leg['status'] for leg in bet_legs]
+        decided = [status for status in statuses if status != 'void']
+        if phase != 'settled':
+            status = phase
+        elif not decided:
+            status = 'void'
+        else:
+            status = 'won' if all(s == 'won' for s in decided) else 'lost'
+
+        decimal_odds = 1.0
+        for leg in bet_legs:
+            if leg['status'] != 'void':
+                decimal_odds *= _decimal_odds(leg['final_leg_odds'])
+        decimal_odds = min(max(decimal_odds, 1.01), MAX_DECIMAL_ODDS)
+        original_odds = _american_odds(decimal_odds)
+        is_boosted = rng.random() < 0.1
+        if is_boosted:
+            decimal_odds = min(1 + (decimal_odds - 1) * 1.25, MAX_DECIMAL_ODDS)
+        wager = Decimal(_weighted(rng, WAGERS))
+        potential = (wager * Decimal(str(round(decimal_odds, 4)))).quantize(Decimal('0.01'))
+        actual = {'won': potential, 'lost': Decimal('0.00'), 'void': wager}.get(status)
+        if phase == 'settled' and rng.random() < COMPLETED_SHARE:
+            status = 'completed'
+
+        others = [uid for uid in rng.sample(user_ids, min(4, users)) if uid != owner]
+        secondary = others[:rng.randint(1, 2)] if others and rng.random() < shared_rate else []
+        watchers = others[len(secondary):len(secondary) + rng.randint(1, 3)] if rng.random() < watched_rate else []
+
+        bet_type = 'Single Bet' if leg_count == 1 else ('SGP' if sgp else 'Parlay')
+        bet_data = json.dumps({'name': f"{leg_count} Pick {bet_type}" if leg_count > 1 else bet_type})
+        betting_site = _weighted(rng, BETTING_SITES)
+        bet_date = min(leg['game_date'] for leg in bet_legs)
+        placed_at = datetime.combine(bet_date, time(12)) - timedelta(hours=rng.randint(1, 30))
+        writer.add(Bet, {
+            'id': bet_id, 'user_id': owner, 'bet_type': bet_type, 'betting_site': betting_site,
+            'betting_site_id': f"SYN{seed}-{bet_id}", 'status': status, 'is_active': phase != 'settled',
+            'is_archived': phase == 'settled' and rng.random() < ARCHIVED_SHARE, 'api_fetched': 'Yes',
+            'bet_data': bet_data, 'created_at': placed_at, 'updated_at': placed_at,
+            'bet_date': bet_date.isoformat(), 'wager': wager, 'original_odds': original_odds,
+            'boosted_odds': _american_odds(decimal_odds) if is_boosted else None,
+            'final_odds': _american_odds(decimal_odds), 'is_boosted': is_boosted, 'potential_winnings': potential,
+            'actual_winnings': actual, 'has_insurance': False, 'total_legs': leg_count,
+            'legs_won': statuses.count('won'), 'legs_lost': statuses.count('lost'),
+            'legs_pending': statuses.count('pending'), 'legs_live': statuses.count('live'),
+            'legs_void': statuses.count('void'), 'secondary_bettors': secondary, 'watchers': watchers,
+            'search_document': build_search_document_from_values(
+                betting_site, bet_type, bet_data,
+                [(leg['player_name'], leg['player_team'], leg['home_team'], leg['away_team'], leg['stat_type'])
+                 for leg in bet_legs]),
+        })
+        for user_id, role in BetParticipant.roles_for(owner, secondary, watchers).items():
+            writer.add(BetParticipant, {'bet_id': bet_id, 'user_id': user_id, 'role': role})
+        for order, leg in enumerate(bet_legs):
+            writer.add(BetLeg, {'id': leg_id, 'bet_id': bet_id, 'leg_order': order,
+                                'created_at': placed_at, 'updated_at': placed_at, **leg})
+            leg_id += 1
+        if status in SETTLED_STATUSES:
+            settled_ids.append(bet_id)
+        bet_id += 1
+        if (index + 1) % (batch_size * 4) == 0:
+            report(f"{index + 1}/{bets} bets")
+    writer.flush()
+    counts = dict(writer.counts)
+
+    if connection.dialect.name == 'postgresql':
+        # Explicit ids leave the serial sequences behind
+        for model in (User, Team, Player, Bet, BetLeg):
+            table = model.__tablename__
+            connection.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                                    f"COALESCE((SELECT MAX(id) FROM {table}), 1))"))
+        connection.commit()
+
+    if derived:
+        report(f"Analytics rollups for {len(settled_ids)} settled bets")
+        for start in range(0, len(settled_ids), 500):
+            refresh_bet_rollups(connection, settled_ids[start:start + 500])
+            connection.commit()
+        report("Player prop index")
+        backfill_player_prop_index(connection)
+        connection.commit()
+
+    logger.info(f"[SYNTHETIC] Generated {counts} (seed {seed})")
+    return counts
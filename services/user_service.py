@@ -1,38 +1,46 @@
 # Business logic for users
 
-from models import Bet, db
-from sqlalchemy import or_, text, and_
+from models import Bet, BetParticipant, db
+from sqlalchemy import and_
+
+# Roles that make a bet show up in a user's own listings (watched bets excluded)
+BETTOR_ROLES = (BetParticipant.ROLE_PRIMARY, BetParticipant.ROLE_SECONDARY)
+ALL_ROLES = BETTOR_ROLES + (BetParticipant.ROLE_WATCHER,)
+
+
+def participant_bets_query(user_id, roles=BETTOR_ROLES):
+    """Bets where user_id participates with one of ``roles`` (indexed join on bet_participants)."""
+    return Bet.query.join(
+        BetParticipant,
+        and_(
+            BetParticipant.bet_id == Bet.id,
+            BetParticipant.user_id == user_id,
+            BetParticipant.role.in_(roles)
+        )
+    )
+
 
 def get_user_bets_query(user, is_active=None, is_archived=None, status=None):
     """
-    Get bets for a user, including both primary bets (user_id=user.id)
-    and secondary bets (user.id in secondary_bettors array).
+    Get bets for a user, including both primary and secondary bets
+    (a bet_participants row for the user with a bettor role).
     """
     if not user or not hasattr(user, 'id'):
         return Bet.query.filter(db.text('0=1'))  # Always empty query
     
-    # Build base query for primary bettor (user_id = user.id)
-    primary_filter = Bet.user_id == user.id
-    
-    # Build filter for secondary bettors (user.id in secondary_bettors array)
-    # SQLite workaround: Check string containment for JSON arrays
-    # We check if the user ID string is present in the JSON string representation
-    user_id_str = str(user.id)
-    secondary_filter = db.cast(Bet.secondary_bettors, db.String).like(f'%{user_id_str}%')
-    
-    # Combine both filters (OR - user is either primary or secondary)
-    base_query = Bet.query.filter(or_(primary_filter, secondary_filter))
+    # Primary + secondary bettor access via bet_participants (one row per bet/user)
+    base_query = participant_bets_query(user.id, BETTOR_ROLES)
     
-    # Apply additional filters
+    # Apply additional filters (explicit Bet columns: filter_by would target the joined table)
     if is_active is not None:
-        base_query = base_query.filter_by(is_active=is_active)
+        base_query = base_query.filter(Bet.is_active == is_active)
     if is_archived is not None:
-        base_query = base_query.filter_by(is_archived=is_archived)
+        base_query = base_query.filter(Bet.is_archived == is_archived)
     if status is not None:
         if isinstance(status, list):
             base_query = base_query.filter(Bet.status.in_(status))
         else:
-            base_query = base_query.filter_by(status=status)
+            base_query = base_query.filter(Bet.status == status)
     
     return base_query
 
@@ -0,0 +1,171 @@
+"""
+Tests for incremental analytics rollups (services.analytics) and the summary API.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db, User, Bet, BetLeg, BetParticipant, AnalyticsRollup, AnalyticsBetContribution
+from services.analytics import performance_summary, rebuild_analytics_rollups
+
+
+def _bet(user_id, status, wager, payout, legs, site='DraftKings', bet_date='2025-05-03', **kwargs):
+    bet = Bet(user_id=user_id, status=status, bet_type='Parlay', betting_site=site, bet_date=bet_date,
+              wager=wager, potential_winnings=payout, total_legs=len(legs),
+              secondary_bettors=kwargs.pop('secondary_bettors', []), watchers=[])
+    db.session.add(bet)
+    db.session.flush()
+    for sport, stat, leg_status in legs:
+        db.session.add(BetLeg(bet_id=bet.id, player_name='Rollup Player', home_team='Home', away_team='Away',
+                              bet_type='player_prop', stat_type=stat, target_value=10, sport=sport,
+                              status=leg_status))
+    return bet
+
+
+@pytest.fixture
+def analytics_users():
+    app.config['TESTING'] = True
+    app.config['LOGIN_DISABLED'] = True
+    with app.app_context():
+        db.create_all()
+        user = User(username='rollup_user', email='rollup_user@example.com', password_hash='x')
+        friend = User(username='rollup_friend', email='rollup_friend@example.com', password_hash='x')
+        db.session.add_all([user, friend])
+        db.session.commit()
+        user_ids = [user.id, friend.id]
+
+        yield user, friend
+
+        db.session.rollback()
+        bet_ids = [b.id for b in Bet.query.filter(Bet.user_id.in_(user_ids)).all()]
+        BetLeg.query.filter(BetLeg.bet_id.in_(bet_ids)).delete(synchronize_session=False)
+        BetParticipant.query.filter(BetParticipant.user_id.in_(user_ids)).delete(synchronize_session=False)
+        Bet.query.filter(Bet.id.in_(bet_ids)).delete(synchronize_session=False)
+        AnalyticsRollup.query.filter(AnalyticsRollup.user_id.in_(user_ids)).delete(synchronize_session=False)
+        AnalyticsBetContribution.query.filter(AnalyticsBetContribution.bet_id.in_(bet_ids)).delete(synchronize_session=False)
+        User.query.filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def test_rollups_follow_settlement_and_corrections(analytics_users):
+    user, friend = analytics_users
+    with app.app_context():
+        won = _bet(user.id, 'won', 10, 45, [('NBA', 'points', 'won'), ('NBA', 'rebounds', 'won')],
+                   secondary_bettors=[friend.id])
+        _bet(user.id, 'lost', 20, 120, [('NFL', 'passing_yards', 'won'), ('NBA', 'points', 'lost')],
+             site='FanDuel', bet_date='2025-06-10')
+        pending = _bet(user.id, 'pending', 5, 25, [('NBA', 'assists', None)])
+        db.session.commit()
+
+        totals = performance_summary(user.id)['totals']
+        assert (totals['bets'], totals['bets_won'], totals['bets_lost']) == (2, 1, 1)
+        assert totals['wagered'] == 30 and totals['returned'] == 45
+        assert totals['profit'] == 15 and totals['roi'] == 0.5
+        assert totals['win_rate'] == 0.5 and totals['leg_hit_rate'] == 0.75
+        # The secondary bettor shares the bet they were on
+        assert performance_summary(friend.id)['totals']['bets_won'] == 1
+
+        # Settling later, correcting, and un-settling all apply deltas
+        pending.status = 'won'
+        BetLeg.query.filter_by(bet_id=pending.id).one().status = 'won'
+        won.status = 'lost'
+        db.session.commit()
+        totals = performance_summary(user.id)['totals']
+        assert (totals['bets'], totals['bets_won'], totals['bets_lost']) == (3, 1, 2)
+        assert totals['returned'] == 25
+
+        pending.status = 'live'
+        db.session.commit()
+        assert performance_summary(user.id)['totals']['bets'] == 2
+
+        # Incremental state matches a full rebuild
+        before = performance_summary(user.id, group_by='day')
+        rebuild_analytics_rollups()
+        assert performance_summary(user.id, group_by='day') == before
+
+
+def test_grouping_and_api(analytics_users):
+    user, _ = analytics_users
+    with app.app_context():
+        _bet(user.id, 'won', 10, 30, [('NBA', 'points', 'won')])
+        _bet(user.id, 'lost', 10, 30, [('NFL', 'passing_yards', 'lost'), ('NBA', 'points', 'won')],
+             bet_date='2025-06-01')
+        db.session.commit()
+
+        by_sport = {g['key']: g for g in performance_summary(user.id, group_by='sport')['groups']}
+        assert by_sport['NBA']['bets'] == 1 and by_sport['Mixed']['bets'] == 1
+        assert by_sport['NBA']['legs'] == 2
+
+        by_stat = {g['key']: g for g in performance_summary(user.id, group_by='stat_type')['groups']}
+        assert set(by_stat) == {'points', 'passing_yards'}
+        assert by_stat['points']['leg_hit_rate'] == 1.0
+
+        by_month = [g['key'] for g in performance_summary(user.id, group_by='month')['groups']]
+        assert by_month == ['2025-05', '2025-06']
+
+        with patch('routes.analytics.current_user', user), app.test_client() as client:
+            data = client.get('/api/analytics/summary?group_by=site&from=2025-06-01').get_json()
+            assert data['totals']['bets'] == 1 and data['groups'][0]['key'] == 'DraftKings'
+            assert client.get('/api/analytics/summary?group_by=player').status_code == 400
+            assert client.get('/api/analytics/summary?from=yesterday').status_code == 400
+
+
+def test_completed_bets_settle_by_their_legs(analytics_users):
+    user, _ = analytics_users
+    with app.app_context():
+        def settle(wager, payout, leg_statuses, **fields):
+            # The path the app stores settled bets through: set_bet_data marks them 'completed'
+            bet = _bet(user.id, 'live', wager, payout, [('NBA', 'points', s) for s in leg_statuses], **fields)
+            bet.set_bet_data({'wager': wager, 'potential_winnings': payout, 'legs': [{'status': s} for s in leg_statuses]})
+            return bet
+
+        all_won = settle(10, 40, ['won', 'won'])
+        one_lost = settle(10, 40, ['won', 'lost'])
+        voided = settle(10, 40, ['won', 'void'], bet_date='2025-05-04')
+        db.session.commit()
+        assert {all_won.status, one_lost.status} == {'completed'}
+
+        totals = performance_summary(user.id)['totals']
+        assert (totals['bets'], totals['bets_won'], totals['bets_lost'], totals['bets_void']) == (2, 1, 1, 0)
+        assert totals['returned'] == 40
+
+        # Moved to historical with undecided legs: actual_winnings decides, otherwise no outcome
+        voided.status = 'completed'
+        BetLeg.query.filter_by(bet_id=voided.id, status='won').one().status = 'void'
+        unknown = _bet(user.id, 'completed', 10, 40, [('NFL', 'receptions', 'pending')], bet_date='2025-05-05')
+        refunded = _bet(user.id, 'completed', 10, 40, [('NFL', 'receptions', 'pending')], bet_date='2025-05-05')
+        refunded.actual_winnings = 10
+        db.session.commit()
+        totals = performance_summary(user.id)['totals']
+        assert (totals['bets'], totals['bets_won'], totals['bets_lost'], totals['bets_void']) == (5, 1, 1, 2)
+        assert totals['wagered'] == 50 and totals['returned'] == 70
+        assert unknown.status == 'completed'
+
+        before = performance_summary(user.id, group_by='day')
+        rebuild_analytics_rollups()
+        assert performance_summary(user.id, group_by='day') == before
+
+
+def test_live_leg_updates_skip_rollup_queries(analytics_users):
+    user, _ = analytics_users
+    with app.app_context():
+        live = _bet(user.id, 'live', 10, 40, [('NBA', 'points', 'live')])
+        db.session.commit()
+        leg = BetLeg.query.filter_by(bet_id=live.id).one()
+        live = leg.bet
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            leg.status, leg.is_hit = 'won', True
+            db.session.commit()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        assert not [s for s in statements if 'analytics' in s]
@@ -0,0 +1,139 @@
+"""
+Tests for set-based batch bet operations (services.bet_batch, /api/bets/batch).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db, User, Bet, BetLeg, BetParticipant, SyncTombstone, AnalyticsRollup, AnalyticsBetContribution
+from services.analytics import performance_summary
+
+
+def _bet(user_id, status='pending', sport='NFL', secondary_bettors=None, watchers=None, is_archived=False):
+    bet = Bet(user_id=user_id, status=status, bet_type='Parlay', betting_site='FanDuel', bet_date='2025-01-10',
+              wager=10, potential_winnings=30, total_legs=2, is_archived=is_archived,
+              secondary_bettors=secondary_bettors or [], watchers=watchers or [])
+    db.session.add(bet)
+    db.session.flush()
+    leg_status = 'won' if status == 'won' else None
+    for order, player in enumerate(('Batch Player A', 'Batch Player B')):
+        db.session.add(BetLeg(bet_id=bet.id, player_name=player, home_team='Home', away_team='Away',
+                              bet_type='player_prop', stat_type='points', target_value=10, sport=sport,
+                              status=leg_status, leg_order=order, achieved_value=12 if leg_status else None))
+    return bet
+
+
+@pytest.fixture
+def batch_users():
+    app.config['TESTING'] = True
+    app.config['LOGIN_DISABLED'] = True
+    with app.app_context():
+        db.create_all()
+        owner = User(username='batch_owner', email='batch_owner@example.com', password_hash='x')
+        other = User(username='batch_other', email='batch_other@example.com', password_hash='x')
+        db.session.add_all([owner, other])
+        db.session.commit()
+        user_ids = [owner.id, other.id]
+
+        yield owner, other
+
+        db.session.rollback()
+        bet_ids = [b.id for b in Bet.query.filter(Bet.user_id.in_(user_ids)).all()]
+        BetLeg.query.filter(BetLeg.bet_id.in_(bet_ids)).delete(synchronize_session=False)
+        BetParticipant.query.filter(BetParticipant.user_id.in_(user_ids)).delete(synchronize_session=False)
+        Bet.query.filter(Bet.id.in_(bet_ids)).delete(synchronize_session=False)
+        SyncTombstone.query.filter(SyncTombstone.user_id.in_(user_ids)).delete(synchronize_session=False)
+        AnalyticsRollup.query.filter(AnalyticsRollup.user_id.in_(user_ids)).delete(synchronize_session=False)
+        AnalyticsBetContribution.query.filter(AnalyticsBetContribution.bet_id.in_(bet_ids)).delete(synchronize_session=False)
+        User.query.filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def _results(response):
+    return {r['bet_id']: r['result'] for r in response.get_json()['results']}
+
+
+def test_batch_archive_and_unarchive(batch_users):
+    owner, other = batch_users
+    with app.app_context():
+        mine = _bet(owner.id)
+        archived = _bet(owner.id, is_archived=True)
+        shared = _bet(other.id, secondary_bettors=[owner.id])
+        watched = _bet(other.id, watchers=[owner.id])
+        db.session.commit()
+        ids = [mine.id, archived.id, shared.id, watched.id, 999999]
+
+        with patch('routes.bets.current_user', owner), app.test_client() as client:
+            response = client.post('/api/bets/bulk-archive', json={'bet_ids': ids})
+            assert response.status_code == 200
+            assert _results(response) == {mine.id: 'ok', archived.id: 'unchanged', shared.id: 'ok',
+                                          watched.id: 'forbidden', 999999: 'not_found'}
+            assert response.get_json()['message'] == 'Archived 2 bets'
+            flags = dict(db.session.query(Bet.id, Bet.is_archived).filter(Bet.id.in_(ids)))
+            assert flags == {mine.id: True, archived.id: True, shared.id: True, watched.id: False}
+
+            response = client.post('/api/bets/batch', json={'action': 'unarchive', 'bet_ids': [mine.id, archived.id]})
+            assert _results(response) == {mine.id: 'ok', archived.id: 'ok'}
+            assert not db.session.get(Bet, archived.id).is_archived
+
+            assert client.post('/api/bets/batch', json={'action': 'archive', 'bet_ids': []}).status_code == 400
+            assert client.post('/api/bets/batch', json={'action': 'archive', 'bet_ids': ['x']}).status_code == 400
+            assert client.post('/api/bets/batch', json={'action': 'explode', 'bet_ids': [1]}).status_code == 400
+
+
+def test_batch_delete_keeps_derived_state_consistent(batch_users):
+    owner, other = batch_users
+    with app.app_context():
+        won = _bet(owner.id, status='won', secondary_bettors=[other.id])
+        pending = _bet(owner.id)
+        theirs = _bet(other.id, secondary_bettors=[owner.id])
+        db.session.commit()
+        assert performance_summary(owner.id)['totals']['bets'] == 1
+        won_id, pending_id, theirs_id = won.id, pending.id, theirs.id
+
+        with patch('routes.bets.current_user', owner), app.test_client() as client:
+            response = client.post('/api/bets/batch', json={'action': 'delete', 'bet_ids': [won_id, pending_id, theirs_id]})
+            assert _results(response) == {won_id: 'ok', pending_id: 'ok', theirs_id: 'forbidden'}
+
+            assert client.delete(f'/api/bets/{theirs_id}').status_code == 404
+
+        remaining = {b.id for b in Bet.query.filter(Bet.id.in_([won_id, pending_id, theirs_id]))}
+        assert remaining == {theirs_id}
+        assert BetLeg.query.filter(BetLeg.bet_id.in_([won_id, pending_id])).count() == 0
+        assert BetParticipant.query.filter(BetParticipant.bet_id.in_([won_id, pending_id])).count() == 0
+        # Both participants of the shared bet learn about the deletion on sync
+        tombstones = {(t.user_id, t.entity_id) for t in SyncTombstone.query.filter_by(entity_type='bet')}
+        assert {(owner.id, won_id), (other.id, won_id), (owner.id, pending_id)} <= tombstones
+        assert performance_summary(owner.id)['totals']['bets'] == 0
+        assert performance_summary(other.id)['totals']['bets'] == 0
+
+
+def test_batch_correct_sport(batch_users):
+    owner, _ = batch_users
+    with app.app_context():
+        nfl = _bet(owner.id, sport='NFL')
+        nba = _bet(owner.id, sport='NBA')
+        db.session.commit()
+        BetLeg.query.filter_by(bet_id=nfl.id).update({'status': 'live', 'achieved_value': 7, 'home_score': 14})
+        db.session.commit()
+
+        with patch('routes.bets.current_user', owner), app.test_client() as client:
+            response = client.post('/api/bets/batch', json={'action': 'sport', 'sport': 'nba', 'bet_ids': [nfl.id, nba.id]})
+            data = response.get_json()
+            assert {r['bet_id']: r['result'] for r in data['results']} == {nfl.id: 'ok', nba.id: 'unchanged'}
+            assert data['legs_updated'] == 2 and data['sport'] == 'NBA'
+
+            legs = BetLeg.query.filter_by(bet_id=nfl.id).all()
+            assert {(leg.sport, leg.status, leg.achieved_value, leg.home_score) for leg in legs} == {('NBA', 'pending', None, None)}
+
+            # Single-bet endpoint, one leg only
+            response = client.put(f'/api/bets/{nba.id}/sport', json={'sport': 'NHL', 'leg_order': 1})
+            assert response.get_json()['legs_updated'] == 1
+            assert sorted(leg.sport for leg in BetLeg.query.filter_by(bet_id=nba.id)) == ['NBA', 'NHL']
+            assert client.put(f'/api/bets/{nba.id}/sport', json={'sport': 'CRICKET'}).status_code == 400
+            assert client.put('/api/bets/999999/sport', json={'sport': 'NBA'}).status_code == 404
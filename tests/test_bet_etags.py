@@ -0,0 +1,89 @@
+"""
+Tests for ETag / 304 handling on bet listing endpoints.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db, User, Bet, BetLeg, BetParticipant
+
+
+@pytest.fixture
+def etag_client():
+    """Test client logged in as a user with two settled bets."""
+    app.config['TESTING'] = True
+    app.config['LOGIN_DISABLED'] = True
+    with app.app_context():
+        db.create_all()
+        user = User(username='etag_user', email='etag_user@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        bets = []
+        for i in range(2):
+            bet = Bet(user_id=user.id, status='won', bet_type='Parlay', betting_site='FanDuel',
+                      bet_date=f'2025-02-0{i + 1}', total_legs=1, secondary_bettors=[], watchers=[])
+            db.session.add(bet)
+            db.session.flush()
+            db.session.add(BetLeg(bet_id=bet.id, player_name='Etag Player', home_team='Home', away_team='Away',
+                                  bet_type='player_prop', stat_type='receiving_yards', target_value=40,
+                                  sport='NFL', status='won', home_score=21, away_score=17))
+            bets.append(bet)
+        db.session.commit()
+        bet_ids = [b.id for b in bets]
+
+        with patch('routes.bets.current_user', user), app.test_client() as client:
+            yield client, bet_ids
+
+        db.session.rollback()
+        BetLeg.query.filter(BetLeg.bet_id.in_(bet_ids)).delete(synchronize_session=False)
+        BetParticipant.query.filter(BetParticipant.bet_id.in_(bet_ids)).delete(synchronize_session=False)
+        Bet.query.filter(Bet.id.in_(bet_ids)).delete(synchronize_session=False)
+        User.query.filter_by(username='etag_user').delete(synchronize_session=False)
+        db.session.commit()
+
+
+def test_historical_returns_304_when_unchanged(etag_client):
+    client, _ = etag_client
+    first = client.get('/historical')
+    assert first.status_code == 200
+    etag = first.headers.get('ETag')
+    assert etag
+
+    second = client.get('/historical?t=12345', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.headers.get('ETag') == etag
+    assert second.get_data() == b''
+
+
+def test_historical_etag_changes_on_write_and_filters(etag_client):
+    client, bet_ids = etag_client
+    etag = client.get('/historical').headers['ETag']
+
+    filtered = client.get('/historical?site=FanDuel', headers={'If-None-Match': etag})
+    assert filtered.status_code == 200
+    assert filtered.headers['ETag'] != etag
+
+    time.sleep(1.1)  # SQLite CURRENT_TIMESTAMP has one-second resolution
+    leg = BetLeg.query.filter_by(bet_id=bet_ids[0]).one()
+    leg.achieved_value = 55
+    db.session.commit()
+
+    changed = client.get('/historical', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+
+def test_live_returns_304_when_unchanged(etag_client):
+    client, _ = etag_client
+    first = client.get('/live')
+    assert first.status_code == 200
+    assert first.get_json() == []
+
+    second = client.get('/live', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
@@ -0,0 +1,75 @@
+"""
+Tests for the bet_participants access model.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app, get_user_bets_query as get_all_access_bets_query
+from models import db, User, Bet, BetParticipant
+from services.user_service import get_user_bets_query
+
+
+@pytest.fixture
+def participant_users():
+    """Users 7 and 71 (the old LIKE matching confused them) plus a watcher."""
+    with app.app_context():
+        db.create_all()
+        users = {
+            'owner': User(id=7, username='participant_7', email='participant_7@example.com', password_hash='x'),
+            'shared': User(id=71, username='participant_71', email='participant_71@example.com', password_hash='x'),
+            'watcher': User(id=72, username='participant_72', email='participant_72@example.com', password_hash='x'),
+        }
+        db.session.add_all(users.values())
+        db.session.commit()
+
+        yield users
+
+        db.session.rollback()
+        bet_ids = [b.id for b in Bet.query.filter(Bet.user_id.in_([7, 71, 72])).all()]
+        BetParticipant.query.filter(BetParticipant.bet_id.in_(bet_ids)).delete(synchronize_session=False)
+        Bet.query.filter(Bet.id.in_(bet_ids)).delete(synchronize_session=False)
+        User.query.filter(User.id.in_([7, 71, 72])).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def _roles(bet):
+    return {p.user_id: p.role for p in BetParticipant.query.filter_by(bet_id=bet.id).all()}
+
+
+def test_participants_synced_on_write(participant_users):
+    with app.app_context():
+        bet = Bet(user_id=71, status='pending', secondary_bettors=[7, 71], watchers=[72])
+        db.session.add(bet)
+        db.session.commit()
+        # Owner listed as secondary too keeps only the primary role
+        assert _roles(bet) == {71: 'primary', 7: 'secondary', 72: 'watcher'}
+
+        bet.secondary_bettors = []
+        bet.watchers = [7]
+        db.session.commit()
+        assert _roles(bet) == {71: 'primary', 7: 'watcher'}
+
+
+def test_listing_queries_use_exact_user_ids(participant_users):
+    with app.app_context():
+        shared_with_71 = Bet(user_id=72, status='pending', secondary_bettors=[71], watchers=[])
+        watched_by_7 = Bet(user_id=72, status='pending', secondary_bettors=[], watchers=[7])
+        owned_by_7 = Bet(user_id=7, status='live', secondary_bettors=[], watchers=[])
+        db.session.add_all([shared_with_71, watched_by_7, owned_by_7])
+        db.session.commit()
+
+        user_7 = db.session.get(User, 7)
+        user_71 = db.session.get(User, 71)
+
+        # User 7 must not match the bet shared with user 71
+        assert {b.id for b in get_user_bets_query(user_7)} == {owned_by_7.id}
+        assert {b.id for b in get_user_bets_query(user_71)} == {shared_with_71.id}
+        assert {b.id for b in get_user_bets_query(user_7, status='live')} == {owned_by_7.id}
+
+        # The app-level query also includes watched bets
+        assert {b.id for b in get_all_access_bets_query(user_7)} == {owned_by_7.id, watched_by_7.id}
+        assert {b.id for b in get_all_access_bets_query(user_7, status=['pending'])} == {watched_by_7.id}
@@ -0,0 +1,121 @@
+"""
+Tests for indexed historical bet search (services.bet_search).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db, User, Bet, BetLeg, BetParticipant
+from services.bet_search import apply_bet_search, ensure_sqlite_search_index, build_search_document
+
+
+@pytest.fixture
+def search_bets():
+    """Two bets with different players/sites; cleaned up afterwards."""
+    with app.app_context():
+        db.create_all()
+        user = User(username='search_user', email='search_user@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+
+        mahomes = Bet(user_id=user.id, status='won', betting_site='DraftKings', bet_type='SGP',
+                      bet_data=json.dumps({'name': 'Sunday Special'}), secondary_bettors=[], watchers=[])
+        jokic = Bet(user_id=user.id, status='lost', betting_site='FanDuel', bet_type='Parlay',
+                    bet_data=json.dumps({'name': 'Nuggets night', 'passing_yards': 'key only'}),
+                    secondary_bettors=[], watchers=[])
+        db.session.add_all([mahomes, jokic])
+        db.session.flush()
+        db.session.add(BetLeg(bet_id=mahomes.id, player_name='Patrick Mahomes', player_team='Kansas City Chiefs',
+                              home_team='Kansas City Chiefs', away_team='Denver Broncos',
+                              bet_type='player_prop', stat_type='passing_yards', target_value=250))
+        db.session.add(BetLeg(bet_id=jokic.id, player_name='Nikola Jokic', player_team='Denver Nuggets',
+                              home_team='Denver Nuggets', away_team='Utah Jazz',
+                              bet_type='player_prop', stat_type='rebounds', target_value=12))
+        db.session.commit()
+        ids = {'mahomes': mahomes.id, 'jokic': jokic.id}
+
+        yield ids
+
+        db.session.rollback()
+        BetLeg.query.filter(BetLeg.bet_id.in_(ids.values())).delete(synchronize_session=False)
+        BetParticipant.query.filter(BetParticipant.bet_id.in_(ids.values())).delete(synchronize_session=False)
+        Bet.query.filter(Bet.id.in_(ids.values())).delete(synchronize_session=False)
+        User.query.filter_by(username='search_user').delete(synchronize_session=False)
+        db.session.commit()
+
+
+def _search(ids, term):
+    query = Bet.query.filter(Bet.id.in_(ids.values()))
+    return {bet.id for bet in apply_bet_search(query, term).all()}
+
+
+def test_search_document_maintained_on_write(search_bets):
+    with app.app_context():
+        bet = db.session.get(Bet, search_bets['mahomes'])
+        assert 'mahomes' in bet.search_document
+        assert 'draftkings' in bet.search_document
+        assert 'sunday' in bet.search_document
+
+        leg = bet.bet_legs_rel[0]
+        leg.player_name = 'Travis Kelce'
+        db.session.commit()
+
+        db.session.refresh(bet)
+        assert 'kelce' in bet.search_document
+        assert 'mahomes' not in bet.search_document
+        assert bet.search_document == build_search_document(bet)
+
+
+def test_search_matches_fields_not_json_keys(search_bets):
+    with app.app_context():
+        assert _search(search_bets, 'Mahomes') == {search_bets['mahomes']}
+        assert _search(search_bets, 'denver') == {search_bets['mahomes'], search_bets['jokic']}
+        assert _search(search_bets, 'fanduel') == {search_bets['jokic']}
+        # 'passing_yards' only appears as a JSON key in the Jokic bet_data
+        assert _search(search_bets, 'passing_yards') == {search_bets['mahomes']}
+        assert _search(search_bets, 'jokic rebounds') == {search_bets['jokic']}
+
+
+def _assert_word_prefix_rule(ids):
+    assert _search(ids, 'mahom') == {ids['mahomes']}
+    assert _search(ids, 'nug') == {ids['jokic']}
+    # Tokens match the start of a word, never the middle of one
+    assert _search(ids, 'homes') == set()
+    assert _search(ids, 'uggets') == set()
+    assert _search(ids, 'ity chiefs') == set()
+
+
+def test_search_matches_word_prefixes(search_bets):
+    with app.app_context():
+        _assert_word_prefix_rule(search_bets)
+
+
+def test_sqlite_fts_index(search_bets):
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            pytest.skip('FTS5 fallback is SQLite only')
+        with db.engine.begin() as conn:
+            ensure_sqlite_search_index(conn)
+        try:
+            # Same matching rule as the LIKE path used on PostgreSQL
+            _assert_word_prefix_rule(search_bets)
+            assert _search(search_bets, 'nuggets jok') == {search_bets['jokic']}
+
+            # Triggers keep the FTS table in sync on write
+            leg = BetLeg.query.filter_by(bet_id=search_bets['jokic']).one()
+            leg.player_name = 'Jamal Murray'
+            db.session.commit()
+            assert _search(search_bets, 'murray') == {search_bets['jokic']}
+            assert _search(search_bets, 'jokic') == set()
+        finally:
+            with db.engine.begin() as conn:
+                for trigger in ('bets_search_ai', 'bets_search_ad', 'bets_search_au'):
+                    conn.execute(db.text(f'DROP TRIGGER IF EXISTS {trigger}'))
+                conn.execute(db.text('DROP TABLE IF EXISTS bet_search_fts'))
+            from services import bet_search
+            bet_search._sqlite_fts_available.clear()
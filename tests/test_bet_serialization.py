@@ -0,0 +1,220 @@
+"""
+Tests for batch bet serialization (BetSerializationContext).
+
+Verifies that serializing a page of bets issues a constant number of
+queries regardless of page size, and that the output matches the
+unbatched per-bet serialization.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db, User, Bet, BetLeg, BetParticipant, Player, Team
+from unittest.mock import patch
+
+from services.bet_serialization import (
+    BetSerializationContext, serialize_bets, bet_payload_cache,
+    bet_version_column, get_processed_bet_payloads, invalidate_bet_payloads,
+    shape_bet_payloads, LEG_V2_ALIASES,
+)
+
+
+@pytest.fixture
+def seeded_bets():
+    """Create users, players, teams and 20 two-leg bets; clean up afterwards."""
+    with app.app_context():
+        db.create_all()
+
+        users = [
+            User(username=f'serial_user_{i}', email=f'serial_user_{i}@example.com', password_hash='x')
+            for i in range(3)
+        ]
+        db.session.add_all(users)
+        teams = [
+            Team(team_name='Serial Home Hawks', team_abbr='SHH', sport='NFL', espn_team_id='serial-1', color='112233'),
+            Team(team_name='Serial Away Owls', team_abbr='SAO', sport='NFL', espn_team_id='serial-2', color='#445566'),
+        ]
+        db.session.add_all(teams)
+        db.session.flush()
+
+        players = []
+        for i in range(10):
+            players.append(Player(
+                player_name=f'Serial Player {i}', normalized_name=f'serial player {i}',
+                display_name=f'Serial Player {i}', sport='NFL', jersey_number=i + 1,
+            ))
+        db.session.add_all(players)
+        db.session.flush()
+
+        bets = []
+        for i in range(20):
+            bet = Bet(
+                user_id=users[0].id, bet_type='Parlay', betting_site='DraftKings',
+                status='completed', is_active=False, is_archived=False,
+                bet_date=f'2025-01-{(i % 28) + 1:02d}', total_legs=2,
+                secondary_bettors=[users[1].id, users[2].id], watchers=[],
+            )
+            db.session.add(bet)
+            db.session.flush()
+            for order in range(2):
+                player = players[(i + order) % len(players)]
+                db.session.add(BetLeg(
+                    bet_id=bet.id,
+                    # Half the legs resolve by id, the rest by (name, sport)
+                    player_id=player.id if order == 0 else None,
+                    player_name=player.player_name, sport='NFL',
+                    player_team='Serial Home Hawks',
+                    home_team='Serial Home Hawks', away_team='Serial Away Owls',
+                    bet_type='player_prop', stat_type='rushing_yards',
+                    target_value=50, leg_order=order,
+                ))
+            bets.append(bet)
+        db.session.commit()
+        bet_ids = [b.id for b in bets]
+
+        yield bet_ids
+
+        db.session.rollback()
+        BetLeg.query.filter(BetLeg.bet_id.in_(bet_ids)).delete(synchronize_session=False)
+        BetParticipant.query.filter(BetParticipant.bet_id.in_(bet_ids)).delete(synchronize_session=False)
+        Bet.query.filter(Bet.id.in_(bet_ids)).delete(synchronize_session=False)
+        Player.query.filter(Player.player_name.like('Serial Player %')).delete(synchronize_session=False)
+        Team.query.filter(Team.espn_team_id.like('serial-%')).delete(synchronize_session=False)
+        User.query.filter(User.username.like('serial_user_%')).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def _load_bets(bet_ids):
+    return (Bet.query.filter(Bet.id.in_(bet_ids))
+            .options(db.joinedload(Bet.bet_legs_rel))
+            .order_by(Bet.id).all())
+
+
+def _count_serialization_queries(bet_ids):
+    """Count SQL statements issued while serializing the given bets."""
+    bets = _load_bets(bet_ids)
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+    try:
+        serialize_bets(bets)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', _before_cursor_execute)
+    return len(statements)
+
+
+def test_query_count_is_constant_per_page(seeded_bets):
+    with app.app_context():
+        Team.find_cached_team('Serial Home Hawks')  # prime the team cache
+        small_page = _count_serialization_queries(seeded_bets[:5])
+        db.session.expire_all()
+        full_page = _count_serialization_queries(seeded_bets)
+
+    assert small_page == full_page
+    # users + players by id + players by name
+    assert full_page == 3
+
+
+def test_context_output_matches_unbatched(seeded_bets):
+    with app.app_context():
+        bets = _load_bets(seeded_bets)
+        batched = serialize_bets(bets)
+        unbatched = [bet.to_dict_structured() for bet in bets]
+
+    assert batched == unbatched
+    first = batched[0]
+    assert first['bettor_usernames'] == ['serial_user_0', 'serial_user_1', 'serial_user_2']
+    jerseys = [leg['player_jersey_number'] for leg in first['legs']]
+    assert all(j is not None for j in jerseys)
+    assert first['legs'][0]['team_color'] == '#112233'
+    assert first['games'][0]['teams']['away_abbr'] == 'SAO'
+
+
+def test_empty_context_builds_without_queries():
+    ctx = BetSerializationContext.for_bets([])
+    assert ctx.get_user(1) is None
+    assert ctx.get_jersey_number(1, 'Nobody', 'NFL') is None
+
+
+def _versioned_ids(bet_ids):
+    rows = (db.session.query(Bet.id, Bet.updated_at, bet_version_column())
+            .filter(Bet.id.in_(bet_ids)).order_by(Bet.id).all())
+    return [(bet_id, (bet_updated, legs_updated)) for bet_id, bet_updated, legs_updated in rows]
+
+
+def test_payload_cache_serves_hits_without_reserializing(seeded_bets):
+    with app.app_context():
+        invalidate_bet_payloads()
+        first = get_processed_bet_payloads(_versioned_ids(seeded_bets))
+        assert len(first) == len(seeded_bets)
+        assert set(bet_payload_cache) >= set(seeded_bets)
+
+        with patch.object(Bet, 'to_dict_structured') as mock_serialize:
+            second = get_processed_bet_payloads(_versioned_ids(seeded_bets))
+        mock_serialize.assert_not_called()
+        assert second == first
+
+
+def test_payload_cache_invalidated_on_leg_write(seeded_bets):
+    with app.app_context():
+        invalidate_bet_payloads()
+        bet_id = seeded_bets[0]
+        before = get_processed_bet_payloads(_versioned_ids([bet_id]))[0]
+        assert before['legs'][0]['status'] == 'pending'
+
+        leg = BetLeg.query.filter_by(bet_id=bet_id, leg_order=0).one()
+        leg.status = 'won'
+        db.session.commit()
+        assert bet_id not in bet_payload_cache
+
+        after = get_processed_bet_payloads(_versioned_ids([bet_id]))[0]
+        assert after['legs'][0]['status'] == 'won'
+
+
+def test_payload_cache_skipped_for_live_fetches(seeded_bets):
+    with app.app_context():
+        invalidate_bet_payloads()
+        versioned = _versioned_ids(seeded_bets[:2])
+        cached = get_processed_bet_payloads(versioned)
+
+        with patch('services.bet_service.process_parlay_data', side_effect=lambda bets, fetch_live: [
+                {**bet, 'live': fetch_live} for bet in bets]) as mock_process:
+            live = get_processed_bet_payloads(versioned, fetch_live=True)
+        assert mock_process.call_count == 2
+        assert all(payload['live'] for payload in live)
+        # Live payloads are never stored, so the cached versions stay in place
+        assert get_processed_bet_payloads(versioned) == cached
+
+
+def test_v2_payload_drops_aliases_and_raw_bet_data(seeded_bets):
+    with app.app_context():
+        v1 = serialize_bets(_load_bets(seeded_bets[:2]))
+    v2 = shape_bet_payloads(v1, version=2)
+
+    assert 'bet_data' in v1[0] and 'bet_data' not in v2[0]
+    assert 'final_odds' not in v2[0] and 'odds' in v2[0]
+    leg_v1, leg_v2 = v1[0]['legs'][0], v2[0]['legs'][0]
+    for dropped, kept in LEG_V2_ALIASES.items():
+        assert dropped not in leg_v2
+        if dropped in leg_v1:
+            assert leg_v2[kept] == leg_v1[dropped]
+    assert len(repr(v2)) < len(repr(v1))
+    # Shared (cached) inputs are left untouched
+    assert 'player_name' in v1[0]['legs'][0]
+
+
+def test_fields_selection():
+    bets = [{'db_id': 1, 'name': 'x', 'status': 'won', 'legs': [{'player': 'A', 'stat': 'points', 'target': 10}]}]
+    shaped = shape_bet_payloads(bets, version=2, fields='db_id,legs.player,legs.target')
+    assert shaped == [{'db_id': 1, 'legs': [{'player': 'A', 'target': 10}]}]
+    assert shape_bet_payloads(bets, version=1, fields='name') == [{'name': 'x'}]
+    with pytest.raises(ValueError):
+        shape_bet_payloads(bets, version=9)
@@ -0,0 +1,134 @@
+"""
+Tests for /api/sync delta sync and tombstones.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db, User, Bet, BetLeg, BetParticipant, SyncTombstone
+from services import bet_sync
+from services.bet_sync import encode_sync_cursor, database_now
+
+
+def _bet(user_id, **kwargs):
+    bet = Bet(user_id=user_id, status='live', bet_type='Parlay', betting_site='DraftKings',
+              bet_date='2025-04-01', total_legs=1, secondary_bettors=kwargs.pop('secondary_bettors', []),
+              watchers=[], **kwargs)
+    db.session.add(bet)
+    db.session.flush()
+    db.session.add(BetLeg(bet_id=bet.id, player_name='Sync Player', home_team='Home', away_team='Away',
+                          bet_type='player_prop', stat_type='points', target_value=20, sport='NBA'))
+    return bet
+
+
+@pytest.fixture
+def sync_client(monkeypatch):
+    """Client for a user who owns two bets and shares one owned by another user."""
+    monkeypatch.setattr(bet_sync, 'SYNC_OVERLAP_SECONDS', 0)
+    app.config['TESTING'] = True
+    app.config['LOGIN_DISABLED'] = True
+    with app.app_context():
+        db.create_all()
+        user = User(username='sync_user', email='sync_user@example.com', password_hash='x')
+        other = User(username='sync_other', email='sync_other@example.com', password_hash='x')
+        db.session.add_all([user, other])
+        db.session.flush()
+        bets = {
+            'a': _bet(user.id),
+            'b': _bet(user.id),
+            'shared': _bet(other.id, secondary_bettors=[user.id]),
+        }
+        db.session.commit()
+        ids = {name: bet.id for name, bet in bets.items()}
+        user_ids = [user.id, other.id]
+
+        # SQLite timestamps have one-second resolution: keep the seed out of the first window
+        time.sleep(1.1)
+        with patch('routes.bets.current_user', user), app.test_client() as client:
+            yield client, ids, user
+
+        db.session.rollback()
+        bet_ids = [b.id for b in Bet.query.filter(Bet.user_id.in_(user_ids)).all()]
+        BetLeg.query.filter(BetLeg.bet_id.in_(bet_ids)).delete(synchronize_session=False)
+        # Includes rows of bets deleted in the test (SQLite doesn't cascade)
+        BetParticipant.query.filter(BetParticipant.user_id.in_(user_ids)).delete(synchronize_session=False)
+        Bet.query.filter(Bet.id.in_(bet_ids)).delete(synchronize_session=False)
+        SyncTombstone.query.filter(SyncTombstone.user_id.in_(user_ids)).delete(synchronize_session=False)
+        User.query.filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def _start(client):
+    data = client.get('/api/sync').get_json()
+    assert data['reset'] is True and data['bets'] == []
+    return data['next_cursor']
+
+
+def test_returns_only_changed_bets(sync_client):
+    client, ids, user = sync_client
+    cursor = _start(client)
+
+    assert client.get(f'/api/sync?since={cursor}').get_json()['bets'] == []
+
+    leg = BetLeg.query.filter_by(bet_id=ids['a']).one()
+    leg.achieved_value = 25
+    new_bet = _bet(user.id)
+    db.session.commit()
+
+    data = client.get(f'/api/sync?since={cursor}').get_json()
+    assert data['reset'] is False
+    assert {b['db_id'] for b in data['bets']} == {ids['a'], new_bet.id}
+    assert data['deleted'] == {'bets': [], 'legs': []}
+
+    # Moving a bet (status change) shows up as well
+    db.session.get(Bet, ids['b']).status = 'completed'
+    db.session.commit()
+    data = client.get(f"/api/sync?since={data['next_cursor']}").get_json()
+    assert ids['b'] in {b['db_id'] for b in data['bets']}
+
+
+def test_tombstones_for_deletes_and_lost_access(sync_client):
+    client, ids, _ = sync_client
+    cursor = _start(client)
+
+    leg = BetLeg.query.filter_by(bet_id=ids['a']).one()
+    leg_id = leg.id
+    db.session.delete(leg)
+    db.session.delete(BetLeg.query.filter_by(bet_id=ids['b']).one())
+    db.session.delete(db.session.get(Bet, ids['b']))
+    db.session.get(Bet, ids['shared']).secondary_bettors = []
+    db.session.commit()
+
+    data = client.get(f'/api/sync?since={cursor}').get_json()
+    assert set(data['deleted']['bets']) == {ids['b'], ids['shared']}
+    assert leg_id in data['deleted']['legs']
+    # The surviving bet is resent without the deleted leg
+    assert [b['db_id'] for b in data['bets']] == [ids['a']]
+
+
+def test_paging_and_invalid_cursors(sync_client):
+    client, ids, _ = sync_client
+    cursor = _start(client)
+    for name in ('a', 'b'):
+        db.session.get(Bet, ids[name]).status = 'completed'
+    db.session.commit()
+
+    seen = []
+    data = client.get(f'/api/sync?since={cursor}&limit=1').get_json()
+    seen += [b['db_id'] for b in data['bets']]
+    assert data['has_more'] is True
+    data = client.get(f"/api/sync?since={data['next_cursor']}&limit=1").get_json()
+    seen += [b['db_id'] for b in data['bets']]
+    assert sorted(seen) == sorted([ids['a'], ids['b']])
+
+    assert client.get('/api/sync?since=garbage').status_code == 400
+
+    with app.app_context():
+        stale = encode_sync_cursor(database_now().replace(year=2000))
+    assert client.get(f'/api/sync?since={stale}').get_json()['reset'] is True
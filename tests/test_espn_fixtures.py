@@ -0,0 +1,93 @@
+"""
+Tests for ESPN record/replay (helpers.espn_fixtures) against the local stand-in server.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db
+from helpers import espn_fixtures
+from helpers.espn_fixtures import FixtureServer, FixtureStore, fixture_key, recording, replaying
+from helpers.utils import get_events
+from services.bet_service import fetch_game_details_from_espn
+
+SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?dates=20251116"
+SUMMARY_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/summary?event=401772001"
+
+EVENT = {
+    "id": "401772001", "date": "2025-11-16T18:00Z",
+    "status": {"type": {"name": "STATUS_FINAL"}, "period": 4, "displayClock": "0:00"},
+    "competitions": [{"competitors": [
+        {"homeAway": "away", "score": "17", "team": {"displayName": "Minnesota Vikings", "abbreviation": "MIN"}},
+        {"homeAway": "home", "score": "24", "team": {"displayName": "Detroit Lions", "abbreviation": "DET"}},
+    ]}],
+}
+SUMMARY = {
+    "boxscore": {"players": [{"team": {"displayName": "Detroit Lions"}, "statistics": [
+        {"name": "rushing", "labels": ["CAR", "YDS", "TD"],
+         "athletes": [{"athlete": {"id": "4429795", "displayName": "Jahmyr Gibbs"}, "stats": ["14", "88", "1"]}]},
+    ]}]},
+    "scoringPlays": [{"type": {"text": "Rushing Touchdown"}, "text": "Jahmyr Gibbs 3 Yd Run",
+                      "team": {"displayName": "Detroit Lions"}}],
+    "news": {"articles": []},
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FixtureStore(tmp_path / "espn")
+    store.put(fixture_key("GET", SCOREBOARD_URL), 200, json.dumps({"events": [EVENT]}))
+    store.put(fixture_key("GET", SUMMARY_URL), 200, json.dumps(SUMMARY))
+    return store
+
+
+def test_fixture_keys_ignore_scheme_and_query_order(store):
+    assert fixture_key("get", "http://site.api.espn.com/a/b?z=1&a=2") == "GET site.api.espn.com/a/b?a=2&z=1"
+    assert store.keys() == sorted([fixture_key("GET", SCOREBOARD_URL), fixture_key("GET", SUMMARY_URL)])
+    assert store.get(fixture_key("GET", SUMMARY_URL))["status"] == 200
+    assert store.get("GET site.api.espn.com/nothing") is None
+
+
+def test_replay_runs_the_fetch_pipeline_offline(store):
+    with FixtureServer(store) as server, replaying(server.url), app.app_context():
+        db.create_all()
+        game = fetch_game_details_from_espn("2025-11-16", "Minnesota Vikings", "Detroit Lions", "NFL")
+        assert requests.get("https://site.api.espn.com/apis/unrecorded").status_code == 404
+
+    assert requests.Session.send is espn_fixtures._original_send
+    assert game.player_stat("Jahmyr Gibbs", "rushing", "YDS") == 88
+    assert game.touchdowns.count("Jahmyr Gibbs") == 1
+    assert server.counts == {"requests": 3, "served": 2, "missing": 1, "errors": 0, "stalls": 0}
+
+
+def test_record_while_replaying_round_trips(store, tmp_path):
+    with FixtureServer(store) as server, replaying(server.url), recording(tmp_path / "recorded") as recorded:
+        assert len(get_events("2025-11-16", "NFL")) == 1
+    assert recorded.keys() == [fixture_key("GET", SCOREBOARD_URL)]
+
+    with FixtureServer(recorded) as server, replaying(server.url):
+        assert get_events("2025-11-16", "NFL")[0]["id"] == "401772001"
+
+
+def test_latency_and_error_injection(store):
+    with FixtureServer(store, latency_ms=30) as server, replaying(server.url):
+        started = time.perf_counter()
+        get_events("2025-11-16", "NFL")
+        assert time.perf_counter() - started >= 0.03
+
+    with FixtureServer(store, error_rate=1.0) as server, replaying(server.url):
+        assert requests.get(SCOREBOARD_URL).status_code == 503
+        assert get_events("2025-11-16", "NFL") == []
+    assert server.counts["errors"] == 2
+
+    with FixtureServer(store, stall_rate=1.0, stall_seconds=0.5) as server, replaying(server.url):
+        with pytest.raises(requests.exceptions.Timeout):
+            requests.get(SCOREBOARD_URL, timeout=0.1)
+    assert server.counts["stalls"] == 1
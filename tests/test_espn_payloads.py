@@ -0,0 +1,73 @@
+"""
+Tests for selective parsing of ESPN payloads (helpers.espn_payloads).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers import espn_payloads
+from helpers.espn_payloads import parse_json_parts, read_json_parts, select_parts
+
+SUMMARY = {
+    'boxscore': {'teams': [{'team': {'id': '8'}}],
+                 'players': [{'team': {'displayName': 'Detroit Lions'},
+                              'statistics': [{'name': 'rushing', 'labels': ['YDS', 'AVG'],
+                                              'athletes': [{'athlete': {'id': '1'}, 'stats': ['88', '6.3']}]}]}]},
+    'plays': [{'id': str(i), 'text': 'scoringPlays in play text'} for i in range(50)],
+    'header': {'competitions': [{'status': {'type': {'completed': True}}}], 'season': {'year': 2025}},
+    'scoringPlays': [{'type': {'text': 'Rushing Touchdown'}, 'awayScore': 0, 'homeScore': 7, 'clock': 1.5}],
+}
+PATHS = ('boxscore.players', 'boxScore.players', 'scoringPlays', 'header.competitions', 'news.articles')
+EXPECTED = {
+    'boxscore.players': SUMMARY['boxscore']['players'],
+    'boxScore.players': None,
+    'scoringPlays': SUMMARY['scoringPlays'],
+    'header.competitions': SUMMARY['header']['competitions'],
+    'news.articles': None,
+}
+
+
+def _response(payload):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(payload).encode()
+    return response
+
+
+def test_select_parts_from_parsed_document():
+    assert select_parts(SUMMARY, PATHS) == EXPECTED
+    assert select_parts({'boxscore': []}, ('boxscore.players',)) == {'boxscore.players': None}
+
+
+@pytest.mark.parametrize('selective', [True, False])
+def test_parse_json_parts_matches_full_parse(selective):
+    if selective and espn_payloads.ijson is None:
+        pytest.skip('ijson not installed')
+    body = json.dumps(SUMMARY).encode()
+    with patch.object(espn_payloads, 'selective_parsing', selective):
+        parts = parse_json_parts(body, PATHS)
+    assert parts == EXPECTED
+    # Numbers come back as plain floats/ints, not Decimals
+    assert type(parts['scoringPlays'][0]['clock']) is float
+
+
+def test_read_json_parts_from_responses():
+    assert read_json_parts(_response(SUMMARY), ('scoringPlays',)) == {'scoringPlays': SUMMARY['scoringPlays']}
+
+    # Stand-in responses that only implement .json()
+    stand_in = MagicMock()
+    stand_in.json.return_value = SUMMARY
+    assert read_json_parts(stand_in, ('header.competitions',))['header.competitions'] == \
+        SUMMARY['header']['competitions']
+
+    # Broken bodies fail like json.loads does
+    truncated = _response(SUMMARY)
+    truncated._content = truncated._content[:-40]
+    with pytest.raises(ValueError):
+        read_json_parts(truncated, ('scoringPlays',))
@@ -0,0 +1,109 @@
+"""
+Tests for compact game snapshots (helpers.game_snapshot) and their use in services.bet_service.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from helpers.game_snapshot import GameSnapshot, PlayerLine, CLIENT_FIELDS
+from services import bet_service
+from services.bet_service import calculate_bet_value, fetch_game_details_from_espn, process_parlay_data
+
+EVENT = {
+    "id": "401772001",
+    "date": "2025-11-16T18:00Z",
+    "status": {"type": {"name": "STATUS_IN_PROGRESS"}, "period": 3, "displayClock": "7:12"},
+    "competitions": [{
+        "competitors": [
+            {"homeAway": "away", "score": "17", "team": {"displayName": "Minnesota Vikings", "abbreviation": "MIN"}},
+            {"homeAway": "home", "score": "24", "team": {"displayName": "Detroit Lions", "abbreviation": "DET"}},
+        ],
+        "boxscore": {"players": [{
+            "team": {"displayName": "Detroit Lions"},
+            "statistics": [
+                {"name": "rushing", "labels": ["CAR", "YDS", "AVG", "TD", "LONG"],
+                 "athletes": [{"athlete": {"id": "4429795", "displayName": "Jahmyr Gibbs"},
+                               "stats": ["14", "88", "6.3", "1", "31"]}]},
+                {"name": "kicking", "labels": ["FG", "PCT", "LONG", "XP", "PTS"],
+                 "athletes": [{"athlete": {"id": "5", "displayName": "Jake Bates"},
+                               "stats": ["2/3", "66.7", "51", "3/3", "9"]}]},
+            ],
+        }]},
+    }],
+}
+
+SCORING_PLAYS = [
+    {"type": {"text": "Rushing Touchdown"}, "text": "Jahmyr Gibbs 3 Yd Run",
+     "participants": [{"displayName": "Jahmyr Gibbs"}], "team": {"displayName": "Detroit Lions"}},
+    {"type": {"text": "Field Goal Good"}, "text": "Will Reichard 40 Yd Field Goal",
+     "team": {"displayName": "Minnesota Vikings"}},
+]
+
+
+def _snapshot():
+    return GameSnapshot.from_espn(EVENT, "NFL", "2025-11-16", EVENT["competitions"][0]["boxscore"]["players"],
+                                  SCORING_PLAYS)
+
+
+def test_snapshot_holds_parsed_lines_and_client_view():
+    game = _snapshot()
+    assert not hasattr(game, "__dict__") and not hasattr(PlayerLine("1", "X", ()), "__dict__")
+    line = game.groups[0].lines[0]
+    assert (line.athlete_id, line.name_norm, line.values) == ("4429795", "jahmyr gibbs", (14, 88, 6, 1, 31))
+    assert game.player_stat("Jahmyr Gibbs", "rushing", "YDS") == 88
+    assert game.player_stat("J. Gibbs", "Rushing", "CAR") == 14
+    assert game.player_stat("Jake Bates", "kicking", "FG") == 2
+    assert game.player_stat("Jahmyr Gibbs", "receiving", "YDS") is None
+
+    client = game.to_client()
+    assert tuple(client) == CLIENT_FIELDS
+    assert client["teams"] == {"away": "Minnesota Vikings", "home": "Detroit Lions",
+                               "away_abbr": "MIN", "home_abbr": "DET"}
+    assert client["score"] == {"away": 17, "home": 24} and client["startTime"] == "18:00 ET"
+    assert game.to_client() is client and game.get("espn_game_id") == "401772001"
+    json.dumps(client)
+
+
+def test_calculate_bet_value_on_snapshots():
+    game = _snapshot()
+    assert calculate_bet_value({"player": "Jahmyr Gibbs", "stat": "rushing_yards", "sport": "NFL"}, game) == 88
+    assert calculate_bet_value({"player": "Jahmyr Gibbs", "stat": "anytime_touchdown", "sport": "NFL"}, game) == 1
+    assert calculate_bet_value({"player": "Jahmyr Gibbs", "stat": "first_td_scorer", "sport": "NFL"}, game) == 1
+    assert calculate_bet_value({"stat": "first_team_to_score", "sport": "NFL"}, game) == "Detroit Lions"
+    assert calculate_bet_value({"stat": "last_team_to_score", "sport": "NFL"}, game) == "Minnesota Vikings"
+    assert calculate_bet_value({"stat": "moneyline", "team": "Minnesota Vikings", "sport": "NFL"}, game) == -7
+
+
+@pytest.fixture
+def empty_game_cache():
+    bet_service.clear_game_cache()
+    yield
+    bet_service.clear_game_cache()
+
+
+def test_fetch_caches_snapshots_and_serializes_client_subset(empty_game_cache):
+    parlay = {"name": "Sunday", "legs": [
+        {"player": "Jahmyr Gibbs", "stat": "rushing_yards", "sport": "NFL", "game_date": "2025-11-16",
+         "away": "Minnesota Vikings", "home": "Detroit Lions", "target": 70},
+        {"player": "Jahmyr Gibbs", "stat": "anytime_touchdown", "sport": "NFL", "game_date": "2025-11-16",
+         "away": "Minnesota Vikings", "home": "Detroit Lions", "target": 1},
+    ]}
+    with app.app_context(), patch.object(bet_service, "get_events", return_value=[EVENT]) as events:
+        # The competition carries its own boxscore, so no summary request is made
+        game = fetch_game_details_from_espn("2025-11-16", "Minnesota Vikings", "Detroit Lions", "NFL")
+        assert isinstance(game, GameSnapshot) and game.player_stat("Jahmyr Gibbs", "rushing", "TD") == 1
+
+        processed = process_parlay_data([parlay])[0]
+        assert events.call_count == 2
+
+    cached, _ = next(iter(bet_service.game_data_cache.values()))
+    assert isinstance(cached, GameSnapshot)
+    assert [leg["current"] for leg in processed["legs"]] == [88, 1]
+    assert processed["games"] == [cached.to_client()]
+    assert "boxscore" not in processed["games"][0]
@@ -0,0 +1,84 @@
+"""
+Tests for the shared game summary cache (helpers.game_summaries) used by get_player_season_stats.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.espn_api import get_player_season_stats
+from helpers.game_summaries import game_summary_cache, index_boxscore_players, is_final_summary
+
+GAME_IDS = ['401', '402', '403', '404', '405', '406']
+
+
+def _response(payload, status=200):
+    response = MagicMock()
+    response.status_code = status
+    response.json.return_value = payload
+    return response
+
+
+def _summary(game_id, completed=True):
+    return {
+        'header': {'competitions': [{'status': {'type': {'completed': completed}}}]},
+        'boxscore': {'players': [{'statistics': [{
+            'names': ['PTS', 'REB', 'AST'],
+            'athletes': [
+                {'athlete': {'id': '1'}, 'stats': [str(20 + int(game_id) % 10), '5', '7']},
+                {'athlete': {'id': '2'}, 'stats': ['12', '9', '1']},
+            ],
+        }]}]},
+    }
+
+
+def _plain_get(url, *args, **kwargs):
+    if url.endswith('/gamelog'):
+        return _response({'events': {gid: {'id': gid, 'gameDate': '2025-01-01', 'opponent': {'abbreviation': 'UTA'}}
+                                     for gid in GAME_IDS}})
+    return _response({}, status=404)
+
+
+@pytest.fixture(autouse=True)
+def clear_summary_cache():
+    game_summary_cache.clear()
+    yield
+    game_summary_cache.clear()
+
+
+def test_index_boxscore_players():
+    players = index_boxscore_players(_summary('401'))
+    assert players == {'1': {'PTS': '21', 'REB': '5', 'AST': '7'}, '2': {'PTS': '12', 'REB': '9', 'AST': '1'}}
+    assert is_final_summary(_summary('401'))
+    assert not is_final_summary(_summary('401', completed=False))
+    assert not is_final_summary({})
+
+
+def test_teammates_share_summary_fetches():
+    summary_get = MagicMock(side_effect=lambda url, params=None, **kw: _response(_summary(params['event'])))
+    with patch('helpers.espn_api.requests.get', side_effect=_plain_get), \
+            patch.object(requests.Session, 'get', summary_get):
+        first = get_player_season_stats('1', sport='basketball', league='nba')
+        second = get_player_season_stats('2', sport='basketball', league='nba')
+
+    # Five summaries for the first player, none for the teammate
+    assert summary_get.call_count == 5
+    assert [g['gameId'] for g in first['stats_last_5_games']] == GAME_IDS[:5]
+    assert first['stats_last_5_games'][0]['points'] == '21'
+    assert second['stats_last_5_games'][0]['rebounds'] == '9'
+
+
+def test_unfinished_and_failed_games_are_refetched():
+    responses = {'401': _response(_summary('401', completed=False)), '402': _response({}, status=500)}
+    summary_get = MagicMock(side_effect=lambda url, params=None, **kw: responses[params['event']])
+    with patch.object(requests.Session, 'get', summary_get), \
+            patch('helpers.game_summaries.LIVE_SUMMARY_TTL_SECONDS', 0):
+        boxscores = game_summary_cache.boxscores('basketball', 'nba', ['401', '402', '401'])
+        assert boxscores['401']['2']['PTS'] == '12'
+        assert boxscores['402'] is None
+        game_summary_cache.boxscores('basketball', 'nba', ['401', '402'])
+    assert summary_get.call_count == 4
@@ -0,0 +1,86 @@
+"""
+Tests for /historical pagination: keyset cursors and page-number compatibility.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db, User, Bet, BetLeg, BetParticipant
+
+
+@pytest.fixture
+def paged_client():
+    """Test client logged in as a user with 25 settled bets (some sharing a date)."""
+    app.config['TESTING'] = True
+    app.config['LOGIN_DISABLED'] = True
+    with app.app_context():
+        db.create_all()
+        user = User(username='paging_user', email='paging_user@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        bet_ids = []
+        for i in range(25):
+            bet = Bet(user_id=user.id, status='lost', bet_type='Parlay', betting_site='DraftKings',
+                      bet_date=f'2025-03-{(i // 2) + 1:02d}', total_legs=0,
+                      secondary_bettors=[], watchers=[])
+            db.session.add(bet)
+            db.session.flush()
+            bet_ids.append(bet.id)
+        db.session.commit()
+
+        with patch('routes.bets.current_user', user), app.test_client() as client:
+            yield client, bet_ids
+
+        db.session.rollback()
+        BetParticipant.query.filter(BetParticipant.bet_id.in_(bet_ids)).delete(synchronize_session=False)
+        Bet.query.filter(Bet.id.in_(bet_ids)).delete(synchronize_session=False)
+        User.query.filter_by(username='paging_user').delete(synchronize_session=False)
+        db.session.commit()
+
+
+def _ids(response):
+    return [b['db_id'] for b in response.get_json()['bets']]
+
+
+def test_cursor_walk_matches_page_numbers(paged_client):
+    client, bet_ids = paged_client
+
+    by_page = []
+    for page in (1, 2, 3):
+        by_page.extend(_ids(client.get(f'/historical?per_page=10&page={page}')))
+
+    by_cursor = []
+    data = client.get('/historical?per_page=10').get_json()
+    while True:
+        by_cursor.extend(b['db_id'] for b in data['bets'])
+        if not data['next_cursor']:
+            break
+        assert data['has_next']
+        data = client.get(f"/historical?per_page=10&cursor={data['next_cursor']}").get_json()
+
+    assert len(by_cursor) == len(bet_ids)
+    assert sorted(by_cursor) == sorted(bet_ids)
+    assert set(by_page) == set(by_cursor)
+    assert data['has_next'] is False
+    assert data['total_bets'] == 25
+    assert data['total_pages'] == 3
+
+
+def test_invalid_cursor_returns_400(paged_client):
+    client, _ = paged_client
+    response = client.get('/historical?cursor=not-a-cursor')
+    assert response.status_code == 400
+
+
+def test_compact_schema_and_field_selection(paged_client):
+    client, _ = paged_client
+    data = client.get('/historical?v=2&fields=db_id,status&per_page=10').get_json()
+    assert data['total_bets'] == 25
+    assert all(set(bet) == {'db_id', 'status'} for bet in data['bets'])
+
+    assert client.get('/historical?v=7').status_code == 400
@@ -0,0 +1,128 @@
+"""
+Tests for the prioritized, resumable player enrichment queue (jobs.player_enrichment_job).
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db, User, Bet, BetLeg, BetParticipant, Player, PlayerEnrichmentQueue
+from helpers.player_resolver import player_resolver
+from jobs.player_enrichment_job import refill_enrichment_queue, process_enrichment_queue
+
+Queue = PlayerEnrichmentQueue
+
+
+def _player(name, **fields):
+    player = Player(player_name=name, normalized_name=name.lower(), display_name=name, sport='NFL', **fields)
+    db.session.add(player)
+    return player
+
+
+def _leg(bet, player, status, game_date):
+    db.session.add(BetLeg(bet_id=bet.id, player_id=player.id, player_name=player.player_name, home_team='SEA',
+                          away_team='MIN', bet_type='player_prop', stat_type='receiving_yards', target_value=50,
+                          status=status, game_date=game_date, sport='NFL'))
+
+
+@pytest.fixture
+def queue_players():
+    with app.app_context():
+        db.create_all()
+        user = User(username='enrich_user', email='enrich_user@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        bet = Bet(user_id=user.id, status='pending', bet_type='Parlay', betting_site='FanDuel',
+                  bet_date='2025-01-10', total_legs=0, secondary_bettors=[], watchers=[])
+        db.session.add(bet)
+        players = {
+            'active': _player('Queue Active'),
+            'recent': _player('Queue Recent'),
+            'background': _player('Queue Background'),
+            'complete': _player('Queue Complete', position='WR', jersey_number=1, current_team='Seahawks',
+                                team_abbreviation='SEA', espn_player_id='queue-4', stats_season={'2025': {}},
+                                last_stats_update=datetime.utcnow()),
+        }
+        db.session.flush()
+        _leg(bet, players['active'], 'pending', date.today())
+        _leg(bet, players['recent'], 'won', date.today() - timedelta(days=3))
+        _leg(bet, players['background'], 'lost', date(2020, 1, 1))
+        db.session.commit()
+        ids = {key: player.id for key, player in players.items()}
+
+        yield bet, ids
+
+        db.session.rollback()
+        BetLeg.query.filter_by(bet_id=bet.id).delete(synchronize_session=False)
+        BetParticipant.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+        Bet.query.filter_by(id=bet.id).delete(synchronize_session=False)
+        User.query.filter_by(id=user.id).delete(synchronize_session=False)
+        Player.query.filter(Player.id.in_(ids.values())).delete(synchronize_session=False)
+        Queue.query.delete(synchronize_session=False)
+        db.session.commit()
+        player_resolver.invalidate()
+
+
+def _profile(name):
+    return {'sport': 'NFL', 'position': 'WR', 'jersey_number': '11', 'current_team': 'Seattle Seahawks',
+            'team_abbreviation': 'SEA', 'espn_player_id': f'espn-{name}'}
+
+
+def test_refill_ranks_by_leg_activity(queue_players):
+    bet, ids = queue_players
+    with app.app_context():
+        assert refill_enrichment_queue(set()) == 3
+        priorities = {row.player_id: row.priority for row in Queue.query}
+        assert priorities == {ids['active']: Queue.PRIORITY_ACTIVE, ids['recent']: Queue.PRIORITY_RECENT,
+                              ids['background']: Queue.PRIORITY_BACKGROUND}
+
+        # A new pending leg promotes the queued background player
+        _leg(bet, db.session.get(Player, ids['background']), 'pending', date.today())
+        db.session.commit()
+        assert refill_enrichment_queue(set()) == 0
+        assert db.session.get(Queue, ids['background']).priority == Queue.PRIORITY_ACTIVE
+
+
+def test_processes_in_priority_order_with_backoff(queue_players):
+    _, ids = queue_players
+    searched = []
+
+    def search(name, sport='football', league='nfl'):
+        searched.append(name)
+        if name == 'Queue Recent':
+            return None
+        if name == 'Queue Background':
+            raise RuntimeError('ESPN timeout')
+        return _profile(name)
+
+    stats = {'stats_season': {'2025': {'receiving_yards': 900}}, 'stats_last_5_games': []}
+    with app.app_context(), patch.object(player_resolver, 'search_espn', side_effect=search), \
+            patch('jobs.player_enrichment_job.get_player_season_stats', return_value=stats):
+        refill_enrichment_queue(set())
+
+        # No budget: nothing processed, the queue waits for the next run
+        assert process_enrichment_queue(time_budget=0, fresh_sports=set())['processed'] == 0
+        assert Queue.query.count() == 3
+
+        counts = process_enrichment_queue(fresh_sports=set())
+        assert searched == ['Queue Active', 'Queue Recent', 'Queue Background']
+        assert counts == {'processed': 3, 'completed': 1, 'backed_off': 2, 'stats_updated': 1}
+
+        active = db.session.get(Player, ids['active'])
+        assert (active.espn_player_id, active.jersey_number) == ('espn-Queue Active', 11)
+        assert active.stats_season['2025']['receiving_yards'] == 900
+        assert db.session.get(Queue, ids['active']) is None
+
+        recent = db.session.get(Queue, ids['recent'])
+        background = db.session.get(Queue, ids['background'])
+        assert recent.attempts == 1 and recent.next_attempt_at > datetime.utcnow()
+        assert background.last_error == 'ESPN timeout'
+
+        # Backed-off rows aren't due yet
+        assert process_enrichment_queue(fresh_sports=set())['processed'] == 0
+        assert len(searched) == 3
@@ -0,0 +1,101 @@
+"""
+Tests for the player prop hit-rate index (services.player_props).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db, User, Bet, BetLeg, BetParticipant, Player, PlayerPropIndex
+from services.player_props import prop_line_history, rebuild_player_prop_index
+
+GAME_LOGS = [
+    {'gameId': '401', 'gameDate': '2025-01-01', 'opponent': 'UTA', 'rebounds': 10, 'points': 30, 'assists': 8},
+    {'gameId': '402', 'gameDate': '2025-01-03', 'opponent': 'LAL', 'rebounds': '15', 'points': 22, 'assists': 11},
+    {'gameId': '403', 'gameDate': '2025-01-05', 'opponent': 'PHX', 'REB': 13, 'PTS': 25, 'AST': 9},
+]
+
+
+@pytest.fixture
+def prop_legs():
+    app.config['TESTING'] = True
+    app.config['LOGIN_DISABLED'] = True
+    with app.app_context():
+        db.create_all()
+        user = User(username='prop_user', email='prop_user@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        bet = Bet(user_id=user.id, status='completed', bet_type='Parlay', betting_site='FanDuel',
+                  bet_date='2025-01-10', total_legs=2, secondary_bettors=[], watchers=[])
+        db.session.add(bet)
+        db.session.flush()
+        legs = [
+            BetLeg(bet_id=bet.id, player_name='Nikola Jokic', home_team='Denver Nuggets', away_team='Utah Jazz', sport='NBA', bet_type='player_prop',
+                   stat_type='rebounds', bet_line_type='over', target_value=12.5, achieved_value=14,
+                   game_id='501', status='won', is_hit=True),
+            BetLeg(bet_id=bet.id, player_name='Nikola  Jokic', home_team='Denver Nuggets', away_team='Utah Jazz', sport='NBA', bet_type='player_prop',
+                   stat_type='Rebounds', bet_line_type='over', target_value=12.5, achieved_value=9,
+                   game_id='502', status='lost', is_hit=False),
+        ]
+        db.session.add_all(legs)
+        db.session.commit()
+
+        yield user, bet, legs
+
+        db.session.rollback()
+        BetLeg.query.filter_by(bet_id=bet.id).delete(synchronize_session=False)
+        BetParticipant.query.filter_by(bet_id=bet.id).delete(synchronize_session=False)
+        Bet.query.filter_by(id=bet.id).delete(synchronize_session=False)
+        Player.query.filter_by(player_name='Nikola Jokic').delete(synchronize_session=False)
+        PlayerPropIndex.query.filter_by(player_key='nikola jokic').delete(synchronize_session=False)
+        User.query.filter_by(id=user.id).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def test_settled_legs_and_game_logs_are_indexed(prop_legs):
+    _, _, legs = prop_legs
+    with app.app_context():
+        history = prop_line_history('Nikola Jokic', 'rebounds', 12.5, sport='NBA')
+        assert history['samples'] == 2 and history['hits'] == 1
+        assert history['our_legs'] == {'settled': 2, 'won': 1, 'win_rate': 0.5}
+
+        # The enrichment job writing game logs feeds the same index
+        db.session.add(Player(player_name='Nikola Jokic', normalized_name='nikola jokic',
+                              display_name='Nikola Jokic', sport='NBA', stats_last_5_games=GAME_LOGS,
+                              stats_season={'2025': {'rebounds': 12.7, 'games_played': 40}}))
+        db.session.commit()
+
+        history = prop_line_history('nikola jokic', 'reb', 12.5, sport='NBA')
+        # 9, 10, 13, 14, 15
+        assert history['samples'] == 5 and history['hits'] == 3 and history['hit_rate'] == 0.6
+        assert history['distribution']['median'] == 13
+        assert history['season'] == {'season': '2025', 'value': 12.7, 'games_played': 40}
+        under = prop_line_history('Nikola Jokic', 'rebounds', 13, side='under')
+        assert (under['hits'], under['pushes']) == (2, 1)
+
+        combo = prop_line_history('Nikola Jokic', 'pra', 47.5, sport='NBA')
+        assert combo['samples'] == 3 and combo['hits'] == 2  # 48, 48, 47
+
+        # Un-settling a leg removes its outcome and value
+        db.session.get(BetLeg, legs[1].id).status = 'pending'
+        db.session.commit()
+        history = prop_line_history('Nikola Jokic', 'rebounds', 12.5, sport='NBA')
+        assert history['samples'] == 4 and history['our_legs']['settled'] == 1
+
+        before = prop_line_history('Nikola Jokic', 'rebounds', 12.5, sport='NBA')
+        rebuild_player_prop_index()
+        assert prop_line_history('Nikola Jokic', 'rebounds', 12.5, sport='NBA') == before
+
+
+def test_prop_history_endpoint(prop_legs):
+    user, _, _ = prop_legs
+    with app.app_context(), patch('routes.analytics.current_user', user), app.test_client() as client:
+        data = client.get('/api/analytics/prop-history?player=Nikola Jokic&stat=rebounds&line=10.5').get_json()
+        assert data['samples'] == 2 and data['hit_rate'] == 0.5
+
+        assert client.get('/api/analytics/prop-history?player=Nikola Jokic&stat=rebounds').status_code == 400
+        assert client.get('/api/analytics/prop-history?player=Nobody&stat=points&line=1').status_code == 404
@@ -0,0 +1,202 @@
+"""
+Tests for the local player resolver (helpers.player_resolver).
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app, populate_player_data_for_bet
+from models import db, User, Bet, BetLeg, BetParticipant, Player
+from helpers.player_resolver import player_resolver, player_name_key
+
+PLAYERS = [
+    ('C.J. Stroud', 'NFL', '4432577', 'Houston Texans', 'HOU'),
+    ('Marvin Harrison Jr.', 'NFL', '4432708', 'Arizona Cardinals', 'ARI'),
+    ('Kenneth Walker III', 'NFL', '4567048', 'Seattle Seahawks', 'SEA'),
+    ('Josh Allen', 'NFL', '3918298', 'Buffalo Bills', 'BUF'),
+    ('Anthony Richardson', 'NFL', '4429084', 'Indianapolis Colts', 'IND'),
+    ('Jameson Williams', 'NFL', '4426385', 'Detroit Lions', 'DET'),
+    ('Nikola Jokić', 'NBA', '3112335', 'Denver Nuggets', 'DEN'),
+    ('Anthony Davis', 'NBA', '6583', 'Dallas Mavericks', 'DAL'),
+    ('Jaylin Williams', 'NBA', '4432823', 'Oklahoma City Thunder', 'OKC'),
+]
+
+
+@pytest.fixture
+def resolver_players():
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Player(player_name=name, normalized_name=name.lower(), display_name=name, sport=sport,
+                   espn_player_id=espn_id, current_team=team, team_abbreviation=abbr)
+            for name, sport, espn_id, team, abbr in PLAYERS
+        ])
+        db.session.commit()
+        player_resolver.invalidate()
+
+        yield
+
+        db.session.rollback()
+        Player.query.filter(Player.espn_player_id.in_([p[2] for p in PLAYERS] + ['resolver-new'])).delete(synchronize_session=False)
+        db.session.commit()
+        player_resolver.invalidate()
+
+
+def test_player_name_key():
+    assert player_name_key('Marvin Harrison Jr.') == 'marvin harrison'
+    assert player_name_key('C.J. Stroud') == 'cj stroud'
+    assert player_name_key('Nikola Jokić') == 'nikola jokic'
+    assert player_name_key("Amon-Ra St. Brown") == 'amon ra st brown'
+    assert player_name_key('Jr') == 'jr'
+
+
+def test_local_matching_levels(resolver_players):
+    with app.app_context():
+        def name(query, sport=None):
+            entry, method = player_resolver.match(query, sport)
+            return (entry['player_name'], method) if entry else (None, None)
+
+        assert name('CJ Stroud', 'NFL') == ('C.J. Stroud', 'exact')
+        assert name('Marvin Harrison', 'NFL') == ('Marvin Harrison Jr.', 'exact')
+        assert name('Kenneth Walker', 'NFL') == ('Kenneth Walker III', 'exact')
+        assert name('nikola jokic', 'NBA') == ('Nikola Jokić', 'exact')
+        assert name('J. Allen', 'NFL') == ('Josh Allen', 'initials')
+        assert name('A. Davis') == ('Anthony Davis', 'initials')
+        assert name('Jokic') == ('Nikola Jokić', 'last_name')
+        assert name('Nikola Jokc', 'NBA') == ('Nikola Jokić', 'fuzzy')
+        # Lookups with a sport stay within it
+        assert name('Josh Allen', 'NBA') == (None, None)
+        # Nothing close enough
+        assert name('Anthony', 'NFL') == (None, None)
+        assert name('Completely Unknown', 'NFL') == (None, None)
+
+        player = player_resolver.find('cj stroud', 'NFL')
+        assert player is db.session.get(Player, player.id)
+
+
+def test_approximate_matches_need_the_slip_team(resolver_players):
+    with app.app_context():
+        def found(query, sport, team=None):
+            player = player_resolver.find(query, sport, team=team)
+            return player.player_name if player else None
+
+        # Exact (suffix-stripped) names link on their own
+        assert found('Marvin Harrison', 'NFL') == 'Marvin Harrison Jr.'
+        # Near misses of a known player are a different player until the team says otherwise
+        assert found('Jalen Williams', 'NBA') is None
+        assert found('J. Williams', 'NBA') is None
+        assert found('Williams', 'NBA') is None
+        assert found('J. Williams', 'NBA', team='Boston Celtics') is None
+        # Same team, but two letters apart is still another first name
+        assert found('Jalen Williams', 'NBA', team='OKC') is None
+        assert found('J. Williams', 'NBA', team='OKC') == 'Jaylin Williams'
+        assert found('Jokic', 'NBA', team='Denver Nuggets') == 'Nikola Jokić'
+        assert found('Nikola Jokc', 'NBA', team='DEN') == 'Nikola Jokić'
+        # Never across sports
+        assert found('Jameson Williams', 'NBA') is None
+        assert found('Jameson Williams', 'NFL') == 'Jameson Williams'
+
+
+def test_follows_committed_player_writes(resolver_players):
+    with app.app_context():
+        assert player_resolver.find('Brock Purdy', 'NFL') is None
+
+        db.session.add(Player(player_name='Brock Purdy', normalized_name='brock purdy', display_name='Brock Purdy',
+                              sport='NFL', espn_player_id='resolver-new'))
+        db.session.rollback()
+        assert player_resolver.find('Brock Purdy', 'NFL') is None
+
+        db.session.add(Player(player_name='Brock Purdy', normalized_name='brock purdy', display_name='Brock Purdy',
+                              sport='NFL', espn_player_id='resolver-new'))
+        db.session.commit()
+        assert player_resolver.find('Brock Purdy', 'NFL').espn_player_id == 'resolver-new'
+
+        db.session.delete(player_resolver.find('Brock Purdy', 'NFL'))
+        db.session.commit()
+        assert player_resolver.find('Brock Purdy', 'NFL') is None
+
+
+def test_espn_search_only_on_local_miss_with_negative_cache(resolver_players):
+    with app.app_context(), patch('helpers.enhanced_player_search.enhanced_player_search',
+                                  return_value=None) as search:
+        assert isinstance(player_resolver.resolve('CJ Stroud', 'NFL'), Player)
+        assert search.call_count == 0
+
+        assert player_resolver.resolve('Nobody Atall', 'NFL') is None
+        assert player_resolver.resolve('nobody atall', 'NFL') is None
+        assert search.call_count == 1
+
+
+def test_bet_population_searches_espn_for_near_misses(resolver_players):
+    espn_jalen = {'player_name': 'Jalen Williams', 'sport': 'NBA', 'position': 'G', 'jersey_number': '8',
+                  'current_team': 'Oklahoma City Thunder', 'team_abbreviation': 'OKC', 'espn_player_id': 'resolver-new'}
+    espn = {'Jalen Williams': espn_jalen}
+    with app.app_context(), patch.object(player_resolver, 'search_espn',
+                                         side_effect=lambda name, **kwargs: espn.get(name)) as search:
+        user = User(username='resolver_user', email='resolver_user@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        bet = Bet(user_id=user.id, status='pending', bet_type='Parlay', betting_site='FanDuel',
+                  bet_date='2025-01-10', total_legs=2, secondary_bettors=[], watchers=[])
+        db.session.add(bet)
+        db.session.flush()
+        jalen = BetLeg(bet_id=bet.id, player_name='Jalen Williams', player_team='OKC', home_team='OKC',
+                       away_team='DEN', bet_type='player_prop',
+                       stat_type='points', target_value=20.5, status='pending', sport='NBA', parlay_sport='NBA')
+        jameson = BetLeg(bet_id=bet.id, player_name='Jameson Williams', home_team='OKC', away_team='DEN',
+                         bet_type='player_prop', stat_type='points',
+                         target_value=10.5, status='pending', sport='NBA', parlay_sport='NBA')
+        db.session.add_all([jalen, jameson])
+        db.session.commit()
+        try:
+            populate_player_data_for_bet(bet)
+
+            assert [c.args[0] for c in search.call_args_list] == ['Jalen Williams', 'Jameson Williams']
+            created = Player.query.filter_by(espn_player_id='resolver-new').one()
+            assert db.session.get(BetLeg, jalen.id).player_id == created.id
+            # The NFL receiver of the same name is never linked to an NBA leg
+            assert db.session.get(BetLeg, jameson.id).player_id is None
+        finally:
+            db.session.rollback()
+            BetLeg.query.filter_by(bet_id=bet.id).delete(synchronize_session=False)
+            BetParticipant.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+            Bet.query.filter_by(id=bet.id).delete(synchronize_session=False)
+            User.query.filter_by(id=user.id).delete(synchronize_session=False)
+            db.session.commit()
+
+
+def test_lookups_are_safe_during_in_place_updates(resolver_players):
+    with app.app_context():
+        player_resolver.match('Josh Allen', 'NFL')  # load the indexes
+    errors = []
+    stop = threading.Event()
+
+    def write():
+        for i in range(300):
+            rows = [{'id': 900000 + n, 'player_name': f'Josh Alen {i} {n}', 'display_name': None,
+                     'normalized_name': None, 'sport': 'NFL', 'position': None, 'jersey_number': None,
+                     'current_team': None, 'team_abbreviation': None, 'espn_player_id': None}
+                    for n in range(20)]
+            player_resolver.apply_changes(rows, [])
+        stop.set()
+
+    def read():
+        try:
+            while not stop.is_set():
+                player_resolver.match('Josh Alen 1', 'NFL')
+        except Exception as e:  # e.g. "Set changed size during iteration"
+            errors.append(e)
+            stop.set()
+
+    threads = [threading.Thread(target=write), threading.Thread(target=read)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    player_resolver.invalidate()
+    assert errors == []
@@ -0,0 +1,105 @@
+"""
+Tests for the fast JSON provider and Accept-Encoding based compression.
+"""
+
+import gzip
+import json
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.compression import init_response_compression, brotli
+from helpers import fast_json
+from helpers.fast_json import FastJSONProvider
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    init_response_compression(app)
+
+    @app.route('/big')
+    def big():
+        return jsonify([{'player': 'Patrick Mahomes', 'target': Decimal('249.5')}] * 200)
+
+    @app.route('/small')
+    def small():
+        return jsonify({'ok': True})
+
+    @app.route('/tagged')
+    def tagged():
+        response = jsonify([{'leg': i} for i in range(500)])
+        response.set_etag('abc123')
+        if request.if_none_match.contains_weak('abc123'):
+            return '', 304
+        return response
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize('backend', ['orjson', 'stdlib'])
+def test_provider_encodes_model_types(backend, monkeypatch):
+    if backend == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(fast_json, 'orjson', None)
+    app = Flask(__name__)
+    provider = FastJSONProvider(app)
+    payload = {
+        'wager': Decimal('10.50'),
+        'bet_date': date(2025, 3, 1),
+        'updated_at': datetime(2025, 3, 1, 18, 30),
+    }
+    encoded = provider.dumps({**payload, 'bettors': {7}})
+    # Same values as Flask's default provider, which the frontend parses
+    assert json.loads(encoded) == {
+        'wager': '10.50',
+        'bet_date': 'Sat, 01 Mar 2025 00:00:00 GMT',
+        'updated_at': 'Sat, 01 Mar 2025 18:30:00 GMT',
+        'bettors': [7],
+    }
+    assert {k: v for k, v in json.loads(encoded).items() if k != 'bettors'} == \
+        json.loads(DefaultJSONProvider(app).dumps(payload))
+    assert provider.loads(encoded)['wager'] == '10.50'
+    assert json.loads(provider.response(payload).get_data())['updated_at'] == 'Sat, 01 Mar 2025 18:30:00 GMT'
+
+
+def test_gzip_when_accepted(client):
+    response = client.get('/big', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    payload = json.loads(gzip.decompress(response.get_data()))
+    assert payload[0] == {'player': 'Patrick Mahomes', 'target': '249.5'}
+
+
+@pytest.mark.skipif(brotli is None, reason='no brotli module installed')
+def test_brotli_preferred(client):
+    response = client.get('/big', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert len(json.loads(brotli.decompress(response.get_data()))) == 200
+
+
+def test_uncompressed_when_not_accepted_or_small(client):
+    plain = client.get('/big', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers
+    assert len(plain.get_json()) == 200
+
+    small = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+    assert small.get_json() == {'ok': True}
+
+
+def test_compressed_etag_is_weak_and_still_revalidates(client):
+    response = client.get('/tagged', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'] == 'W/"abc123"'
+
+    revalidated = client.get('/tagged', headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
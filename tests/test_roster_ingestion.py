@@ -0,0 +1,140 @@
+"""
+Tests for bulk roster ingestion (jobs.roster_ingestion_job, helpers.espn_api.get_league_rosters).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db, Player, JobWatermark
+from helpers.espn_api import get_league_rosters
+from helpers.player_resolver import player_resolver
+from jobs.roster_ingestion_job import ingest_rosters, fresh_roster_sports, roster_job_name, upsert_roster_players
+
+
+def _response(payload):
+    response = MagicMock()
+    response.json.return_value = payload
+    response.raise_for_status.return_value = None
+    return response
+
+
+ESPN_PAYLOADS = {
+    'teams': {'sports': [{'leagues': [{'teams': [
+        {'team': {'id': '26', 'abbreviation': 'SEA', 'displayName': 'Seattle Seahawks'}},
+        {'team': {'id': '16', 'abbreviation': 'MIN', 'displayName': 'Minnesota Vikings'}},
+    ]}]}]},
+    '26': {'athletes': [
+        {'position': 'offense', 'items': [
+            {'id': 'ing-1', 'fullName': 'Kenneth Walker III', 'displayName': 'Kenneth Walker III',
+             'jersey': '9', 'position': {'abbreviation': 'RB'}, 'status': {'type': 'active'}},
+            {'id': 'ing-2', 'fullName': 'Jaxon Smith-Njigba', 'displayName': 'Jaxon Smith-Njigba',
+             'jersey': '11', 'position': {'abbreviation': 'WR'}},
+        ]},
+    ]},
+    '16': {'athletes': [
+        {'position': 'offense', 'items': [
+            {'id': 'ing-3', 'fullName': 'Justin Jefferson', 'displayName': 'Justin Jefferson',
+             'jersey': '18', 'position': {'abbreviation': 'WR'}, 'status': {'type': 'active'}},
+        ]},
+    ]},
+}
+
+
+def _fake_get(url, *args, **kwargs):
+    if url.endswith('/teams'):
+        return _response(ESPN_PAYLOADS['teams'])
+    return _response(ESPN_PAYLOADS[url.split('/teams/')[1].split('/')[0]])
+
+
+@pytest.fixture
+def roster_players():
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            # Linked player who changed teams
+            Player(player_name='Justin Jefferson', normalized_name='justin jefferson', display_name='Justin Jefferson',
+                   sport='NFL', espn_player_id='ing-3', current_team='Old Team', team_abbreviation='OLD',
+                   position='WR', jersey_number=18),
+            # Created from a bet slip, no ESPN id yet
+            Player(player_name='Kenneth Walker', normalized_name='kenneth walker', display_name='Kenneth Walker',
+                   sport='NFL'),
+        ])
+        db.session.commit()
+        player_resolver.invalidate()
+
+        yield
+
+        db.session.rollback()
+        Player.query.filter((Player.espn_player_id.like('ing-%')) |
+                            (Player.player_name == 'Kenneth Walker')).delete(synchronize_session=False)
+        JobWatermark.query.delete(synchronize_session=False)
+        db.session.commit()
+        player_resolver.invalidate()
+
+
+def test_get_league_rosters_flattens_grouped_rosters():
+    with patch.object(requests.Session, 'get', side_effect=_fake_get) as get:
+        players = get_league_rosters('football', 'nfl')
+    assert get.call_count == 3
+    by_id = {p['espn_player_id']: p for p in players}
+    assert set(by_id) == {'ing-1', 'ing-2', 'ing-3'}
+    assert by_id['ing-1']['jersey_number'] == 9
+    assert by_id['ing-1']['team_abbreviation'] == 'SEA'
+    assert by_id['ing-2']['status'] == 'active'
+    assert by_id['ing-3']['sport'] == 'NFL'
+
+
+def test_ingest_rosters_bulk_upserts(roster_players):
+    with app.app_context(), patch.object(requests.Session, 'get', side_effect=_fake_get):
+        assert fresh_roster_sports() == set()
+        results = ingest_rosters(sports=['NFL'])
+        assert results['NFL'] == {'inserted': 1, 'updated': 1, 'linked': 1, 'unchanged': 0}
+
+        jefferson = Player.query.filter_by(espn_player_id='ing-3').one()
+        assert (jefferson.current_team, jefferson.team_abbreviation) == ('Minnesota Vikings', 'MIN')
+
+        walker = Player.query.filter_by(player_name='Kenneth Walker').one()
+        assert (walker.espn_player_id, walker.position, walker.jersey_number) == ('ing-1', 'RB', 9)
+
+        jsn = Player.query.filter_by(espn_player_id='ing-2').one()
+        assert (jsn.sport, jsn.current_team, jsn.normalized_name) == ('NFL', 'Seattle Seahawks', 'jaxon smith-njigba')
+
+        # Ingested players resolve locally right away
+        assert player_resolver.find('Jaxon Smith-Njigba', 'NFL').id == jsn.id
+        assert player_resolver.find('J. Smith-Njigba', 'NFL', team='SEA').id == jsn.id
+        assert JobWatermark.get(roster_job_name('NFL')) is not None
+        assert fresh_roster_sports() == {'NFL'}
+
+        # Re-running without roster changes writes nothing
+        assert ingest_rosters(sports=['NFL'])['NFL'] == {'inserted': 0, 'updated': 0, 'linked': 0, 'unchanged': 3}
+
+
+def test_failed_fetch_keeps_previous_state(roster_players):
+    with app.app_context(), patch.object(requests.Session, 'get', side_effect=requests.ConnectionError('down')):
+        assert ingest_rosters(sports=['NFL']) == {}
+        assert JobWatermark.get(roster_job_name('NFL')) is None
+        assert Player.query.filter_by(espn_player_id='ing-3').one().current_team == 'Old Team'
+
+
+def test_shared_names_are_not_linked(roster_players):
+    def athlete(espn_id, team, abbr, position):
+        return {'player_name': 'Kenneth Walker', 'espn_player_id': espn_id, 'position': position,
+                'jersey_number': None, 'current_team': team, 'team_abbreviation': abbr, 'status': 'active',
+                'display_name': 'Kenneth Walker'}
+
+    roster = [athlete('ing-4', 'Seattle Seahawks', 'SEA', 'RB'), athlete('ing-5', 'Minnesota Vikings', 'MIN', 'LB')]
+    with app.app_context():
+        counts = upsert_roster_players('NFL', roster)
+        db.session.commit()
+        assert counts == {'inserted': 2, 'updated': 0, 'linked': 0, 'unchanged': 0}
+
+        # The bet-slip row stays unlinked for enrichment to sort out
+        slip = Player.query.filter_by(player_name='Kenneth Walker', sport='NFL', espn_player_id=None).one()
+        assert (slip.current_team, slip.position) == (None, None)
+        assert Player.query.filter(Player.espn_player_id.in_(['ing-4', 'ing-5'])).count() == 2
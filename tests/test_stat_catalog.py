@@ -0,0 +1,96 @@
+"""
+Tests for the unified stat catalog (helpers.stat_catalog) and the evaluators built on it.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers import stat_catalog
+from helpers.espn_api import _extract_achieved_value
+from services.bet_service import calculate_bet_value
+from stat_standardization import standardize_stat_type
+from automation.validators import validate_achieved_value
+
+NBA_GAME = {
+    "score": {"home": 110, "away": 104},
+    "teams": {"home": "Denver Nuggets", "away": "Utah Jazz"},
+    "boxscore": [{
+        "team": {"displayName": "Denver Nuggets"},
+        "statistics": [{
+            "name": None,
+            "labels": ["MIN", "FG", "3PT", "FT", "REB", "AST", "STL", "BLK", "TO", "PTS"],
+            "athletes": [{"athlete": {"displayName": "Nikola Jokic"},
+                          "stats": ["36", "11-19", "2-5", "4-4", "14", "11", "2", "1", "3", "28"]}],
+        }],
+    }],
+    "scoring_plays": [],
+}
+
+
+def test_alias_index_and_standardization():
+    assert standardize_stat_type('Pass Yds', sport='NFL') == 'passing_yards'
+    assert standardize_stat_type('steals', sport='MLB') == 'stolen_bases'
+    assert standardize_stat_type('steals') == 'steals'
+    # A known sport doesn't fall back to other sports
+    assert standardize_stat_type('pts', sport='NFL') == 'pts'
+    assert standardize_stat_type('made_threes') == 'three_pointers'
+    assert standardize_stat_type('something else') == 'something else'
+    assert stat_catalog.get_stat_aliases('receptions', 'NFL')[:2] == ['receptions', 'reception']
+
+
+def test_directional_totals_and_legacy_aliases():
+    # Saved legs and the settlement check in helpers.database key on these names
+    for sport in ('NFL', 'NBA'):
+        assert standardize_stat_type('total_points_over', sport=sport) == 'total_points_over'
+        assert standardize_stat_type('total_points_under', sport=sport) == 'total_points_under'
+        assert standardize_stat_type('game_total', sport=sport) == 'total_points'
+    assert stat_catalog.plan_kind('total_points_under') == stat_catalog.KIND_GAME_TOTAL
+    # Kept from the pre-catalog tables: slips' bare "interceptions" is the QB prop,
+    # and "score" is an NBA player's points (defensive picks and team totals have their own names)
+    assert standardize_stat_type('interceptions', sport='NFL') == 'interceptions_thrown'
+    assert standardize_stat_type('defensive interceptions', sport='NFL') == 'defensive_interceptions'
+    assert standardize_stat_type('score', sport='NBA') == 'points'
+    assert standardize_stat_type('team_score', sport='NBA') == 'team_total_points'
+
+
+def test_lookup_prefers_sport_but_falls_back_to_a_plan():
+    assert stat_catalog.lookup('field_goals', 'NBA').components == (('', 'FG'),)
+    assert stat_catalog.lookup('field_goals', 'NFL').components == (('kicking', 'FG'),)
+    # NHL 'points' has no boxscore plan; the NBA one is used
+    assert stat_catalog.lookup('points', 'NHL').sport == 'NBA'
+    assert stat_catalog.plan_kind('ml') == stat_catalog.KIND_SCORE_DIFFERENTIAL
+    assert stat_catalog.lookup('no such stat') is None
+
+
+def test_calculate_bet_value_uses_catalog_plans():
+    def value(stat, **extra):
+        return calculate_bet_value({"player": "Nikola Jokic", "stat": stat, "sport": "NBA", **extra}, NBA_GAME)
+
+    assert value("alt_points") == 28
+    assert value("3pm") == 2
+    assert value("pra") == 53
+    assert value("pr") == 42
+    assert value("double_double") == 1
+    assert value("triple_double") == 1
+    assert calculate_bet_value({"stat": "ML", "team": "Utah Jazz", "sport": "NBA"}, NBA_GAME) == -6
+    assert calculate_bet_value({"stat": "total_points_over", "sport": "NBA"}, NBA_GAME) == 214
+
+
+def test_extract_achieved_value_from_flattened_stats():
+    stats = {'rushing_yds': 54.0, 'yds': 54.0, 'receiving_yds': 31.0, 'receiving_rec': 4.0, 'rec': 4.0,
+             'rushing_td': 1.0, 'receiving_td': 1.0, 'td': 1.0}
+    assert _extract_achieved_value(stats, 'rush yds', 'player_prop', 'over', 'NFL') == 54.0
+    assert _extract_achieved_value(stats, 'rushing_receiving_yards', 'player_prop', 'over', 'NFL') == 85.0
+    assert _extract_achieved_value(stats, 'catches', 'player_prop', 'over', 'NFL') == 4.0
+    assert _extract_achieved_value(stats, 'rushing_touchdowns', 'player_prop', 'over', 'NFL') == 1.0
+    assert _extract_achieved_value(stats, 'anytime td', 'player_prop', None, 'NFL') == 2.0
+    assert _extract_achieved_value({'pts': 31.0, '3pt': 4.0}, 'made_threes', 'player_prop', 'over', 'NBA') == 4.0
+
+
+def test_validation_ranges_resolve_aliases():
+    assert validate_achieved_value('rec yds', 120)[0]
+    assert not validate_achieved_value('rec yds', 450)[0]
+    assert not validate_achieved_value('made_threes', 25, sport='NBA')[0]
+    assert validate_achieved_value('point_spread', -12)[0]
+    assert validate_achieved_value('unknown stat', 500)[0]
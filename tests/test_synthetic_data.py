@@ -0,0 +1,102 @@
+"""
+Tests for the synthetic data generator (services.synthetic_data).
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app  # noqa: F401 - registers the models' flush hooks
+from models import db, Bet, BetLeg, BetParticipant, AnalyticsRollup, PlayerPropIndex
+from services.synthetic_data import generate_synthetic_data
+
+AS_OF = date(2025, 11, 16)
+OPTIONS = dict(users=12, bets=60, legs=240, players=150, seed=7, as_of=AS_OF, batch_size=50)
+
+
+def _database(tmp_path, name):
+    engine = create_engine(f"sqlite:///{tmp_path / name}")
+    db.metadata.create_all(engine)
+    return engine
+
+
+def _rows(connection, model):
+    return [tuple(row) for row in connection.execute(select(*model.__table__.columns).order_by(*model.__table__.primary_key))]
+
+
+def test_same_seed_same_rows(tmp_path):
+    dumps = []
+    for name, seed in (('a.db', 7), ('b.db', 7), ('c.db', 8)):
+        with _database(tmp_path, name).connect() as connection:
+            counts = generate_synthetic_data(connection, **{**OPTIONS, 'seed': seed}, derived=False)
+            dumps.append([_rows(connection, model) for model in (Bet, BetLeg, BetParticipant)])
+    assert counts['bets'] == 60 and counts['bet_legs'] == 240 and counts['users'] == 12
+    assert dumps[0] == dumps[1]
+    assert dumps[0] != dumps[2]
+
+
+def test_rows_are_consistent(tmp_path):
+    with _database(tmp_path, 'synthetic.db').connect() as connection:
+        generate_synthetic_data(connection, **OPTIONS)
+        bets = connection.execute(select(Bet)).all()
+        legs = connection.execute(select(BetLeg)).all()
+        participants = connection.execute(select(BetParticipant)).all()
+        rollups = connection.execute(select(AnalyticsRollup)).all()
+        prop_rows = connection.execute(select(PlayerPropIndex)).all()
+
+        with pytest.raises(ValueError):
+            generate_synthetic_data(connection, **OPTIONS)
+
+    legs_by_bet = {}
+    for leg in legs:
+        legs_by_bet.setdefault(leg.bet_id, []).append(leg)
+    roles = {(p.bet_id, p.user_id): p.role for p in participants}
+    # Outcome counts the rollups should hold (one per bettor), from the legs
+    expected = {'bets': 0, 'bets_won': 0, 'bets_lost': 0, 'bets_void': 0}
+
+    for bet in bets:
+        bet_legs = legs_by_bet[bet.id]
+        assert bet.total_legs == len(bet_legs) and bet.search_document
+        assert {(bet.id, uid): role for uid, role in
+                BetParticipant.roles_for(bet.user_id, bet.secondary_bettors, bet.watchers).items()} == \
+            {key: role for key, role in roles.items() if key[0] == bet.id}
+        statuses = {leg.status for leg in bet_legs}
+        bettors = len(BetParticipant.roles_for(bet.user_id, bet.secondary_bettors, []))
+        if bet.status not in ('live', 'pending'):
+            expected['bets'] += bettors
+        if bet.status == 'won' or (bet.status == 'completed' and 'lost' not in statuses and 'won' in statuses):
+            assert statuses <= {'won', 'void'} and 'won' in statuses
+            expected['bets_won'] += bettors
+        elif bet.status == 'lost' or (bet.status == 'completed' and 'lost' in statuses):
+            assert 'lost' in statuses
+            expected['bets_lost'] += bettors
+        elif bet.status in ('void', 'completed'):
+            assert statuses == {'void'}
+            expected['bets_void'] += bettors
+        elif bet.status in ('live', 'pending'):
+            assert bet.is_active and statuses == {bet.status}
+        for leg in bet_legs:
+            if leg.status in ('won', 'lost'):
+                assert leg.is_hit == (leg.status == 'won') and leg.achieved_value is not None
+                assert leg.game_date < AS_OF and leg.home_score is not None
+
+    # One game id per matchup and day, with one final score
+    games = {}
+    for leg in legs:
+        if leg.status in ('won', 'lost'):
+            assert games.setdefault(leg.game_id, (leg.home_team, leg.away_team, leg.home_score, leg.away_score)) == \
+                (leg.home_team, leg.away_team, leg.home_score, leg.away_score)
+
+    statuses = [bet.status for bet in bets]
+    assert set(statuses) >= {'won', 'lost', 'completed', 'pending'}
+    # Like the app, most settled bets are stored as 'completed'
+    assert statuses.count('completed') > statuses.count('won') + statuses.count('lost')
+    assert prop_rows
+
+    # Rollups count every settled bet, per bettor, by its leg outcomes
+    bet_rows = [row for row in rollups if row.stat_type == AnalyticsRollup.BET_LEVEL]
+    assert expected == {m: sum(getattr(row, m) for row in bet_rows) for m in expected}
@@ -0,0 +1,139 @@
+"""
+Tests for the process-wide team resolver (helpers.team_resolver).
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app, normalize_bet_leg_team_names, populate_game_ids_for_bet
+from models import db, User, Bet, BetLeg, BetParticipant, Team
+from helpers.team_resolver import team_resolver, normalize_team_key
+
+TEAMS = [
+    ('Seattle Seahawks', 'Seahawks', 'SEA', 'NFL', 'Seattle', 'Seahawks'),
+    ('Minnesota Vikings', 'Vikings', 'MIN', 'NFL', 'Minnesota', 'Vikings'),
+    ('San Francisco 49ers', '49ers', 'SF', 'NFL', 'San Francisco', '49ers'),
+    ('Minnesota Timberwolves', 'Timberwolves', 'MIN', 'NBA', 'Minnesota', 'Timberwolves'),
+    ('Los Angeles Lakers', 'Lakers', 'LAL', 'NBA', 'Los Angeles', 'Lakers'),
+    ('LA Clippers', 'Clippers', 'LAC', 'NBA', 'Los Angeles', 'Clippers'),
+    ('Seattle Mariners', 'Mariners', 'SEA', 'MLB', 'Seattle', 'Mariners'),
+    ('Texas Rangers', 'Rangers', 'TEX', 'MLB', 'Texas', 'Rangers'),
+    ('Seattle Kraken', 'Kraken', 'SEA', 'NHL', 'Seattle', 'Kraken'),
+    ('New York Rangers', 'Rangers', 'NYR', 'NHL', 'New York', 'Rangers'),
+]
+
+
+@pytest.fixture
+def resolver_teams():
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Team(team_name=name, team_name_short=short, team_abbr=abbr, sport=sport, location=location,
+                 nickname=nickname, espn_team_id=f'resolver-{i}')
+            for i, (name, short, abbr, sport, location, nickname) in enumerate(TEAMS)
+        ])
+        db.session.commit()
+
+        yield
+
+        db.session.rollback()
+        Team.query.filter(Team.espn_team_id.like('resolver-%')).delete(synchronize_session=False)
+        db.session.commit()
+        team_resolver.invalidate()
+
+
+def test_normalize_team_key():
+    assert normalize_team_key("  L.A. Clippers ") == 'la clippers'
+    assert normalize_team_key("St. Louis Blues") == 'st louis blues'
+    assert normalize_team_key(None) == ''
+
+
+def test_exact_abbreviation_and_partial_matches(resolver_teams):
+    with app.app_context():
+        assert team_resolver.full_name('seattle seahawks', 'NFL') == 'Seattle Seahawks'
+        assert team_resolver.full_name('SEA', 'NFL') == 'Seattle Seahawks'
+        assert team_resolver.nickname('Seattle', 'NFL') == 'Seahawks'
+        assert team_resolver.nickname('Niners', 'NFL') == '49ers'
+        assert team_resolver.abbreviation('LA Lakers', 'NBA') == 'LAL'
+        assert team_resolver.abbreviation('Los Angeles Clippers', 'NBA') == 'LAC'
+
+        # Abbreviations shared across sports resolve within the requested sport
+        assert team_resolver.nickname('MIN', 'NFL') == 'Vikings'
+        assert team_resolver.nickname('MIN', 'NBA') == 'Timberwolves'
+        assert team_resolver.by_abbreviation('min', 'NBA').team_name == 'Minnesota Timberwolves'
+
+        # Ambiguous partial names and unknown names don't guess
+        assert team_resolver.resolve('Los Angeles', 'NBA') is None
+        assert team_resolver.resolve('Game Total', 'NFL') is None
+        assert team_resolver.nickname('Nowhere Nobodies', 'NFL', default='Nowhere Nobodies') == 'Nowhere Nobodies'
+        assert team_resolver.resolve('Seahawks', 'CRICKET') is None
+
+
+def test_refreshes_after_team_changes(resolver_teams):
+    with app.app_context():
+        assert team_resolver.nickname('Seattle', 'NFL') == 'Seahawks'
+        team = Team.query.filter_by(espn_team_id='resolver-0').one()
+        team.nickname = 'Sea Birds'
+        db.session.commit()
+        assert team_resolver.nickname('SEA', 'NFL') == 'Sea Birds'
+
+        # Session-bound lookups come back as the persistent row
+        bound = Team.get_team_by_name_cached('Seattle Seahawks')
+        assert bound is db.session.get(Team, team.id)
+        assert Team.get_team_abbr_by_name_cached('Vikings') == 'MIN'
+
+
+def test_leg_normalization_only_rewrites_nfl_and_nba(resolver_teams):
+    game_day = date(2025, 10, 12)
+    with app.app_context():
+        user = User(username='team_resolver_user', email='team_resolver_user@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        bet = Bet(user_id=user.id, status='pending', bet_type='Parlay', betting_site='FanDuel',
+                  bet_date=game_day.isoformat(), total_legs=3, secondary_bettors=[], watchers=[])
+        db.session.add(bet)
+        db.session.flush()
+        legs = {
+            'NFL': BetLeg(bet_id=bet.id, player_name='Seattle Seahawks', player_team='Seattle Seahawks',
+                          home_team='Seattle Seahawks', away_team='MIN', sport='NFL'),
+            'MLB': BetLeg(bet_id=bet.id, player_name='Seattle Mariners', player_team='Seattle Mariners',
+                          home_team='Seattle Mariners', away_team='TEX', sport='MLB'),
+            'NHL': BetLeg(bet_id=bet.id, player_name='Kraken', player_team='Kraken',
+                          home_team='Kraken', away_team='NYR', sport='NHL'),
+        }
+        for leg in legs.values():
+            leg.bet_type, leg.stat_type, leg.target_value, leg.status = 'moneyline', 'moneyline', 0, 'pending'
+            leg.game_date = game_day
+        db.session.add_all(legs.values())
+        db.session.commit()
+        try:
+            normalize_bet_leg_team_names()
+
+            teams = {sport: (leg.home_team, leg.away_team, leg.player_team) for sport, leg in legs.items()}
+            assert teams == {
+                'NFL': ('Seahawks', 'Vikings', 'SEA'),
+                'MLB': ('Seattle Mariners', 'TEX', 'Seattle Mariners'),
+                'NHL': ('Kraken', 'NYR', 'Kraken'),
+            }
+
+            # The saved spellings still match ESPN's games
+            games = [('nfl-1', 'Minnesota Vikings', 'Seattle Seahawks', game_day),
+                     ('mlb-1', 'Texas Rangers', 'Seattle Mariners', game_day),
+                     ('nhl-1', 'New York Rangers', 'Seattle Kraken', game_day)]
+            with patch('helpers.espn_api.get_espn_games_with_ids_for_date',
+                       side_effect=lambda day: games if day == game_day else []):
+                populate_game_ids_for_bet(bet)
+            assert {sport: leg.game_id for sport, leg in legs.items()} == \
+                {'NFL': 'nfl-1', 'MLB': 'mlb-1', 'NHL': 'nhl-1'}
+        finally:
+            db.session.rollback()
+            BetLeg.query.filter_by(bet_id=bet.id).delete(synchronize_session=False)
+            BetParticipant.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+            Bet.query.filter_by(id=bet.id).delete(synchronize_session=False)
+            User.query.filter_by(id=user.id).delete(synchronize_session=False)
+            db.session.commit()
@@ -0,0 +1,138 @@
+"""
+Tests for the incremental team name standardization job (automation.team_name_standardization).
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app import app
+from models import db, User, Bet, BetLeg, BetParticipant, Team, TeamAlias, JobWatermark
+from automation.team_name_standardization import standardize_bet_leg_team_names
+from helpers.team_resolver import team_resolver
+
+
+def _leg(bet_id, home, away, player_team=None, sport='NFL'):
+    leg = BetLeg(bet_id=bet_id, player_name='Std Player', player_team=player_team, home_team=home,
+                 away_team=away, bet_type='player_prop', stat_type='receiving_yards', target_value=50,
+                 sport=sport)
+    db.session.add(leg)
+    return leg
+
+
+@pytest.fixture
+def standardization_data():
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Team(team_name='Seattle Seahawks', team_name_short='Seahawks', team_abbr='SEA', sport='NFL',
+                 location='Seattle', nickname='Seahawks', espn_team_id='std-1'),
+            Team(team_name='Minnesota Vikings', team_name_short='Vikings', team_abbr='MIN', sport='NFL',
+                 location='Minnesota', nickname='Vikings', espn_team_id='std-2'),
+            Team(team_name='Minnesota Timberwolves', team_name_short='Timberwolves', team_abbr='MIN',
+                 sport='NBA', location='Minnesota', nickname='Timberwolves', espn_team_id='std-3'),
+        ])
+        user = User(username='std_user', email='std_user@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        bet = Bet(user_id=user.id, status='pending', bet_type='Parlay', betting_site='FanDuel',
+                  bet_date='2025-01-10', total_legs=0, secondary_bettors=[], watchers=[])
+        db.session.add(bet)
+        db.session.commit()
+
+        yield bet
+
+        db.session.rollback()
+        BetLeg.query.filter_by(bet_id=bet.id).delete(synchronize_session=False)
+        BetParticipant.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+        Bet.query.filter_by(id=bet.id).delete(synchronize_session=False)
+        User.query.filter_by(id=user.id).delete(synchronize_session=False)
+        Team.query.filter(Team.espn_team_id.like('std-%')).delete(synchronize_session=False)
+        TeamAlias.query.delete(synchronize_session=False)
+        JobWatermark.query.delete(synchronize_session=False)
+        db.session.commit()
+        team_resolver.invalidate()
+
+
+def test_standardizes_new_legs_set_based(standardization_data):
+    bet = standardization_data
+    with app.app_context():
+        exact = _leg(bet.id, 'SEA', 'Minnesota Vikings', player_team='sea')
+        partial = _leg(bet.id, 'Seattle', 'Game Total')
+        nba = _leg(bet.id, 'MIN', 'Nowhere', sport='NBA')
+        db.session.commit()
+        leg_ids = [exact.id, partial.id, nba.id]
+
+        assert standardize_bet_leg_team_names() == 3
+        rows = {leg.id: (leg.home_team, leg.away_team, leg.player_team)
+                for leg in BetLeg.query.filter(BetLeg.id.in_(leg_ids))}
+        assert rows[exact.id] == ('Seahawks', 'Vikings', 'Seahawks')
+        assert rows[partial.id] == ('Seahawks', 'Game Total', None)
+        assert rows[nba.id] == ('Timberwolves', 'Nowhere', None)
+
+        # Spellings the resolver matched (or missed) once are now aliases
+        learned = {(a.alias, a.sport): a.canonical
+                   for a in TeamAlias.query.filter_by(source=TeamAlias.SOURCE_LEARNED)}
+        assert learned[('seattle', 'NFL')] == 'Seahawks'
+        assert learned[('game total', 'NFL')] is None
+
+        # Search documents follow the rewritten names
+        assert 'seahawks' in db.session.get(Bet, bet.id).search_document.split()
+
+        # Nothing new since the watermark: no changes
+        assert standardize_bet_leg_team_names() == 0
+
+
+def test_only_legs_after_watermark_are_processed(standardization_data):
+    bet = standardization_data
+    with app.app_context():
+        assert standardize_bet_leg_team_names() == 0  # seeds aliases, sets the watermark
+
+        old = _leg(bet.id, 'Minnesota Vikings', 'SEA')
+        new = _leg(bet.id, 'Seattle Seahawks', 'MIN')
+        db.session.commit()
+        db.session.execute(BetLeg.__table__.update().where(BetLeg.id == old.id)
+                           .values(updated_at=datetime(2020, 1, 1)))
+        db.session.commit()
+        old_id, new_id = old.id, new.id
+
+        assert standardize_bet_leg_team_names() == 1
+        assert db.session.get(BetLeg, new_id).home_team == 'Seahawks'
+        assert db.session.get(BetLeg, old_id).home_team == 'Minnesota Vikings'
+
+        assert standardize_bet_leg_team_names(full=True) == 1
+        leg = db.session.get(BetLeg, old_id)
+        assert (leg.home_team, leg.away_team) == ('Vikings', 'Seahawks')
+
+
+def test_other_sports_are_left_alone(standardization_data):
+    bet = standardization_data
+    with app.app_context():
+        db.session.add_all([
+            Team(team_name='Seattle Mariners', team_name_short='Mariners', team_abbr='SEA', sport='MLB',
+                 location='Seattle', nickname='Mariners', espn_team_id='std-4'),
+            Team(team_name='Texas Rangers', team_name_short='Rangers', team_abbr='TEX', sport='MLB',
+                 location='Texas', nickname='Rangers', espn_team_id='std-5'),
+            Team(team_name='Seattle Kraken', team_name_short='Kraken', team_abbr='SEA', sport='NHL',
+                 location='Seattle', nickname='Kraken', espn_team_id='std-6'),
+        ])
+        mlb = _leg(bet.id, 'Seattle Mariners', 'TEX', player_team='SEA', sport='MLB')
+        nhl = _leg(bet.id, 'SEA', 'Minnesota Wild', sport='NHL')
+        nfl = _leg(bet.id, 'SEA', 'MIN')
+        db.session.commit()
+        mlb_id, nhl_id, nfl_id = mlb.id, nhl.id, nfl.id
+
+        assert standardize_bet_leg_team_names() == 1
+        leg = db.session.get(BetLeg, mlb_id)
+        assert (leg.home_team, leg.away_team, leg.player_team) == ('Seattle Mariners', 'TEX', 'SEA')
+        leg = db.session.get(BetLeg, nhl_id)
+        assert (leg.home_team, leg.away_team) == ('SEA', 'Minnesota Wild')
+        leg = db.session.get(BetLeg, nfl_id)
+        assert (leg.home_team, leg.away_team) == ('Seahawks', 'Vikings')
+
+        # Neither seeded nor learned aliases cover the other sports
+        assert not TeamAlias.query.filter(TeamAlias.sport.in_(['MLB', 'NHL'])).count()
+        assert not TeamAlias.query.filter_by(canonical='Mariners').count()
@@ -0,0 +1,75 @@
+"""
+Tests for the per-game touchdown scorer index (helpers.utils.TouchdownIndex).
+"""
+
+import sys
+from pathlib import Path
+
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers import utils
+from helpers.utils import TouchdownIndex, touchdown_index, _get_touchdowns
+from services.bet_service import calculate_bet_value
+
+
+def _category(name, athletes):
+    return {"name": name, "labels": ["CAR", "YDS", "TD"],
+            "athletes": [{"athlete": {"id": athlete_id, "displayName": display}, "stats": ["10", "50", str(tds)]}
+                         for athlete_id, display, tds in athletes]}
+
+
+BOXSCORE = [
+    {"team": {"displayName": "Detroit Lions"},
+     "statistics": [_category("rushing", [("101", "Jahmyr Gibbs", 1), ("102", "David Montgomery", 0)]),
+                    _category("receiving", [("101", "Jahmyr Gibbs", 1), ("103", "Amon-Ra St. Brown", 0)])]},
+    {"team": {"displayName": "Minnesota Vikings"},
+     "statistics": [_category("receiving", [("201", "Justin Jefferson", 2)])]},
+]
+
+SCORING_PLAYS = [
+    {"type": {"text": "Passing Touchdown"}, "text": "Sam Darnold 12 Yd pass to Jordan Addison",
+     "team": {"displayName": "Minnesota Vikings"}},
+    {"type": {"text": "Rushing Touchdown"}, "text": "Jahmyr Gibbs 3 Yd Run",
+     "team": {"displayName": "Detroit Lions"}},
+    {"type": {"text": "Field Goal Good"}, "text": "Jake Bates 45 Yd Field Goal",
+     "team": {"displayName": "Detroit Lions"}},
+]
+
+
+def test_counts_from_boxscore_and_scoring_plays():
+    index = TouchdownIndex(BOXSCORE, SCORING_PLAYS)
+    assert index.count("Jahmyr Gibbs") == 2
+    assert index.count("J. Gibbs") == 2
+    assert index.count("Amon-Ra St. Brown") == 0
+    assert index.count(None, athlete_id=201) == 2
+    # Not in the boxscore: fall back to scoring play text, skipping the passer
+    assert index.count("Jordan Addison") == 1
+    assert index.count("Sam Darnold") == 0
+    assert index.scored("Sam Darnold") == 0
+    assert index.scored("jahmyr gibbs", last=True) == 0
+
+
+def test_first_and_last_scorer_from_participants():
+    plays = [{"type": {"text": "Rushing Touchdown"}, "participants": [{"displayName": "Jahmyr Gibbs"}]},
+             {"type": {"text": "Receiving Touchdown"}, "participants": [{"displayName": "Justin Jefferson"}]}]
+    index = TouchdownIndex([], plays)
+    assert index.scored("Jahmyr Gibbs") == 1
+    assert index.scored("Justin Jefferson", last=True) == 1
+    assert index.count("Justin Jefferson") == 1
+
+
+def test_index_is_built_once_per_game():
+    game = {"boxscore": BOXSCORE, "scoring_plays": SCORING_PLAYS,
+            "score": {"home": 24, "away": 17}, "teams": {"home": "Detroit Lions", "away": "Minnesota Vikings"}}
+    utils._touchdown_indexes.clear()
+    with patch.object(utils, "TouchdownIndex", wraps=TouchdownIndex) as build:
+        for player in ("Jahmyr Gibbs", "Justin Jefferson", "Jordan Addison"):
+            calculate_bet_value({"player": player, "stat": "anytime_touchdown", "sport": "NFL"}, game)
+        assert calculate_bet_value({"player": "Jahmyr Gibbs", "stat": "anytime_touchdown", "sport": "NFL"},
+                                   game) == 2
+        assert build.call_count == 1
+    assert touchdown_index(BOXSCORE, SCORING_PLAYS) is touchdown_index(BOXSCORE, SCORING_PLAYS)
+    # Different lists with equal content get their own index
+    assert touchdown_index(list(BOXSCORE), SCORING_PLAYS) is not touchdown_index(BOXSCORE, SCORING_PLAYS)
+    assert _get_touchdowns("Justin Jefferson", BOXSCORE, SCORING_PLAYS) == 2
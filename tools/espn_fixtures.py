@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Record ESPN responses to a fixture store, or serve a store as a local ESPN stand-in.
+
+record: fetches each date's scoreboard and game summaries (and, for each
+--player, the ESPN search, athlete and season stats pages) through the app's
+own ESPN client while recording every response.
+
+serve: replays a store over HTTP with optional latency and error injection.
+Point the app at it with ESPN_REPLAY_URL=<printed url>.
+
+Usage:
+    python tools/espn_fixtures.py record --store fixtures/espn --sport NFL --date 2025-11-16 [--player "Jahmyr Gibbs"]
+    python tools/espn_fixtures.py serve --store fixtures/espn [--port 8765] [--latency-ms 80] [--error-rate 0.05]
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from helpers.espn_fixtures import FixtureServer, FixtureStore, recording
+
+
+def record(args):
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+    from app import app, db
+    from helpers.utils import get_events
+    from helpers.espn_api import get_espn_player_details, get_player_season_stats
+    from helpers.player_resolver import player_resolver, espn_sport_league
+    from services.bet_service import fetch_game_details_from_espn
+
+    store = FixtureStore(args.store)
+    espn_sport, league = espn_sport_league(args.sport)
+    with app.app_context(), recording(store):
+        db.create_all()
+        for game_date in args.date:
+            events = get_events(game_date, args.sport)
+            print(f"{game_date}: {len(events)} {args.sport} events")
+            for event in events:
+                competitors = event['competitions'][0]['competitors']
+                away = next(c for c in competitors if c['homeAway'] == 'away')['team']['displayName']
+                home = next(c for c in competitors if c['homeAway'] == 'home')['team']['displayName']
+                game = fetch_game_details_from_espn(game_date, away, home, args.sport)
+                print(f"  {away} @ {home}: {'ok' if game else 'not found'}")
+        for name in args.player:
+            data = player_resolver.search_espn(name, sport=espn_sport, league=league)
+            espn_id = (data or {}).get('espn_player_id')
+            print(f"player {name}: {espn_id or 'not found'}")
+            if espn_id:
+                get_espn_player_details(espn_id, sport=espn_sport, league=league)
+                get_player_season_stats(espn_id, sport=espn_sport, league=league)
+    print(f"{len(store.keys())} fixtures in {args.store}")
+
+
+def serve(args):
+    server = FixtureServer(args.store, host=args.host, port=args.port, latency_ms=args.latency_ms,
+                           jitter_ms=args.jitter_ms, error_rate=args.error_rate, stall_rate=args.stall_rate,
+                           stall_seconds=args.stall_seconds, seed=args.seed)
+    print(f"Serving {len(server.store.keys())} fixtures from {args.store} at {server.url}")
+    print(f"Run the app with ESPN_REPLAY_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Counts: {server.counts}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rec = commands.add_parser('record', help='record ESPN responses for dates and players')
+    rec.add_argument('--store', required=True)
+    rec.add_argument('--sport', default='NFL')
+    rec.add_argument('--date', action='append', default=[], help='YYYY-MM-DD (repeatable)')
+    rec.add_argument('--player', action='append', default=[], help='player name (repeatable)')
+    rec.set_defaults(func=record)
+
+    srv = commands.add_parser('serve', help='serve a fixture store as an ESPN stand-in')
+    srv.add_argument('--store', required=True)
+    srv.add_argument('--host', default='127.0.0.1')
+    srv.add_argument('--port', type=int, default=8765)
+    srv.add_argument('--latency-ms', type=float, default=0)
+    srv.add_argument('--jitter-ms', type=float, default=0)
+    srv.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with a 503')
+    srv.add_argument('--stall-rate', type=float, default=0.0, help='share of requests stalled before answering')
+    srv.add_argument('--stall-seconds', type=float, default=10.0)
+    srv.add_argument('--seed', type=int, default=0)
+    srv.set_defaults(func=serve)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()